@@ -0,0 +1,74 @@
+"""Throughput of the pydantic, array and batched chart calculation paths.
+
+Casts the same random charts (1930-2020, any place) with the real ephemeris
+through ``calculate_chart_at`` (pydantic models), ``calculate_arrays_at``
+(one ``ChartArrays`` per chart) and ``calculate_batch`` (one ``ChartBatch``,
+fresh and reused), and reports microseconds per chart. The raw Swiss
+Ephemeris calls are timed on their own as the floor.
+
+Example::
+
+    python -m benchmarks.chart_batch --charts 20000 --bodies standard
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+
+import swisseph as swe
+
+from src.infrastructure.astro_engine.bodies import resolve_plan
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+
+def best_of(repeats: int, run: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=10_000)
+    parser.add_argument("--bodies", default="classic")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    engine = SwissEphemerisEngine()
+    rng = random.Random(args.seed)
+    jd_1930, jd_2020 = swe.julday(1930, 1, 1, 0.0), swe.julday(2020, 12, 31, 0.0)
+    jds = [rng.uniform(jd_1930, jd_2020) for _ in range(args.charts)]
+    lats = [rng.uniform(-55.0, 65.0) for _ in range(args.charts)]
+    lons = [rng.uniform(-180.0, 180.0) for _ in range(args.charts)]
+    moments = list(zip(jds, lats, lons))
+    plan = resolve_plan(args.bodies)
+
+    def raw() -> None:
+        for jd, lat, lon in moments:
+            armc = swe.houses(jd, lat, lon, engine.HOUSE_SYSTEM)[1][2]
+            eps = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+            for _, body_id in plan.ephemeris:
+                pos = swe.calc_ut(jd, body_id, flags=engine.CALC_FLAGS)[0]
+                swe.house_pos(armc, lat, eps, (pos[0], pos[1]), engine.HOUSE_SYSTEM)
+
+    out = engine.calculate_batch(jds, lats, lons, args.bodies)
+    paths = [
+        ("swiss ephemeris only", raw),
+        ("calculate_chart_at", lambda: [engine.calculate_chart_at(*m, bodies=args.bodies) for m in moments]),
+        ("calculate_arrays_at", lambda: [engine.calculate_arrays_at(*m, bodies=args.bodies) for m in moments]),
+        ("calculate_batch", lambda: engine.calculate_batch(jds, lats, lons, args.bodies)),
+        ("calculate_batch(out=)", lambda: engine.calculate_batch(jds, lats, lons, args.bodies, out=out)),
+    ]
+    print(f"{args.charts} charts, {len(plan.layout)} bodies\n")
+    print(f"{'path':<24} {'us/chart':>10}")
+    for name, run in paths:
+        print(f"{name:<24} {best_of(args.repeats, run) / args.charts * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Load test of the full API stack against a local fake LLM server.
+
+Starts the fake model server, then for every requested worker count launches
+``uvicorn`` with ``GeminiAdapter`` pointed at it and drives open-loop mixed
+traffic (chart-only, horoscope, admin horoscope) at a target rate. Reports
+throughput, latency percentiles and error rates per scenario.
+
+Example::
+
+    python -m benchmarks.loadtest.run --workers 1 2 4 --rps 50 --duration 30 \\
+        --llm-median-ms 800 --llm-p99-ms 6000 --llm-error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from src.tests.fake_llm_server import FakeLLMConfig, FakeLLMServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_MIX = {"chart": 0.6, "horoscope": 0.3, "admin": 0.1}
+
+
+@dataclass
+class ScenarioStats:
+    """Outcomes of one traffic scenario."""
+
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    timeouts: int = 0
+
+    @property
+    def sent(self) -> int:
+        return len(self.latencies) + self.errors + self.timeouts
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def make_request(scenario: str, rng: random.Random) -> Tuple[str, str, dict]:
+    """Build a realistic request for a scenario with random birth data.
+
+    Args:
+        scenario: "chart", "horoscope" or "admin".
+        rng: Random source.
+
+    Returns:
+        Tuple of (method, path, JSON body).
+    """
+    date = f"{rng.randint(1940, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    time_of_day = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+    lat = round(rng.uniform(-60.0, 65.0), 4)
+    lon = round(rng.uniform(-180.0, 180.0), 4)
+    if scenario == "chart":
+        return "POST", "/api/v1/chart/calculate", {
+            "date": date, "time": time_of_day, "latitude": lat, "longitude": lon, "timezone": "UTC",
+        }
+    return "POST", "/api/v1/horoscope/personal", {
+        "profile": {"name": "Load", "birth_date": date, "birth_time": time_of_day, "latitude": lat, "longitude": lon},
+        "preferences": {"tone": rng.choice(["spiritual", "psychological", "practical"]),
+                        "focus": rng.choice(["general", "love", "career"]), "language": "en"},
+        "admin": scenario == "admin",
+    }
+
+
+async def drive(base_url: str, rps: float, duration: float, mix: Dict[str, float],
+                timeout: float, seed: int) -> Tuple[Dict[str, ScenarioStats], float]:
+    """Send open-loop traffic: arrivals follow a Poisson process at ``rps``.
+
+    Args:
+        base_url: API base URL.
+        rps: Target arrival rate.
+        duration: Seconds of traffic.
+        mix: Scenario weights.
+        timeout: Per-request timeout in seconds.
+        seed: Random seed.
+
+    Returns:
+        Tuple of per-scenario stats and the wall time until all responses arrived.
+    """
+    rng = random.Random(seed)
+    scenarios, weights = zip(*mix.items())
+    stats = {scenario: ScenarioStats() for scenario in scenarios}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def one(scenario: str) -> None:
+            method, path, body = make_request(scenario, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+            except httpx.TimeoutException:
+                stats[scenario].timeouts += 1
+                return
+            except httpx.HTTPError:
+                stats[scenario].errors += 1
+                return
+            if response.status_code >= 400:
+                stats[scenario].errors += 1
+            else:
+                stats[scenario].latencies.append(time.perf_counter() - started)
+
+        tasks = []
+        started = time.perf_counter()
+        next_arrival = started
+        while next_arrival - started < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(rng.choices(scenarios, weights)[0])))
+            next_arrival += rng.expovariate(rps)
+        await asyncio.gather(*tasks)
+        return stats, time.perf_counter() - started
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(workers: int, llm_url: str, port: int, workdir: str) -> subprocess.Popen:
+    """Launch the API under uvicorn and wait until it is healthy."""
+    env = dict(
+        os.environ,
+        GOOGLE_API_KEY="load-test",
+        GEMINI_BASE_URL=llm_url,
+        APP_ENV="production",
+        JOB_WORKERS="0",
+        JOB_QUEUE_PATH=os.path.join(workdir, "jobs.sqlite3"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.interfaces.api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not become healthy within 60 s")
+
+
+def report(workers: int, stats: Dict[str, ScenarioStats], elapsed: float) -> List[dict]:
+    """Print and return one row per scenario."""
+    rows = []
+    for scenario, s in stats.items():
+        rows.append({
+            "workers": workers,
+            "scenario": scenario,
+            "sent": s.sent,
+            "ok": len(s.latencies),
+            "error_rate": (s.errors + s.timeouts) / s.sent if s.sent else 0.0,
+            "timeouts": s.timeouts,
+            "throughput_rps": len(s.latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(s.latencies, 50) * 1000,
+            "p90_ms": percentile(s.latencies, 90) * 1000,
+            "p99_ms": percentile(s.latencies, 99) * 1000,
+            "max_ms": max(s.latencies, default=0.0) * 1000,
+        })
+    for row in rows:
+        print(
+            f"{row['workers']:>7} {row['scenario']:<10} {row['sent']:>6} {row['ok']:>6} "
+            f"{row['error_rate']:>7.2%} {row['throughput_rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX,
+                        help='Scenario weights as JSON, e.g. \'{"chart": 0.8, "horoscope": 0.2}\'')
+    parser.add_argument("--llm-median-ms", type=float, default=800.0)
+    parser.add_argument("--llm-p99-ms", type=float, default=6000.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-hang-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    llm = FakeLLMServer(FakeLLMConfig(
+        median_ms=args.llm_median_ms, p99_ms=args.llm_p99_ms, error_rate=args.llm_error_rate,
+        hang_rate=args.llm_hang_rate, seed=args.seed,
+    )).start()
+    print(f"{'workers':>7} {'scenario':<10} {'sent':>6} {'ok':>6} {'errors':>7} {'rps':>8} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows: List[dict] = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for workers in args.workers:
+                port = free_port()
+                app = start_app(workers, llm.base_url, port, workdir)
+                try:
+                    stats, elapsed = asyncio.run(drive(
+                        f"http://127.0.0.1:{port}", args.rps, args.duration, args.mix, args.timeout, args.seed,
+                    ))
+                    rows.extend(report(workers, stats, elapsed))
+                finally:
+                    app.terminate()
+                    app.wait(timeout=30)
+    finally:
+        llm.stop()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Chart cache hit rate and latency per worker count: per-process vs shared.
+
+Runs N worker processes that split one stream of chart requests, as a load
+balancer would. Birth data is drawn from a Zipf-like popularity over a fixed
+population, and every request goes through ``CalculateChartUseCase`` with
+the real ephemeris. Each worker count is run twice: with a per-process LRU
+of ``--capacity`` charts in every worker, and with one ``SharedChartCache``
+of ``--capacity`` charts for all of them. Reported per run: the hit rate
+over all requests, and the mean, p50 and p99 microseconds per request.
+
+Example::
+
+    python -m benchmarks.shared_chart_cache --workers 1 2 4 8 --requests 40000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.core.domain.models import BirthData, NatalChart
+from src.core.use_cases.calculate_chart import CalculateChartUseCase
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+from src.infrastructure.persistence.bounded_repo import BoundedStore
+from src.infrastructure.persistence.shared_chart_cache import SharedChartCache
+
+
+class LocalChartCache:
+    """Per-process LRU with the ``SharedChartCache`` interface."""
+
+    def __init__(self, capacity: int):
+        self.store = BoundedStore(max_entries=capacity)
+        self.hits = 0
+
+    def get(self, key: str) -> Optional[NatalChart]:
+        chart = self.store.get(key)
+        self.hits += chart is not None
+        return chart
+
+    def put(self, key: str, chart: NatalChart) -> bool:
+        self.store[key] = chart
+        return True
+
+
+def population(size: int, seed: int) -> List[BirthData]:
+    rng = random.Random(seed)
+    return [
+        BirthData(
+            date=f"{rng.randint(1940, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            time=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            lat=round(rng.uniform(-55.0, 65.0), 4), lon=round(rng.uniform(-180.0, 180.0), 4), timezone="UTC",
+        )
+        for _ in range(size)
+    ]
+
+
+def run_worker(args: Tuple[str, str, int, List[BirthData], List[int]]) -> Tuple[int, np.ndarray]:
+    mode, path, capacity, people, requests = args
+    cache = SharedChartCache(path, entries=capacity) if mode == "shared" else LocalChartCache(capacity)
+    use_case = CalculateChartUseCase(SwissEphemerisEngine(), cache=cache)
+    timings = np.empty(len(requests))
+    for i, person in enumerate(requests):
+        start = time.perf_counter()
+        use_case.execute(people[person])
+        timings[i] = time.perf_counter() - start
+    return cache.hits, timings
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=40_000, help="total, split across the workers")
+    parser.add_argument("--population", type=int, default=20_000, help="distinct birth data")
+    parser.add_argument("--capacity", type=int, default=8192, help="charts per cache")
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    people = population(args.population, args.seed)
+    weights = 1.0 / np.arange(1, args.population + 1) ** args.zipf
+    stream = np.random.default_rng(args.seed).choice(args.population, args.requests, p=weights / weights.sum())
+    context = multiprocessing.get_context("fork")
+
+    print(f"{args.requests} requests over {args.population} birth data, {args.capacity} charts per cache\n")
+    print(f"{'workers':>7} {'cache':<7} {'hit rate':>9} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    for workers in args.workers:
+        for mode in ("local", "shared"):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "charts.cache")
+                SharedChartCache(path, entries=args.capacity).close()  # created once, before the workers
+                shares = [(mode, path, args.capacity, people, stream[w::workers].tolist()) for w in range(workers)]
+                with context.Pool(workers) as pool:
+                    results = pool.map(run_worker, shares)
+            hits = sum(h for h, _ in results)
+            timings = np.concatenate([t for _, t in results]) * 1e6
+            print(f"{workers:>7} {mode:<7} {hits / args.requests:>9.1%} {timings.mean():>9.1f} "
+                  f"{np.percentile(timings, 50):>9.1f} {np.percentile(timings, 99):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Recall-vs-latency benchmark of the chart-similarity indexes.
+
+Casts charts for random birth moments (1930-2020) and places with the real
+ephemeris, embeds them, and compares exact ``FlatIndex`` search with
+``IVFIndex`` at several ``nprobe`` values. Recall@k is measured against the
+exact results for held-out query charts. Also reports the time to insert
+incrementally and to open a memory-mapped snapshot.
+
+Example::
+
+    python -m benchmarks.similarity --charts 100000 --queries 200 --k 10 --nprobe 1 4 8 16 32
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.core.domain.models import BirthData
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+from src.infrastructure.similarity.embedding import embed_batch
+from src.infrastructure.similarity.vector_index import ChartSimilarityIndex, FlatIndex, IVFIndex
+
+
+def random_birth_data(rng: random.Random) -> BirthData:
+    return BirthData(
+        date=f"{rng.randint(1930, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        time=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+        lat=rng.uniform(-55.0, 65.0),
+        lon=rng.uniform(-180.0, 180.0),
+        timezone="UTC",
+    )
+
+
+def embed_random_charts(count: int, seed: int) -> np.ndarray:
+    engine = SwissEphemerisEngine()
+    rng = random.Random(seed)
+    births = [random_birth_data(rng) for _ in range(count)]
+    jds = [engine._calculate_julian_day(birth) for birth in births]
+    return embed_batch(engine.calculate_batch(jds, [b.lat for b in births], [b.lon for b in births]))
+
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def timed_search(index, queries: np.ndarray, k: int, **kwargs):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, keys = index.search(query, k, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        results.append(set(keys))
+    return results, latencies
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="IVF clusters; 0 uses 4 * sqrt(charts)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    vectors = embed_random_charts(args.charts + args.queries, args.seed)
+    print(f"cast and embedded {len(vectors)} charts in {time.perf_counter() - start:.1f} s")
+    data, queries = vectors[:args.charts], vectors[args.charts:]
+    keys = list(range(args.charts))
+
+    flat = FlatIndex(data.shape[1])
+    start = time.perf_counter()
+    for key, vector in zip(keys, data):
+        flat.add(key, vector)
+    print(f"flat incremental insert: {(time.perf_counter() - start) / args.charts * 1e6:.1f} us/chart")
+    truth, latencies = timed_search(flat, queries, args.k)
+    print(f"\n{'index':<14} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{'flat':<14} {1.0:>10.3f} {percentile(latencies, 50):>8.3f} {percentile(latencies, 99):>8.3f}")
+
+    nlist = args.nlist or int(min(4096, max(16, 4 * np.sqrt(args.charts))))
+    start = time.perf_counter()
+    ivf = IVFIndex.train(data, keys, nlist=nlist)
+    print(f"{'':<14} (IVF with {nlist} lists trained in {time.perf_counter() - start:.1f} s)")
+    for nprobe in args.nprobe:
+        found, latencies = timed_search(ivf, queries, args.k, nprobe=nprobe)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(f"{'ivf/' + str(nprobe):<14} {recall:>10.3f} {percentile(latencies, 50):>8.3f} "
+              f"{percentile(latencies, 99):>8.3f}")
+
+    index = ChartSimilarityIndex(ivf_threshold=args.charts + 1)
+    index._index = ivf
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index.save(directory)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = ChartSimilarityIndex.load(directory)
+        print(f"\nsnapshot: saved in {saved * 1000:.0f} ms, memory-mapped in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms ({len(loaded)} vectors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Live sky fan-out: broadcast latency and memory per subscriber count.
+
+Subscribes N in-process consumers to one ``SkyFeed`` with the real
+ephemeris, as the WebSocket endpoint does, minus the socket writes. A
+``--slow`` fraction of them takes longer than a tick over each frame. Each
+count runs for ``--ticks`` ticks. Reported per run: the ephemeris
+computations, frames delivered and dropped, the p50 and p99 time from a
+frame's publication to its last delivery, and the memory held per subscriber.
+
+Example::
+
+    python -m benchmarks.sky_feed --subscribers 1000 10000 50000 --ticks 10
+"""
+
+import argparse
+import asyncio
+import tracemalloc
+from typing import List, Optional
+
+from src.infrastructure.astro_engine.sky_feed import SkyFeed
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+
+class CountingEngine(SwissEphemerisEngine):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def calculate_positions(self, jd):
+        self.calls += 1
+        return super().calculate_positions(jd)
+
+
+async def consume(feed: SkyFeed, delay: float) -> None:
+    async for frame in feed.frames():
+        if delay:
+            await asyncio.sleep(delay)
+        feed.delivered(frame)
+
+
+async def run(subscribers: int, ticks: int, interval: float, slow: float) -> None:
+    engine = CountingEngine()
+    feed = SkyFeed(engine, interval=interval, max_subscribers=subscribers)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    slow_count = int(subscribers * slow)
+    tasks = [
+        asyncio.create_task(consume(feed, 1.5 * interval if i < slow_count else 0.0))
+        for i in range(subscribers)
+    ]
+    await asyncio.sleep(interval / 2)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+    await asyncio.sleep(ticks * interval)
+    await feed.stop()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stats = feed.stats()
+    print(f"{subscribers:>11} {engine.calls:>8} {stats['delivered']:>10} {stats['dropped']:>8} "
+          f"{stats['broadcast_p50_ms']:>9.1f} {stats['broadcast_p99_ms']:>9.1f} {per_subscriber:>11.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds per tick")
+    parser.add_argument("--slow", type=float, default=0.01, help="fraction of subscribers slower than a tick")
+    args = parser.parse_args(argv)
+
+    print(f"{args.ticks} ticks of {args.interval} s, {args.slow:.0%} slow subscribers\n")
+    print(f"{'subscribers':>11} {'computed':>8} {'delivered':>10} {'dropped':>8} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'bytes/sub':>11}")
+    for subscribers in args.subscribers:
+        asyncio.run(run(subscribers, args.ticks, args.interval, args.slow))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,10 @@ export interface TimeCorrectionData {
     local_time: string;
     universal_time: string;
     offset: string;
+    time_assumed?: boolean;
+    timezone?: string;
+    zone_offset?: string | null;
+    julian_day?: number;
 }
 
 export interface ChartGenerationData {
@@ -16,6 +20,8 @@ export interface ChartGenerationData {
         name: string;
         degree: number;
         sign: string;
+        house?: number;
+        retrograde?: boolean;
     }>;
     houses: Array<{
         number: number;
@@ -38,7 +44,14 @@ export interface PMConfigData {
     ephemeris_source: string;
     interpretation_engine: string;
     ai_model: string;
-    temperature: number;
+    temperature: number | null;
+}
+
+export interface StageData {
+    name: string;
+    start_ms: number;
+    duration_ms: number;
+    source: 'computed' | 'cache' | 'error';
 }
 
 export interface ProcessingSteps {
@@ -47,6 +60,7 @@ export interface ProcessingSteps {
     chart_generation: ChartGenerationData;
     relationship_mapping: RelationshipMappingData;
     pm_config: PMConfigData;
+    stages?: StageData[];
 }
 
 export default ProcessingSteps;
\ No newline at end of file
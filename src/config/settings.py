@@ -8,7 +8,51 @@ class Settings(BaseSettings):
 
     app_env: str = "development"
     swiss_eph_path: str = ""
+    default_body_set: str = "classic"  # body set of charts whose request names none; see bodies.BODY_SETS
     google_api_key: str
+    gemini_base_url: str = ""  # e.g. a local fake model server for load tests
+    gemini_model: str = "gemini-pro"
+    ai_deadline_seconds: float = 8.0  # shared by both model calls; past it, horoscopes use template text
+    generation_cache_entries: int = 10_000  # cached chart analyses and rendered horoscope texts, each
+    text_engine: str = "ai"  # horoscope text of requests that name none: "ai" or "template" (no model calls)
+    ai_hedge_percentile: float = 95.0  # hedge calls slower than this latency percentile; 0 disables
+    ai_breaker_failures: int = 5
+    ai_breaker_reset_seconds: float = 30.0
+    static_dir: str = ""  # defaults to ./static at the project root
+    gazetteer_path: str = ""  # GeoNames-style cities dump; defaults to the bundled sample
+    job_queue_path: str = "jobs.sqlite3"
+    job_workers: int = 2  # 0 disables in-process workers (API-only processes)
+    job_max_attempts: int = 3
+    job_max_run_seconds: float = 600.0  # leases of longer-running jobs lapse and the attempt counts as failed
+    job_webhook_hosts: str = ""  # comma-separated hosts job webhooks may target; empty allows any public host
+    repository_max_entries: int = 10000  # per store: profiles, charts, chart references
+    repository_max_bytes: int = 256 * 1024 * 1024  # estimated bytes of cached charts
+    repository_ttl_seconds: float = 0.0  # 0 keeps entries until evicted
+    repository_spill_dir: str = ""  # evicted charts are written here; empty discards them
+    repository_compaction_seconds: float = 3600.0  # period of the duplicate compaction; 0 disables it
+    chart_cache_entries: int = 0  # charts in the cache shared by the host's workers; 0 disables it
+    chart_cache_path: str = ""  # defaults to a file under /dev/shm (or the system temp dir)
+    chart_cache_slot_bytes: int = 1024  # per chart record; charts that need more are not cached
+    astrocartography_cache_bytes: int = 64 * 1024 * 1024  # encoded astrocartography maps kept per process
+    profiling_mode: str = "off"  # off | sample (a fraction of requests) | slow (requests over profiling_slow_ms)
+    profiling_sample_rate: float = 0.01
+    profiling_slow_ms: float = 1000.0
+    profiling_interval_ms: float = 5.0  # stack sampling period
+    profiling_dir: str = ""  # capture ring buffer; defaults to a directory under the system temp dir
+    profiling_capacity: int = 200  # captures kept on disk
+    admin_token: str = ""  # required as X-Admin-Token by /admin endpoints; they are disabled when empty
+    similarity_index_dir: str = ""  # memory-mapped chart-similarity snapshot; saved on shutdown
+    similarity_ivf_threshold: int = 50_000  # above this many charts, search clusters instead of scanning all
+    similarity_nprobe: int = 8  # clusters scanned per similarity query
+    event_calendar_path: str = ""  # sky event index; defaults to a file under the system temp dir
+    event_calendar_start_year: int = 1950  # first year of the index; it is extended when the range grows
+    event_calendar_end_year: int = 2050  # first year not indexed
+    rise_set_cache_entries: int = 100_000  # cached cell UTC days of rise and set times
+    rise_set_cell_degrees: float = 0.05  # locations are rounded to cells this size (about 5 km)
+    rise_set_precompute_locations: int = 1000  # most common profile cells precomputed nightly; 0 disables
+    rise_set_precompute_hour: int = 2  # UTC hour of the nightly precompute
+    sky_feed_interval_seconds: float = 1.0  # tick of the live sky feed
+    sky_feed_max_subscribers: int = 50_000  # live sky subscribers per process; more are refused
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,102 @@
+"""Canonical form and content hash of birth data.
+
+A natal chart is a pure function of the birth data and the engine version, so
+two requests that canonicalise to the same values must produce the same chart.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+from src.core.domain.exceptions import InvalidCoordinatesError, InvalidDateError
+from src.core.domain.models import BirthData, NatalChart
+
+DEFAULT_BIRTH_TIME = "12:00"  # the engine uses noon when the time is unknown
+COORDINATE_PRECISION = 6  # decimal places (~0.1 m), far below ephemeris sensitivity
+
+
+def canonicalize_birth_data(birth_data: BirthData) -> BirthData:
+    """Normalise birth data to a single canonical representation.
+
+    Args:
+        birth_data: The birth data as received.
+
+    Returns:
+        BirthData: Zero-padded date/time, rounded coordinates, stripped timezone.
+
+    Raises:
+        InvalidDateError: If the date or time cannot be parsed.
+        InvalidCoordinatesError: If the coordinates are out of range.
+    """
+    time_str = (birth_data.time or DEFAULT_BIRTH_TIME).strip()
+    try:
+        dt = datetime.strptime(f"{birth_data.date.strip()} {time_str}", "%Y-%m-%d %H:%M")
+    except ValueError as exc:
+        raise InvalidDateError(details=str(exc)) from exc
+
+    if not -90.0 <= birth_data.lat <= 90.0 or not -180.0 <= birth_data.lon <= 180.0:
+        raise InvalidCoordinatesError(details=f"lat={birth_data.lat}, lon={birth_data.lon}")
+
+    # Adding 0.0 folds -0.0 into 0.0 so both hash identically
+    return BirthData(
+        date=dt.strftime("%Y-%m-%d"),
+        time=dt.strftime("%H:%M"),
+        lat=round(birth_data.lat, COORDINATE_PRECISION) + 0.0,
+        lon=round(birth_data.lon, COORDINATE_PRECISION) + 0.0,
+        timezone=birth_data.timezone.strip(),
+    )
+
+
+def birth_data_hash(birth_data: BirthData, engine_version: str = "") -> str:
+    """Compute a stable content hash of canonical birth data.
+
+    Args:
+        birth_data: Birth data, canonicalised by the caller or not.
+        engine_version: Version tag of the engine that computes the chart.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    canonical = canonicalize_birth_data(birth_data)
+    payload = json.dumps(
+        [canonical.date, canonical.time, canonical.lat, canonical.lon, canonical.timezone, engine_version],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def profile_id_for(birth_data: BirthData) -> str:
+    """Content-addressed profile ID: identical birth data, identical profile.
+
+    Args:
+        birth_data: The profile's birth data.
+
+    Returns:
+        str: Stable profile ID.
+    """
+    return "p_" + birth_data_hash(birth_data)[:32]
+
+
+def chart_id_for(birth_data: BirthData, engine_version: str) -> str:
+    """Content-addressed chart ID for the chart an engine computes from birth data.
+
+    Args:
+        birth_data: The chart's birth data.
+        engine_version: Version tag of the engine that computed the chart.
+
+    Returns:
+        str: Stable chart ID.
+    """
+    return "c_" + birth_data_hash(birth_data, engine_version)[:32]
+
+
+def chart_content_id(chart: NatalChart) -> str:
+    """Chart ID derived from the chart's own content, for charts of unknown origin.
+
+    Args:
+        chart: A computed natal chart.
+
+    Returns:
+        str: Stable chart ID.
+    """
+    return "c_" + hashlib.sha256(chart.model_dump_json().encode("utf-8")).hexdigest()[:32]
@@ -48,4 +48,135 @@ class CalculationError(DomainException):
             code="CALCULATION_ERROR",
             message="Error calculating astrological data.",
             details=details
-        )
\ No newline at end of file
+        )
+
+class PlaceNotFoundError(DomainException):
+    """Exception for unknown gazetteer place IDs."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="PLACE_NOT_FOUND",
+            message="No place exists with the given place ID.",
+            details=details
+        )
+
+
+class JobNotFoundError(DomainException):
+    """Exception for unknown job IDs."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="JOB_NOT_FOUND",
+            message="No job exists with the given job ID.",
+            details=details
+        )
+
+
+class InvalidWebhookError(DomainException):
+    """Exception for webhook URLs the server must not call."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="INVALID_WEBHOOK_URL",
+            message="Webhook URLs must use https and point to a public host.",
+            details=details
+        )
+
+
+class AIServiceUnavailableError(DomainException):
+    """Exception for AI text that could not be produced in time."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="AI_UNAVAILABLE",
+            message="The AI text service did not respond in time.",
+            details=details
+        )
+
+
+class InvalidBodySetError(DomainException):
+    """Exception for body sets naming unknown bodies."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="INVALID_BODY_SET",
+            message="The requested body set is empty or contains unknown bodies.",
+            details=details
+        )
+
+
+class InvalidQueryError(DomainException):
+    """Exception for placement queries that cannot be parsed."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="INVALID_QUERY",
+            message="The placement query could not be parsed.",
+            details=details
+        )
+
+
+class ChartNotFoundError(DomainException):
+    """Exception for users without a stored chart."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="CHART_NOT_FOUND",
+            message="No chart is stored for the given user.",
+            details=details
+        )
+
+
+class ProfileNotFoundError(DomainException):
+    """Exception for unknown or pruned profiling captures."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="PROFILE_NOT_FOUND",
+            message="No profiling capture exists with the given ID.",
+            details=details
+        )
+
+
+class EventRangeError(DomainException):
+    """Exception for event queries outside the years of the event calendar."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="EVENT_RANGE_NOT_INDEXED",
+            message="The requested dates are outside the event calendar.",
+            details=details
+        )
+
+
+class InvalidMapGridError(DomainException):
+    """Exception for astrocartography maps with an empty or invalid extent."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="INVALID_MAP_GRID",
+            message="The map extent or resolution is invalid.",
+            details=details
+        )
+
+
+class InvalidTimezoneError(DomainException):
+    """Exception for unknown IANA timezone names."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="INVALID_TIMEZONE",
+            message="Unknown timezone. Use an IANA name such as Europe/Bucharest.",
+            details=details
+        )
+
+
+class SkyFeedFullError(DomainException):
+    """Exception for live sky subscriptions beyond the per-process limit."""
+
+    def __init__(self, details: str = ""):
+        super().__init__(
+            code="SKY_FEED_FULL",
+            message="The live sky feed has no room for more subscribers; retry later.",
+            details=details
+        )
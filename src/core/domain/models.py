@@ -1,6 +1,6 @@
 """Domain models for AstroPersona application."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -58,12 +58,38 @@ class NatalChart(BaseModel):
     aspects: List[Aspect]
 
 
+class AspectPattern(BaseModel):
+    """A multi-body aspect configuration such as a grand trine or T-square."""
+
+    type: str  # e.g. "Grand Trine", "T-Square", "Stellium"
+    bodies: List[str]
+    apex: Optional[str] = None  # focal body of T-squares, yods and kites
+    sign: Optional[str] = None  # for sign stelliums
+    house: Optional[int] = None  # for house stelliums
+
+
 class Interpretation(BaseModel):
     """Represents the interpretation of a natal chart."""
 
     traits: List[str]
     strengths: List[str]
     challenges: List[str]
+    patterns: List[AspectPattern] = []
+
+
+class HoroscopePreferences(BaseModel):
+    """How a horoscope is rendered for the reader."""
+
+    tone: str = "spiritual"
+    focus: str = "general"  # life area, e.g. "love" or "career"
+    language: str = "en"
+
+
+class ChartAnalysis(BaseModel):
+    """Structured, preference-independent analysis of a chart by the AI model."""
+
+    overview: str
+    sections: Dict[str, str] = {}  # focus area -> analysis of that area
 
 
 class HoroscopeOutput(BaseModel):
@@ -71,4 +97,121 @@ class HoroscopeOutput(BaseModel):
 
     chart: NatalChart
     interpretation: Interpretation
-    ai_text: str
\ No newline at end of file
+    ai_text: str
+    text_source: str = "ai"  # "ai", "template" (requested) or "fallback" (template text when the model is unavailable)
+    preferences: HoroscopePreferences = HoroscopePreferences()
+    analysis_cached: bool = False  # the chart analysis stage was served from cache
+    text_cached: bool = False  # the rendered text for these preferences was served from cache
+
+class RectificationInterval(BaseModel):
+    """A span of birth times sharing the same rising sign and house placements."""
+
+    start_time: str  # HH:MM, inclusive
+    end_time: str  # HH:MM, inclusive
+    ascendant_sign: str
+    ascendant_start: float
+    ascendant_end: float
+    placements: Dict[str, int]  # planet name -> house number
+
+
+class RectificationScan(BaseModel):
+    """Result of sweeping candidate birth times across a window."""
+
+    date: str
+    step_minutes: int
+    intervals: List[RectificationInterval]
+
+
+class Place(BaseModel):
+    """Represents a populated place from the gazetteer."""
+
+    place_id: int
+    name: str
+    country_code: str
+    latitude: float
+    longitude: float
+    timezone: str  # IANA zone name
+    population: int
+
+
+class SkyPosition(BaseModel):
+    """Geocentric position of a body, independent of any observer location."""
+
+    name: str
+    sign: str
+    longitude: float
+    speed: float  # degrees per day
+    is_retrograde: bool
+
+
+class ReturnChart(BaseModel):
+    """Chart cast for the moment a body returns to its natal longitude."""
+
+    kind: str  # "solar" or "lunar"
+    julian_day: float
+    moment: str  # ISO 8601, UTC
+    chart: NatalChart
+
+
+class ProgressedChart(BaseModel):
+    """Secondary progressed positions for an age (one day per year of life)."""
+
+    age_years: float
+    julian_day: float  # the progressed ephemeris day
+    positions: List[SkyPosition]
+
+
+class SkyEvent(BaseModel):
+    """A dated sky event from the event calendar, the same for every user."""
+
+    kind: str  # "ingress", "station_retrograde", "new_moon", "solar_eclipse", "void_of_course", ...
+    body: str
+    sign: str  # sign of the body at the event; for ingresses the sign entered
+    julian_day: float
+    time: str  # ISO 8601, UTC
+    end_julian_day: Optional[float] = None  # end of void-of-course periods (the Moon's ingress)
+    end_time: Optional[str] = None
+    detail: Optional[str] = None  # eclipse type, "retrograde" ingress, or the aspect ending a void-of-course period
+    other_body: Optional[str] = None  # body of that aspect
+
+
+class PlanetaryHour(BaseModel):
+    """One of the 24 unequal hours of a day, ruled in Chaldean order."""
+
+    ruler: str
+    start: str  # ISO 8601, UTC
+    end: str
+    daytime: bool  # between sunrise and sunset
+
+
+class LocationDay(BaseModel):
+    """Rise and set times and planetary hours of one local day at a location cell."""
+
+    date: str  # local date, YYYY-MM-DD
+    timezone: str
+    latitude: float  # centre of the location cell the times are computed for
+    longitude: float
+    sunrise: Optional[str] = None  # ISO 8601, UTC; None when the body does not rise or set that day
+    sunset: Optional[str] = None
+    moonrise: Optional[str] = None
+    moonset: Optional[str] = None
+    day_ruler: str
+    planetary_hours: List[PlanetaryHour] = []  # empty on days without both a sunrise and a sunset
+
+
+class LiveSkyFrame(BaseModel):
+    """One tick of the live sky feed, the same for every subscriber."""
+
+    seq: int  # increases by one per tick; gaps are frames a slow subscriber skipped
+    time: str  # ISO 8601, UTC
+    julian_day: float
+    positions: List[SkyPosition]
+
+
+class SkySnapshot(BaseModel):
+    """Positions of all bodies for one UTC time bucket, shared by every user."""
+
+    resolution: str  # "hour" or "day"
+    bucket_start: str  # ISO 8601, UTC
+    julian_day: float
+    positions: List[SkyPosition]
@@ -1,12 +1,33 @@
 """Prompt templates for AI text generation."""
 
-NATAL_HOROSCOPE_PROMPT = """
+CHART_ANALYSIS_PROMPT = """
 You are a professional astrologer.
-Based on the natal chart below, write a premium, psychologically nuanced horoscope.
-Avoid vague statements. Be specific and empowering.
+Analyse the natal chart below in depth: psychologically nuanced, specific, no vague statements.
+This analysis is an intermediate step; it will later be rewritten for the reader.
+
+Answer with JSON only, in English, in this shape:
+{{"overview": "<the core of the chart in one paragraph>",
+ "sections": {{{sections}}}}}
 
 Chart:
 {chart_json}
+
+Aspect patterns (give these configurations particular weight):
+{patterns}
+"""
+
+HOROSCOPE_REWRITE_PROMPT = """
+Rewrite the astrological analysis below as a premium personal horoscope.
+Tone: {tone}. Focus: {focus}.
+Write the whole text in the language with code "{language}".
+Keep every astrological statement, add no new placements, be specific and empowering.
+Three to five short paragraphs, plain text.
+
+Overview:
+{overview}
+
+Analysis for {focus}:
+{section}
 """
 
 DAILY_HOROSCOPE_PROMPT = """
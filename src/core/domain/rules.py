@@ -152,4 +152,43 @@ ASPECT_RULES: Dict[str, Dict[str, List[str]]] = {
         "strengths": ["awareness"],
         "challenges": ["tension"]
     }
-}
\ No newline at end of file
+}
+
+# Rules for multi-body aspect patterns
+PATTERN_RULES: Dict[str, Dict[str, List[str]]] = {
+    "Grand Trine": {
+        "traits": ["naturally gifted"],
+        "strengths": ["effortless talent"],
+        "challenges": ["coasting"]
+    },
+    "T-Square": {
+        "traits": ["driven"],
+        "strengths": ["resilience under pressure"],
+        "challenges": ["chronic tension"]
+    },
+    "Grand Cross": {
+        "traits": ["determined"],
+        "strengths": ["endurance"],
+        "challenges": ["feeling pulled in every direction"]
+    },
+    "Yod": {
+        "traits": ["fated"],
+        "strengths": ["sense of mission"],
+        "challenges": ["restless adjustment"]
+    },
+    "Kite": {
+        "traits": ["purposeful"],
+        "strengths": ["channelled talent"],
+        "challenges": ["overreliance on one outlet"]
+    },
+    "Mystic Rectangle": {
+        "traits": ["practical mystic"],
+        "strengths": ["balanced productivity"],
+        "challenges": ["inner contradiction"]
+    },
+    "Stellium": {
+        "traits": ["concentrated"],
+        "strengths": ["specialisation"],
+        "challenges": ["one-sidedness"]
+    }
+}
@@ -0,0 +1,448 @@
+"""Phrase templates and vocabulary for template-generated horoscope text.
+
+One language pack per language code. Every pack has the same shape:
+
+* ``signs``, ``bodies``, ``aspects``, ``patterns``: display names; aspect and
+  pattern names carry their article where the language needs one;
+* ``themes``: what each personal body stands for, used as a sentence subject;
+* ``ordinals``: house numbers as ordinals;
+* ``focus``: life areas of ``HoroscopePreferences.focus``;
+* ``words``: every keyword of ``SIGN_RULES``, ``HOUSE_RULES``,
+  ``ASPECT_RULES`` and ``PATTERN_RULES``; English keeps most of them as
+  they are, other languages render them as noun phrases so no agreement is
+  needed;
+* ``templates``: variants of each sentence, picked per chart.
+
+Templates are ``str.format`` strings; the sentence is capitalised after
+formatting, so templates may start with a lowercase placeholder.
+"""
+
+from typing import Any, Dict
+
+LANGUAGE_PACKS: Dict[str, Dict[str, Any]] = {
+    "en": {
+        "and": " and ",
+        "decimal": ".",
+        "signs": {},  # sign names are the English rule keys
+        "bodies": {},
+        "aspects": {
+            "Conjunction": "conjunction", "Sextile": "sextile", "Square": "square",
+            "Trine": "trine", "Quincunx": "quincunx", "Opposition": "opposition",
+        },
+        "aspect_verbs": {
+            "Conjunction": "fuses with", "Sextile": "supports", "Square": "challenges",
+            "Trine": "flows easily with", "Quincunx": "adjusts to", "Opposition": "pulls against",
+        },
+        "patterns": {
+            "Grand Trine": "a Grand Trine", "T-Square": "a T-Square", "Grand Cross": "a Grand Cross",
+            "Yod": "a Yod", "Kite": "a Kite", "Mystic Rectangle": "a Mystic Rectangle", "Stellium": "a Stellium",
+        },
+        "themes": {
+            "Sun": "your core identity", "Moon": "your emotional life", "Mercury": "your way of thinking",
+            "Venus": "your way of loving", "Mars": "your drive", "Jupiter": "your sense of growth",
+            "Saturn": "your sense of responsibility",
+        },
+        "ordinals": {
+            1: "first", 2: "second", 3: "third", 4: "fourth", 5: "fifth", 6: "sixth",
+            7: "seventh", 8: "eighth", 9: "ninth", 10: "tenth", 11: "eleventh", 12: "twelfth",
+        },
+        "focus": {
+            "love": "love and relationships", "career": "your career", "health": "health and energy",
+            "growth": "personal growth", "finances": "money and resources",
+        },
+        "words": {"short-tempered": "a short temper", "materialistic": "materialism"},
+        "templates": {
+            "placement": [
+                "{theme} is coloured by {body} in {sign}, which makes you {traits}.",
+                "With {body} in {sign}, {theme} is {traits}.",
+                "{body} in {sign} shapes {theme}: {traits}.",
+            ],
+            "house": [
+                " In the {ordinal} house, it plays out through {house}.",
+                " Placed in the {ordinal} house, it seeks expression in {house}.",
+            ],
+            "retrograde": [
+                " Its retrograde motion turns this energy inward.",
+                " Being retrograde, it asks you to revisit and refine before you act.",
+            ],
+            "rising": [
+                "With {sign} rising, you come across as {traits}.",
+                "Your {sign} Ascendant gives a first impression that is {traits}.",
+            ],
+            "aspect": [
+                "{body1} {verb} {body2} ({aspect}, orb {orb}°), bringing {strength} but also a risk of {challenge}.",
+                "Linking {body1} and {body2}, the {aspect} (orb {orb}°) brings {strength}; watch for {challenge}.",
+            ],
+            "aspect_plain": [
+                "{body1} {verb} {body2} ({aspect}, orb {orb}°).",
+                "Linking {body1} and {body2}, the {aspect} (orb {orb}°) colours both.",
+            ],
+            "pattern": [
+                "Your chart holds {pattern}{where} linking {bodies}, a mark of {strength}.",
+                "{pattern}{where} connects {bodies}; its gift is {strength}.",
+            ],
+            "pattern_where_sign": " in {sign}",
+            "pattern_where_house": " in the {ordinal} house",
+            "strengths": [
+                "Lean on your {items}: these are the qualities that carry you furthest.",
+                "Your greatest resources are {items}.",
+            ],
+            "challenges": [
+                "Stay mindful of {items}, which can hold you back when left unchecked.",
+                "Growth comes from working with {items} rather than against them.",
+            ],
+            "focus": [
+                "When it comes to {focus}, {body} in {sign} is your key: rely on {items}.",
+                "For {focus}, look to {body} in {sign} and the {items} it brings.",
+            ],
+            "focus_house": [
+                "Your {ordinal} house of {house} holds {bodies}.",
+            ],
+            "closing": {
+                "spiritual": [
+                    "Trust the rhythm of your chart; it is a map, not a cage.",
+                    "The sky describes your gifts; how you use them is yours to choose.",
+                ],
+                "psychological": [
+                    "Awareness of these patterns is the first step toward choosing how you respond to them.",
+                    "Notice where these themes repeat in your life; that is where change begins.",
+                ],
+                "practical": [
+                    "Pick one strength to use this week and one habit to watch.",
+                    "Start small: one concrete step in the area that matters most to you now.",
+                ],
+            },
+        },
+    },
+    "ro": {
+        "and": " și ",
+        "decimal": ",",
+        "signs": {
+            "Aries": "Berbec", "Taurus": "Taur", "Gemini": "Gemeni", "Cancer": "Rac", "Leo": "Leu",
+            "Virgo": "Fecioară", "Libra": "Balanță", "Scorpio": "Scorpion", "Sagittarius": "Săgetător",
+            "Capricorn": "Capricorn", "Aquarius": "Vărsător", "Pisces": "Pești",
+        },
+        "bodies": {
+            "Sun": "Soarele", "Moon": "Luna", "Mercury": "Mercur", "Venus": "Venus", "Mars": "Marte",
+            "Jupiter": "Jupiter", "Saturn": "Saturn", "Uranus": "Uranus", "Neptune": "Neptun",
+            "Pluto": "Pluto", "Mean Node": "Nodul Nord mediu", "True Node": "Nodul Nord",
+            "South Node": "Nodul Sud", "Lilith": "Lilith", "Osculating Lilith": "Lilith osculatoare",
+            "Chiron": "Chiron", "Ascendant": "Ascendentul", "MC": "Mijlocul Cerului",
+            "Vertex": "Vertexul", "Part of Fortune": "Partea Norocului",
+        },
+        "aspects": {
+            "Conjunction": "o conjuncție", "Sextile": "un sextil", "Square": "un careu",
+            "Trine": "un trigon", "Quincunx": "un quincunx", "Opposition": "o opoziție",
+        },
+        "aspect_verbs": {},
+        "patterns": {
+            "Grand Trine": "un Mare Trigon", "T-Square": "un T-pătrat", "Grand Cross": "o Mare Cruce",
+            "Yod": "un Yod", "Kite": "un Zmeu", "Mystic Rectangle": "un Dreptunghi Mistic",
+            "Stellium": "un stellium",
+        },
+        "themes": {
+            "Sun": "identitatea ta", "Moon": "viața ta emoțională", "Mercury": "felul în care gândești",
+            "Venus": "felul în care iubești", "Mars": "energia ta", "Jupiter": "creșterea ta",
+            "Saturn": "simțul tău al responsabilității",
+        },
+        "ordinals": {
+            1: "I", 2: "a II-a", 3: "a III-a", 4: "a IV-a", 5: "a V-a", 6: "a VI-a",
+            7: "a VII-a", 8: "a VIII-a", 9: "a IX-a", 10: "a X-a", 11: "a XI-a", 12: "a XII-a",
+        },
+        "focus": {
+            "love": "dragostea și relațiile", "career": "cariera", "health": "sănătatea și energia",
+            "growth": "dezvoltarea personală", "finances": "banii și resursele",
+        },
+        "words": {
+            "bold": "îndrăzneală", "energetic": "energie", "independent": "independență",
+            "leadership": "spirit de conducere", "courage": "curaj", "impulsiveness": "impulsivitate",
+            "short-tempered": "irascibilitate", "practical": "simț practic", "reliable": "seriozitate",
+            "patient": "răbdare", "stability": "stabilitate", "determination": "hotărâre",
+            "stubbornness": "încăpățânare", "materialistic": "materialism", "adaptable": "adaptabilitate",
+            "communicative": "comunicativitate", "versatile": "versatilitate", "intellect": "intelect",
+            "social skills": "abilități sociale", "indecisiveness": "nehotărâre",
+            "superficiality": "superficialitate", "emotional": "emotivitate", "intuitive": "intuiție",
+            "nurturing": "grijă față de ceilalți", "empathy": "empatie", "protectiveness": "spirit protector",
+            "moodiness": "schimbări de dispoziție", "over-sensitivity": "sensibilitate excesivă",
+            "confident": "încredere în sine", "generous": "generozitate", "dramatic": "dramatism",
+            "charisma": "carismă", "creativity": "creativitate", "arrogance": "aroganță",
+            "need for attention": "nevoia de atenție", "analytical": "spirit analitic",
+            "helpful": "dorința de a ajuta", "attention to detail": "atenție la detalii",
+            "reliability": "fiabilitate", "criticism": "spirit critic", "perfectionism": "perfecționism",
+            "diplomatic": "diplomație", "fair-minded": "simțul dreptății", "social": "sociabilitate",
+            "harmony": "armonie", "balance": "echilibru", "indecision": "ezitare",
+            "people-pleasing": "dorința de a mulțumi pe toată lumea", "intense": "intensitate",
+            "passionate": "pasiune", "mysterious": "mister", "resilience": "reziliență",
+            "intuition": "intuiție", "jealousy": "gelozie", "control issues": "nevoia de control",
+            "optimistic": "optimism", "adventurous": "spirit de aventură", "philosophical": "spirit filozofic",
+            "freedom": "libertate", "wisdom": "înțelepciune", "recklessness": "nesăbuință",
+            "over-confidence": "încredere excesivă", "ambitious": "ambiție", "disciplined": "disciplină",
+            "responsible": "responsabilitate", "perseverance": "perseverență", "rigidity": "rigiditate",
+            "workaholism": "dependență de muncă", "innovative": "spirit inovator",
+            "humanitarian": "umanism", "originality": "originalitate",
+            "progressiveness": "spirit progresist", "detachment": "detașare",
+            "eccentricity": "excentricitate", "compassionate": "compasiune", "artistic": "simț artistic",
+            "spirituality": "spiritualitate", "escapism": "evadare din realitate",
+            "victim mentality": "mentalitate de victimă", "self-identity": "identitate",
+            "appearance": "imagine", "initiative": "inițiativă", "self-centeredness": "egocentrism",
+            "values": "valori", "possessions": "bunuri", "resourcefulness": "ingeniozitate",
+            "greed": "lăcomie", "communication": "comunicare", "learning": "învățare",
+            "adaptability": "adaptabilitate", "gossip": "bârfă", "home": "cămin", "family": "familie",
+            "security": "siguranță", "emotional dependency": "dependență emoțională", "pleasure": "plăcere",
+            "joy": "bucurie", "self-indulgence": "răsfăț excesiv", "health": "sănătate",
+            "service": "serviciu", "duty": "datorie", "partnerships": "parteneriate",
+            "relationships": "relații", "cooperation": "cooperare", "codependency": "codependență",
+            "transformation": "transformare", "intimacy": "intimitate", "obsession": "obsesie",
+            "philosophy": "filozofie", "travel": "călătorii", "optimism": "optimism",
+            "dogmatism": "dogmatism", "career": "carieră", "reputation": "reputație",
+            "ambition": "ambiție", "status-seeking": "goana după statut", "friends": "prieteni",
+            "community": "comunitate", "altruism": "altruism", "subconscious": "subconștient",
+            "compassion": "compasiune", "isolation": "izolare", "intensified": "intensitate sporită",
+            "focus": "concentrare", "overload": "suprasolicitare", "harmonious": "armonie",
+            "ease": "ușurință", "complacency": "automulțumire", "challenging": "provocare",
+            "growth": "creștere", "conflict": "conflict", "balancing": "echilibrare",
+            "awareness": "conștientizare", "tension": "tensiune", "naturally gifted": "talent înnăscut",
+            "effortless talent": "talent natural", "coasting": "comoditate", "driven": "motivație",
+            "resilience under pressure": "rezistență sub presiune", "chronic tension": "tensiune cronică",
+            "determined": "hotărâre", "endurance": "rezistență",
+            "feeling pulled in every direction": "senzația de a fi tras în toate direcțiile",
+            "fated": "sentimentul destinului", "sense of mission": "simțul misiunii",
+            "restless adjustment": "ajustări neliniștite", "purposeful": "determinare",
+            "channelled talent": "talent canalizat",
+            "overreliance on one outlet": "dependența de o singură cale de exprimare",
+            "practical mystic": "misticism practic", "balanced productivity": "productivitate echilibrată",
+            "inner contradiction": "contradicție interioară", "concentrated": "concentrare",
+            "specialisation": "specializare", "one-sidedness": "unilateralitate",
+        },
+        "templates": {
+            "placement": [
+                "Cu {body} în {sign}, {theme} capătă {traits}.",
+                "Prin {body} în {sign}, {theme} se exprimă cu {traits}.",
+                "Pentru {theme}, {body} în {sign} înseamnă {traits}.",
+            ],
+            "house": [
+                " În casa {ordinal}, se manifestă prin {house}.",
+                " Din casa {ordinal}, caută să se exprime prin {house}.",
+            ],
+            "retrograde": [
+                " Mișcarea retrogradă îndreaptă această energie spre interior.",
+                " Mișcarea retrogradă te invită să revizuiești și să rafinezi înainte de a acționa.",
+            ],
+            "rising": [
+                "Cu Ascendentul în {sign}, lumea te vede prin {traits}.",
+                "Ascendentul în {sign} lasă o primă impresie de {traits}.",
+            ],
+            "aspect": [
+                "{body1} și {body2} formează {aspect} (orb {orb}°), ceea ce aduce {strength}, "
+                "dar și riscul de {challenge}.",
+                "Între {body1} și {body2} există {aspect} (orb {orb}°): te poți baza pe {strength}, "
+                "dar fii atent la {challenge}.",
+            ],
+            "aspect_plain": [
+                "{body1} și {body2} formează {aspect} (orb {orb}°).",
+                "Între {body1} și {body2} există {aspect} (orb {orb}°).",
+            ],
+            "pattern": [
+                "Harta ta conține {pattern}{where} între {bodies}, semn de {strength}.",
+                "{pattern}{where} leagă {bodies}; darul lui este {strength}.",
+            ],
+            "pattern_where_sign": " în {sign}",
+            "pattern_where_house": " în casa {ordinal}",
+            "strengths": [
+                "Bazează-te pe {items}: sunt calitățile care te duc cel mai departe.",
+                "Cele mai mari resurse ale tale sunt {items}.",
+            ],
+            "challenges": [
+                "Fii atent la {items}, care te pot frâna dacă nu le ții în frâu.",
+                "Creșterea vine din a lucra cu {items}, nu împotriva lor.",
+            ],
+            "focus": [
+                "În ceea ce privește {focus}, {body} în {sign} este cheia: bazează-te pe {items}.",
+                "Pentru {focus}, privește spre {body} în {sign} și spre {items}.",
+            ],
+            "focus_house": [
+                "Casa {ordinal} ({house}) găzduiește {bodies}.",
+            ],
+            "closing": {
+                "spiritual": [
+                    "Ai încredere în ritmul hărții tale; este o hartă, nu o cușcă.",
+                    "Cerul îți descrie darurile; felul în care le folosești îți aparține.",
+                ],
+                "psychological": [
+                    "Conștientizarea acestor tipare este primul pas spre a alege cum le răspunzi.",
+                    "Observă unde se repetă aceste teme în viața ta; acolo începe schimbarea.",
+                ],
+                "practical": [
+                    "Alege o calitate de folosit săptămâna aceasta și un obicei de urmărit.",
+                    "Începe cu pași mici: un pas concret în domeniul care contează acum cel mai mult.",
+                ],
+            },
+        },
+    },
+    "es": {
+        "and": " y ",
+        "decimal": ",",
+        "signs": {
+            "Aries": "Aries", "Taurus": "Tauro", "Gemini": "Géminis", "Cancer": "Cáncer", "Leo": "Leo",
+            "Virgo": "Virgo", "Libra": "Libra", "Scorpio": "Escorpio", "Sagittarius": "Sagitario",
+            "Capricorn": "Capricornio", "Aquarius": "Acuario", "Pisces": "Piscis",
+        },
+        "bodies": {
+            "Sun": "el Sol", "Moon": "la Luna", "Mercury": "Mercurio", "Venus": "Venus", "Mars": "Marte",
+            "Jupiter": "Júpiter", "Saturn": "Saturno", "Uranus": "Urano", "Neptune": "Neptuno",
+            "Pluto": "Plutón", "Mean Node": "el Nodo Norte medio", "True Node": "el Nodo Norte",
+            "South Node": "el Nodo Sur", "Lilith": "Lilith", "Osculating Lilith": "Lilith osculatriz",
+            "Chiron": "Quirón", "Ascendant": "el Ascendente", "MC": "el Medio Cielo",
+            "Vertex": "el Vértex", "Part of Fortune": "la Parte de la Fortuna",
+        },
+        "aspects": {
+            "Conjunction": "una conjunción", "Sextile": "un sextil", "Square": "una cuadratura",
+            "Trine": "un trígono", "Quincunx": "un quincuncio", "Opposition": "una oposición",
+        },
+        "aspect_verbs": {},
+        "patterns": {
+            "Grand Trine": "un Gran Trígono", "T-Square": "una T-Cuadrada", "Grand Cross": "una Gran Cruz",
+            "Yod": "un Yod", "Kite": "una Cometa", "Mystic Rectangle": "un Rectángulo Místico",
+            "Stellium": "un stellium",
+        },
+        "themes": {
+            "Sun": "tu identidad", "Moon": "tu vida emocional", "Mercury": "tu forma de pensar",
+            "Venus": "tu forma de amar", "Mars": "tu energía", "Jupiter": "tu crecimiento",
+            "Saturn": "tu sentido de la responsabilidad",
+        },
+        "ordinals": {
+            1: "I", 2: "II", 3: "III", 4: "IV", 5: "V", 6: "VI",
+            7: "VII", 8: "VIII", 9: "IX", 10: "X", 11: "XI", 12: "XII",
+        },
+        "focus": {
+            "love": "el amor y las relaciones", "career": "la carrera", "health": "la salud y la energía",
+            "growth": "el crecimiento personal", "finances": "el dinero y los recursos",
+        },
+        "words": {
+            "bold": "audacia", "energetic": "energía", "independent": "independencia",
+            "leadership": "liderazgo", "courage": "valentía", "impulsiveness": "impulsividad",
+            "short-tempered": "mal genio", "practical": "sentido práctico", "reliable": "fiabilidad",
+            "patient": "paciencia", "stability": "estabilidad", "determination": "determinación",
+            "stubbornness": "terquedad", "materialistic": "materialismo",
+            "adaptable": "capacidad de adaptación", "communicative": "facilidad de palabra",
+            "versatile": "versatilidad", "intellect": "intelecto", "social skills": "habilidades sociales",
+            "indecisiveness": "indecisión", "superficiality": "superficialidad", "emotional": "emotividad",
+            "intuitive": "intuición", "nurturing": "cuidado de los demás", "empathy": "empatía",
+            "protectiveness": "instinto protector", "moodiness": "cambios de humor",
+            "over-sensitivity": "hipersensibilidad", "confident": "confianza en ti",
+            "generous": "generosidad", "dramatic": "dramatismo", "charisma": "carisma",
+            "creativity": "creatividad", "arrogance": "arrogancia", "need for attention": "necesidad de atención",
+            "analytical": "mente analítica", "helpful": "disposición a ayudar",
+            "attention to detail": "atención al detalle", "reliability": "constancia",
+            "criticism": "espíritu crítico", "perfectionism": "perfeccionismo", "diplomatic": "diplomacia",
+            "fair-minded": "sentido de la justicia", "social": "sociabilidad", "harmony": "armonía",
+            "balance": "equilibrio", "indecision": "vacilación", "people-pleasing": "afán de complacer",
+            "intense": "intensidad", "passionate": "pasión", "mysterious": "misterio",
+            "resilience": "resiliencia", "intuition": "intuición", "jealousy": "celos",
+            "control issues": "necesidad de control", "optimistic": "optimismo",
+            "adventurous": "espíritu aventurero", "philosophical": "espíritu filosófico",
+            "freedom": "libertad", "wisdom": "sabiduría", "recklessness": "imprudencia",
+            "over-confidence": "exceso de confianza", "ambitious": "ambición", "disciplined": "disciplina",
+            "responsible": "responsabilidad", "perseverance": "perseverancia", "rigidity": "rigidez",
+            "workaholism": "adicción al trabajo", "innovative": "innovación", "humanitarian": "humanitarismo",
+            "originality": "originalidad", "progressiveness": "espíritu progresista",
+            "detachment": "desapego", "eccentricity": "excentricidad", "compassionate": "compasión",
+            "artistic": "sensibilidad artística", "spirituality": "espiritualidad", "escapism": "escapismo",
+            "victim mentality": "mentalidad de víctima", "self-identity": "identidad", "appearance": "imagen",
+            "initiative": "iniciativa", "self-centeredness": "egocentrismo", "values": "valores",
+            "possessions": "posesiones", "resourcefulness": "ingenio", "greed": "codicia",
+            "communication": "comunicación", "learning": "aprendizaje", "adaptability": "adaptabilidad",
+            "gossip": "chismes", "home": "hogar", "family": "familia", "security": "seguridad",
+            "emotional dependency": "dependencia emocional", "pleasure": "placer", "joy": "alegría",
+            "self-indulgence": "autocomplacencia", "health": "salud", "service": "servicio",
+            "duty": "deber", "partnerships": "asociaciones", "relationships": "relaciones",
+            "cooperation": "cooperación", "codependency": "codependencia", "transformation": "transformación",
+            "intimacy": "intimidad", "obsession": "obsesión", "philosophy": "filosofía", "travel": "viajes",
+            "optimism": "optimismo", "dogmatism": "dogmatismo", "career": "carrera",
+            "reputation": "reputación", "ambition": "ambición", "status-seeking": "afán de estatus",
+            "friends": "amistades", "community": "comunidad", "altruism": "altruismo",
+            "subconscious": "subconsciente", "compassion": "compasión", "isolation": "aislamiento",
+            "intensified": "intensidad", "focus": "concentración", "overload": "sobrecarga",
+            "harmonious": "armonía", "ease": "facilidad", "complacency": "conformismo",
+            "challenging": "desafío", "growth": "crecimiento", "conflict": "conflicto",
+            "balancing": "búsqueda de equilibrio", "awareness": "conciencia", "tension": "tensión",
+            "naturally gifted": "talento innato", "effortless talent": "talento sin esfuerzo",
+            "coasting": "inercia", "driven": "empuje", "resilience under pressure": "resistencia bajo presión",
+            "chronic tension": "tensión crónica", "determined": "determinación", "endurance": "aguante",
+            "feeling pulled in every direction": "sensación de tirar en todas direcciones",
+            "fated": "sentido del destino", "sense of mission": "sentido de misión",
+            "restless adjustment": "ajustes inquietos", "purposeful": "propósito",
+            "channelled talent": "talento canalizado",
+            "overreliance on one outlet": "dependencia de una sola vía",
+            "practical mystic": "misticismo práctico", "balanced productivity": "productividad equilibrada",
+            "inner contradiction": "contradicción interior", "concentrated": "concentración",
+            "specialisation": "especialización", "one-sidedness": "unilateralidad",
+        },
+        "templates": {
+            "placement": [
+                "Con {body} en {sign}, {theme} se expresa con {traits}.",
+                "Con {body} en {sign}, {theme} gana {traits}.",
+                "Bajo {body} en {sign}, {theme} se tiñe de {traits}.",
+            ],
+            "house": [
+                " En la casa {ordinal}, se manifiesta a través de {house}.",
+                " Desde la casa {ordinal}, busca expresarse en {house}.",
+            ],
+            "retrograde": [
+                " Su movimiento retrógrado dirige esta energía hacia dentro.",
+                " El movimiento retrógrado te pide revisar y pulir antes de actuar.",
+            ],
+            "rising": [
+                "Con el Ascendente en {sign}, el mundo te percibe a través de {traits}.",
+                "Tu Ascendente en {sign} deja una primera impresión de {traits}.",
+            ],
+            "aspect": [
+                "{body1} y {body2} forman {aspect} (orbe {orb}°), lo que aporta {strength}, "
+                "aunque también riesgo de {challenge}.",
+                "Entre {body1} y {body2} hay {aspect} (orbe {orb}°): cuenta con {strength} "
+                "y vigila {challenge}.",
+            ],
+            "aspect_plain": [
+                "{body1} y {body2} forman {aspect} (orbe {orb}°).",
+                "Entre {body1} y {body2} hay {aspect} (orbe {orb}°).",
+            ],
+            "pattern": [
+                "Tu carta contiene {pattern}{where} entre {bodies}, señal de {strength}.",
+                "{pattern}{where} une {bodies}; su don es {strength}.",
+            ],
+            "pattern_where_sign": " en {sign}",
+            "pattern_where_house": " en la casa {ordinal}",
+            "strengths": [
+                "Apóyate en {items}: son las cualidades que más lejos te llevan.",
+                "Tus mayores recursos son {items}.",
+            ],
+            "challenges": [
+                "Vigila {items}, que pueden frenarte si no les prestas atención.",
+                "El crecimiento llega al trabajar con {items}, no contra ellos.",
+            ],
+            "focus": [
+                "Para {focus}, {body} en {sign} es la clave: apóyate en {items}.",
+                "En {focus}, la clave está en {body} en {sign} y en {items}.",
+            ],
+            "focus_house": [
+                "Tu casa {ordinal} ({house}) alberga {bodies}.",
+            ],
+            "closing": {
+                "spiritual": [
+                    "Confía en el ritmo de tu carta; es un mapa, no una jaula.",
+                    "El cielo describe tus dones; cómo los usas lo eliges tú.",
+                ],
+                "psychological": [
+                    "Ser consciente de estos patrones es el primer paso para elegir cómo responder a ellos.",
+                    "Observa dónde se repiten estos temas en tu vida; ahí empieza el cambio.",
+                ],
+                "practical": [
+                    "Elige una fortaleza para usar esta semana y un hábito que vigilar.",
+                    "Empieza poco a poco: un paso concreto en el área que más te importa ahora.",
+                ],
+            },
+        },
+    },
+}
+
+DEFAULT_LANGUAGE = "en"
@@ -0,0 +1,54 @@
+"""Use case for astrocartography (relocation) maps."""
+
+import json
+
+from src.core.domain.canonical import birth_data_hash
+from src.core.domain.models import BirthData
+from src.core.use_cases.calculate_chart import BodySelection
+from src.infrastructure.astro_engine.astrocartography import AstrocartographyCalculator, MapGrid
+from src.infrastructure.persistence.bounded_repo import BoundedStore
+from src.infrastructure.profiling.stages import stage
+
+
+class AstrocartographyUseCase:
+    """Use case to map a chart's angle lines, cached per chart and map grid."""
+
+    def __init__(self, calculator: AstrocartographyCalculator, default_bodies: BodySelection = None,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """Initialize with the calculator.
+
+        Args:
+            calculator: Angle line calculator over the astro engine.
+            default_bodies: Body set used when a call names none.
+            max_bytes: Size of the encoded maps kept; the least recently
+                used are evicted.
+        """
+        self.calculator = calculator
+        self.default_bodies = default_bodies
+        self._maps = BoundedStore(max_bytes=max_bytes, sizer=len)
+
+    def execute(self, birth_data: BirthData, bodies: BodySelection = None,
+                grid: MapGrid = MapGrid()) -> bytes:
+        """Draw the angle lines of a natal chart.
+
+        Args:
+            birth_data: Birth data of the chart.
+            bodies: Body set name or list of body names.
+            grid: Map extent and resolution.
+
+        Returns:
+            bytes: Compact GeoJSON ``FeatureCollection`` (UTF-8).
+        """
+        bodies = bodies or self.default_bodies
+        engine = self.calculator.engine
+        # Validates the birth data; the grid's repr covers every field
+        key = birth_data_hash(birth_data, f"{engine.version_for(bodies)}/{grid!r}")
+        with stage("astrocartography") as step:
+            encoded = self._maps.get(key)
+            if encoded is not None:
+                step.source = "cache"
+                return encoded
+            lines = self.calculator.lines(engine._calculate_julian_day(birth_data), bodies, grid)
+            encoded = json.dumps(lines, separators=(",", ":")).encode("utf-8")
+            self._maps[key] = encoded
+            return encoded
@@ -1,27 +1,58 @@
 """Use case for calculating natal charts."""
 
+from typing import Optional, Sequence, Union
+
+from src.core.domain.canonical import birth_data_hash
 from src.core.domain.models import BirthData, NatalChart
 from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+from src.infrastructure.persistence.shared_chart_cache import SharedChartCache
+from src.infrastructure.profiling.stages import stage
+
+BodySelection = Union[None, str, Sequence[str]]
 
 
 class CalculateChartUseCase:
     """Use case to calculate a natal chart."""
 
-    def __init__(self, astro_engine: SwissEphemerisEngine):
+    def __init__(self, astro_engine: SwissEphemerisEngine, default_bodies: BodySelection = None,
+                 cache: Optional[SharedChartCache] = None):
         """Initialize with the astro engine.
 
         Args:
             astro_engine: The astro engine to use for calculations.
+            default_bodies: Body set used when a call names none, e.g. the
+                set of the deployment's tier; defaults to the classic planets.
+            cache: Charts looked up before calculating, keyed by the birth
+                data hash and the engine version of the body set.
         """
         self.astro_engine = astro_engine
+        self.default_bodies = default_bodies
+        self.cache = cache
 
-    def execute(self, birth_data: BirthData) -> NatalChart:
+    def execute(self, birth_data: BirthData, bodies: BodySelection = None) -> NatalChart:
         """Execute the use case to calculate the chart.
 
         Args:
             birth_data: The birth data for the chart.
+            bodies: Body set name or list of body names for this chart.
 
         Returns:
             NatalChart: The calculated natal chart.
         """
-        return self.astro_engine.calculate_chart(birth_data)
\ No newline at end of file
+        bodies = bodies or self.default_bodies
+        with stage("chart") as step:
+            if self.cache is None:
+                return self.astro_engine.calculate_chart(birth_data, bodies)
+            key = birth_data_hash(birth_data, self.astro_engine.version_for(bodies))
+            chart = self.cache.get(key)
+            if chart is not None:
+                step.source = "cache"
+                self.astro_engine.trace_time_correction(birth_data, chart.julian_day)
+                return chart
+            chart = self.astro_engine.calculate_chart(birth_data, bodies)
+            self.cache.put(key, chart)
+            return chart
+
+    def version_for(self, bodies: BodySelection = None) -> str:
+        """Engine version tag of charts calculated with ``bodies``, for cache keys and IDs."""
+        return self.astro_engine.version_for(bodies or self.default_bodies)
@@ -0,0 +1,159 @@
+"""Two-stage horoscope generation: cached chart analysis, then cheap rewrites.
+
+Stage one sends the full chart to the model once and keeps the answer as a
+structured ``ChartAnalysis`` (an overview plus one section per focus area).
+Stage two renders that analysis for a tone, focus and language with a short
+prompt that never contains the chart. Both stages are cached, so switching
+preferences costs one small call and switching back costs none.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core.domain.models import ChartAnalysis, HoroscopePreferences
+from src.core.domain.prompts import CHART_ANALYSIS_PROMPT, HOROSCOPE_REWRITE_PROMPT
+from src.infrastructure.persistence.bounded_repo import BoundedStore
+
+FOCUS_AREAS = ("general", "love", "career", "health", "growth", "finances")
+
+# Prompt edits change the analysis, so they are part of its cache key
+ANALYSIS_VERSION = hashlib.sha256(CHART_ANALYSIS_PROMPT.encode("utf-8")).hexdigest()[:8]
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def analysis_prompt(chart_json: str, patterns: str) -> str:
+    """Stage-one prompt for a chart."""
+    sections = ", ".join(f'"{area}": "<analysis>"' for area in FOCUS_AREAS)
+    return CHART_ANALYSIS_PROMPT.format(chart_json=chart_json, patterns=patterns, sections=sections)
+
+
+def rewrite_prompt(analysis: ChartAnalysis, preferences: HoroscopePreferences) -> str:
+    """Stage-two prompt: the analysis section for the focus, rendered per preferences."""
+    section = analysis.sections.get(preferences.focus) or analysis.sections.get("general") or ""
+    return HOROSCOPE_REWRITE_PROMPT.format(
+        tone=preferences.tone,
+        focus=preferences.focus,
+        language=preferences.language,
+        overview=analysis.overview,
+        section=section or analysis.overview,
+    )
+
+
+def parse_analysis(text: str) -> ChartAnalysis:
+    """Parse the stage-one answer.
+
+    Models sometimes wrap JSON in a code fence or answer in prose; prose is
+    kept whole as the overview so the rewrite stage still has the content.
+
+    Args:
+        text: Raw model answer.
+
+    Returns:
+        ChartAnalysis: The structured analysis.
+    """
+    stripped = _FENCE.sub("", text.strip())
+    try:
+        data = json.loads(stripped)
+        sections = data.get("sections") or {}
+        return ChartAnalysis(
+            overview=str(data.get("overview") or ""),
+            sections={str(area).lower(): str(body) for area, body in sections.items() if body},
+        )
+    except (ValueError, AttributeError):
+        return ChartAnalysis(overview=text.strip())
+
+
+class GenerationCache:
+    """Caches of both generation stages, with reuse and cost counters.
+
+    Analyses are keyed by chart content and prompt version; rendered texts
+    additionally by normalised tone, focus and language.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: Optional[float] = None):
+        """Initialize the caches.
+
+        Args:
+            max_entries: Maximum analyses and rendered texts kept, each.
+            ttl_seconds: Lifetime of cached entries; None keeps them until evicted.
+        """
+        self._analyses = BoundedStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._texts = BoundedStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {
+            "analysis_hits": 0, "analysis_misses": 0, "text_hits": 0, "text_misses": 0,
+            "analysis_calls": 0, "rewrite_calls": 0, "analysis_prompt_chars": 0, "rewrite_prompt_chars": 0,
+        }
+
+    def analysis(self, chart_id: str, prompt: Callable[[], str],
+                 generate: Callable[[str], str]) -> Tuple[ChartAnalysis, bool]:
+        """Cached stage one.
+
+        Args:
+            chart_id: Content ID of the chart.
+            prompt: Builds the stage-one prompt; only called on a miss.
+            generate: Model call.
+
+        Returns:
+            Tuple of (analysis, whether it came from cache).
+        """
+        key = (chart_id, ANALYSIS_VERSION)
+        cached = self._analyses.get(key)
+        if cached is not None:
+            self._count(analysis_hits=1)
+            return cached, True
+        text = prompt()
+        self._count(analysis_misses=1, analysis_calls=1, analysis_prompt_chars=len(text))
+        analysis = parse_analysis(generate(text))
+        self._analyses[key] = analysis
+        return analysis, False
+
+    def text(self, chart_id: str, analysis: ChartAnalysis, preferences: HoroscopePreferences,
+             generate: Callable[[str], str]) -> Tuple[str, bool]:
+        """Cached stage two.
+
+        Args:
+            chart_id: Content ID of the chart.
+            analysis: Stage-one result for the chart.
+            preferences: Tone, focus and language to render.
+            generate: Model call.
+
+        Returns:
+            Tuple of (horoscope text, whether it came from cache).
+        """
+        key = (chart_id, ANALYSIS_VERSION, *(value.strip().lower() for value in (
+            preferences.tone, preferences.focus, preferences.language)))
+        cached = self._texts.get(key)
+        if cached is not None:
+            self._count(text_hits=1)
+            return cached, True
+        text = rewrite_prompt(analysis, preferences)
+        self._count(text_misses=1, rewrite_calls=1, rewrite_prompt_chars=len(text))
+        rendered = generate(text)
+        self._texts[key] = rendered
+        return rendered, False
+
+    def stats(self) -> Dict[str, float]:
+        """Cache reuse and model cost per stage.
+
+        Returns:
+            Dict with the counters, hit ratios per stage and the number of
+            cached analyses and texts.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+        for stage in ("analysis", "text"):
+            lookups = counters[f"{stage}_hits"] + counters[f"{stage}_misses"]
+            counters[f"{stage}_hit_ratio"] = counters[f"{stage}_hits"] / lookups if lookups else 0.0
+        counters["cached_analyses"] = len(self._analyses)
+        counters["cached_texts"] = len(self._texts)
+        return counters
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
@@ -0,0 +1,91 @@
+"""Use case for return charts and secondary progressions."""
+
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from src.core.domain.canonical import canonicalize_birth_data
+from src.core.domain.exceptions import InvalidDateError
+from src.core.domain.models import BirthData, ProgressedChart, ReturnChart
+from src.core.use_cases.calculate_chart import BodySelection
+from src.infrastructure.astro_engine.returns import ReturnsCalculator, jd_to_iso
+
+
+class ChartReturnsUseCase:
+    """Use case to cast solar/lunar return charts and progressed positions."""
+
+    def __init__(self, calculator: ReturnsCalculator, default_bodies: BodySelection = None):
+        """Initialize with the returns calculator.
+
+        Args:
+            calculator: Root-finding calculator over the astro engine.
+            default_bodies: Body set used when a call names none.
+        """
+        self.calculator = calculator
+        self.default_bodies = default_bodies
+
+    def returns(
+        self,
+        birth_data: BirthData,
+        kind: str = "solar",
+        start_date: Optional[str] = None,
+        count: int = 1,
+        location: Optional[Tuple[float, float]] = None,
+        bodies: BodySelection = None,
+    ) -> List[ReturnChart]:
+        """Cast consecutive return charts.
+
+        Args:
+            birth_data: Birth data of the native.
+            kind: "solar" or "lunar".
+            start_date: The first return is the first one after this date
+                (YYYY-MM-DD, UTC midnight); defaults to now.
+            count: Number of returns.
+            location: (lat, lon) to cast the charts for, for relocated
+                returns; defaults to the birthplace.
+            bodies: Body set name or list of body names of the charts.
+
+        Returns:
+            List[ReturnChart]: Return charts in chronological order.
+        """
+        canonicalize_birth_data(birth_data)  # validates date, time and coordinates
+        engine = self.calculator.engine
+        natal_jd = engine._calculate_julian_day(birth_data)
+        start_jd = self._start_julian_day(start_date)
+        lat, lon = location or (birth_data.lat, birth_data.lon)
+        jds = self.calculator.returns(kind, natal_jd, start_jd, count)
+        # Up to a century of lunar returns: cast them as one batch
+        charts = engine.calculate_batch(
+            jds, [lat] * len(jds), [lon] * len(jds), bodies or self.default_bodies
+        ).to_charts()
+        return [
+            ReturnChart(kind=kind, julian_day=jd, moment=jd_to_iso(jd), chart=chart)
+            for jd, chart in zip(jds, charts)
+        ]
+
+    def progressions(self, birth_data: BirthData, ages: Sequence[float],
+                     bodies: BodySelection = None) -> List[ProgressedChart]:
+        """Secondary progressed positions for the given ages.
+
+        Args:
+            birth_data: Birth data of the native.
+            ages: Ages in years.
+            bodies: Body set name or list of body names.
+
+        Returns:
+            List[ProgressedChart]: One entry per age, in input order.
+        """
+        canonicalize_birth_data(birth_data)
+        natal_jd = self.calculator.engine._calculate_julian_day(birth_data)
+        return self.calculator.progressions(
+            natal_jd, ages, birth_data.lat, birth_data.lon, bodies or self.default_bodies
+        )
+
+    def _start_julian_day(self, start_date: Optional[str]) -> float:
+        if start_date is None:
+            start = datetime.now(timezone.utc)
+        else:
+            try:
+                start = datetime.strptime(start_date, "%Y-%m-%d")
+            except ValueError:
+                raise InvalidDateError(details=f"start_date={start_date!r}")
+        return self.calculator.julian_day(start)
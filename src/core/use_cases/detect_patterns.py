@@ -0,0 +1,170 @@
+"""Detection of multi-body aspect configurations.
+
+The aspect list is turned into one adjacency bitset per aspect type: bit ``j``
+of ``graph["trine"][i]`` is set when bodies ``i`` and ``j`` are in trine.
+Configurations are then small cliques and cycles in those graphs, found with
+bitwise ANDs instead of nested loops over all body triples and quadruples.
+This keeps detection fast with 25+ bodies.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from src.core.domain.models import AspectPattern, NatalChart
+
+ASPECT_ALIASES = {"conjunct": "conjunction", "inconjunct": "quincunx"}
+
+MIN_STELLIUM = 3  # bodies sharing a sign or house
+
+Graph = Dict[str, List[int]]
+
+
+def _bits(mask: int) -> Iterator[int]:
+    """Indices of the set bits of a mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def build_aspect_graph(chart: NatalChart) -> Tuple[List[str], Graph]:
+    """Build per-aspect-type adjacency bitsets from a chart's aspect list.
+
+    Args:
+        chart: Chart with planets and aspects.
+
+    Returns:
+        Tuple of (body names by index, aspect type -> adjacency masks).
+    """
+    names = [planet.name for planet in chart.planets]
+    index = {name: i for i, name in enumerate(names)}
+    graph: Graph = defaultdict(lambda: [0] * len(names))
+    for aspect in chart.aspects:
+        i, j = index.get(aspect.planet1), index.get(aspect.planet2)
+        if i is None or j is None:
+            continue
+        kind = aspect.type.lower()
+        kind = ASPECT_ALIASES.get(kind, kind)
+        graph[kind][i] |= 1 << j
+        graph[kind][j] |= 1 << i
+    return names, graph
+
+
+def _triangles(adj: List[int]) -> Iterator[Tuple[int, int, int]]:
+    """3-cliques (i < j < k) of one aspect graph."""
+    for i, neighbours in enumerate(adj):
+        for j in _bits(neighbours >> (i + 1) << (i + 1)):
+            for k in _bits((adj[i] & adj[j]) >> (j + 1) << (j + 1)):
+                yield i, j, k
+
+
+def _pairs(adj: List[int]) -> Iterator[Tuple[int, int]]:
+    """Edges (i < j) of one aspect graph."""
+    for i, neighbours in enumerate(adj):
+        for j in _bits(neighbours >> (i + 1) << (i + 1)):
+            yield i, j
+
+
+def detect_patterns(chart: NatalChart) -> List[AspectPattern]:
+    """Find the classic aspect configurations of a chart.
+
+    Detects grand trines, T-squares, grand crosses, yods, kites, mystic
+    rectangles and stelliums by sign and by house. T-squares that are part
+    of a grand cross are not reported separately.
+
+    Args:
+        chart: The natal chart.
+
+    Returns:
+        List[AspectPattern]: Configurations found, in a stable order.
+    """
+    names, graph = build_aspect_graph(chart)
+    n = len(names)
+    empty = [0] * n
+    trine, square, opposition = graph.get("trine", empty), graph.get("square", empty), graph.get("opposition", empty)
+    sextile, quincunx = graph.get("sextile", empty), graph.get("quincunx", empty)
+    patterns: List[AspectPattern] = []
+
+    def pattern(kind: str, members: Iterable[int], apex: int = None) -> AspectPattern:
+        return AspectPattern(
+            type=kind,
+            bodies=[names[i] for i in sorted(members)],
+            apex=names[apex] if apex is not None else None,
+        )
+
+    # Grand trines and kites (a grand trine plus a body opposite one corner,
+    # sextile the other two)
+    for a, b, c in _triangles(trine):
+        patterns.append(pattern("Grand Trine", (a, b, c)))
+        for corner, x, y in ((a, b, c), (b, a, c), (c, a, b)):
+            for d in _bits(opposition[corner] & sextile[x] & sextile[y]):
+                patterns.append(pattern("Kite", (a, b, c, d), apex=d))
+
+    # Grand crosses: two oppositions whose ends all square each other
+    crosses: Set[frozenset] = set()
+    for a, c in _pairs(opposition):
+        around = square[a] & square[c]
+        for b in _bits(around):
+            for d in _bits(opposition[b] & around):
+                members = frozenset((a, b, c, d))
+                if b < d and members not in crosses:
+                    crosses.add(members)
+                    patterns.append(pattern("Grand Cross", members))
+
+    # T-squares: an opposition with a body square to both ends
+    for a, c in _pairs(opposition):
+        for apex in _bits(square[a] & square[c]):
+            if not any({a, c, apex} <= cross for cross in crosses):
+                patterns.append(pattern("T-Square", (a, c, apex), apex=apex))
+
+    # Yods: a sextile with a body quincunx to both ends
+    for a, b in _pairs(sextile):
+        for apex in _bits(quincunx[a] & quincunx[b]):
+            patterns.append(pattern("Yod", (a, b, apex), apex=apex))
+
+    # Mystic rectangles: two oppositions joined alternately by sextiles and trines
+    rectangles: Set[frozenset] = set()
+    for a, c in _pairs(opposition):
+        for b in _bits(sextile[a] & trine[c]):
+            for d in _bits(opposition[b] & trine[a] & sextile[c]):
+                members = frozenset((a, b, c, d))
+                if members not in rectangles:
+                    rectangles.add(members)
+                    patterns.append(pattern("Mystic Rectangle", members))
+
+    # Stelliums by sign and by house
+    by_sign: Dict[str, List[str]] = defaultdict(list)
+    by_house: Dict[int, List[str]] = defaultdict(list)
+    for planet in chart.planets:
+        by_sign[planet.sign].append(planet.name)
+        by_house[planet.house].append(planet.name)
+    for sign, bodies in by_sign.items():
+        if len(bodies) >= MIN_STELLIUM:
+            patterns.append(AspectPattern(type="Stellium", bodies=bodies, sign=sign))
+    for house, bodies in sorted(by_house.items()):
+        if len(bodies) >= MIN_STELLIUM:
+            patterns.append(AspectPattern(type="Stellium", bodies=bodies, house=house))
+
+    return patterns
+
+
+def detect_patterns_batch(charts: Iterable[NatalChart]) -> List[List[AspectPattern]]:
+    """Detect patterns over many charts, e.g. every stored chart.
+
+    Args:
+        charts: Charts to analyse.
+
+    Returns:
+        List of pattern lists, in input order.
+    """
+    return [detect_patterns(chart) for chart in charts]
+
+
+def describe_patterns(patterns: List[AspectPattern]) -> str:
+    """One line per pattern, for prompts."""
+    lines = []
+    for p in patterns:
+        where = f" in {p.sign}" if p.sign else f" in house {p.house}" if p.house is not None else ""
+        apex = f" (apex {p.apex})" if p.apex else ""
+        lines.append(f"- {p.type}{where}: {', '.join(p.bodies)}{apex}")
+    return "\n".join(lines) or "- none"
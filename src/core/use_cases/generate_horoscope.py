@@ -1,49 +1,143 @@
 """Use case for generating a complete horoscope including AI text."""
 
 import json
+import logging
+import time
+from typing import Callable, Optional
 
-from src.core.domain.models import BirthData, HoroscopeOutput
-from src.core.domain.prompts import NATAL_HOROSCOPE_PROMPT
+from src.core.domain.canonical import chart_content_id
+from src.core.domain.exceptions import AIServiceUnavailableError
+from src.core.domain.models import BirthData, HoroscopeOutput, HoroscopePreferences
 from src.core.use_cases.calculate_chart import CalculateChartUseCase
+from src.core.use_cases.chart_analysis import GenerationCache, analysis_prompt
+from src.core.use_cases.detect_patterns import describe_patterns
 from src.core.use_cases.interpret_chart import interpret_chart
-from src.infrastructure.ai.gemini_adapter import GeminiAdapter
+from src.core.use_cases.template_text import TemplateTextGenerator
+from src.infrastructure.ai.resilience import ResilientTextGenerator
+from src.infrastructure.profiling.stages import stage
+
+logger = logging.getLogger(__name__)
+
+TEXT_ENGINES = ("ai", "template")
 
 
 class GenerateHoroscopeUseCase:
-    """Use case to generate a complete horoscope with AI text."""
+    """Use case to generate a complete horoscope with AI text.
+
+    Text is generated in two stages (see ``chart_analysis``): a cached,
+    preference-independent analysis of the chart, then a short rewrite for
+    the requested tone, focus and language. With a deadline, both stages
+    share it: the rewrite gets whatever time the analysis left.
+
+    The "template" text engine skips the model and renders the text from
+    phrase templates instead (see ``template_text``); the same templates
+    provide the fallback text when the model is unavailable.
+    """
 
-    def __init__(self, calculate_use_case: CalculateChartUseCase, ai_adapter: GeminiAdapter):
+    def __init__(self, calculate_use_case: CalculateChartUseCase, ai_adapter: ResilientTextGenerator,
+                 allow_fallback: bool = True, cache: Optional[GenerationCache] = None,
+                 templates: Optional[TemplateTextGenerator] = None, text_engine: str = "ai",
+                 deadline: Optional[float] = None):
         """Initialize with dependencies.
 
         Args:
             calculate_use_case: Use case for calculating the chart.
-            ai_adapter: AI adapter for text generation.
+            ai_adapter: Text generator, called with ``timeout`` and ``stage``
+                keywords (see ``ResilientTextGenerator.generate_text``).
+            allow_fallback: Whether to answer with rule-generated text when the
+                AI service is unavailable, instead of raising.
+            cache: Stage caches, shared across requests to reuse analyses.
+            templates: Template text generator, shared across requests.
+            text_engine: Default text engine, "ai" or "template".
+            deadline: Seconds both model calls of a horoscope must finish in;
+                None leaves each call to the generator's own deadline.
         """
+        if text_engine not in TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine {text_engine!r}; expected one of {TEXT_ENGINES}")
         self.calculate_use_case = calculate_use_case
         self.ai_adapter = ai_adapter
+        self.allow_fallback = allow_fallback
+        self.cache = cache if cache is not None else GenerationCache()
+        self.templates = templates if templates is not None else TemplateTextGenerator()
+        self.text_engine = text_engine
+        self.deadline = deadline
 
-    def execute(self, birth_data: BirthData) -> HoroscopeOutput:
+    def execute(self, birth_data: BirthData, preferences: Optional[HoroscopePreferences] = None,
+                text_engine: Optional[str] = None) -> HoroscopeOutput:
         """Execute the use case to generate the horoscope.
 
         Args:
             birth_data: The birth data for the horoscope.
+            preferences: Tone, focus and language of the text.
+            text_engine: "ai" or "template"; defaults to the use case's engine.
 
         Returns:
             HoroscopeOutput: The complete horoscope output.
         """
+        preferences = preferences or HoroscopePreferences()
+        text_engine = text_engine or self.text_engine
+        if text_engine not in TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine {text_engine!r}; expected one of {TEXT_ENGINES}")
         chart = self.calculate_use_case.execute(birth_data)
-        interpretation = interpret_chart(chart)
+        with stage("interpretation"):
+            interpretation = interpret_chart(chart)
+        chart_id = chart_content_id(chart)
 
-        # Prepare prompt
-        chart_dict = chart.model_dump()
-        chart_json = json.dumps(chart_dict, indent=2)
-        prompt = NATAL_HOROSCOPE_PROMPT.format(chart_json=chart_json)
+        def prompt() -> str:
+            return analysis_prompt(
+                chart_json=json.dumps(chart.model_dump(), indent=2),
+                patterns=describe_patterns(interpretation.patterns)
+            )
 
-        # Generate AI text
-        ai_text = self.ai_adapter.generate_text(prompt)
+        analysis_cached = text_cached = False
+        if text_engine == "template":
+            with stage("template_text"):
+                ai_text = self.templates.generate(chart, interpretation, preferences, chart_id)
+            return HoroscopeOutput(
+                chart=chart,
+                interpretation=interpretation,
+                ai_text=ai_text,
+                text_source="template",
+                preferences=preferences
+            )
+
+        # Generate AI text, falling back to template text when the model
+        # cannot answer within its deadline
+        text_source = "ai"
+        deadline_at = time.monotonic() + self.deadline if self.deadline is not None else None
+        try:
+            with stage("ai.analysis") as step:
+                analysis, analysis_cached = self.cache.analysis(
+                    chart_id, prompt, self._generator("analysis", deadline_at)
+                )
+                step.source = "cache" if analysis_cached else "computed"
+            with stage("ai.rewrite") as step:
+                ai_text, text_cached = self.cache.text(
+                    chart_id, analysis, preferences, self._generator("rewrite", deadline_at)
+                )
+                step.source = "cache" if text_cached else "computed"
+        except AIServiceUnavailableError as exc:
+            if not self.allow_fallback:
+                raise
+            logger.warning("Using fallback horoscope text: %s", exc.details)
+            with stage("fallback_text"):
+                ai_text = self.templates.generate(chart, interpretation, preferences, chart_id)
+            text_source = "fallback"
 
         return HoroscopeOutput(
             chart=chart,
             interpretation=interpretation,
-            ai_text=ai_text
-        )
\ No newline at end of file
+            ai_text=ai_text,
+            text_source=text_source,
+            preferences=preferences,
+            analysis_cached=analysis_cached,
+            text_cached=text_cached
+        )
+
+    def _generator(self, stage_name: str, deadline_at: Optional[float]) -> Callable[[str], str]:
+        """Model call of one stage, bounded by what is left of the shared deadline."""
+        def generate(prompt: str) -> str:
+            timeout = deadline_at - time.monotonic() if deadline_at is not None else None
+            return self.ai_adapter.generate_text(prompt, timeout=timeout, stage=stage_name)
+
+        return generate
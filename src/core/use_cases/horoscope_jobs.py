@@ -0,0 +1,33 @@
+"""Use case for generating horoscopes from queued jobs."""
+
+from typing import Any, Dict
+
+from src.core.domain.models import BirthData, HoroscopePreferences
+from src.core.use_cases.generate_horoscope import GenerateHoroscopeUseCase
+
+
+class HoroscopeJobHandler:
+    """Job handler that runs the horoscope pipeline for a queued request."""
+
+    def __init__(self, generate_use_case: GenerateHoroscopeUseCase):
+        """Initialize with the horoscope use case.
+
+        Args:
+            generate_use_case: Use case producing the horoscope.
+        """
+        self.generate_use_case = generate_use_case
+
+    def __call__(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the horoscope for a job payload.
+
+        Args:
+            payload: Job input with the resolved ``birth`` data, ``profile_id``
+                and optional ``preferences`` and ``text_engine``.
+
+        Returns:
+            Dict: JSON-serialisable horoscope output.
+        """
+        birth_data = BirthData(**payload["birth"])
+        preferences = HoroscopePreferences(**payload.get("preferences", {}))
+        output = self.generate_use_case.execute(birth_data, preferences, payload.get("text_engine"))
+        return {"profile_id": payload.get("profile_id"), **output.model_dump()}
@@ -3,7 +3,8 @@
 from typing import Set
 
 from src.core.domain.models import Aspect, Interpretation, NatalChart
-from src.core.domain.rules import ASPECT_RULES, HOUSE_RULES, SIGN_RULES
+from src.core.domain.rules import ASPECT_RULES, HOUSE_RULES, PATTERN_RULES, SIGN_RULES
+from src.core.use_cases.detect_patterns import detect_patterns
 
 
 def interpret_chart(chart: NatalChart) -> Interpretation:
@@ -42,8 +43,17 @@ def interpret_chart(chart: NatalChart) -> Interpretation:
             strengths.update(ASPECT_RULES[aspect_type]["strengths"])
             challenges.update(ASPECT_RULES[aspect_type]["challenges"])
 
+    # Apply rules for multi-body aspect patterns
+    patterns = detect_patterns(chart)
+    for pattern in patterns:
+        if pattern.type in PATTERN_RULES:
+            traits.update(PATTERN_RULES[pattern.type]["traits"])
+            strengths.update(PATTERN_RULES[pattern.type]["strengths"])
+            challenges.update(PATTERN_RULES[pattern.type]["challenges"])
+
     return Interpretation(
         traits=list(traits),
         strengths=list(strengths),
-        challenges=list(challenges)
+        challenges=list(challenges),
+        patterns=patterns
     )
\ No newline at end of file
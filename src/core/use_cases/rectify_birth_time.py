@@ -0,0 +1,36 @@
+"""Use case for scanning candidate birth times."""
+
+from src.core.domain.models import BirthData, RectificationScan
+from src.infrastructure.astro_engine.rectification import RectificationScanner
+
+
+class RectifyBirthTimeUseCase:
+    """Use case to show how the chart's angles and houses change across a day."""
+
+    def __init__(self, scanner: RectificationScanner):
+        """Initialize with the rectification scanner.
+
+        Args:
+            scanner: Scanner sweeping the houses over a time window.
+        """
+        self.scanner = scanner
+
+    def execute(
+        self,
+        birth_data: BirthData,
+        start_time: str = "00:00",
+        end_time: str = "23:59",
+        step_minutes: int = 1,
+    ) -> RectificationScan:
+        """Execute the use case to scan the window.
+
+        Args:
+            birth_data: Birth date and location; the time is ignored.
+            start_time: Window start (HH:MM).
+            end_time: Window end (HH:MM), inclusive.
+            step_minutes: Scan resolution in minutes.
+
+        Returns:
+            RectificationScan: Intervals of stable rising sign and placements.
+        """
+        return self.scanner.scan(birth_data, start_time, end_time, step_minutes)
@@ -0,0 +1,215 @@
+"""Template-generated horoscope text, the fast path without the AI model.
+
+The text is assembled from the phrase templates of ``text_templates`` and the
+rule keywords of the chart's placements, aspects and patterns. Everything
+that does not depend on the chart (translated keyword lists per sign and
+house, bound template methods) is compiled once per language, so a text is a
+few dozen ``str.format`` calls.
+
+Wording varies between charts: each sentence picks one of its variants with
+a random generator seeded by the chart ID, so the same chart always gets the
+same text and retries and caches see no difference.
+"""
+
+import heapq
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core.domain.canonical import chart_content_id
+from src.core.domain.models import HoroscopePreferences, Interpretation, NatalChart
+from src.core.domain.rules import ASPECT_RULES, HOUSE_RULES, PATTERN_RULES, SIGN_RULES
+from src.core.domain.text_templates import DEFAULT_LANGUAGE, LANGUAGE_PACKS
+
+# Body read first for each focus area, and the house of that area
+FOCUS_BODIES: Dict[str, str] = {
+    "general": "Sun", "love": "Venus", "career": "Saturn", "health": "Mars", "growth": "Jupiter",
+    "finances": "Jupiter",
+}
+FOCUS_HOUSES: Dict[str, int] = {"love": 7, "career": 10, "health": 6, "growth": 9, "finances": 2}
+
+ASPECT_RULE_KEYS: Dict[str, str] = {"Conjunction": "conjunct"}  # engine aspect type -> ASPECT_RULES key
+
+MAX_ASPECTS = 2  # tightest aspects described
+MAX_PATTERNS = 2
+MAX_ITEMS = 3  # strengths and challenges mentioned, each
+
+
+def _capitalize(sentence: str) -> str:
+    return sentence[:1].upper() + sentence[1:]
+
+
+class _Language:
+    """One language pack, compiled for fast rendering."""
+
+    def __init__(self, pack: Dict):
+        self.conjunction = pack["and"]
+        self.decimal = pack["decimal"]
+        self.signs: Dict[str, str] = pack["signs"]
+        self.bodies: Dict[str, str] = pack["bodies"]
+        self.aspects: Dict[str, str] = pack["aspects"]
+        self.aspect_verbs: Dict[str, str] = pack["aspect_verbs"]
+        self.patterns: Dict[str, str] = pack["patterns"]
+        self.themes: Dict[str, str] = pack["themes"]
+        self.ordinals: Dict[int, str] = pack["ordinals"]
+        self.focus: Dict[str, str] = pack["focus"]
+        self.words: Dict[str, str] = pack["words"]
+
+        templates = pack["templates"]
+        self.templates: Dict[str, Tuple[Callable[..., str], ...]] = {
+            name: tuple(variant.format for variant in variants)
+            for name, variants in templates.items() if isinstance(variants, list)
+        }
+        self.where_sign = templates["pattern_where_sign"].format
+        self.where_house = templates["pattern_where_house"].format
+        self.closings: Dict[str, Tuple[str, ...]] = {
+            tone: tuple(variants) for tone, variants in templates["closing"].items()
+        }
+
+        self.sign_traits = {sign: self.join(rules["traits"]) for sign, rules in SIGN_RULES.items()}
+        self.sign_strengths = {sign: self.join(rules["strengths"]) for sign, rules in SIGN_RULES.items()}
+        self.house_themes = {house: self.join(rules["traits"]) for house, rules in HOUSE_RULES.items()}
+        self.aspect_effects = {
+            kind: (self.word(rules["strengths"][0]), self.word(rules["challenges"][0]))
+            for kind, rules in ASPECT_RULES.items()
+        }
+        self.pattern_strengths = {
+            kind: self.join(rules["strengths"]) for kind, rules in PATTERN_RULES.items()
+        }
+
+    def word(self, keyword: str) -> str:
+        return self.words.get(keyword, keyword)
+
+    def join(self, keywords: Sequence[str]) -> str:
+        """Translated keywords as a list phrase: "a, b and c"."""
+        words = [self.word(keyword) for keyword in keywords]
+        if len(words) <= 1:
+            return "".join(words)
+        return f"{', '.join(words[:-1])}{self.conjunction}{words[-1]}"
+
+    def join_names(self, names: Sequence[str]) -> str:
+        bodies = [self.bodies.get(name, name) for name in names]
+        if len(bodies) <= 1:
+            return "".join(bodies)
+        return f"{', '.join(bodies[:-1])}{self.conjunction}{bodies[-1]}"
+
+
+class TemplateTextGenerator:
+    """Renders horoscope text from templates, without calling the AI model."""
+
+    def __init__(self, packs: Optional[Dict[str, Dict]] = None, default_language: str = DEFAULT_LANGUAGE):
+        """Compile the language packs.
+
+        Args:
+            packs: Language packs by language code; defaults to ``LANGUAGE_PACKS``.
+            default_language: Language used for codes without a pack.
+        """
+        packs = LANGUAGE_PACKS if packs is None else packs
+        self.languages: Dict[str, _Language] = {code: _Language(pack) for code, pack in packs.items()}
+        self.default_language = default_language
+
+    def generate(self, chart: NatalChart, interpretation: Interpretation,
+                 preferences: Optional[HoroscopePreferences] = None, chart_id: Optional[str] = None) -> str:
+        """Compose a horoscope for a chart.
+
+        Args:
+            chart: The natal chart.
+            interpretation: Result of ``interpret_chart`` for the chart.
+            preferences: Tone, focus and language; unknown languages fall back
+                to the default language, unknown tones to "spiritual".
+            chart_id: Content ID of the chart, computed when not given.
+
+        Returns:
+            str: Plain-text horoscope of a few paragraphs.
+        """
+        preferences = preferences or HoroscopePreferences()
+        language = self.languages.get(preferences.language.strip().lower()) \
+            or self.languages[self.default_language]
+        focus = preferences.focus.strip().lower()
+        rng = random.Random(chart_id or chart_content_id(chart))
+        choice = rng.choice
+        templates = language.templates
+        signs = language.signs
+        bodies = language.bodies
+
+        paragraphs: List[str] = []
+
+        sentences = []
+        by_name = {}
+        for planet in chart.planets:
+            by_name[planet.name] = planet
+            theme = language.themes.get(planet.name)
+            if theme is None:
+                continue
+            sentence = choice(templates["placement"])(
+                theme=theme, body=bodies.get(planet.name, planet.name),
+                sign=signs.get(planet.sign, planet.sign), traits=language.sign_traits.get(planet.sign, ""),
+            )
+            if planet.house in language.house_themes:
+                sentence += choice(templates["house"])(
+                    ordinal=language.ordinals[planet.house], house=language.house_themes[planet.house])
+            if planet.is_retrograde:
+                sentence += choice(templates["retrograde"])()
+            sentences.append(_capitalize(sentence))
+        if chart.houses:
+            rising = chart.houses[0].sign
+            sentences.append(_capitalize(choice(templates["rising"])(
+                sign=signs.get(rising, rising), traits=language.sign_traits.get(rising, ""))))
+        if sentences:
+            paragraphs.append(" ".join(sentences))
+
+        sentences = []
+        for aspect in heapq.nsmallest(MAX_ASPECTS, chart.aspects, key=lambda a: a.orb):
+            effect = language.aspect_effects.get(ASPECT_RULE_KEYS.get(aspect.type, aspect.type.lower()))
+            values = dict(
+                body1=bodies.get(aspect.planet1, aspect.planet1), body2=bodies.get(aspect.planet2, aspect.planet2),
+                aspect=language.aspects.get(aspect.type, aspect.type.lower()),
+                verb=language.aspect_verbs.get(aspect.type, ""),
+                orb=f"{aspect.orb:.1f}".replace(".", language.decimal),
+            )
+            if effect:
+                sentence = choice(templates["aspect"])(strength=effect[0], challenge=effect[1], **values)
+            else:
+                sentence = choice(templates["aspect_plain"])(**values)
+            sentences.append(_capitalize(sentence))
+        for pattern in interpretation.patterns[:MAX_PATTERNS]:
+            if pattern.sign:
+                where = language.where_sign(sign=signs.get(pattern.sign, pattern.sign))
+            elif pattern.house in language.ordinals:
+                where = language.where_house(ordinal=language.ordinals[pattern.house])
+            else:
+                where = ""
+            sentences.append(_capitalize(choice(templates["pattern"])(
+                pattern=language.patterns.get(pattern.type, pattern.type), where=where,
+                bodies=language.join_names(pattern.bodies), strength=language.pattern_strengths.get(pattern.type, ""),
+            )))
+        if sentences:
+            paragraphs.append(" ".join(sentences))
+
+        sentences = []
+        for name, keywords in (("strengths", interpretation.strengths), ("challenges", interpretation.challenges)):
+            if keywords:
+                keywords = sorted(keywords)  # sets upstream; sort before sampling for determinism
+                picked = sorted(rng.sample(keywords, min(MAX_ITEMS, len(keywords))))
+                sentences.append(_capitalize(choice(templates[name])(items=language.join(picked))))
+        if sentences:
+            paragraphs.append(" ".join(sentences))
+
+        sentences = []
+        key_body = by_name.get(FOCUS_BODIES.get(focus, ""))
+        if focus in language.focus and key_body is not None:
+            sentences.append(_capitalize(choice(templates["focus"])(
+                focus=language.focus[focus], body=bodies.get(key_body.name, key_body.name),
+                sign=signs.get(key_body.sign, key_body.sign), items=language.sign_strengths.get(key_body.sign, ""),
+            )))
+            house = FOCUS_HOUSES[focus]
+            occupants = [planet.name for planet in chart.planets if planet.house == house]
+            if occupants:
+                sentences.append(_capitalize(choice(templates["focus_house"])(
+                    ordinal=language.ordinals[house], house=language.house_themes[house],
+                    bodies=language.join_names(occupants),
+                )))
+        closings = language.closings.get(preferences.tone.strip().lower()) or language.closings["spiritual"]
+        sentences.append(choice(closings))
+        paragraphs.append(" ".join(sentences))
+
+        return "\n\n".join(paragraphs)
@@ -6,14 +6,23 @@ import google.genai as genai
 class GeminiAdapter:
     """Adapter for Google Gemini AI text generation."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = "", model_name: str = "gemini-pro", timeout: float = 0.0):
         """Initialize the Gemini adapter.
 
         Args:
             api_key: Google AI API key.
+            base_url: Override of the API endpoint (e.g. a local fake model
+                server for load tests); empty for the public API.
+            model_name: Model to generate with.
+            timeout: Per-request HTTP timeout in seconds; 0 for none.
         """
-        self.client = genai.Client(api_key=api_key)
-        self.model_name = 'gemini-pro'
+        http_options = {}
+        if base_url:
+            http_options["base_url"] = base_url
+        if timeout:
+            http_options["timeout"] = int(timeout * 1000)  # the SDK takes milliseconds
+        self.client = genai.Client(api_key=api_key, http_options=http_options or None)
+        self.model_name = model_name
 
     def generate_text(self, prompt: str) -> str:
         """Generate text using the Gemini model.
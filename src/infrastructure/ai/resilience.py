@@ -0,0 +1,254 @@
+"""Deadline, hedging and circuit breaking around a text generation adapter.
+
+Model latency has a long tail: most calls return in about a second, while a
+few percent take tens of seconds or never return. ``ResilientTextGenerator``
+bounds every call by a deadline and, once the primary call has taken longer
+than a high percentile of recent latencies, fires one hedged duplicate and
+takes whichever answers first. After repeated upstream failures a circuit
+breaker stops calling the model for a cool-down period. Callers see
+``AIServiceUnavailableError`` whenever no model text is available in time, and
+can fall back to rule-generated text.
+
+Calls may be tagged with a stage, e.g. the two calls of a horoscope. Each
+stage keeps its own latency window, so a fast stage is not hedged late
+because of a slow one, and may be given less time than the deadline when it
+shares one budget with earlier calls.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, DefaultDict, Deque, Dict, Optional
+
+from src.core.domain.exceptions import AIServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"  # cool-down elapsed; a single probe call is let through
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and probes again after a cool-down."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker in the closed state.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now.
+
+        Returns:
+            bool: True when closed, or for the single probe of a half-open circuit.
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open (or re-open) the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning("AI circuit breaker opened after %d failures", self._failures)
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+
+class ResilientTextGenerator:
+    """Wraps an adapter's ``generate_text`` with a deadline, hedging and a breaker."""
+
+    def __init__(
+        self,
+        adapter: Any,
+        deadline: float = 8.0,
+        hedge_percentile: float = 95.0,
+        initial_hedge_delay: float = 2.0,
+        breaker: Optional[CircuitBreaker] = None,
+        window: int = 200,
+        min_samples: int = 20,
+        max_workers: int = 32,
+    ):
+        """Initialize the generator.
+
+        Args:
+            adapter: Object with a blocking ``generate_text(prompt) -> str``.
+            deadline: Seconds after which the call is given up.
+            hedge_percentile: Latency percentile of recent successful calls
+                after which a hedged duplicate is sent; 0 disables hedging.
+            initial_hedge_delay: Hedge delay used until ``min_samples``
+                latencies have been observed.
+            breaker: Circuit breaker; a default one is created if omitted.
+            window: Number of recent latencies per stage the percentile is
+                taken over.
+            min_samples: Observations required before the percentile is used.
+            max_workers: Threads available for in-flight upstream calls.
+        """
+        self.adapter = adapter
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.min_samples = min_samples
+        self._latencies: DefaultDict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-call")
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {
+            "calls": 0, "primary_wins": 0, "hedges_sent": 0, "hedge_wins": 0,
+            "timeouts": 0, "errors": 0, "short_circuited": 0,
+        }
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.adapter, "model_name", "")
+
+    def hedge_delay(self, stage: str = "default") -> Optional[float]:
+        """Seconds to wait on the primary call of a stage before hedging, or None if disabled."""
+        if not self.hedge_percentile:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(stage, ()))
+        if len(samples) < self.min_samples:
+            return min(self.initial_hedge_delay, self.deadline)
+        rank = min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100.0))
+        return min(samples[rank], self.deadline)
+
+    def generate_text(self, prompt: str, timeout: Optional[float] = None, stage: str = "default") -> str:
+        """Generate text within the deadline.
+
+        Args:
+            prompt: The prompt to send to the model.
+            timeout: Seconds left of a budget shared with other calls; the
+                call is given up after this or the deadline, whichever is
+                shorter.
+            stage: Name of the pipeline stage, for its latency window.
+
+        Returns:
+            str: The generated text.
+
+        Raises:
+            AIServiceUnavailableError: The circuit is open, the deadline or
+                budget passed, or every attempt failed.
+        """
+        self._count("calls")
+        limit = self.deadline if timeout is None else min(self.deadline, timeout)
+        if limit <= 0:
+            self._count("timeouts")
+            raise AIServiceUnavailableError(details="no time left of the request budget")
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise AIServiceUnavailableError(details="circuit open")
+
+        started = time.monotonic()
+        deadline_at = started + limit
+        pending = {self._submit(prompt): ("primary", started)}
+        hedge_delay = self.hedge_delay(stage)
+        hedge_at = started + hedge_delay if hedge_delay is not None else None
+        last_error: Optional[BaseException] = None
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline_at:
+                break
+            wake_at = hedge_at if hedge_at is not None and hedge_at < deadline_at else deadline_at
+            done, _ = wait(pending, timeout=max(wake_at - now, 0.0), return_when=FIRST_COMPLETED)
+            for future in done:
+                path, submitted_at = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as exc:
+                    last_error = exc
+                    continue
+                self._record_success(time.monotonic() - submitted_at, path, stage)
+                for other in pending:
+                    other.cancel()
+                return text
+            # Hedge once: when the primary is slow, or right away if it failed fast
+            if hedge_at is not None and (not pending or time.monotonic() >= hedge_at):
+                hedge_at = None
+                self._count("hedges_sent")
+                pending[self._submit(prompt)] = ("hedge", time.monotonic())
+
+        for future in pending:
+            future.cancel()
+        self.breaker.record_failure()
+        if pending or last_error is None:
+            self._count("timeouts")
+            raise AIServiceUnavailableError(details=f"deadline of {limit:g}s exceeded")
+        self._count("errors")
+        raise AIServiceUnavailableError(details=f"{type(last_error).__name__}: {last_error}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, breaker state, the current hedge delay and latencies per stage."""
+        with self._lock:
+            counters = dict(self.counters)
+            stages = list(self._latencies)
+        return {
+            **counters,
+            "breaker_state": self.breaker.state,
+            "hedge_delay": self.hedge_delay(),
+            "stages": {stage: self.stage_stats(stage) for stage in stages},
+        }
+
+    def stage_stats(self, stage: str) -> Dict[str, Any]:
+        """Latency percentiles of a stage's recent successful calls, in milliseconds."""
+        with self._lock:
+            samples = sorted(self._latencies.get(stage, ()))
+        stats: Dict[str, Any] = {"samples": len(samples), "p50_ms": None, "p95_ms": None, "max_ms": None}
+        if samples:
+            for name, percentile in (("p50_ms", 50), ("p95_ms", 95)):
+                stats[name] = round(samples[min(len(samples) - 1, len(samples) * percentile // 100)] * 1000, 1)
+            stats["max_ms"] = round(samples[-1] * 1000, 1)
+        stats["hedge_delay"] = self.hedge_delay(stage)
+        return stats
+
+    def _submit(self, prompt: str) -> "Future[str]":
+        return self._executor.submit(self.adapter.generate_text, prompt)
+
+    def _record_success(self, latency: float, path: str, stage: str) -> None:
+        self.breaker.record_success()
+        with self._lock:
+            self._latencies[stage].append(latency)
+            self.counters["primary_wins" if path == "primary" else "hedge_wins"] += 1
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
@@ -0,0 +1,209 @@
+"""Astrocartography: where on Earth each natal body sits on an angle.
+
+A body culminates (MC) wherever the local sidereal time equals its right
+ascension, so its MC line is the meridian at longitude ``RA - GAST`` and its
+IC line the opposite meridian. It rises (ASC) or sets (DSC) where its hour
+angle is ``-H0`` or ``+H0``, with ``cos H0 = -tan(lat) tan(dec)``, which gives
+one longitude per latitude. Every line of a chart therefore comes from one
+equatorial position per body and one sidereal time, evaluated for all
+latitudes of the grid at once with NumPy, instead of a house calculation
+per grid cell.
+
+Above latitude ``90 - |dec|`` a body never rises or sets; each ASC/DSC curve
+is sampled at that latitude exactly, so the curves reach their turning point.
+Lines are returned as a GeoJSON ``FeatureCollection``, one ``MultiLineString``
+per body and angle, split at the antimeridian and the edges of the map.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import swisseph as swe
+
+from src.core.domain.exceptions import InvalidMapGridError
+from src.infrastructure.astro_engine.bodies import resolve_plan
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+ANGLES = ("MC", "IC", "ASC", "DSC")
+# Finest curve spacing: a world map at 0.05 degrees is about 1 MB of GeoJSON, and
+# the size and CPU cost grow as 1/step
+MIN_STEP = 0.05
+MAX_STEP = 10.0
+# Apparent positions on the true equator of date, the frame sidereal time is measured in
+EQUATORIAL_FLAGS = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
+
+
+@dataclass(frozen=True)
+class MapGrid:
+    """Extent and resolution of a map, in degrees."""
+
+    south: float = -75.0
+    north: float = 75.0
+    west: float = -180.0
+    east: float = 180.0
+    step: float = 1.0  # latitude spacing of the ASC/DSC curve points
+    precision: int = 2  # decimals of the output coordinates (0.01 degrees is about 1 km)
+
+    def __post_init__(self):
+        if not -90.0 < self.south < self.north < 90.0:
+            raise InvalidMapGridError(details=f"need -90 < south < north < 90, got {self.south}, {self.north}")
+        if not -180.0 <= self.west < self.east <= 180.0:
+            raise InvalidMapGridError(details=f"need -180 <= west < east <= 180, got {self.west}, {self.east}")
+        if not MIN_STEP <= self.step <= MAX_STEP:
+            raise InvalidMapGridError(details=f"need {MIN_STEP:g} <= step <= {MAX_STEP:g}, got {self.step}")
+
+    def latitudes(self) -> np.ndarray:
+        """Curve sample latitudes: every ``step`` from ``south``, and ``north``."""
+        latitudes = np.arange(self.south, self.north, self.step)
+        return np.append(latitudes[latitudes < self.north - 1e-9], self.north)
+
+
+def wrap_longitude(degrees: np.ndarray) -> np.ndarray:
+    """Longitudes folded into [-180, 180)."""
+    return (np.asarray(degrees) + 180.0) % 360.0 - 180.0
+
+
+def angle_lines(ra: np.ndarray, dec: np.ndarray, sidereal_time: float,
+                latitudes: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Longitudes of every body's angle lines, for all bodies at once.
+
+    Args:
+        ra: Right ascension of each body, degrees.
+        dec: Declination of each body, degrees.
+        sidereal_time: Greenwich apparent sidereal time, degrees.
+        latitudes: Latitudes at which the ASC/DSC curves are evaluated.
+
+    Returns:
+        Dict mapping each of ``ANGLES`` to ``(latitudes, longitudes)``
+        arrays of shape ``(bodies, points)``. MC and IC have one longitude
+        per body (shape ``(bodies, 1)``) and NaN latitudes; ASC and DSC
+        longitudes are NaN where the body is circumpolar.
+    """
+    ra = np.asarray(ra, dtype=float)
+    dec = np.asarray(dec, dtype=float)
+    meridian = wrap_longitude(ra - sidereal_time)[:, None]
+    no_latitude = np.full_like(meridian, np.nan)
+
+    # The grid plus the latitudes where each body stops rising and setting;
+    # NaN where those are off the grid, which sorts them to the end
+    limit = 90.0 - np.abs(dec)
+    turning = np.stack((limit, -limit), axis=1)
+    turning[(turning <= latitudes[0]) | (turning >= latitudes[-1])] = np.nan
+    grid = np.broadcast_to(latitudes, (len(ra), len(latitudes)))
+    lats = np.sort(np.concatenate((grid, turning), axis=1), axis=1)
+
+    cos_h0 = -np.tan(np.radians(lats)) * np.tan(np.radians(dec))[:, None]
+    circumpolar = ~(np.abs(cos_h0) <= 1.0 + 1e-12)  # NaN latitudes included
+    h0 = np.degrees(np.arccos(np.clip(cos_h0, -1.0, 1.0)))
+    h0[circumpolar] = np.nan
+    base = (ra - sidereal_time)[:, None]
+    return {
+        "MC": (no_latitude, meridian),
+        "IC": (no_latitude, wrap_longitude(meridian + 180.0)),
+        "ASC": (lats, wrap_longitude(base - h0)),
+        "DSC": (lats, wrap_longitude(base + h0)),
+    }
+
+
+def _curve(lats: np.ndarray, lons: np.ndarray, grid: MapGrid) -> List[List[List[float]]]:
+    """Split one sampled curve into GeoJSON line strings within the map."""
+    inside = (lons >= grid.west) & (lons <= grid.east)  # False for NaN
+    points = np.round(np.stack((lons, lats), axis=1), grid.precision).tolist()
+
+    # Where the curve crosses the antimeridian it ends at one edge of the map
+    # and continues from the other, at the interpolated crossing latitude
+    jumps = np.flatnonzero(inside[:-1] & inside[1:] & (np.abs(np.diff(lons)) > 180.0)) + 1
+    before, after = lons[jumps - 1], lons[jumps]
+    edges = np.where(before > 0, 180.0, -180.0)
+    fraction = (edges - before) / (after + 2 * edges - before)
+    crossings = np.round(lats[jumps - 1] + fraction * (lats[jumps] - lats[jumps - 1]), grid.precision)
+    crossing_at = {int(j): (edge, lat) for j, edge, lat in zip(jumps, edges.tolist(), crossings.tolist())}
+
+    gaps = np.flatnonzero(~inside)
+    lines: List[List[List[float]]] = []
+    for run in np.split(np.arange(len(lons)), np.union1d(jumps, np.union1d(gaps, gaps + 1))):
+        if not len(run) or not inside[run[0]]:
+            continue
+        first, last = int(run[0]), int(run[-1]) + 1
+        line = points[first:last]
+        if first in crossing_at:
+            edge, lat = crossing_at[first]
+            if grid.west <= -edge <= grid.east:
+                line.insert(0, [-edge, lat])
+        if last in crossing_at:
+            edge, lat = crossing_at[last]
+            if grid.west <= edge <= grid.east:
+                line.append([edge, lat])
+        if len(line) > 1:
+            lines.append(line)
+    return lines
+
+
+class AstrocartographyCalculator:
+    """Computes the angle lines of a chart moment over a map grid."""
+
+    def __init__(self, engine: SwissEphemerisEngine):
+        """Initialize the calculator.
+
+        Args:
+            engine: Engine whose Julian Day conversion and body sets are used.
+        """
+        self.engine = engine
+
+    def equatorial(self, jd: float, bodies: Union[None, str, Sequence[str]] = None
+                   ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Right ascension and declination of the ephemeris bodies of a set.
+
+        Chart angles and derived points have no lines of their own and are
+        skipped.
+
+        Args:
+            jd: Julian Day (UT).
+            bodies: Body set name or body names.
+
+        Returns:
+            Tuple of (names, right ascensions, declinations), degrees.
+        """
+        plan = resolve_plan(bodies)
+        names = [name for name, _ in plan.ephemeris]
+        positions = np.array([swe.calc_ut(jd, body_id, EQUATORIAL_FLAGS)[0][:2] for _, body_id in plan.ephemeris])
+        return names, positions[:, 0], positions[:, 1]
+
+    def lines(self, jd: float, bodies: Union[None, str, Sequence[str]] = None,
+              grid: MapGrid = MapGrid()) -> Dict[str, Any]:
+        """Angle lines of every body as a GeoJSON feature collection.
+
+        Args:
+            jd: Julian Day (UT) of the chart.
+            bodies: Body set name or body names.
+            grid: Map extent and resolution.
+
+        Returns:
+            Dict: GeoJSON ``FeatureCollection``; each feature's properties
+            name its ``body`` and ``angle``.
+        """
+        names, ra, dec = self.equatorial(jd, bodies)
+        sidereal_time = swe.sidtime(jd) * 15.0
+        lines = angle_lines(ra, dec, sidereal_time, grid.latitudes())
+        features = []
+        for angle in ANGLES:
+            lats, lons = lines[angle]
+            for row, name in enumerate(names):
+                if angle in ("MC", "IC"):
+                    lon = round(float(lons[row, 0]), grid.precision)
+                    coordinates = [[[lon, grid.south], [lon, grid.north]]] if grid.west <= lon <= grid.east else []
+                else:
+                    coordinates = _curve(lats[row], lons[row], grid)
+                if coordinates:
+                    features.append({
+                        "type": "Feature",
+                        "geometry": {"type": "MultiLineString", "coordinates": coordinates},
+                        "properties": {"body": name, "angle": angle},
+                    })
+        return {
+            "type": "FeatureCollection",
+            "features": features,
+            "julian_day": jd,
+            "sidereal_time": round(sidereal_time, 6),
+        }
@@ -0,0 +1,155 @@
+"""Configurable body sets and their precomputed calculation plans.
+
+A body set is an ordered list of names from ``BODY_CATALOG``: ephemeris
+bodies (planets, lunar nodes, Black Moon Lilith, Chiron and the main
+asteroids), chart angles (Ascendant, MC, Vertex) and derived points (South
+Node, Part of Fortune). ``resolve_plan`` turns a set into a
+``CalculationPlan`` once. The plan fixes the Swiss Ephemeris IDs to compute,
+any hidden dependencies of derived points and the output layout. Every later
+chart with the same set reuses the cached plan.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import swisseph as swe
+
+from src.core.domain.exceptions import InvalidBodySetError
+
+EPHEMERIS = "ephemeris"
+ANGLE = "angle"  # read from the houses calculation
+DERIVED = "derived"  # computed from other bodies
+
+
+@dataclass(frozen=True)
+class BodySpec:
+    """How to obtain one body or point."""
+
+    name: str
+    source: str
+    swe_id: Optional[int] = None  # for ephemeris bodies
+    ascmc_index: Optional[int] = None  # for angles, index into swe.houses()[1]
+    requires: Tuple[str, ...] = ()  # for derived points
+    needs_asteroid_files: bool = False  # requires seas_*.se1 in SWISS_EPH_PATH
+
+
+BODY_CATALOG: Dict[str, BodySpec] = {spec.name: spec for spec in (
+    BodySpec("Sun", EPHEMERIS, swe.SUN),
+    BodySpec("Moon", EPHEMERIS, swe.MOON),
+    BodySpec("Mercury", EPHEMERIS, swe.MERCURY),
+    BodySpec("Venus", EPHEMERIS, swe.VENUS),
+    BodySpec("Mars", EPHEMERIS, swe.MARS),
+    BodySpec("Jupiter", EPHEMERIS, swe.JUPITER),
+    BodySpec("Saturn", EPHEMERIS, swe.SATURN),
+    BodySpec("Uranus", EPHEMERIS, swe.URANUS),
+    BodySpec("Neptune", EPHEMERIS, swe.NEPTUNE),
+    BodySpec("Pluto", EPHEMERIS, swe.PLUTO),
+    BodySpec("Mean Node", EPHEMERIS, swe.MEAN_NODE),
+    BodySpec("True Node", EPHEMERIS, swe.TRUE_NODE),
+    BodySpec("Lilith", EPHEMERIS, swe.MEAN_APOG),  # Black Moon Lilith, mean lunar apogee
+    BodySpec("Osculating Lilith", EPHEMERIS, swe.OSCU_APOG),
+    BodySpec("Chiron", EPHEMERIS, swe.CHIRON, needs_asteroid_files=True),
+    BodySpec("Pholus", EPHEMERIS, swe.PHOLUS, needs_asteroid_files=True),
+    BodySpec("Ceres", EPHEMERIS, swe.CERES, needs_asteroid_files=True),
+    BodySpec("Pallas", EPHEMERIS, swe.PALLAS, needs_asteroid_files=True),
+    BodySpec("Juno", EPHEMERIS, swe.JUNO, needs_asteroid_files=True),
+    BodySpec("Vesta", EPHEMERIS, swe.VESTA, needs_asteroid_files=True),
+    BodySpec("Ascendant", ANGLE, ascmc_index=0),
+    BodySpec("MC", ANGLE, ascmc_index=1),
+    BodySpec("Vertex", ANGLE, ascmc_index=3),
+    BodySpec("South Node", DERIVED, requires=("True Node",)),
+    BodySpec("Part of Fortune", DERIVED, requires=("Ascendant", "Sun", "Moon")),
+)}
+
+CLASSIC = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+
+# Named sets; product tiers map onto these
+BODY_SETS: Dict[str, Tuple[str, ...]] = {
+    "classic": CLASSIC,
+    "standard": CLASSIC + ("True Node", "South Node", "Lilith", "Ascendant", "MC", "Part of Fortune"),
+    "extended": CLASSIC + (
+        "Mean Node", "True Node", "South Node", "Lilith", "Osculating Lilith", "Chiron",
+        "Ceres", "Pallas", "Juno", "Vesta", "Ascendant", "MC", "Vertex", "Part of Fortune",
+    ),
+}
+
+DEFAULT_BODY_SET = "classic"
+
+# Pairs that are always in exact opposition by construction; not reported as aspects
+FIXED_AXES = frozenset({frozenset(("True Node", "South Node"))})
+
+
+@dataclass(frozen=True)
+class CalculationPlan:
+    """Precomputed recipe for one body set.
+
+    ``ephemeris`` lists every body passed to ``calc_ut``, including hidden
+    dependencies of derived points; only names in ``layout`` are returned.
+    """
+
+    layout: Tuple[str, ...]  # output order
+    ephemeris: Tuple[Tuple[str, int], ...]  # (name, swe_id)
+    angles: Tuple[Tuple[str, int], ...]  # (name, ascmc index)
+    derived: Tuple[str, ...]  # in dependency order
+    signature: str  # stable short ID of the layout, for cache keys
+
+    @property
+    def needs_asteroid_files(self) -> bool:
+        return any(BODY_CATALOG[name].needs_asteroid_files for name, _ in self.ephemeris)
+
+
+def _normalize(bodies: Union[None, str, Sequence[str]]) -> Tuple[str, ...]:
+    """Resolve a set name, comma-separated string or list to body names."""
+    if bodies is None:
+        bodies = DEFAULT_BODY_SET
+    if isinstance(bodies, str):
+        if bodies in BODY_SETS:
+            return BODY_SETS[bodies]
+        bodies = [name.strip() for name in bodies.split(",") if name.strip()]
+    names = tuple(dict.fromkeys(bodies))  # drop duplicates, keep order
+    unknown = [name for name in names if name not in BODY_CATALOG]
+    if unknown or not names:
+        raise InvalidBodySetError(
+            details=f"Unknown bodies: {', '.join(unknown)}." if unknown else "The body set is empty."
+        )
+    return names
+
+
+def resolve_plan(bodies: Union[None, str, Sequence[str]] = None) -> CalculationPlan:
+    """Return the cached calculation plan for a body set.
+
+    Args:
+        bodies: A name from ``BODY_SETS``, a comma-separated list of body
+            names, a sequence of names, or None for the default set.
+
+    Returns:
+        CalculationPlan: The plan, shared by all calls with the same set.
+
+    Raises:
+        InvalidBodySetError: If the set is empty or names unknown bodies.
+    """
+    return _build_plan(_normalize(bodies))
+
+
+@lru_cache(maxsize=256)
+def _build_plan(layout: Tuple[str, ...]) -> CalculationPlan:
+    needed: Dict[str, None] = {}
+
+    def add(name: str) -> None:
+        for dependency in BODY_CATALOG[name].requires:
+            add(dependency)
+        needed.setdefault(name, None)
+
+    for name in layout:
+        add(name)
+
+    specs = [BODY_CATALOG[name] for name in needed]
+    return CalculationPlan(
+        layout=layout,
+        ephemeris=tuple((s.name, s.swe_id) for s in specs if s.source == EPHEMERIS),
+        angles=tuple((s.name, s.ascmc_index) for s in specs if s.source == ANGLE),
+        derived=tuple(s.name for s in specs if s.source == DERIVED),
+        signature=hashlib.sha256(",".join(layout).encode("utf-8")).hexdigest()[:12],
+    )
@@ -0,0 +1,196 @@
+"""Struct-of-arrays chart results for batch, analytics and search paths.
+
+``NatalChart`` builds one pydantic object per planet, house and aspect, and
+for bulk work that validation and allocation cost more than the ephemeris
+calls. ``ChartBatch`` holds N charts of one body set as NumPy arrays: one
+row per chart, one column per body (or house, or body pair). Signs and
+aspects are computed for the whole batch at once, and pydantic models are
+only built on request with ``to_chart``/``to_charts``.
+
+``ChartArrays`` is a single chart: row views into a batch plus that chart's
+aspects compacted to index arrays.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.domain.models import Aspect, House, NatalChart, Planet
+
+SIGNS = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+
+NO_ASPECT = -1  # aspect type code of pairs without an aspect
+
+
+def sign_indices(longitudes: np.ndarray) -> np.ndarray:
+    """Zodiac sign index (0 = Aries) of each longitude, as int8."""
+    return (np.floor_divide(longitudes, 30.0) % 12).astype(np.int8)
+
+
+@lru_cache(maxsize=256)
+def aspect_pairs(names: Tuple[str, ...], excluded: frozenset = frozenset()) -> np.ndarray:
+    """Body index pairs (i < j) checked for aspects, in row-major order.
+
+    Args:
+        names: Bodies of the layout.
+        excluded: Pairs (as frozensets of names) never reported as aspects.
+
+    Returns:
+        np.ndarray: ``(P, 2)`` int16 array; read-only, shared per layout.
+    """
+    pairs = [
+        (i, j)
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+        if frozenset((names[i], names[j])) not in excluded
+    ]
+    array = np.array(pairs, dtype=np.int16).reshape(-1, 2)
+    array.flags.writeable = False
+    return array
+
+
+def find_aspects(longitudes: np.ndarray, pairs: np.ndarray, angles: np.ndarray, limits: np.ndarray,
+                 types_out: np.ndarray, orbs_out: np.ndarray) -> None:
+    """Classify every body pair of every chart at once.
+
+    A pair gets the first aspect, in ``angles`` order, whose orb is within
+    its limit. Pairs without an aspect get ``NO_ASPECT`` and a NaN orb.
+
+    Args:
+        longitudes: ``(N, B)`` ecliptic longitudes.
+        pairs: ``(P, 2)`` body index pairs.
+        angles: Aspect angles in degrees.
+        limits: Maximum orb of each angle.
+        types_out: ``(N, P)`` int8 output of aspect indices into ``angles``.
+        orbs_out: ``(N, P)`` float output of orbs.
+    """
+    diff = np.abs(longitudes[:, pairs[:, 0]] - longitudes[:, pairs[:, 1]])
+    diff = np.minimum(diff, 360.0 - diff)
+    orbs = np.abs(diff[..., None] - angles)  # (N, P, A)
+    within = orbs <= limits
+    first = within.argmax(axis=-1)
+    types_out[...] = np.where(within.any(axis=-1), first, NO_ASPECT)
+    orbs_out[...] = np.where(types_out != NO_ASPECT, np.take_along_axis(orbs, first[..., None], -1)[..., 0], np.nan)
+
+
+class ChartArrays:
+    """One chart as arrays; see the module docstring."""
+
+    __slots__ = (
+        "names", "julian_day", "longitudes", "speeds", "signs", "houses", "retrograde",
+        "cusps", "cusp_signs", "aspect_pairs", "aspect_types", "aspect_orbs", "aspect_names",
+    )
+
+    def __init__(self, names: Tuple[str, ...], julian_day: float, longitudes: np.ndarray, speeds: np.ndarray,
+                 signs: np.ndarray, houses: np.ndarray, retrograde: np.ndarray, cusps: np.ndarray,
+                 cusp_signs: np.ndarray, aspect_pairs: np.ndarray, aspect_types: np.ndarray,
+                 aspect_orbs: np.ndarray, aspect_names: Tuple[str, ...]):
+        self.names = names  # body names, in layout order
+        self.julian_day = julian_day
+        self.longitudes = longitudes  # float64 (B,)
+        self.speeds = speeds  # float64 (B,), degrees per day
+        self.signs = signs  # int8 (B,), 0 = Aries
+        self.houses = houses  # int8 (B,), 1-12
+        self.retrograde = retrograde  # uint8 (ceil(B / 8),), bit-packed
+        self.cusps = cusps  # float64 (12,)
+        self.cusp_signs = cusp_signs  # int8 (12,)
+        self.aspect_pairs = aspect_pairs  # int16 (M, 2), body indices
+        self.aspect_types = aspect_types  # int8 (M,), indices into aspect_names
+        self.aspect_orbs = aspect_orbs  # float64 (M,)
+        self.aspect_names = aspect_names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def is_retrograde(self) -> np.ndarray:
+        """Unpacked retrograde flags, as a bool array."""
+        return np.unpackbits(self.retrograde, count=len(self.names)).astype(bool)
+
+    def to_chart(self) -> NatalChart:
+        """Build the pydantic chart, e.g. at the API boundary."""
+        names = self.names
+        signs = self.signs.tolist()
+        houses = self.houses.tolist()
+        retrograde = self.is_retrograde.tolist()
+        planets = [
+            Planet(name=name, sign=SIGNS[sign], longitude=longitude, house=house, is_retrograde=rx)
+            for name, longitude, sign, house, rx in zip(names, self.longitudes.tolist(), signs, houses, retrograde)
+        ]
+        cusps = [
+            House(number=number, degree=degree, sign=SIGNS[sign])
+            for number, (degree, sign) in enumerate(zip(self.cusps.tolist(), self.cusp_signs.tolist()), start=1)
+        ]
+        aspects = [
+            Aspect(planet1=names[i], planet2=names[j], type=self.aspect_names[kind], orb=orb)
+            for (i, j), kind, orb in zip(self.aspect_pairs.tolist(), self.aspect_types.tolist(),
+                                         self.aspect_orbs.tolist())
+        ]
+        return NatalChart(julian_day=self.julian_day, planets=planets, houses=cusps, aspects=aspects)
+
+
+class ChartBatch:
+    """N charts of one body set as arrays; see the module docstring."""
+
+    __slots__ = (
+        "names", "pairs", "aspect_names", "julian_days", "longitudes", "speeds", "signs", "houses",
+        "retrograde", "cusps", "cusp_signs", "aspect_types", "aspect_orbs",
+    )
+
+    def __init__(self, size: int, names: Tuple[str, ...], pairs: np.ndarray, aspect_names: Tuple[str, ...]):
+        """Allocate the arrays of an empty batch.
+
+        Args:
+            size: Number of charts.
+            names: Body names, in layout order.
+            pairs: ``(P, 2)`` body index pairs checked for aspects.
+            aspect_names: Aspect type names, indexed by aspect type code.
+        """
+        bodies = len(names)
+        self.names = names
+        self.pairs = pairs
+        self.aspect_names = aspect_names
+        self.julian_days = np.zeros(size)
+        self.longitudes = np.zeros((size, bodies))
+        self.speeds = np.zeros((size, bodies))
+        self.signs = np.zeros((size, bodies), dtype=np.int8)
+        self.houses = np.zeros((size, bodies), dtype=np.int8)
+        self.retrograde = np.zeros((size, (bodies + 7) // 8), dtype=np.uint8)
+        self.cusps = np.zeros((size, 12))
+        self.cusp_signs = np.zeros((size, 12), dtype=np.int8)
+        self.aspect_types = np.full((size, len(pairs)), NO_ASPECT, dtype=np.int8)
+        self.aspect_orbs = np.full((size, len(pairs)), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.julian_days)
+
+    def matches(self, size: int, names: Sequence[str], pairs: np.ndarray) -> bool:
+        """Whether this batch can be reused for ``size`` charts of a layout."""
+        return len(self) == size and tuple(names) == self.names and pairs is self.pairs
+
+    def chart(self, index: int) -> ChartArrays:
+        """One chart of the batch; positions are views, aspects are compacted."""
+        found = np.flatnonzero(self.aspect_types[index] != NO_ASPECT)
+        return ChartArrays(
+            names=self.names,
+            julian_day=float(self.julian_days[index]),
+            longitudes=self.longitudes[index],
+            speeds=self.speeds[index],
+            signs=self.signs[index],
+            houses=self.houses[index],
+            retrograde=self.retrograde[index],
+            cusps=self.cusps[index],
+            cusp_signs=self.cusp_signs[index],
+            aspect_pairs=self.pairs[found],
+            aspect_types=self.aspect_types[index, found],
+            aspect_orbs=self.aspect_orbs[index, found],
+            aspect_names=self.aspect_names,
+        )
+
+    def to_charts(self, indices: Optional[Sequence[int]] = None) -> List[NatalChart]:
+        """Build pydantic charts for some or all charts of the batch."""
+        return [self.chart(i).to_chart() for i in (range(len(self)) if indices is None else indices)]
@@ -0,0 +1,554 @@
+"""Precomputed calendar of sky events, shared by every user.
+
+Daily content needs sign ingresses, new and full moons, eclipses, retrograde
+stations and void-of-course Moon periods. They do not depend on the user, so
+they are computed once for a range of years into a memory-mapped index, and
+queries are binary searches over it.
+
+Events are found by sampling each body on a fixed grid of Julian days (one
+day for the fast bodies, more for the slow ones) and refining every crossing
+between two samples with a safeguarded Newton iteration. The grid is
+anchored at absolute Julian days, so an extended index holds exactly the
+events a full rebuild would.
+
+Index layout (little-endian)::
+
+    header   magic, version, covered years, counts and section offsets
+    times    float64 Julian day of every event, sorted
+    events   ``EVENT`` records in the same order
+    keys     ``KEY`` entries, one per (kind, body), sorted
+    by key   (float64 Julian day, uint32 event index) entries grouped by key,
+             sorted by time within each key
+
+Ranges ("all events between X and Y") are one ``searchsorted`` on ``times``;
+"next Mercury station after T" is one ``searchsorted`` in that key's group.
+
+Building and extending hold an ``fcntl`` lock on ``<index>.lock``: when
+several worker processes start together, one builds the index and the others
+wait and map the result.
+"""
+
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.domain.exceptions import EventRangeError
+from src.core.domain.models import SkyEvent
+from src.infrastructure.astro_engine.bodies import BODY_CATALOG
+from src.infrastructure.astro_engine.chart_arrays import SIGNS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LEV1"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIiiIIIIII")  # magic, version, start year, end year, events, keys, times@, events@, keys@, by key@
+EVENT = np.dtype([
+    ("jd", "<f8"), ("end_jd", "<f8"), ("kind", "u1"), ("body", "u1"), ("sign", "i1"),
+    ("detail", "u1"), ("other", "u1"),
+])
+KEY = np.dtype([("kind", "u1"), ("body", "u1"), ("start", "<u4"), ("count", "<u4")])
+
+KINDS = (
+    "ingress", "station_retrograde", "station_direct", "new_moon", "full_moon",
+    "solar_eclipse", "lunar_eclipse", "void_of_course",
+)
+BODIES = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+DETAILS = (
+    None, "retrograde", "total", "annular", "hybrid", "partial", "penumbral",
+    "conjunction", "sextile", "square", "trine", "opposition",
+)
+NO_BODY = 255
+
+SAMPLE_STEPS = {  # days between samples; small enough that no crossing is skipped
+    "Sun": 1.0, "Moon": 1.0, "Mercury": 1.0, "Venus": 1.0, "Mars": 2.0,
+    "Jupiter": 8.0, "Saturn": 8.0, "Uranus": 8.0, "Neptune": 8.0, "Pluto": 8.0,
+}
+STATION_BODIES = ("Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+MAJOR_ASPECTS = {0: "conjunction", 60: "sextile", 90: "square", 120: "trine", 180: "opposition"}
+PADDING_DAYS = 4.0  # computed beyond a range's ends, so periods crossing them are complete
+CHUNK_YEARS = 10  # years computed at once while building
+TOLERANCE_DAYS = 1e-6  # about 0.1 s
+STATION_STEP_DAYS = 1e-3  # finite difference for the change of speed at stations
+
+J2000 = 2451545.0
+J2000_UTC = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def julian_day(at: datetime) -> float:
+    """Julian day (UT) of a timestamp; naive values are taken as UTC."""
+    at = at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
+    return J2000 + (at - J2000_UTC) / timedelta(days=1)
+
+
+def from_julian_day(jd: float) -> datetime:
+    """UTC timestamp of a Julian day (UT), to the second."""
+    at = J2000_UTC + timedelta(days=jd - J2000)
+    return at.replace(microsecond=0) + timedelta(seconds=round(at.microsecond / 1e6))
+
+
+def year_start(year: int) -> float:
+    """Julian day of January 1st, 00:00 UT."""
+    return julian_day(datetime(year, 1, 1, tzinfo=timezone.utc))
+
+
+def _wrap(degrees):
+    """Angle difference folded to [-180, 180)."""
+    return (np.asarray(degrees) + 180.0) % 360.0 - 180.0
+
+
+def _position(jd: float, body: str) -> Tuple[float, float]:
+    pos, _ = swe.calc_ut(jd, BODY_CATALOG[body].swe_id, swe.FLG_SPEED)
+    return pos[0], pos[3]
+
+
+def _solve(f: Callable[[float], Tuple[float, float]], a: float, b: float, guess: float,
+           negative_at_a: bool = True) -> float:
+    """Root of ``f`` in ``[a, b]``, where it changes sign.
+
+    ``f`` returns its value and derivative. Iteration starts at ``guess``,
+    usually interpolated from the samples; Newton steps that leave the
+    bracket are replaced by bisection.
+    """
+    t = guess if a < guess < b else a + (b - a) * 0.5
+    for _ in range(50):
+        value, slope = f(t)
+        if value == 0:
+            return t
+        if (value < 0) == negative_at_a:
+            a = t
+        else:
+            b = t
+        step = value / slope if slope else 0.0
+        next_t = t - step
+        if not a < next_t < b or not step:
+            next_t = a + (b - a) * 0.5
+        if abs(next_t - t) < TOLERANCE_DAYS:
+            return next_t
+        t = next_t
+    return t
+
+
+def _interpolate(times: np.ndarray, values: np.ndarray, i: int, level: float) -> float:
+    """Time between samples i and i + 1 where the linearly interpolated values reach ``level``."""
+    fraction = (level - values[i]) / (values[i + 1] - values[i])
+    return float(times[i] + fraction * (times[i + 1] - times[i]))
+
+
+def _crossings(values: np.ndarray) -> np.ndarray:
+    """Indices i where an unwrapped series crosses a multiple of 30 degrees between i and i + 1."""
+    return np.flatnonzero(np.floor_divide(values[1:], 30.0) != np.floor_divide(values[:-1], 30.0))
+
+
+class _Samples:
+    """Longitudes and speeds of one body on its sampling grid."""
+
+    def __init__(self, body: str, start_jd: float, end_jd: float):
+        step = SAMPLE_STEPS[body]
+        self.body = body
+        self.times = np.arange(np.floor(start_jd / step), np.ceil(end_jd / step) + 1) * step
+        positions = np.array([_position(jd, body) for jd in self.times.tolist()])
+        self.longitudes = np.unwrap(positions[:, 0], period=360.0)
+        self.speeds = positions[:, 1]
+
+    def at(self, times: np.ndarray) -> np.ndarray:
+        """Unwrapped longitudes interpolated to other times."""
+        return np.interp(times, self.times, self.longitudes)
+
+
+def compute_events(start_jd: float, end_jd: float) -> np.ndarray:
+    """Compute all events starting in ``[start_jd, end_jd)``.
+
+    Args:
+        start_jd: Start of the range (Julian day, UT).
+        end_jd: End of the range, exclusive.
+
+    Returns:
+        np.ndarray: ``EVENT`` records sorted by time.
+    """
+    lo, hi = start_jd - PADDING_DAYS, end_jd + PADDING_DAYS
+    samples = {body: _Samples(body, lo, hi) for body in BODIES}
+    rows: List[tuple] = []
+    body_index = {body: i for i, body in enumerate(BODIES)}
+
+    def sign_at(jd: float, body: str) -> int:
+        return int(_position(jd, body)[0] // 30.0) % 12
+
+    # Sign ingresses, refined against the crossed sign boundary
+    ingresses = {}
+    for body, sample in samples.items():
+        times = []
+        for i in _crossings(sample.longitudes).tolist():
+            forward = sample.longitudes[i + 1] > sample.longitudes[i]
+            level = np.floor(sample.longitudes[i + 1 if forward else i] / 30.0) * 30.0
+            boundary = level % 360.0
+
+            def offset(jd, boundary=boundary):
+                longitude, speed = _position(jd, body)
+                return float(_wrap(longitude - boundary)), speed
+
+            jd = _solve(offset, sample.times[i], sample.times[i + 1],
+                        _interpolate(sample.times, sample.longitudes, i, level), forward)
+            sign = int(boundary // 30.0) if forward else (int(boundary // 30.0) - 1) % 12
+            times.append((jd, sign))
+            rows.append((jd, np.nan, KINDS.index("ingress"), body_index[body], sign,
+                         0 if forward else DETAILS.index("retrograde"), NO_BODY))
+        ingresses[body] = times
+
+    # Stations, where the speed changes sign
+    for body in STATION_BODIES:
+        sample = samples[body]
+        for i in np.flatnonzero(np.sign(sample.speeds[1:]) != np.sign(sample.speeds[:-1])).tolist():
+            def speed(jd, body=body):
+                value = _position(jd, body)[1]
+                return value, (_position(jd + STATION_STEP_DAYS, body)[1] - value) / STATION_STEP_DAYS
+
+            t = _solve(speed, sample.times[i], sample.times[i + 1],
+                       _interpolate(sample.times, sample.speeds, i, 0.0), sample.speeds[i] < 0)
+            kind = "station_retrograde" if sample.speeds[i] > 0 else "station_direct"
+            rows.append((t, np.nan, KINDS.index(kind), body_index[body], sign_at(t, body), 0, NO_BODY))
+
+    # New and full moons: the Moon-Sun elongation crosses 0 or 180 degrees
+    moon, sun = samples["Moon"], samples["Sun"]
+    elongation = moon.longitudes - sun.at(moon.times)
+    for i in np.flatnonzero(np.floor_divide(elongation[1:], 180.0) != np.floor_divide(elongation[:-1], 180.0)).tolist():
+        level = np.floor(elongation[i + 1] / 180.0) * 180.0
+        target = level % 360.0
+
+        def phase(jd, target=target):
+            moon_lon, moon_speed = _position(jd, "Moon")
+            sun_lon, sun_speed = _position(jd, "Sun")
+            return float(_wrap(moon_lon - sun_lon - target)), moon_speed - sun_speed
+
+        jd = _solve(phase, moon.times[i], moon.times[i + 1], _interpolate(moon.times, elongation, i, level))
+        kind = "new_moon" if target == 0 else "full_moon"
+        rows.append((jd, np.nan, KINDS.index(kind), body_index["Moon"], sign_at(jd, "Moon"), 0, NO_BODY))
+
+    rows.extend(_eclipses(lo, hi, sign_at))
+    rows.extend(_void_of_course(samples, ingresses["Moon"], body_index))
+
+    events = np.array(rows, dtype=EVENT)
+    events = events[(events["jd"] >= start_jd) & (events["jd"] < end_jd)]
+    return events[np.lexsort((events["body"], events["kind"], events["jd"]))]
+
+
+def _eclipses(start_jd: float, end_jd: float, sign_at: Callable[[float, str], int]) -> Iterable[tuple]:
+    """Solar and lunar eclipses at their maximum, from the Swiss Ephemeris eclipse search."""
+    solar_types = ((swe.ECL_ANNULAR_TOTAL, "hybrid"), (swe.ECL_TOTAL, "total"),
+                   (swe.ECL_ANNULAR, "annular"), (swe.ECL_PARTIAL, "partial"))
+    lunar_types = ((swe.ECL_TOTAL, "total"), (swe.ECL_PARTIAL, "partial"), (swe.ECL_PENUMBRAL, "penumbral"))
+    searches = (
+        ("solar_eclipse", "Sun", lambda jd: swe.sol_eclipse_when_glob(jd, swe.FLG_SWIEPH, 0), solar_types),
+        ("lunar_eclipse", "Moon", lambda jd: swe.lun_eclipse_when(jd, swe.FLG_SWIEPH, 0), lunar_types),
+    )
+    for kind, body, search, types in searches:
+        jd = start_jd
+        while True:
+            flags, times = search(jd)
+            maximum = times[0]
+            if maximum >= end_jd or maximum <= jd:
+                break
+            detail = next((name for flag, name in types if flags & flag), None)
+            yield (maximum, np.nan, KINDS.index(kind), BODIES.index(body), sign_at(maximum, body),
+                   DETAILS.index(detail), NO_BODY)
+            jd = maximum + 1.0
+
+
+def _void_of_course(samples, ingresses: Sequence[Tuple[float, int]], body_index) -> Iterable[tuple]:
+    """Void-of-course Moon periods: from the Moon's last major aspect in a sign to its next ingress.
+
+    Aspects to the Sun and the planets are located on the sampling grid
+    first; only the last one before each ingress is refined. A sign without
+    any aspect is void from the ingress into it.
+    """
+    moon = samples["Moon"]
+    candidates = []  # (approximate time, body, aspect angle)
+    for body in BODIES:
+        if body == "Moon":
+            continue
+        separation = moon.longitudes - samples[body].at(moon.times)
+        for i in _crossings(separation).tolist():
+            level = np.floor(separation[i + 1] / 30.0) * 30.0
+            angle = level % 360.0
+            aspect = min(angle, 360.0 - angle)
+            if aspect not in MAJOR_ASPECTS:
+                continue
+            candidates.append((_interpolate(moon.times, separation, i, level), body, angle, i))
+    candidates.sort()
+    times = [c[0] for c in candidates]
+
+    for (previous, moon_sign), (ingress, _) in zip(ingresses, ingresses[1:]):
+        first = int(np.searchsorted(times, previous, side="right"))
+        last = int(np.searchsorted(times, ingress)) - 1
+        # Linear estimates may misorder nearly simultaneous aspects; refine the close ones
+        exact = []
+        for approx, body, angle, i in reversed(candidates[first:last + 1]):
+            if exact and approx < max(exact)[0] - 0.25:
+                break
+
+            def separation_at(jd, body=body, angle=angle):
+                moon_lon, moon_speed = _position(jd, "Moon")
+                other_lon, other_speed = _position(jd, body)
+                return float(_wrap(moon_lon - other_lon - angle)), moon_speed - other_speed
+
+            jd = _solve(separation_at, moon.times[i], moon.times[i + 1], approx)
+            if previous < jd < ingress:
+                exact.append((jd, body, angle))
+        if exact:
+            start, body, angle = max(exact)
+            aspect = MAJOR_ASPECTS[min(angle, 360.0 - angle)]
+            yield (start, ingress, KINDS.index("void_of_course"), body_index["Moon"], moon_sign,
+                   DETAILS.index(aspect), body_index[body])
+        else:
+            yield (previous, ingress, KINDS.index("void_of_course"), body_index["Moon"], moon_sign, 0, NO_BODY)
+
+
+def write_index(events: np.ndarray, start_year: int, end_year: int, index_path: str) -> None:
+    """Write events into the binary index.
+
+    Args:
+        events: ``EVENT`` records sorted by time.
+        start_year: First year covered.
+        end_year: First year not covered.
+        index_path: Destination of the index; written atomically.
+    """
+    events = np.ascontiguousarray(events, dtype=EVENT)
+    times = np.ascontiguousarray(events["jd"])
+    order = np.lexsort((events["jd"], events["body"], events["kind"]))
+    grouped = events[order]
+    boundaries = np.flatnonzero(
+        (grouped["kind"][1:] != grouped["kind"][:-1]) | (grouped["body"][1:] != grouped["body"][:-1])
+    ) + 1
+    starts = np.concatenate(([0], boundaries)) if len(events) else np.zeros(0, dtype=np.int64)
+    keys = np.zeros(len(starts), dtype=KEY)
+    keys["kind"] = grouped["kind"][starts]
+    keys["body"] = grouped["body"][starts]
+    keys["start"] = starts
+    keys["count"] = np.diff(np.concatenate((starts, [len(events)])))
+    key_times = np.ascontiguousarray(grouped["jd"])
+    key_events = order.astype("<u4")
+
+    times_offset = HEADER.size
+    events_offset = times_offset + times.nbytes
+    keys_offset = events_offset + events.nbytes
+    by_key_offset = keys_offset + keys.nbytes
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, start_year, end_year, len(events), len(keys),
+        times_offset, events_offset, keys_offset, by_key_offset,
+    )
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as out:
+        out.write(header)
+        out.write(times.astype("<f8").tobytes())
+        out.write(events.tobytes())
+        out.write(keys.tobytes())
+        out.write(key_times.astype("<f8").tobytes())
+        out.write(key_events.tobytes())
+    os.replace(tmp_path, index_path)
+
+
+@contextmanager
+def _build_lock(index_path: str) -> Iterator[None]:
+    """Hold the index's build lock, across threads and processes."""
+    with open(index_path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def build_events(start_year: int, end_year: int) -> np.ndarray:
+    """Compute the events of a range of years, a few years at a time.
+
+    Args:
+        start_year: First year.
+        end_year: First year not included.
+
+    Returns:
+        np.ndarray: ``EVENT`` records sorted by time.
+    """
+    chunks = []
+    for year in range(start_year, end_year, CHUNK_YEARS):
+        chunks.append(compute_events(year_start(year), year_start(min(year + CHUNK_YEARS, end_year))))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=EVENT)
+
+
+def default_index_path() -> str:
+    """Index location in the system temp directory, shared by all workers."""
+    return os.path.join(tempfile.gettempdir(), f"lilith-events-v{FORMAT_VERSION}.idx")
+
+
+class EventCalendar:
+    """Read-only event queries over a memory-mapped index."""
+
+    def __init__(self, index_path: str):
+        """Map an existing index file.
+
+        Args:
+            index_path: Path produced by ``write_index``.
+        """
+        self.path = index_path
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.start_year, self.end_year, n_events, n_keys,
+         times_offset, events_offset, keys_offset, by_key_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{index_path} is not an event index of version {FORMAT_VERSION}")
+        self._times = np.frombuffer(self._mm, dtype="<f8", count=n_events, offset=times_offset)
+        self._events = np.frombuffer(self._mm, dtype=EVENT, count=n_events, offset=events_offset)
+        self._key_times = np.frombuffer(self._mm, dtype="<f8", count=n_events, offset=by_key_offset)
+        self._key_events = np.frombuffer(self._mm, dtype="<u4", count=n_events, offset=by_key_offset + 8 * n_events)
+        keys = np.frombuffer(self._mm, dtype=KEY, count=n_keys, offset=keys_offset)
+        self._keys = {
+            (int(kind), int(body)): (int(start), int(start) + int(count))
+            for kind, body, start, count in keys.tolist()
+        }
+        self.start_jd = year_start(self.start_year)
+        self.end_jd = year_start(self.end_year)
+
+    @classmethod
+    def open(cls, start_year: int, end_year: int, index_path: Optional[str] = None,
+             eph_path: str = "") -> "EventCalendar":
+        """Open the index, building it or extending it to cover the years.
+
+        Only the missing years are computed; events already in the index
+        are kept as they are.
+
+        Args:
+            start_year: First year that must be covered.
+            end_year: First year that need not be covered.
+            index_path: Index location; defaults to ``default_index_path``.
+            eph_path: Path to the ephemeris files used for missing years.
+
+        Returns:
+            EventCalendar: The mapped calendar.
+        """
+        index_path = index_path or default_index_path()
+        if eph_path:
+            swe.set_ephe_path(eph_path)
+        with _build_lock(index_path):
+            # Another process may have built or extended the index while this one waited
+            calendar = cls(index_path) if os.path.exists(index_path) else None
+            if calendar is not None and calendar.start_year <= start_year and calendar.end_year >= end_year:
+                return calendar
+            if calendar is None:
+                logger.info("Building the event calendar for %d-%d", start_year, end_year)
+                events = build_events(start_year, end_year)
+            else:
+                start_year, end_year = min(start_year, calendar.start_year), max(end_year, calendar.end_year)
+                logger.info("Extending the event calendar from %d-%d to %d-%d",
+                            calendar.start_year, calendar.end_year, start_year, end_year)
+                events = np.concatenate((
+                    build_events(start_year, calendar.start_year),
+                    np.array(calendar._events),
+                    build_events(calendar.end_year, end_year),
+                ))
+            write_index(events, start_year, end_year, index_path)
+            return cls(index_path)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def between(self, start_jd: float, end_jd: float, kinds: Optional[Sequence[str]] = None,
+                bodies: Optional[Sequence[str]] = None, limit: Optional[int] = None) -> List[SkyEvent]:
+        """Events starting in ``[start_jd, end_jd)``, in time order.
+
+        Args:
+            start_jd: Start of the range (Julian day, UT).
+            end_jd: End of the range, exclusive.
+            kinds: Only events of these kinds; all when None.
+            bodies: Only events of these bodies; all when None.
+            limit: Maximum number of events returned.
+
+        Returns:
+            List[SkyEvent]: The events.
+
+        Raises:
+            EventRangeError: If the range is not covered by the index.
+        """
+        self._check_range(start_jd, end_jd)
+        lo, hi = np.searchsorted(self._times, [start_jd, end_jd])
+        events = self._events[lo:hi]
+        if kinds is not None:
+            events = events[np.isin(events["kind"], [self._kind(kind) for kind in kinds])]
+        if bodies is not None:
+            events = events[np.isin(events["body"], [self._body(body) for body in bodies])]
+        return [self._event(record) for record in events[:limit].tolist()]
+
+    def next(self, kind: str, body: str, after_jd: float) -> Optional[SkyEvent]:
+        """The first event of a kind and body strictly after a moment.
+
+        Args:
+            kind: Event kind, e.g. "station_retrograde".
+            body: Body name, e.g. "Mercury".
+            after_jd: Julian day (UT).
+
+        Returns:
+            The event, or None if the index has none up to its end.
+
+        Raises:
+            EventRangeError: If ``after_jd`` is not covered by the index.
+        """
+        self._check_range(after_jd, after_jd)
+        start, end = self._keys.get((self._kind(kind), self._body(body)), (0, 0))
+        position = start + int(np.searchsorted(self._key_times[start:end], after_jd, side="right"))
+        if position >= end:
+            return None
+        return self._event(self._events[self._key_events[position]].tolist())
+
+    def _check_range(self, start_jd: float, end_jd: float) -> None:
+        if start_jd < self.start_jd or end_jd > self.end_jd:
+            raise EventRangeError(
+                details=f"The index covers {self.start_year}-01-01 to {self.end_year}-01-01 (UTC)."
+            )
+
+    @staticmethod
+    def _kind(kind: str) -> int:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown event kind {kind!r}; expected one of {KINDS}")
+        return KINDS.index(kind)
+
+    @staticmethod
+    def _body(body: str) -> int:
+        if body not in BODIES:
+            raise ValueError(f"Unknown event body {body!r}; expected one of {BODIES}")
+        return BODIES.index(body)
+
+    @staticmethod
+    def _event(record: tuple) -> SkyEvent:
+        jd, end_jd, kind, body, sign, detail, other = record
+        has_end = end_jd == end_jd  # not NaN
+        return SkyEvent(
+            kind=KINDS[kind],
+            body=BODIES[body],
+            sign=SIGNS[sign],
+            julian_day=jd,
+            time=from_julian_day(jd).isoformat(),
+            end_julian_day=end_jd if has_end else None,
+            end_time=from_julian_day(end_jd).isoformat() if has_end else None,
+            detail=DETAILS[detail],
+            other_body=BODIES[other] if other != NO_BODY else None,
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or extend the sky event calendar index.")
+    parser.add_argument("--start", type=int, default=1900, help="first year covered")
+    parser.add_argument("--end", type=int, default=2100, help="first year not covered")
+    parser.add_argument("--path", default=None, help="index file; defaults to the system temp directory")
+    parser.add_argument("--eph-path", default="", help="Swiss Ephemeris files")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    calendar = EventCalendar.open(args.start, args.end, args.path, args.eph_path)
+    print(f"{calendar.path}: {len(calendar)} events, {calendar.start_year}-{calendar.end_year}")
@@ -0,0 +1,190 @@
+"""Birth-time rectification scan over a window of candidate times.
+
+Computing a full chart for every minute of the day repeats work that barely
+changes: planets move slowly, and only the houses turn with the Earth. The scan
+therefore evaluates each body once at both ends of the window (position and
+daily speed), interpolates ecliptic longitude and latitude in between with
+cubic Hermite splines, advances the ARMC linearly with sidereal time and only
+recomputes the houses per step. Houses are assigned with ``swe.house_pos`` and
+the engine's flags, exactly as ``SwissEphemerisEngine.calculate_chart`` does.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import swisseph as swe
+
+from src.core.domain.exceptions import InvalidDateError
+from src.core.domain.models import BirthData, RectificationInterval, RectificationScan
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+Spline = Tuple[float, float, float, float]
+
+
+class RectificationScanner:
+    """Sweeps the houses across a time window at fixed resolution."""
+
+    SIDEREAL_DEGREES_PER_DAY = 360.98564736629
+    MINUTES_PER_DAY = 1440.0
+
+    def __init__(self, engine: SwissEphemerisEngine):
+        """Initialize the scanner.
+
+        Args:
+            engine: Engine providing the body set and house system.
+        """
+        self.engine = engine
+
+    def scan(
+        self,
+        birth_data: BirthData,
+        start_time: str = "00:00",
+        end_time: str = "23:59",
+        step_minutes: int = 1,
+    ) -> RectificationScan:
+        """Scan candidate birth times and group them into stable intervals.
+
+        The birth time in ``birth_data`` is ignored; the window is local time
+        on ``birth_data.date`` in the birth zone, as for ``calculate_chart``.
+        Interval labels are local too, so they repeat or skip across a
+        daylight saving change.
+
+        Args:
+            birth_data: Birth date and location.
+            start_time: Window start (HH:MM).
+            end_time: Window end (HH:MM), inclusive.
+            step_minutes: Scan resolution in minutes.
+
+        Returns:
+            RectificationScan: Intervals where the rising sign and every
+            planet's house stay the same.
+
+        Raises:
+            InvalidDateError: If the window cannot be parsed or is empty.
+            InvalidTimezoneError: If the timezone is not a known IANA zone.
+        """
+        start, end = self._parse_window(birth_data.date, start_time, end_time)
+        if step_minutes < 1:
+            raise InvalidDateError(details="step_minutes must be at least 1.")
+
+        zone = self.engine.birth_zone(birth_data)
+        utc_start = start.replace(tzinfo=zone).astimezone(timezone.utc)
+        jd_start = self._julian_day(utc_start)
+        jd_end = self._julian_day(end.replace(tzinfo=zone).astimezone(timezone.utc))
+        span_days = jd_end - jd_start
+
+        bodies = self._body_splines(jd_start, jd_end)
+        eps = swe.calc_ut(jd_start, swe.ECL_NUT)[0][0]  # true obliquity; constant within a day
+        armc_start = swe.houses(jd_start, birth_data.lat, birth_data.lon, self.engine.HOUSE_SYSTEM)[1][2]
+        house_system = self.engine.HOUSE_SYSTEM
+
+        intervals: List[RectificationInterval] = []
+        total_minutes = int(round(span_days * self.MINUTES_PER_DAY))
+        current_key = None
+        for minute in range(0, total_minutes + 1, step_minutes):
+            days = minute / self.MINUTES_PER_DAY
+            armc = (armc_start + self.SIDEREAL_DEGREES_PER_DAY * days) % 360.0
+            ascendant = swe.houses_armc(armc, birth_data.lat, eps, house_system)[1][0]
+
+            fraction = days / span_days if span_days else 0.0
+            placements = {
+                name: int(swe.house_pos(
+                    armc, birth_data.lat, eps,
+                    (self._hermite(lon, fraction, span_days) % 360.0, self._hermite(lat, fraction, span_days)),
+                    house_system,
+                ))
+                for name, lon, lat in bodies
+            }
+            asc_sign = self.engine._get_sign(ascendant)
+            key = (asc_sign, tuple(placements.values()))
+            label = (utc_start + timedelta(minutes=minute)).astimezone(zone).strftime("%H:%M")
+
+            if key != current_key:
+                intervals.append(RectificationInterval(
+                    start_time=label,
+                    end_time=label,
+                    ascendant_sign=asc_sign,
+                    ascendant_start=ascendant,
+                    ascendant_end=ascendant,
+                    placements=placements,
+                ))
+                current_key = key
+            else:
+                intervals[-1].end_time = label
+                intervals[-1].ascendant_end = ascendant
+
+        return RectificationScan(date=birth_data.date, step_minutes=step_minutes, intervals=intervals)
+
+    def _body_splines(self, jd_start: float, jd_end: float) -> List[Tuple[str, Spline, Spline]]:
+        """Evaluate every body at both window ends with the engine's flags.
+
+        Args:
+            jd_start: Julian Day of the window start.
+            jd_end: Julian Day of the window end.
+
+        Returns:
+            List of (name, longitude spline, latitude spline), each spline
+            (value_start, speed_start, value_end, speed_end); the end
+            longitude is unwrapped to follow the start longitude.
+        """
+        flags = self.engine.CALC_FLAGS
+        splines = []
+        for name, planet_id in self.engine.PLANETS:
+            start = swe.calc_ut(jd_start, planet_id, flags)[0]
+            end = swe.calc_ut(jd_end, planet_id, flags)[0]
+            delta = (end[0] - start[0] + 180.0) % 360.0 - 180.0
+            splines.append((
+                name,
+                (start[0], start[3], start[0] + delta, end[3]),
+                (start[1], start[4], end[1], end[4]),
+            ))
+        return splines
+
+    @staticmethod
+    def _hermite(spline: Spline, t: float, span_days: float) -> float:
+        """Interpolate a coordinate with a cubic Hermite spline.
+
+        Args:
+            spline: (value_start, speed_start, value_end, speed_end), speeds in deg/day.
+            t: Position within the window, 0..1.
+            span_days: Window length in days (scales the tangents).
+
+        Returns:
+            float: Interpolated value in degrees, not normalized.
+        """
+        p0, v0, p1, v1 = spline
+        t2 = t * t
+        t3 = t2 * t
+        return (
+            (2 * t3 - 3 * t2 + 1) * p0
+            + (t3 - 2 * t2 + t) * v0 * span_days
+            + (-2 * t3 + 3 * t2) * p1
+            + (t3 - t2) * v1 * span_days
+        )
+
+    @staticmethod
+    def _parse_window(date: str, start_time: str, end_time: str) -> Tuple[datetime, datetime]:
+        """Parse and validate the scan window.
+
+        Args:
+            date: Date (YYYY-MM-DD).
+            start_time: Window start (HH:MM).
+            end_time: Window end (HH:MM).
+
+        Returns:
+            Tuple of start and end datetimes.
+        """
+        try:
+            start = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
+            end = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M")
+        except ValueError as exc:
+            raise InvalidDateError(details=str(exc)) from exc
+        if end < start:
+            raise InvalidDateError(details="end_time must not be earlier than start_time.")
+        return start, end
+
+    @staticmethod
+    def _julian_day(dt: datetime) -> float:
+        """Julian Day (UT) for a UTC datetime."""
+        return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0)
+
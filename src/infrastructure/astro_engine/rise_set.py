@@ -0,0 +1,317 @@
+"""Sunrise, sunset, moonrise and planetary hours per location and local day.
+
+Daily features need the rise and set times of the user's own location, and
+each day costs five ``swe.rise_trans`` searches (sunrise, sunset, the next
+sunrise, moonrise and moonset). Users cluster in a few cities, so the
+service caches by a location cell (coordinates quantized to
+``cell_degrees``, computed at the cell centre) and UTC day: each entry holds
+the cell's rise and set times during one UTC day. A local day, in whatever
+timezone the caller asks, is assembled from the UTC days it overlaps, so
+callers in different zones share entries, and so do profiles whose zone is
+unknown. A cell of 0.05 degrees moves rise and set times by at most about
+12 seconds.
+
+UTC days are kept in a bounded LRU. A background thread precomputes the UTC
+days behind today and tomorrow, in any timezone, for the most common cells
+among the stored profiles once a night, so the morning's requests are
+dictionary reads.
+
+Planetary hours divide daylight (sunrise to sunset) and night (sunset to the
+next sunrise) into twelve equal hours each. The first hour of the day is
+ruled by the weekday's planet, and the rest follow the Chaldean order. They
+are computed with NumPy, and nights whose sunrise is more than
+``NIGHT_LOOKAHEAD`` days away (polar regions) have none.
+"""
+
+import logging
+import math
+import threading
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import swisseph as swe
+
+from src.core.domain.exceptions import InvalidCoordinatesError, InvalidTimezoneError
+from src.core.domain.models import LocationDay, PlanetaryHour
+from src.infrastructure.astro_engine.event_calendar import from_julian_day, julian_day
+from src.infrastructure.persistence.bounded_repo import BoundedStore
+
+logger = logging.getLogger(__name__)
+
+CHALDEAN_ORDER = ("Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon")
+# Ruler of the first hour of each weekday, Monday first as in date.weekday()
+DAY_RULERS = ("Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun")
+_FIRST_HOUR = np.array([CHALDEAN_ORDER.index(ruler) for ruler in DAY_RULERS])
+
+Location = Tuple[float, float, str]  # latitude, longitude, timezone
+Cell = Tuple[int, int]  # latitude and longitude in units of the cell size
+DayTimes = Tuple[float, float, float, float, float]  # sunrise, sunset, next sunrise, moonrise, moonset (NaN: none)
+UtcDay = Tuple[Tuple[float, ...], ...]  # times of each event, in the order below, during one UTC day
+
+SUNRISE, SUNSET, MOONRISE, MOONSET = range(4)
+NIGHT_LOOKAHEAD = 2.0  # days after sunset searched for the next sunrise
+EVENT_GAP = 0.001  # days (86 s) past an event before searching for the next one
+
+
+def planetary_hours(sunrise: np.ndarray, sunset: np.ndarray, next_sunrise: np.ndarray,
+                    weekday: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Planetary hours of many days at once.
+
+    Args:
+        sunrise: Julian Day of each day's sunrise.
+        sunset: Julian Day of the following sunset.
+        next_sunrise: Julian Day of the sunrise after that.
+        weekday: Weekday of each local date, Monday = 0.
+
+    Returns:
+        Tuple of (bounds, rulers): hour boundaries of shape ``(days, 25)``,
+        the twelve day hours then the twelve night hours, and each hour's
+        ruler as an index into ``CHALDEAN_ORDER``, of shape ``(days, 24)``.
+    """
+    sunrise, sunset, next_sunrise = (np.asarray(a, dtype=float)[:, None] for a in (sunrise, sunset, next_sunrise))
+    fractions = np.arange(12) / 12.0
+    bounds = np.concatenate((
+        sunrise + (sunset - sunrise) * fractions,
+        sunset + (next_sunrise - sunset) * fractions,
+        next_sunrise,
+    ), axis=1)
+    rulers = (_FIRST_HOUR[np.asarray(weekday)][:, None] + np.arange(24)) % len(CHALDEAN_ORDER)
+    return bounds, rulers
+
+
+class RiseSetService:
+    """Rise and set times and planetary hours, cached per location cell and UTC day."""
+
+    def __init__(self, max_entries: int = 100_000, cell_degrees: float = 0.05,
+                 locations: Optional[Callable[[], Iterable[Location]]] = None, top_n: int = 1000,
+                 precompute_hour: int = 2):
+        """Initialize the service.
+
+        Args:
+            max_entries: Cell UTC days kept; the least recently used are evicted.
+            cell_degrees: Size of a location cell, in degrees of latitude and longitude.
+            locations: Returns the locations of the users, e.g. the stored
+                profiles' birthplaces; the nightly batch serves their most
+                common cells.
+            top_n: Number of cells precomputed each night.
+            precompute_hour: UTC hour of the nightly batch.
+        """
+        self.cell_degrees = cell_degrees
+        self.locations = locations
+        self.top_n = top_n
+        self.precompute_hour = precompute_hour
+        # Bounded by count only, so entries skip size estimation
+        self._days = BoundedStore(max_entries=max_entries, sizer=lambda item: 0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.computed = 0  # cell UTC days computed, for cache effectiveness metrics
+
+    def cell(self, latitude: float, longitude: float) -> Cell:
+        """Location cell of a pair of coordinates."""
+        if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+            raise InvalidCoordinatesError(details=f"lat={latitude}, lon={longitude}")
+        return round(latitude / self.cell_degrees), round(longitude / self.cell_degrees)
+
+    def day(self, latitude: float, longitude: float, tz: str = "UTC",
+            local_date: Optional[date] = None) -> LocationDay:
+        """Return the rise and set times and planetary hours of a local day.
+
+        Args:
+            latitude: Latitude of the location.
+            longitude: Longitude of the location.
+            tz: IANA timezone whose calendar day is used.
+            local_date: The day; defaults to today in ``tz``.
+
+        Returns:
+            LocationDay: Times of the location's cell.
+
+        Raises:
+            InvalidCoordinatesError: If the coordinates are out of range.
+            InvalidTimezoneError: If the timezone is unknown.
+        """
+        cell = self.cell(latitude, longitude)
+        zone = _zone(tz)
+        local_date = local_date or datetime.now(zone).date()
+        return self._build([(cell, tz, local_date, self._times(cell, zone, local_date))])[0]
+
+    def precompute(self, locations: Iterable[Location], days: int = 2, now: Optional[datetime] = None) -> int:
+        """Compute and cache the UTC days behind upcoming local days of many locations.
+
+        The UTC days cover the local days in every timezone, since callers
+        may ask in a zone other than the one stored with the location.
+
+        Args:
+            locations: Locations to serve; each cell is computed once.
+            days: Local days per location, starting today.
+            now: Reference time; defaults to now.
+
+        Returns:
+            int: Number of cell UTC days computed (those not cached yet).
+        """
+        now = now or datetime.now(timezone.utc)
+        # Local days from today on span UTC-12 to UTC+14, plus the night after the last one
+        first = julian_day(datetime.combine(now.astimezone(timezone.utc).date(), time(), timezone.utc)) - 1.0
+        computed = self.computed
+        for latitude, longitude, _ in locations:
+            try:
+                cell = self.cell(latitude, longitude)
+            except InvalidCoordinatesError:
+                continue  # profiles with unusable locations have nothing to precompute
+            for offset in range(days + 3):
+                self._utc_day(cell, first + offset)
+        return self.computed - computed
+
+    def top_locations(self, locations: Iterable[Location], n: int) -> List[Location]:
+        """The ``n`` most common cells among locations.
+
+        Args:
+            locations: User locations, one per user.
+            n: Number of locations returned.
+
+        Returns:
+            List of locations (the first seen in each cell), most common first.
+        """
+        counts: Counter = Counter()
+        first: Dict[Cell, Location] = {}
+        for latitude, longitude, tz in locations:
+            try:
+                key = self.cell(latitude, longitude)
+            except InvalidCoordinatesError:
+                continue
+            counts[key] += 1
+            first.setdefault(key, (latitude, longitude, tz))
+        return [first[key] for key, _ in counts.most_common(n)]
+
+    def run_batch(self, now: Optional[datetime] = None) -> int:
+        """Precompute today and tomorrow for the ``top_n`` most common user cells."""
+        if self.locations is None:
+            return 0
+        return self.precompute(self.top_locations(self.locations(), self.top_n), days=2, now=now)
+
+    def start(self) -> None:
+        """Run the batch now and then nightly in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rise-set-precompute", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the nightly batch."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def seconds_until_batch(self, now: Optional[datetime] = None) -> float:
+        """Seconds until the next ``precompute_hour`` (UTC)."""
+        now = now or datetime.now(timezone.utc)
+        run = now.replace(hour=self.precompute_hour, minute=0, second=0, microsecond=0)
+        if run <= now:
+            run += timedelta(days=1)
+        return (run - now).total_seconds()
+
+    def stats(self) -> Dict[str, int]:
+        """Cached cell UTC days, cache counters and UTC days computed."""
+        return {"entries": len(self._days), "computed": self.computed, **self._days.counters}
+
+    def _run(self) -> None:
+        wait = 0.0
+        while not self._stop.wait(wait):
+            try:
+                computed = self.run_batch()
+                logger.info("Precomputed %d location days", computed)
+            except Exception:
+                logger.exception("Rise and set precompute failed")
+            wait = self.seconds_until_batch()
+
+    def _times(self, cell: Cell, zone: ZoneInfo, local_date: date) -> DayTimes:
+        """Rise and set times of one cell and local day, from the cached UTC days."""
+        start = julian_day(datetime.combine(local_date, time(), zone))
+        end = julian_day(datetime.combine(local_date + timedelta(days=1), time(), zone))
+        sunrise = self._first(cell, SUNRISE, start, end)
+        sunset = self._first(cell, SUNSET, start if math.isnan(sunrise) else sunrise, end)
+        # The next sunrise only bounds the night, so it may fall after the local day
+        next_sunrise = float("nan") if math.isnan(sunset) else self._first(
+            cell, SUNRISE, sunset, sunset + NIGHT_LOOKAHEAD
+        )
+        moonrise = self._first(cell, MOONRISE, start, end)
+        moonset = self._first(cell, MOONSET, start, end)
+        return sunrise, sunset, next_sunrise, moonrise, moonset
+
+    def _first(self, cell: Cell, event: int, after: float, before: float) -> float:
+        """Time of the first event in ``[after, before)``, NaN if there is none."""
+        day_start = math.floor(after - 0.5) + 0.5  # 00:00 UT on or before ``after``
+        while day_start < before:
+            for jd in self._utc_day(cell, day_start)[event]:
+                if after <= jd < before:
+                    return jd
+            day_start += 1.0
+        return float("nan")
+
+    def _utc_day(self, cell: Cell, day_start: float) -> UtcDay:
+        """Rise and set times of one cell during the UTC day starting at ``day_start``."""
+        key = (cell, day_start)
+        found = self._days.get(key)
+        if found is not None:
+            return found
+        geopos = (cell[1] * self.cell_degrees, cell[0] * self.cell_degrees, 0.0)
+        events = []
+        for body, event in ((swe.SUN, swe.CALC_RISE), (swe.SUN, swe.CALC_SET),
+                            (swe.MOON, swe.CALC_RISE), (swe.MOON, swe.CALC_SET)):
+            times, after = [], day_start
+            while True:
+                status, result = swe.rise_trans(after, body, event, geopos)
+                if status != 0 or result[0] >= day_start + 1.0:  # -2: circumpolar
+                    break
+                times.append(result[0])
+                after = result[0] + EVENT_GAP
+            events.append(tuple(times))
+        found = tuple(events)
+        self.computed += 1
+        self._days[key] = found
+        return found
+
+    def _build(self, rows: Sequence[Tuple[Cell, str, date, DayTimes]]) -> List[LocationDay]:
+        """Location day models of computed rows, with the planetary hours of all rows at once."""
+        if not rows:
+            return []
+        times = np.array([row[3] for row in rows], dtype=float).reshape(len(rows), 5)
+        weekdays = np.array([row[2].weekday() for row in rows])
+        bounds, rulers = planetary_hours(times[:, 0], times[:, 1], times[:, 2], weekdays)
+        has_hours = ~np.isnan(bounds).any(axis=1)  # days with both a sunrise and a sunset
+
+        def iso(jd: float) -> Optional[str]:
+            return None if jd != jd else from_julian_day(jd).isoformat()
+
+        days = []
+        for row, ((lat_cell, lon_cell), tz, local_date, _) in enumerate(rows):
+            hours = []
+            if has_hours[row]:
+                edges = [from_julian_day(jd).isoformat() for jd in bounds[row].tolist()]
+                hours = [
+                    PlanetaryHour(ruler=CHALDEAN_ORDER[ruler], start=edges[i], end=edges[i + 1], daytime=i < 12)
+                    for i, ruler in enumerate(rulers[row].tolist())
+                ]
+            sunrise, sunset, _, moonrise, moonset = times[row].tolist()
+            days.append(LocationDay(
+                date=local_date.isoformat(),
+                timezone=tz,
+                latitude=round(lat_cell * self.cell_degrees, 6),
+                longitude=round(lon_cell * self.cell_degrees, 6),
+                sunrise=iso(sunrise),
+                sunset=iso(sunset),
+                moonrise=iso(moonrise),
+                moonset=iso(moonset),
+                day_ruler=DAY_RULERS[local_date.weekday()],
+                planetary_hours=hours,
+            ))
+        return days
+
+
+def _zone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise InvalidTimezoneError(details=f"timezone={tz!r}") from exc
@@ -0,0 +1,197 @@
+"""Live "sky right now" feed, computed once per tick for every subscriber.
+
+A live sky wheel polling ``/chart/calculate`` makes the engine repeat the
+same work for every client. Instead, one background task computes the
+positions once per tick and encodes them once. It then publishes the
+encoded frame to all subscribers of the process, whether they use the
+WebSocket or the server-sent events endpoint.
+
+Subscribers hold no queue. Each tick sets one shared event that every
+waiting subscriber awaits, then each reads the single latest frame, so an
+idle subscriber costs one suspended task. A subscriber still sending an
+older frame when new ones arrive skips to the latest when it is done: slow
+clients drop stale frames and never hold back the others. Nothing is
+computed while nobody is subscribed.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import numpy as np
+
+from src.core.domain.exceptions import SkyFeedFullError
+from src.core.domain.models import LiveSkyFrame
+from src.infrastructure.astro_engine.event_calendar import julian_day
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SkyFrame:
+    """One published tick, encoded once for all subscribers."""
+
+    seq: int
+    text: str  # JSON ``LiveSkyFrame``, sent as is over WebSockets
+    event: bytes  # the same as a server-sent event
+    published: float  # time.monotonic() of the publication
+
+
+class SkyFeed:
+    """Computes the current sky once per tick and fans it out to all subscribers."""
+
+    def __init__(self, engine: SwissEphemerisEngine, interval: float = 1.0, max_subscribers: int = 50_000,
+                 latency_window: int = 600):
+        """Initialize the feed.
+
+        Args:
+            engine: Engine computing the positions.
+            interval: Seconds between ticks.
+            max_subscribers: Subscribers served at once; more are refused.
+            latency_window: Number of recent ticks the broadcast latency
+                percentiles are taken over.
+        """
+        self.engine = engine
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self.latest: Optional[SkyFrame] = None
+        self._tick: Optional[asyncio.Event] = None  # set when the next frame is published
+        self._active: Optional[asyncio.Event] = None  # set while anyone is subscribed
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._broadcasts: Deque[float] = deque(maxlen=latency_window)  # per tick: until the last delivery
+        self._slowest = 0.0  # latest delivery of the current frame so far
+        self.subscribers = 0
+        self.counters: Dict[str, int] = {
+            "peak_subscribers": 0, "rejected": 0, "published": 0, "delivered": 0, "dropped": 0,
+        }
+        self.compute_ms = 0.0  # compute and encode time of the last tick
+
+    async def frames(self) -> AsyncIterator[SkyFrame]:
+        """Subscribe: yield the latest frame, then each newer one as it is published.
+
+        Frames published while the caller is still busy with the previous
+        one are skipped in favour of the newest.
+
+        Raises:
+            SkyFeedFullError: If ``max_subscribers`` are already subscribed.
+        """
+        if self.subscribers >= self.max_subscribers:
+            self.counters["rejected"] += 1
+            raise SkyFeedFullError(details=f"{self.subscribers} subscribers")
+        self._ensure_running()
+        self.subscribers += 1
+        self.counters["peak_subscribers"] = max(self.counters["peak_subscribers"], self.subscribers)
+        self._active.set()
+        seen = 0
+        try:
+            while not self._closed:
+                frame = self.latest
+                if frame is None or frame.seq == seen:
+                    # One wake-up per tick; leaving subscribers cancel only their own wait
+                    await self._tick.wait()
+                    continue
+                if seen and frame.seq > seen + 1:
+                    self.counters["dropped"] += frame.seq - seen - 1
+                seen = frame.seq
+                yield frame
+        finally:
+            self.subscribers -= 1
+            if not self.subscribers:
+                self._active.clear()
+                self.latest = None  # stale by the time anyone subscribes again
+
+    def delivered(self, frame: SkyFrame) -> None:
+        """Record that a frame reached a subscriber, for the latency metrics."""
+        self.counters["delivered"] += 1
+        if frame is self.latest:
+            self._slowest = max(self._slowest, time.monotonic() - frame.published)
+
+    def publish(self, sky: LiveSkyFrame) -> SkyFrame:
+        """Encode a frame once and wake every waiting subscriber with it."""
+        if self.latest is not None:
+            self._broadcasts.append(self._slowest)
+        text = sky.model_dump_json()
+        frame = SkyFrame(
+            seq=sky.seq, text=text, event=f"id: {sky.seq}\ndata: {text}\n\n".encode("utf-8"),
+            published=time.monotonic()
+        )
+        self.latest, self._slowest = frame, 0.0
+        waking, self._tick = self._tick, asyncio.Event()
+        waking.set()
+        self.counters["published"] += 1
+        return frame
+
+    def compute(self, seq: int, at: Optional[datetime] = None) -> LiveSkyFrame:
+        """Positions of all bodies at a moment.
+
+        Args:
+            seq: Sequence number of the frame.
+            at: Moment; defaults to now.
+        """
+        at = (at or datetime.now(timezone.utc)).replace(microsecond=0)
+        jd = julian_day(at)
+        return LiveSkyFrame(
+            seq=seq, time=at.isoformat(), julian_day=jd, positions=self.engine.calculate_positions(jd)
+        )
+
+    async def run(self) -> None:
+        """Publish a frame every ``interval`` seconds while anyone is subscribed."""
+        loop = asyncio.get_running_loop()
+        seq = 0
+        while True:
+            await self._active.wait()
+            started = time.perf_counter()
+            try:
+                seq += 1
+                # Off the event loop, which keeps serving subscribers meanwhile
+                sky = await loop.run_in_executor(None, self.compute, seq)
+                self.publish(sky)
+            except Exception:
+                logger.exception("Live sky tick failed")
+            self.compute_ms = (time.perf_counter() - started) * 1000.0
+            # Ticks stay on a fixed grid, whatever each one cost
+            await asyncio.sleep(self.interval - (loop.time() % self.interval))
+
+    async def stop(self) -> None:
+        """Stop the background task and end every subscription."""
+        if self._task is not None and self._task.get_loop() is asyncio.get_running_loop():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._closed = True
+            self._tick.set()
+        self._task = None
+
+    def stats(self) -> Dict[str, float]:
+        """Subscriber counts, frame counters and broadcast latency in milliseconds.
+
+        The broadcast latency of a tick is the time from its publication to
+        its delivery to the last subscriber that received it.
+        """
+        broadcasts = np.array(self._broadcasts) * 1000.0
+        return {
+            "subscribers": self.subscribers,
+            **self.counters,
+            "compute_ms": round(self.compute_ms, 3),
+            "broadcast_p50_ms": round(float(np.percentile(broadcasts, 50)), 3) if len(broadcasts) else 0.0,
+            "broadcast_p99_ms": round(float(np.percentile(broadcasts, 99)), 3) if len(broadcasts) else 0.0,
+            "broadcast_max_ms": round(float(broadcasts.max()), 3) if len(broadcasts) else 0.0,
+        }
+
+    def _ensure_running(self) -> None:
+        """Start the background task on the running loop, on first use."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._tick = asyncio.Event()
+        self._active = asyncio.Event()
+        self._closed = False
+        self.latest = None  # frames of another loop's task are not continued
+        self._task = loop.create_task(self.run(), name="live-sky-feed")
@@ -0,0 +1,139 @@
+"""Shared cache of "current sky" positions per UTC time bucket.
+
+Transit and daily features all need the planets "now" or "today", and those
+positions are the same for every user. The service computes each bucket once
+(at the bucket midpoint) and keeps a small ring of past and upcoming buckets
+precomputed, so per-user lookups cost a dictionary read.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import swisseph as swe
+
+from src.core.domain.models import SkySnapshot
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS: Dict[str, timedelta] = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+def bucket_start(at: datetime, resolution: str) -> datetime:
+    """Floor a timestamp to the start of its UTC bucket.
+
+    Args:
+        at: Timestamp; naive values are taken as UTC.
+        resolution: "hour" or "day".
+
+    Returns:
+        datetime: Timezone-aware bucket start.
+    """
+    at = at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
+    if resolution == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    if resolution == "day":
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+class SkySnapshotService:
+    """Computes each sky bucket once and serves it to every caller."""
+
+    def __init__(self, engine: SwissEphemerisEngine, past: int = 2, ahead: int = 2, refresh_interval: float = 60.0):
+        """Initialize the service.
+
+        Args:
+            engine: Engine computing the positions.
+            past: Number of past buckets kept per resolution.
+            ahead: Number of upcoming buckets precomputed per resolution.
+            refresh_interval: Seconds between background ring refreshes.
+        """
+        self.engine = engine
+        self.past = past
+        self.ahead = ahead
+        self.refresh_interval = refresh_interval
+        self._snapshots: Dict[Tuple[str, datetime], SkySnapshot] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.computed = 0  # buckets computed so far, for cache effectiveness metrics
+
+    def get(self, resolution: str = "hour", at: Optional[datetime] = None) -> SkySnapshot:
+        """Return the snapshot of the bucket containing ``at``.
+
+        Args:
+            resolution: "hour" or "day".
+            at: Timestamp; defaults to now.
+
+        Returns:
+            SkySnapshot: The bucket's positions.
+        """
+        start = bucket_start(at or datetime.now(timezone.utc), resolution)
+        key = (resolution, start)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            # Another thread may have filled the bucket while we waited
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                snapshot = self._compute(resolution, start)
+                self._snapshots[key] = snapshot
+            return snapshot
+
+    def refresh(self, now: Optional[datetime] = None) -> None:
+        """Precompute the ring around ``now`` and evict buckets outside it.
+
+        Args:
+            now: Reference time; defaults to now.
+        """
+        now = now or datetime.now(timezone.utc)
+        keep = set()
+        for resolution, width in RESOLUTIONS.items():
+            current = bucket_start(now, resolution)
+            for offset in range(-self.past, self.ahead + 1):
+                start = current + offset * width
+                keep.add((resolution, start))
+                self.get(resolution, start)
+        with self._lock:
+            for key in [key for key in self._snapshots if key not in keep]:
+                del self._snapshots[key]
+
+    def start(self) -> None:
+        """Refresh the ring now and then periodically in a background thread."""
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sky-snapshot-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Sky snapshot refresh failed")
+
+    def _compute(self, resolution: str, start: datetime) -> SkySnapshot:
+        """Compute a bucket at its midpoint."""
+        mid = start + RESOLUTIONS[resolution] / 2
+        jd = swe.julday(mid.year, mid.month, mid.day, mid.hour + mid.minute / 60.0 + mid.second / 3600.0)
+        self.computed += 1
+        return SkySnapshot(
+            resolution=resolution,
+            bucket_start=start.isoformat(),
+            julian_day=jd,
+            positions=self.engine.calculate_positions(jd),
+        )
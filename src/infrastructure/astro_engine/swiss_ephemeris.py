@@ -1,21 +1,26 @@
 """Swiss Ephemeris wrapper for calculating natal charts."""
 
 import math
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import numpy as np
 import swisseph as swe
 
-from src.core.domain.models import Aspect, BirthData, House, NatalChart, Planet
+from src.core.domain.exceptions import CalculationError, InvalidTimezoneError
+from src.infrastructure.astro_engine.bodies import BODY_CATALOG, DEFAULT_BODY_SET, FIXED_AXES, CalculationPlan, resolve_plan
+from src.infrastructure.astro_engine.chart_arrays import (
+    SIGNS, ChartArrays, ChartBatch, aspect_pairs, find_aspects, sign_indices
+)
+from src.core.domain.models import BirthData, NatalChart, SkyPosition
+from src.infrastructure.profiling.stages import current_trace
 
 
 class SwissEphemerisEngine:
     """Astro engine using Swiss Ephemeris for calculations."""
 
-    SIGNS = [
-        "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-        "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-    ]
+    SIGNS = list(SIGNS)
 
     PLANETS = [
         ("Sun", swe.SUN),
@@ -35,10 +40,21 @@ class SwissEphemerisEngine:
         60: "Sextile",
         90: "Square",
         120: "Trine",
+        150: "Quincunx",
         180: "Opposition",
     }
 
     MAX_ORB = 10.0  # degrees
+    ASPECT_ORBS = {150: 3.0}  # minor aspects get tighter orbs than MAX_ORB
+
+    HOUSE_SYSTEM = b'P'  # Placidus
+
+    # High-precision flags (FLG_SWIEPH for calculation with JPL data)
+    CALC_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_ICRS
+
+    # Bump whenever the calculation output changes for identical input, so
+    # content hashes and HTTP validators derived from it are invalidated.
+    ENGINE_VERSION = "3"
 
     def __init__(self, eph_path: str = ""):
         """Initialize the engine.
@@ -49,117 +65,276 @@ class SwissEphemerisEngine:
         # Only set ephemeris path if one is explicitly provided
         if eph_path:
             swe.set_ephe_path(eph_path)
+        self._aspect_names = tuple(self.ASPECT_TYPES.values())
+        self._aspect_angles = np.array(list(self.ASPECT_TYPES), dtype=float)
+        self._aspect_limits = np.array([self.ASPECT_ORBS.get(angle, self.MAX_ORB) for angle in self.ASPECT_TYPES])
+
+    @property
+    def version(self) -> str:
+        """Version tag identifying the engine's output for a given input."""
+        return f"{self.ENGINE_VERSION}/{self.HOUSE_SYSTEM.decode()}"
+
+    def version_for(self, bodies: Union[None, str, Sequence[str]] = None) -> str:
+        """Version tag of charts calculated with a body set.
+
+        The default set keeps the plain engine version, so existing cache keys
+        and content-addressed IDs stay valid.
+        """
+        plan = resolve_plan(bodies)
+        if plan is resolve_plan(DEFAULT_BODY_SET):
+            return self.version
+        return f"{self.version}/{plan.signature}"
 
-    def calculate_chart(self, birth_data: BirthData) -> NatalChart:
+    def calculate_chart(self, birth_data: BirthData, bodies: Union[None, str, Sequence[str]] = None) -> NatalChart:
         """Calculate the complete natal chart for given birth data.
 
         Args:
             birth_data: The birth data including date, time, location.
+            bodies: Body set name or list of body names; defaults to the
+                ten classic planets.
 
         Returns:
             NatalChart: The calculated natal chart.
         """
         jd = self._calculate_julian_day(birth_data)
-        houses_data = swe.houses(jd, birth_data.lat, birth_data.lon, b'P')
-        houses = self._calculate_houses(houses_data)
-        planets = self._calculate_planets(jd, houses_data, birth_data.lat)
-        aspects = self._calculate_aspects(planets)
-        return NatalChart(julian_day=jd, planets=planets, houses=houses, aspects=aspects)
+        self.trace_time_correction(birth_data, jd)
+        return self.calculate_chart_at(jd, birth_data.lat, birth_data.lon, bodies)
 
-    def _calculate_julian_day(self, birth_data: BirthData) -> float:
-        """Calculate Julian Day for the birth data.
+    def trace_time_correction(self, birth_data: BirthData, jd: float) -> None:
+        """Record the local-to-UT conversion of ``birth_data`` in the current trace, if any.
+
+        Args:
+            birth_data: Birth data of the chart.
+            jd: Julian Day the birth moment was converted to.
+        """
+        trace = current_trace()
+        if trace is not None:
+            trace.details["time_correction"] = self._time_correction(birth_data, jd)
 
-        Assumes time is in UTC for simplicity. In production, handle timezone conversion.
+    def calculate_chart_at(
+        self, jd: float, lat: float, lon: float, bodies: Union[None, str, Sequence[str]] = None
+    ) -> NatalChart:
+        """Calculate a chart for an exact moment, e.g. a solar return.
 
         Args:
-            birth_data: Birth data.
+            jd: Julian Day (UT).
+            lat: Latitude of the location.
+            lon: Longitude of the location.
+            bodies: Body set name or list of body names.
 
         Returns:
-            float: Julian Day.
+            NatalChart: The calculated chart.
         """
-        date_str = birth_data.date
-        time_str = birth_data.time or "12:00"  # Default to noon if no time
-        dt_str = f"{date_str} {time_str}"
-        dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-        year, month, day = dt.year, dt.month, dt.day
-        hour = dt.hour + dt.minute / 60.0
-        return swe.julday(year, month, day, hour)
+        return self.calculate_arrays_at(jd, lat, lon, bodies).to_chart()
 
-    def _calculate_planets(self, jd: float, houses_data, lat: float) -> List[Planet]:
-        """Calculate planetary positions.
+    def calculate_arrays(self, birth_data: BirthData,
+                         bodies: Union[None, str, Sequence[str]] = None) -> ChartArrays:
+        """Calculate a natal chart as arrays, without building pydantic models.
 
         Args:
-            jd: Julian Day.
-            houses_data: Houses data from swe.houses.
-            lat: Latitude.
+            birth_data: The birth data including date, time, location.
+            bodies: Body set name or list of body names.
+
+        Returns:
+            ChartArrays: The chart; ``to_chart()`` gives the ``calculate_chart`` result.
+        """
+        jd = self._calculate_julian_day(birth_data)
+        return self.calculate_arrays_at(jd, birth_data.lat, birth_data.lon, bodies)
+
+    def calculate_arrays_at(self, jd: float, lat: float, lon: float,
+                            bodies: Union[None, str, Sequence[str]] = None) -> ChartArrays:
+        """Calculate a chart for an exact moment as arrays.
+
+        Args:
+            jd: Julian Day (UT).
+            lat: Latitude of the location.
+            lon: Longitude of the location.
+            bodies: Body set name or list of body names.
+
+        Returns:
+            ChartArrays: The chart.
+        """
+        return self.calculate_batch([jd], [lat], [lon], bodies).chart(0)
+
+    def calculate_batch(
+        self,
+        jds: Sequence[float],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        bodies: Union[None, str, Sequence[str]] = None,
+        out: Optional[ChartBatch] = None,
+    ) -> ChartBatch:
+        """Calculate many charts of one body set into arrays.
+
+        Only the ephemeris and house calls run per chart; signs, retrograde
+        flags and aspects are computed for the whole batch at once.
+
+        Args:
+            jds: Julian Day (UT) of each chart.
+            lats: Latitude of each chart.
+            lons: Longitude of each chart.
+            bodies: Body set name or list of body names.
+            out: Batch to fill instead of allocating one, e.g. reused across
+                calls; must have the same size and body set.
 
         Returns:
-            List[Planet]: List of planets with positions.
+            ChartBatch: ``out`` or a new batch, one row per chart.
+
+        Raises:
+            ValueError: If the inputs differ in length or ``out`` does not fit.
         """
-        planets = []
-        armc = houses_data[3]
-        eps = houses_data[4]
+        size = len(jds)
+        if len(lats) != size or len(lons) != size:
+            raise ValueError("jds, lats and lons must have the same length")
+        plan = resolve_plan(bodies)
+        pairs = aspect_pairs(plan.layout, FIXED_AXES)
+        if out is None:
+            out = ChartBatch(size, plan.layout, pairs, self._aspect_names)
+        elif not out.matches(size, plan.layout, pairs):
+            raise ValueError("out was allocated for another size or body set")
+
+        for row, (jd, lat, lon) in enumerate(zip(jds, lats, lons)):
+            self._fill_row(out, row, float(jd), float(lat), float(lon), plan)
+        out.signs[:] = sign_indices(out.longitudes)
+        out.cusp_signs[:] = sign_indices(out.cusps)
+        out.retrograde[:] = np.packbits(out.speeds < 0, axis=1)
+        find_aspects(out.longitudes, pairs, self._aspect_angles, self._aspect_limits,
+                     out.aspect_types, out.aspect_orbs)
+        return out
+
+    def calculate_positions(self, jd: float) -> List[SkyPosition]:
+        """Calculate location-independent positions of all bodies.
+
+        Args:
+            jd: Julian Day (UT).
+
+        Returns:
+            List[SkyPosition]: Longitude, speed and sign of each body.
+        """
+        positions = []
         for name, planet_id in self.PLANETS:
-            # Use high-precision flags (FLG_SWIEPH for calculation with JPL data)
-            flags = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_ICRS
-            pos = swe.calc_ut(jd, planet_id, flags=flags)
+            pos = swe.calc_ut(jd, planet_id, flags=self.CALC_FLAGS)
             longitude = pos[0][0]
-            speed = pos[0][3]  # daily speed
-            is_retrograde = speed < 0
-            sign = self._get_sign(longitude)
-            house = int(swe.house_pos(armc, lat, eps, b'P', longitude, lat))
-            planets.append(Planet(
+            speed = pos[0][3]
+            positions.append(SkyPosition(
                 name=name,
-                sign=sign,
+                sign=self._get_sign(longitude),
                 longitude=longitude,
-                house=house,
-                is_retrograde=is_retrograde
+                speed=speed,
+                is_retrograde=speed < 0
             ))
-        return planets
+        return positions
+
+    def _calculate_julian_day(self, birth_data: BirthData) -> float:
+        """Calculate Julian Day (UT) for the birth data.
 
-    def _calculate_houses(self, houses_data) -> List[House]:
-        """Calculate house cusps using Placidus system.
+        The local birth time is converted to UT with the offset the birth
+        place's zone had at that moment, daylight saving included.
 
         Args:
-            houses_data: Houses data from swe.houses.
+            birth_data: Birth data.
 
         Returns:
-            List[House]: List of houses.
+            float: Julian Day.
+
+        Raises:
+            InvalidTimezoneError: If the timezone is not a known IANA zone.
         """
-        cusps = houses_data[0]  # cusps[1] to cusps[12]
-        houses = []
-        for i in range(1, 13):
-            degree = cusps[i]
-            sign = self._get_sign(degree)
-            houses.append(House(number=i, degree=degree, sign=sign))
-        return houses
+        local, offset = self._local_time(birth_data)
+        ut = local - offset
+        return swe.julday(ut.year, ut.month, ut.day, ut.hour + ut.minute / 60.0 + ut.second / 3600.0)
 
-    def _calculate_aspects(self, planets: List[Planet]) -> List[Aspect]:
-        """Calculate aspects between planets.
+    def birth_zone(self, birth_data: BirthData) -> ZoneInfo:
+        """IANA zone the birth time is given in.
 
-        Args:
-            planets: List of planets.
+        Raises:
+            InvalidTimezoneError: If the timezone is not a known IANA zone.
+        """
+        try:
+            return ZoneInfo(birth_data.timezone.strip())
+        except (ZoneInfoNotFoundError, ValueError) as exc:
+            raise InvalidTimezoneError(details=f"timezone={birth_data.timezone!r}") from exc
 
-        Returns:
-            List[Aspect]: List of aspects.
+    def _local_time(self, birth_data: BirthData) -> Tuple[datetime, timedelta]:
+        """Local birth moment (noon if no time was given) and its UTC offset."""
+        local = datetime.strptime(f"{birth_data.date} {birth_data.time or '12:00'}", "%Y-%m-%d %H:%M")
+        return local, self.birth_zone(birth_data).utcoffset(local)
+
+    def _time_correction(self, birth_data: BirthData, jd: float) -> Dict[str, Any]:
+        """Describe the local-to-UT conversion ``_calculate_julian_day`` applied.
+
+        ``offset`` is the offset subtracted from the local time; ``zone_offset``
+        is the one the birth place's zone had at that moment. The two are the
+        same since birth times are converted with the zone, but both are kept
+        so existing trace consumers keep working.
+        """
+        local, applied = self._local_time(birth_data)
+        return {
+            "local_time": local.strftime("%Y-%m-%d %H:%M"),
+            "time_assumed": not birth_data.time,
+            "timezone": birth_data.timezone,
+            "universal_time": (local - applied).strftime("%Y-%m-%d %H:%M:%S"),
+            "offset": _format_offset(applied),
+            "zone_offset": _format_offset(applied),
+            "julian_day": jd,
+        }
+
+    def _fill_row(self, out: ChartBatch, row: int, jd: float, lat: float, lon: float,
+                  plan: CalculationPlan) -> None:
+        """Fill one row of a batch with the ephemeris and house results.
+
+        Args:
+            out: Batch to fill.
+            row: Row of the chart.
+            jd: Julian Day (UT).
+            lat: Latitude.
+            lon: Longitude.
+            plan: Calculation plan of the batch's body set.
         """
-        aspects = []
-        planet_dict = {p.name: p for p in planets}
-        for i, p1 in enumerate(planets):
-            for p2 in planets[i+1:]:
-                diff = abs(p1.longitude - p2.longitude)
-                diff = min(diff, 360 - diff)
-                for angle, aspect_type in self.ASPECT_TYPES.items():
-                    if abs(diff - angle) <= self.MAX_ORB:
-                        orb = abs(diff - angle)
-                        aspects.append(Aspect(
-                            planet1=p1.name,
-                            planet2=p2.name,
-                            type=aspect_type,
-                            orb=orb
-                        ))
-                        break  # Take the closest aspect
-        return aspects
+        try:
+            houses_data = swe.houses(jd, lat, lon, self.HOUSE_SYSTEM)
+            eps = swe.calc_ut(jd, swe.ECL_NUT)[0][0]  # true obliquity of the ecliptic
+        except swe.Error as exc:
+            raise CalculationError(details=f"houses at JD {jd}, {lat}, {lon}: {exc}")
+        armc = houses_data[1][2]
+
+        # name -> (longitude, ecliptic latitude, daily speed)
+        positions: Dict[str, Tuple[float, float, float]] = {}
+        for name, body_id in plan.ephemeris:
+            try:
+                pos = swe.calc_ut(jd, body_id, flags=self.CALC_FLAGS)[0]
+            except swe.Error as exc:
+                hint = " (asteroids need seas_18.se1 in SWISS_EPH_PATH)" if BODY_CATALOG[name].needs_asteroid_files else ""
+                raise CalculationError(details=f"{name}: {exc}{hint}")
+            positions[name] = (pos[0], pos[1], pos[3])
+        for name, index in plan.angles:
+            positions[name] = (houses_data[1][index], 0.0, 0.0)
+        for name in plan.derived:
+            positions[name] = self._derived_position(name, positions, armc, lat, eps)
+
+        out.julian_days[row] = jd
+        out.cusps[row] = houses_data[0][:12]
+        longitudes, speeds, houses = out.longitudes[row], out.speeds[row], out.houses[row]
+        for column, name in enumerate(plan.layout):
+            longitude, latitude, speed = positions[name]
+            longitudes[column] = longitude
+            speeds[column] = speed
+            houses[column] = int(swe.house_pos(armc, lat, eps, (longitude, latitude), self.HOUSE_SYSTEM))
+
+    def _derived_position(self, name: str, positions: Dict[str, Tuple[float, float, float]],
+                          armc: float, lat: float, eps: float) -> Tuple[float, float, float]:
+        """Position of a point derived from already calculated bodies."""
+        if name == "South Node":
+            node_lon, _, node_speed = positions["True Node"]
+            return (node_lon + 180.0) % 360.0, 0.0, node_speed
+        if name == "Part of Fortune":
+            asc = positions["Ascendant"][0]
+            sun_lon, sun_lat, _ = positions["Sun"]
+            moon = positions["Moon"][0]
+            # Day charts (Sun above the horizon, houses 7-12) use Asc + Moon - Sun
+            is_day = swe.house_pos(armc, lat, eps, (sun_lon, sun_lat), self.HOUSE_SYSTEM) >= 7.0
+            return ((asc + moon - sun_lon) if is_day else (asc + sun_lon - moon)) % 360.0, 0.0, 0.0
+        raise CalculationError(details=f"No rule to derive {name}.")
 
     def _get_sign(self, longitude: float) -> str:
         """Get zodiac sign from longitude.
@@ -172,3 +347,10 @@ class SwissEphemerisEngine:
         """
         index = int(longitude // 30) % 12
         return self.SIGNS[index]
+
+
+def _format_offset(offset: timedelta) -> str:
+    """``timedelta`` as a signed ``+HH:MM`` UTC offset."""
+    minutes = int(offset.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    return f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
@@ -0,0 +1,330 @@
+"""Offline gazetteer backed by a memory-mapped prefix index.
+
+The source is a GeoNames-style cities dump (tab-separated, 19 columns, e.g.
+``cities15000.txt``). On first use it is compiled into a compact binary index
+that every worker process maps read-only, so lookups never parse text and the
+pages are shared through the OS page cache.
+
+Index layout (little-endian)::
+
+    header   magic, version, counts and section offsets
+    places   fixed-size records sorted by place ID (binary search by ID)
+    keys     fixed-size (key offset, key length, place index) entries sorted
+             by normalised key, then by descending population
+    zones    (offset, length) entries for the distinct IANA zone names
+    pool     UTF-8 string pool for names, keys and zones
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.core.domain.models import Place
+
+BUNDLED_CITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities_sample.txt")
+
+MAGIC = b"LGZ1"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIIIIIIII")  # magic, version, places, keys, zones, places@, keys@, zones@, pool@
+PLACE = struct.Struct("<IddQIH2sH")  # id, lat, lon, population, name@, name len, country, zone index
+KEY = struct.Struct("<IHI")  # key@, key len, place index
+ZONE = struct.Struct("<IH")  # zone@, zone len
+
+TYPO_ALPHABET = "abcdefghijklmnopqrstuvwxyz "
+MAX_PREFIX_SCAN = 1000  # key entries inspected per prefix lookup
+SEARCH_CACHE_SIZE = 4096
+
+
+def normalize(text: str) -> str:
+    """Fold a place name to the lower-case ASCII form used as index key.
+
+    Args:
+        text: A place name or query.
+
+    Returns:
+        str: Accent-free, lower-case text with punctuation collapsed to spaces.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    cleaned = "".join(c if c.isalnum() else " " for c in folded)
+    return " ".join(cleaned.split())
+
+
+def build_index(source_path: str, index_path: str) -> None:
+    """Compile a GeoNames-style dump into the binary index.
+
+    Args:
+        source_path: Path of the tab-separated cities dump.
+        index_path: Destination of the index; written atomically.
+    """
+    places: List[Tuple[int, str, float, float, int, str, str, List[str]]] = []
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 18 or not cols[0].isdigit():
+                continue
+            names = [cols[1], cols[2]] + [n for n in cols[3].split(",") if n]
+            places.append((
+                int(cols[0]), cols[1], float(cols[4]), float(cols[5]),
+                int(cols[14] or 0), cols[8][:2], cols[17], names,
+            ))
+    places.sort(key=lambda p: p[0])
+
+    pool = bytearray()
+    pool_offsets: Dict[bytes, int] = {}
+
+    def intern(data: bytes) -> int:
+        if data not in pool_offsets:
+            pool_offsets[data] = len(pool)
+            pool.extend(data)
+        return pool_offsets[data]
+
+    zones: Dict[str, int] = {}
+    place_records = bytearray()
+    key_entries: List[Tuple[bytes, int, int]] = []
+    for index, (place_id, name, lat, lon, population, country, zone, names) in enumerate(places):
+        zone_index = zones.setdefault(zone, len(zones))
+        name_bytes = name.encode("utf-8")
+        place_records += PLACE.pack(
+            place_id, lat, lon, population, intern(name_bytes), len(name_bytes),
+            country.encode("ascii", "replace").ljust(2), zone_index,
+        )
+        for key in {normalize(n) for n in names}:
+            if key and key.isascii():
+                key_entries.append((key.encode("ascii"), -population, index))
+
+    key_entries.sort()
+    key_records = bytearray()
+    for key, _, index in key_entries:
+        key_records += KEY.pack(intern(key), len(key), index)
+
+    zone_records = bytearray()
+    for zone in zones:
+        zone_bytes = zone.encode("utf-8")
+        zone_records += ZONE.pack(intern(zone_bytes), len(zone_bytes))
+
+    places_offset = HEADER.size
+    keys_offset = places_offset + len(place_records)
+    zones_offset = keys_offset + len(key_records)
+    pool_offset = zones_offset + len(zone_records)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(places), len(key_entries), len(zones),
+        places_offset, keys_offset, zones_offset, pool_offset,
+    )
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as out:
+        out.write(header)
+        out.write(place_records)
+        out.write(key_records)
+        out.write(zone_records)
+        out.write(pool)
+    os.replace(tmp_path, index_path)
+
+
+def default_index_path(source_path: str) -> str:
+    """Index location for a source dump, outside the (possibly read-only) source tree.
+
+    Args:
+        source_path: Path of the cities dump.
+
+    Returns:
+        str: Path in the system temp directory, unique per source file.
+    """
+    digest = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"lilith-gazetteer-{digest}.idx")
+
+
+class Gazetteer:
+    """Read-only place lookup over a memory-mapped index."""
+
+    def __init__(self, index_path: str):
+        """Map an existing index file.
+
+        Args:
+            index_path: Path produced by ``build_index``.
+        """
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self._n_places, self._n_keys, n_zones,
+         self._places_offset, self._keys_offset, zones_offset, self._pool_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{index_path} is not a gazetteer index of version {FORMAT_VERSION}")
+
+        self._zones = []
+        for i in range(n_zones):
+            offset, length = ZONE.unpack_from(self._mm, zones_offset + i * ZONE.size)
+            self._zones.append(self._string(offset, length))
+        self._ids = [
+            struct.unpack_from("<I", self._mm, self._places_offset + i * PLACE.size)[0]
+            for i in range(self._n_places)
+        ]
+        self.search = lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._search)
+
+    @classmethod
+    def open(cls, source_path: str = BUNDLED_CITIES_PATH, index_path: Optional[str] = None) -> "Gazetteer":
+        """Open the index for a dump, (re)building it if missing or stale.
+
+        Args:
+            source_path: Path of the cities dump.
+            index_path: Index location; defaults to ``default_index_path``.
+
+        Returns:
+            Gazetteer: The mapped gazetteer.
+        """
+        index_path = index_path or default_index_path(source_path)
+        if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(source_path):
+            build_index(source_path, index_path)
+        return cls(index_path)
+
+    def __len__(self) -> int:
+        return self._n_places
+
+    def get(self, place_id: int) -> Optional[Place]:
+        """Look up a place by its ID.
+
+        Args:
+            place_id: GeoNames ID.
+
+        Returns:
+            The place, or None if unknown.
+        """
+        index = bisect.bisect_left(self._ids, place_id)
+        if index < len(self._ids) and self._ids[index] == place_id:
+            return self._place(index)
+        return None
+
+    def _search(self, query: str, limit: int = 10) -> Tuple[Place, ...]:
+        """Autocomplete a place name (exposed as the cached ``search``).
+
+        Exact prefix matches come first, ranked by population. If they do not
+        fill ``limit``, prefixes one edit away from the query are tried too.
+
+        Args:
+            query: User input, in any case and with or without diacritics.
+            limit: Maximum number of places to return.
+
+        Returns:
+            Tuple of matching places.
+        """
+        prefix = normalize(query).encode("ascii", "ignore")
+        if not prefix or limit <= 0:
+            return ()
+
+        found = self._collect(prefix)
+        if len(found) < limit:
+            fuzzy: Dict[int, int] = {}
+            for variant in self._typo_variants(prefix):
+                for index, population in self._collect(variant).items():
+                    if index not in found:
+                        fuzzy[index] = population
+            ranked_fuzzy = sorted(fuzzy, key=fuzzy.__getitem__, reverse=True)
+        else:
+            ranked_fuzzy = []
+
+        ranked = sorted(found, key=found.__getitem__, reverse=True) + ranked_fuzzy
+        return tuple(self._place(index) for index in ranked[:limit])
+
+    def _collect(self, prefix: bytes) -> Dict[int, int]:
+        """Gather places whose key starts with a prefix.
+
+        At most ``MAX_PREFIX_SCAN`` key entries are inspected, which bounds
+        latency for very short prefixes at the cost of exhaustive ranking.
+
+        Args:
+            prefix: Normalised ASCII prefix.
+
+        Returns:
+            Dict of place index -> population.
+        """
+        found: Dict[int, int] = {}
+        position = self._lower_bound(prefix)
+        for position in range(position, min(position + MAX_PREFIX_SCAN, self._n_keys)):
+            key, index = self._key(position)
+            if not key.startswith(prefix):
+                break
+            if index not in found:
+                found[index] = self._population(index)
+        return found
+
+    def _typo_variants(self, prefix: bytes) -> Iterator[bytes]:
+        """Yield prefixes one edit away, around where the query stops matching.
+
+        Args:
+            prefix: Normalised ASCII prefix without exact matches to spare.
+
+        Yields:
+            Candidate prefixes (deletion, substitution, insertion, transposition).
+        """
+        # The longest matching prefix pinpoints the likely typo position
+        lo, hi = 0, len(prefix)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._has_prefix(prefix[:mid]):
+                lo = mid
+            else:
+                hi = mid - 1
+        seen = {prefix}
+        for pos in {max(lo - 1, 0), lo}:
+            if pos >= len(prefix):
+                continue
+            candidates = [prefix[:pos] + prefix[pos + 1:]]
+            if pos + 1 < len(prefix):
+                candidates.append(prefix[:pos] + prefix[pos + 1:pos + 2] + prefix[pos:pos + 1] + prefix[pos + 2:])
+            for char in TYPO_ALPHABET.encode("ascii"):
+                letter = bytes((char,))
+                candidates.append(prefix[:pos] + letter + prefix[pos + 1:])
+                candidates.append(prefix[:pos] + letter + prefix[pos:])
+            for candidate in candidates:
+                if candidate and candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+    def _has_prefix(self, prefix: bytes) -> bool:
+        position = self._lower_bound(prefix)
+        return position < self._n_keys and self._key(position)[0].startswith(prefix)
+
+    def _lower_bound(self, prefix: bytes) -> int:
+        """Index of the first key not less than ``prefix``."""
+        lo, hi = 0, self._n_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid)[0] < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _key(self, position: int) -> Tuple[bytes, int]:
+        offset, length, index = KEY.unpack_from(self._mm, self._keys_offset + position * KEY.size)
+        start = self._pool_offset + offset
+        return self._mm[start:start + length], index
+
+    def _population(self, index: int) -> int:
+        return struct.unpack_from("<Q", self._mm, self._places_offset + index * PLACE.size + 20)[0]
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._pool_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _place(self, index: int) -> Place:
+        place_id, lat, lon, population, name_offset, name_length, country, zone_index = PLACE.unpack_from(
+            self._mm, self._places_offset + index * PLACE.size
+        )
+        return Place(
+            place_id=place_id,
+            name=self._string(name_offset, name_length),
+            country_code=country.decode("ascii").strip(),
+            latitude=lat,
+            longitude=lon,
+            timezone=self._zones[zone_index],
+            population=population,
+        )
@@ -0,0 +1,303 @@
+"""Durable job queue stored in a local SQLite database.
+
+No external broker is needed: every worker process opens the same database
+file, and claims are made atomic with ``BEGIN IMMEDIATE`` transactions. A
+claimed job carries a lease that its worker extends while the job runs; if
+the worker dies or hangs, the job becomes claimable again once the lease
+expires. Every claim counts as an attempt, so a job that keeps killing its
+worker is dead-lettered like one that keeps failing. The attempt number
+also fences the claim: a worker whose lease was taken over can no longer
+complete, fail or extend the job.
+"""
+
+import json
+import random
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+DEAD = "dead"  # exhausted its attempts; kept for inspection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    webhook_url TEXT,
+    created_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at);
+"""
+
+
+@dataclass
+class Job:
+    """A queued unit of work and its current state."""
+
+    id: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    webhook_url: Optional[str]
+    created_at: float
+    available_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            webhook_url=row["webhook_url"],
+            created_at=row["created_at"],
+            available_at=row["available_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+
+class SqliteJobQueue:
+    """Job queue with leases, exponential retry backoff and dead-lettering."""
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        lease_seconds: float = 120.0,
+    ):
+        """Initialize the queue, creating the schema if needed.
+
+        Args:
+            path: SQLite database file.
+            max_attempts: Default attempts before a job is dead-lettered.
+            backoff_base: Delay in seconds before the first retry; doubles per attempt.
+            backoff_max: Upper bound on the retry delay.
+            lease_seconds: How long a claim is valid before the job is reclaimable.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def enqueue(self, payload: Dict[str, Any], webhook_url: Optional[str] = None,
+                max_attempts: Optional[int] = None) -> str:
+        """Add a job to the queue.
+
+        Args:
+            payload: JSON-serialisable job input.
+            webhook_url: URL notified when the job succeeds or is dead-lettered.
+            max_attempts: Override of the default attempt budget.
+
+        Returns:
+            str: The new job ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, payload, status, max_attempts, webhook_url, created_at, available_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(payload), QUEUED, max_attempts or self.max_attempts, webhook_url, now, now),
+            )
+        return job_id
+
+    def claim(self) -> Optional[Job]:
+        """Atomically take the next due job, or a running job whose lease expired.
+
+        The claim counts as an attempt. Expired jobs without attempts left
+        are not claimed; ``reap`` dead-letters them.
+
+        Returns:
+            The claimed job (status ``running``), or None if nothing is due.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE (status = ? AND available_at <= ?) "
+                    "OR (status = ? AND lease_until < ? AND attempts < max_attempts) "
+                    "ORDER BY available_at LIMIT 1",
+                    (QUEUED, now, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (RUNNING, now, now + self.lease_seconds, row["id"]),
+                )
+                return Job.from_row(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+            finally:
+                conn.execute("COMMIT")
+
+    def reap(self) -> List[str]:
+        """Dead-letter running jobs whose lease expired on their last attempt.
+
+        Returns:
+            List[str]: IDs of the jobs dead-lettered.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                job_ids = [row["id"] for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= max_attempts",
+                    (RUNNING, now),
+                )]
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                    [(DEAD, "Lease expired: the worker died or hung on the last attempt.", now, job_id)
+                     for job_id in job_ids],
+                )
+                return job_ids
+            finally:
+                conn.execute("COMMIT")
+
+    def extend_lease(self, job_id: str, attempt: int) -> bool:
+        """Renew the lease of a running job.
+
+        Args:
+            job_id: The job ID.
+            attempt: Attempt number of the caller's claim.
+
+        Returns:
+            bool: False if the claim is no longer the caller's.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING, attempt),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: Dict[str, Any], attempt: Optional[int] = None) -> bool:
+        """Mark a job as succeeded.
+
+        Args:
+            job_id: The job ID.
+            result: JSON-serialisable job output.
+            attempt: Attempt number of the caller's claim; a stale claim
+                leaves the job untouched. Unchecked when omitted.
+
+        Returns:
+            bool: Whether the job was marked as succeeded.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, lease_until = NULL "
+                "WHERE id = ? AND status = ? AND (? IS NULL OR attempts = ?)",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id, RUNNING, attempt, attempt),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, error: str, attempt: Optional[int] = None) -> Optional[str]:
+        """Record a failed attempt; retry with backoff or dead-letter the job.
+
+        Args:
+            job_id: The job ID.
+            error: Description of the failure.
+            attempt: Attempt number of the caller's claim; a stale claim
+                leaves the job untouched. Unchecked when omitted.
+
+        Returns:
+            The job's new status (``queued`` or ``dead``), or None if the
+            claim was stale.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? "
+                    "AND (? IS NULL OR attempts = ?)",
+                    (job_id, RUNNING, attempt, attempt),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] >= row["max_attempts"]:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                        (DEAD, error, now, job_id),
+                    )
+                    return DEAD
+                delay = min(self.backoff_base * 2 ** (row["attempts"] - 1), self.backoff_max)
+                delay *= random.uniform(0.8, 1.2)  # jitter spreads retries of correlated failures
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_until = NULL WHERE id = ?",
+                    (QUEUED, error, now + delay, job_id),
+                )
+                return QUEUED
+            finally:
+                conn.execute("COMMIT")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job.
+
+        Args:
+            job_id: The job ID.
+
+        Returns:
+            The job, or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per status and lag of the oldest due job.
+
+        Returns:
+            Dict with ``counts`` per status and ``lag_seconds``: how long the
+            oldest due job has been waiting to be claimed (0 when none is due).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, DEAD)}
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+            oldest = conn.execute(
+                "SELECT MIN(available_at) AS t FROM jobs WHERE status = ? AND available_at <= ?",
+                (QUEUED, now),
+            ).fetchone()["t"]
+        return {"counts": counts, "lag_seconds": now - oldest if oldest is not None else 0.0}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A fresh connection per operation keeps the queue safe to share
+        # across worker threads; autocommit mode leaves transactions explicit.
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,50 @@
+"""Validation of client-supplied webhook URLs.
+
+Job webhooks are POSTed from inside the deployment, so an unchecked URL
+would let any client make the server call loopback, link-local (cloud
+metadata) or other internal addresses. Only ``https`` URLs whose host
+resolves exclusively to public addresses are accepted, optionally further
+restricted to an allowlist of hosts. URLs are checked when a job is
+submitted and again right before delivery, since DNS answers can change.
+"""
+
+import ipaddress
+import socket
+from typing import Collection
+from urllib.parse import urlsplit
+
+from src.core.domain.exceptions import InvalidWebhookError
+
+
+def check_webhook_url(url: str, allowed_hosts: Collection[str] = ()) -> None:
+    """Reject webhook URLs that could reach non-public addresses.
+
+    Args:
+        url: The webhook URL.
+        allowed_hosts: Host names webhooks may target; any public host when empty.
+
+    Raises:
+        InvalidWebhookError: If the URL is not https, its host is not allowed,
+            does not resolve, or resolves to a private, loopback, link-local
+            or otherwise non-global address.
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port or 443
+    except ValueError as exc:
+        raise InvalidWebhookError(details=str(exc)) from exc
+    if parts.scheme != "https" or not parts.hostname:
+        raise InvalidWebhookError(details="Only https URLs with a host name are accepted.")
+    host = parts.hostname.lower().rstrip(".")
+    if allowed_hosts and host not in allowed_hosts:
+        raise InvalidWebhookError(details=f"{host} is not an allowed webhook host.")
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as exc:
+        raise InvalidWebhookError(details=f"{host} does not resolve: {exc}") from exc
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise InvalidWebhookError(details=f"{host} resolves to the non-public address {address}.")
@@ -0,0 +1,169 @@
+"""Thread pool draining the SQLite job queue."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+import httpx
+
+from src.core.domain.exceptions import InvalidWebhookError
+from src.infrastructure.jobs.sqlite_queue import DEAD, Job, SqliteJobQueue, SUCCEEDED
+from src.infrastructure.jobs.webhooks import check_webhook_url
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class JobWorkerPool:
+    """Runs a handler for every queued job on a fixed number of threads.
+
+    Terminal outcomes (success or dead-lettering) are POSTed to the job's
+    webhook, if one was registered. Webhook delivery is best effort: failures
+    are logged and clients can always fall back to polling. The URL is checked
+    again before each delivery and redirects are not followed, so a host that
+    starts resolving to an internal address is never called.
+
+    While a handler runs, a keeper thread extends the job's lease, so slow
+    jobs are not claimed a second time. It stops extending after
+    ``max_run_seconds``: the lease of a hung job then expires and the job is
+    retried, or dead-lettered once its attempts are spent.
+    """
+
+    def __init__(
+        self,
+        queue: SqliteJobQueue,
+        handler: JobHandler,
+        workers: int = 2,
+        poll_interval: float = 0.5,
+        webhook_timeout: float = 5.0,
+        webhook_hosts: Collection[str] = (),
+        max_run_seconds: float = 600.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            queue: Queue to drain.
+            handler: Turns a job payload into a JSON-serialisable result.
+            workers: Number of worker threads.
+            poll_interval: Seconds to sleep when the queue is empty.
+            webhook_timeout: Timeout for webhook deliveries.
+            webhook_hosts: Hosts webhooks may target; any public host when empty.
+            max_run_seconds: How long a job's lease is kept alive.
+        """
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.webhook_timeout = webhook_timeout
+        self.webhook_hosts = webhook_hosts
+        self.max_run_seconds = max_run_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Signal the workers to stop and wait for in-flight jobs.
+
+        Args:
+            timeout: Seconds to wait for each thread.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self) -> bool:
+        """Claim and process a single job.
+
+        Returns:
+            bool: True if a job was processed, False if none was due.
+        """
+        for job_id in self.queue.reap():
+            logger.warning("Job %s dead-lettered: its lease expired on the last attempt", job_id)
+            self._notify(job_id)
+        job = self.queue.claim()
+        if job is None:
+            return False
+        done = threading.Event()
+        keeper = threading.Thread(target=self._keep_leased, args=(job, done), name=f"job-lease-{job.id}",
+                                  daemon=True)
+        keeper.start()
+        try:
+            result = self.handler(job.payload)
+        except Exception as exc:
+            done.set()
+            keeper.join()
+            logger.warning("Job %s attempt %d failed: %s", job.id, job.attempts, exc)
+            if self.queue.fail(job.id, f"{type(exc).__name__}: {exc}", attempt=job.attempts) == DEAD:
+                self._notify(job.id)
+            return True
+        done.set()
+        keeper.join()
+        if self.queue.complete(job.id, result, attempt=job.attempts):
+            self._notify(job.id)
+        else:
+            logger.warning("Job %s attempt %d finished after its lease was taken over", job.id, job.attempts)
+        return True
+
+    def _keep_leased(self, job: Job, done: threading.Event) -> None:
+        """Extend the lease of a running job until it is done or has run too long."""
+        interval = self.queue.lease_seconds / 3
+        if interval <= 0:
+            return
+        deadline = time.monotonic() + self.max_run_seconds
+        while not done.wait(interval) and time.monotonic() < deadline:
+            if not self.queue.extend_lease(job.id, job.attempts):
+                return
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Job worker iteration failed")
+                processed = False
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def _notify(self, job_id: str) -> None:
+        """Deliver the terminal state of a job to its webhook."""
+        job = self.queue.get(job_id)
+        if job is None or not job.webhook_url or job.status not in (SUCCEEDED, DEAD):
+            return
+        try:
+            check_webhook_url(job.webhook_url, self.webhook_hosts)
+            httpx.post(job.webhook_url, json=job_payload(job), timeout=self.webhook_timeout, follow_redirects=False)
+        except InvalidWebhookError as exc:
+            logger.warning("Webhook of job %s not delivered: %s", job.id, exc.details)
+        except httpx.HTTPError as exc:
+            logger.warning("Webhook delivery for job %s failed: %s", job.id, exc)
+
+
+def job_payload(job: Job) -> Dict[str, Any]:
+    """Public representation of a job, shared by the status API and webhooks.
+
+    Args:
+        job: The job.
+
+    Returns:
+        Dict: Job state without its input payload.
+    """
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "result": job.result,
+        "error": job.error,
+    }
@@ -0,0 +1,343 @@
+"""Memory-bounded variant of the in-memory repository.
+
+A process-wide repository must not grow until the pod is OOM-killed.
+``BoundedStore`` is a dict-like LRU with an optional TTL, an entry cap and a
+byte budget tracked with approximate object sizes. ``BoundedInMemoryRepository``
+swaps the plain dicts of ``InMemoryRepository`` for bounded stores. Charts
+evicted for capacity can optionally spill to disk, where a later lookup finds
+them again.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.core.domain.models import NatalChart
+from src.infrastructure.persistence.in_memory_repo import InMemoryRepository
+from src.infrastructure.similarity.vector_index import ChartSimilarityIndex
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate the deep memory footprint of an object in bytes.
+
+    Follows containers, pydantic models and instance dicts and counts shared
+    objects once. Interned singletons and small ints are counted as if they
+    were owned, so the estimate errs on the high side.
+
+    Args:
+        obj: Object to measure.
+
+    Returns:
+        int: Estimated size in bytes.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in obj)
+    if isinstance(obj, BaseModel):
+        size += estimate_size(obj.__dict__, seen)
+        extra = obj.__pydantic_extra__
+        return size + (estimate_size(extra, seen) if extra else 0)
+    if hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), seen)
+    return size
+
+
+class ChartSpill:
+    """Directory of charts evicted from memory, one JSON file per chart ID."""
+
+    def __init__(self, directory: str, max_files: int = 100_000):
+        """Initialize the spill directory.
+
+        Args:
+            directory: Directory for spilled charts; created if missing.
+            max_files: Oldest spilled charts are deleted beyond this count.
+        """
+        self.directory = directory
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+        self._keys: "OrderedDict[str, None]" = OrderedDict(
+            (name[:-5], None) for name in sorted(os.listdir(directory), key=self._mtime) if name.endswith(".json")
+        )
+        self._lock = threading.Lock()
+
+    def put(self, key: str, chart: NatalChart) -> None:
+        """Write a chart to disk."""
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(chart.model_dump_json())
+        os.replace(tmp, path)
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.max_files:
+                self._remove(self._keys.popitem(last=False)[0])
+
+    def take(self, key: str) -> Optional[NatalChart]:
+        """Read a spilled chart and remove it from disk, or None if absent."""
+        with self._lock:
+            if key not in self._keys:
+                return None
+            del self._keys[key]
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                chart = NatalChart.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+        self._remove(key)
+        return chart
+
+    def discard(self, key: str) -> None:
+        """Delete a spilled chart if present."""
+        with self._lock:
+            if key not in self._keys:
+                return
+            del self._keys[key]
+        self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _path(self, key: str) -> str:
+        # Chart IDs are hex digests with a prefix, safe as file names
+        return os.path.join(self.directory, f"{os.path.basename(key)}.json")
+
+    def _mtime(self, name: str) -> float:
+        return os.path.getmtime(os.path.join(self.directory, name))
+
+    def _remove(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class BoundedStore(MutableMapping):
+    """Thread-safe LRU mapping bounded by entry count, bytes and age.
+
+    Reads refresh recency; entries past their TTL are dropped on access and
+    by ``expire()``. Capacity evictions go to the optional spill, from which
+    misses are transparently re-admitted.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        sizer: Callable[[Any], int] = estimate_size,
+        spill: Optional[ChartSpill] = None,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            max_entries: Maximum number of entries; None for unbounded.
+            max_bytes: Budget for the estimated size of keys and values.
+            ttl_seconds: Lifetime of an entry since it was written.
+            sizer: Size estimator for keys and values.
+            spill: Destination for entries evicted for capacity.
+            on_evict: Called with the key of every entry evicted or expired
+                (not of entries overwritten or deleted).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sizer = sizer
+        self.spill = spill
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Any, Tuple[Any, int, float]]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.counters: Dict[str, int] = {
+            "hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "spilled": 0, "spill_hits": 0,
+        }
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._drop(key, evicted=True)
+                self.counters["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[0]
+            if self.spill is not None:
+                value = self.spill.take(key)
+                if value is not None:
+                    self.counters["spill_hits"] += 1
+                    self[key] = value
+                    return value
+            self.counters["misses"] += 1
+            raise KeyError(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        size = self.sizer(key) + self.sizer(value)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._enforce_limits(protect=key)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            found = key in self._entries
+            if found:
+                self._drop(key)
+            if self.spill is not None:
+                self.spill.discard(key)
+            elif not found:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        # Membership reflects memory only; lookups also consult the spill
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[2] > time.monotonic()
+
+    def __iter__(self) -> Iterator[Any]:
+        # Iterate a snapshot: reads during iteration reorder the LRU
+        with self._lock:
+            now = time.monotonic()
+            keys = [key for key, entry in self._entries.items() if entry[2] > now]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def expire(self) -> int:
+        """Drop all entries past their TTL.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, entry in self._entries.items() if entry[2] <= now]
+            for key in expired:
+                self._drop(key, evicted=True)
+            self.counters["expirations"] += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy and eviction metrics.
+
+        Returns:
+            Dict with entry and byte counts, their limits, ``occupancy`` (the
+            fuller of the two ratios, 0..1) and the hit/eviction counters.
+        """
+        with self._lock:
+            ratios = []
+            if self.max_entries:
+                ratios.append(len(self._entries) / self.max_entries)
+            if self.max_bytes:
+                ratios.append(self._bytes / self.max_bytes)
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "estimated_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "occupancy": max(ratios, default=0.0),
+                "spilled_entries": len(self.spill) if self.spill is not None else 0,
+                **self.counters,
+            }
+
+    def _drop(self, key: Any, evicted: bool = False) -> Any:
+        value, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        if evicted and self.on_evict is not None:
+            self.on_evict(key)
+        return value
+
+    def _enforce_limits(self, protect: Any) -> None:
+        """Evict least recently used entries until within limits.
+
+        The entry just written is kept even if it alone exceeds the budget.
+        """
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            if key == protect:
+                break
+            value, _, expires_at = self._entries[key]
+            self._drop(key, evicted=True)
+            if expires_at <= time.monotonic():
+                self.counters["expirations"] += 1
+                continue
+            self.counters["evictions"] += 1
+            if self.spill is not None:
+                self.spill.put(key, value)
+                self.counters["spilled"] += 1
+
+
+class BoundedInMemoryRepository(InMemoryRepository):
+    """In-memory repository that stays within configured memory limits.
+
+    Charts dominate memory, so the byte budget applies to them; profiles and
+    user-to-chart references are bounded by count. Evicting a reference only
+    forgets which chart a user had, never the chart itself while it is cached,
+    and drops the user from the placement and similarity indexes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+        similarity: Optional[ChartSimilarityIndex] = None,
+    ):
+        """Initialize the repository.
+
+        Args:
+            max_entries: Maximum profiles, charts and chart references, each.
+            max_bytes: Byte budget for cached charts (estimated).
+            ttl_seconds: Lifetime of every entry; None keeps entries until evicted.
+            spill_dir: Directory receiving charts evicted for capacity; None
+                discards them.
+            similarity: Nearest-neighbour index to maintain.
+        """
+        super().__init__(similarity)
+        spill = ChartSpill(spill_dir) if spill_dir else None
+        self._profiles = BoundedStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._charts = BoundedStore(max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds, spill=spill)
+        self._chart_refs = BoundedStore(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, on_evict=self._forget_user
+        )
+
+    def expire(self) -> int:
+        """Drop every entry past its TTL.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        return sum(store.expire() for store in (self._profiles, self._charts, self._chart_refs))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-store occupancy, eviction and estimated-bytes metrics."""
+        return {
+            "profiles": self._profiles.stats(),
+            "charts": self._charts.stats(),
+            "chart_refs": self._chart_refs.stats(),
+            "placements": self._placements.stats(),
+            "similarity": self._similar.stats(),
+        }
@@ -1,24 +1,54 @@
 """In-memory repository for storing UserProfile and NatalChart."""
 
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
+from src.core.domain.canonical import chart_content_id, profile_id_for
+from src.core.domain.exceptions import DomainException
 from src.core.domain.models import NatalChart, UserProfile
+from src.infrastructure.persistence.placement_index import PlacementIndex, PlacementMatches
+from src.infrastructure.similarity.vector_index import ChartSimilarityIndex, Matches
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of collapsing duplicate profiles and charts."""
+
+    profiles_merged: int = 0
+    charts_merged: int = 0
+    orphan_charts_removed: int = 0
 
 
 class InMemoryRepository:
-    """In-memory repository implementation."""
+    """In-memory repository implementation.
 
-    def __init__(self):
-        """Initialize the repository."""
+    Charts are stored once under a content-addressed chart ID and shared by
+    reference: each profile points at a chart ID, so profiles with identical
+    birth data reuse the same chart object. Saved charts are also indexed by
+    placement for ``find_users`` and by embedding for ``find_similar``.
+    """
+
+    def __init__(self, similarity: Optional[ChartSimilarityIndex] = None):
+        """Initialize the repository.
+
+        Args:
+            similarity: Nearest-neighbour index to maintain, e.g. one loaded
+                from a shared snapshot; a new empty index by default.
+        """
         self._profiles: Dict[str, UserProfile] = {}
         self._charts: Dict[str, NatalChart] = {}
+        self._chart_refs: Dict[str, str] = {}  # user_id -> chart_id
+        self._aliases: Dict[str, str] = {}  # merged user_id -> surviving user_id
+        self._placements = PlacementIndex()
+        self._similar = similarity if similarity is not None else ChartSimilarityIndex()
 
     def save_profile(self, profile: UserProfile) -> None:
-        """Save a user profile.
+        """Save (upsert) a user profile.
 
         Args:
             profile: The user profile to save.
         """
+        self._aliases.pop(profile.user_id, None)
         self._profiles[profile.user_id] = profile
 
     def get_profile(self, user_id: str) -> Optional[UserProfile]:
@@ -30,16 +60,30 @@ class InMemoryRepository:
         Returns:
             The user profile if found, None otherwise.
         """
-        return self._profiles.get(user_id)
+        return self._profiles.get(self._resolve(user_id))
 
-    def save_chart(self, user_id: str, chart: NatalChart) -> None:
+    def save_chart(self, user_id: str, chart: NatalChart, chart_id: Optional[str] = None) -> str:
         """Save a natal chart for a user.
 
+        The chart is stored once per chart ID; saving an already known chart
+        only points the user at it.
+
         Args:
             user_id: The user ID.
             chart: The natal chart to save.
+            chart_id: Content-addressed chart ID; derived from the chart's
+                content when omitted.
+
+        Returns:
+            str: The chart ID the user now references.
         """
-        self._charts[user_id] = chart
+        chart_id = chart_id or chart_content_id(chart)
+        self._charts.setdefault(chart_id, chart)
+        user_id = self._resolve(user_id)
+        self._chart_refs[user_id] = chart_id
+        self._placements.add(user_id, chart)
+        self._similar.add(user_id, chart)
+        return chart_id
 
     def get_chart(self, user_id: str) -> Optional[NatalChart]:
         """Get a natal chart by user ID.
@@ -50,4 +94,134 @@ class InMemoryRepository:
         Returns:
             The natal chart if found, None otherwise.
         """
-        return self._charts.get(user_id)
\ No newline at end of file
+        chart_id = self._chart_refs.get(self._resolve(user_id))
+        return self._charts.get(chart_id) if chart_id else None
+
+    def get_chart_by_id(self, chart_id: str) -> Optional[NatalChart]:
+        """Get a natal chart by its chart ID.
+
+        Args:
+            chart_id: The content-addressed chart ID.
+
+        Returns:
+            The natal chart if found, None otherwise.
+        """
+        return self._charts.get(chart_id)
+
+    def profile_locations(self) -> List[Tuple[float, float, str]]:
+        """Birthplace (lat, lon, timezone) of every stored profile.
+
+        Returns:
+            One location per profile, e.g. for precomputing daily sky data
+            of the most common places.
+        """
+        return [(p.birth.lat, p.birth.lon, p.birth.timezone) for p in list(self._profiles.values())]
+
+    def find_users(self, query: str, limit: Optional[int] = 100) -> PlacementMatches:
+        """Find users whose saved chart matches a placement query.
+
+        Args:
+            query: e.g. ``"Venus in Libra in house 7"`` or
+                ``"Moon square Saturn within 3 AND NOT Mercury retrograde"``;
+                see ``placement_index`` for the grammar.
+            limit: Maximum user IDs returned; None for all.
+
+        Returns:
+            PlacementMatches: Total match count and the first user IDs.
+
+        Raises:
+            InvalidQueryError: If the query cannot be parsed.
+        """
+        return self._placements.query(query, limit)
+
+    def find_similar(self, user_id: str, k: int = 10) -> Optional[Matches]:
+        """Users whose charts are most similar to a user's chart.
+
+        Args:
+            user_id: The user ID.
+            k: Number of matches.
+
+        Returns:
+            (user ID, cosine similarity) pairs best first, or None if the
+            user has no indexed chart.
+        """
+        return self._similar.similar(self._resolve(user_id), k=k)
+
+    def save_similarity_index(self, directory: str) -> None:
+        """Write the similarity index to a snapshot other processes can map."""
+        self._similar.save(directory)
+
+    def compact(self) -> CompactionReport:
+        """Collapse duplicates left by non-content-addressed writes.
+
+        Profiles with identical canonical birth data are merged into the
+        profile keyed by the content-addressed ID (old IDs keep resolving
+        through aliases), charts with identical content are merged into one
+        entry, and charts no profile references any more are dropped.
+
+        Returns:
+            CompactionReport: Counts of merged and removed entries.
+        """
+        report = CompactionReport()
+
+        # 1. Merge profiles sharing the same canonical birth data
+        for user_id, profile in list(self._profiles.items()):
+            try:
+                target_id = profile_id_for(profile.birth)
+            except DomainException:
+                continue  # legacy record with invalid birth data; leave untouched
+            if target_id == user_id:
+                continue
+            if target_id not in self._profiles:
+                self._profiles[target_id] = profile.model_copy(update={"user_id": target_id})
+            if user_id in self._chart_refs:
+                self._chart_refs.setdefault(target_id, self._chart_refs[user_id])
+                del self._chart_refs[user_id]
+                self._forget_user(user_id)
+                chart = self._charts.get(self._chart_refs[target_id])
+                if chart is not None and target_id not in self._placements:
+                    self._placements.add(target_id, chart)
+                    self._similar.add(target_id, chart)
+            del self._profiles[user_id]
+            self._aliases[user_id] = target_id
+            report.profiles_merged += 1
+
+        # Re-point aliases whose targets were merged in turn
+        for alias in list(self._aliases):
+            self._aliases[alias] = self._resolve(alias)
+
+        # 2. Merge charts with identical content
+        survivors: Dict[str, str] = {}  # content id -> surviving chart id
+        renames: Dict[str, str] = {}
+        for chart_id in sorted(self._charts):
+            content_id = chart_content_id(self._charts[chart_id])
+            survivor = survivors.setdefault(content_id, chart_id)
+            if survivor != chart_id:
+                renames[chart_id] = survivor
+        for user_id, chart_id in self._chart_refs.items():
+            self._chart_refs[user_id] = renames.get(chart_id, chart_id)
+        for chart_id in renames:
+            del self._charts[chart_id]
+        report.charts_merged = len(renames)
+
+        # 3. Drop charts nobody references
+        referenced = set(self._chart_refs.values())
+        orphans: List[str] = [chart_id for chart_id in self._charts if chart_id not in referenced]
+        for chart_id in orphans:
+            del self._charts[chart_id]
+        report.orphan_charts_removed = len(orphans)
+
+        return report
+
+    def _forget_user(self, user_id: str) -> None:
+        """Drop a user from the placement and similarity indexes."""
+        self._placements.remove(user_id)
+        self._similar.remove(user_id)
+
+    def _resolve(self, user_id: str) -> str:
+        """Follow merge aliases to the surviving user ID."""
+        seen = set()
+        while user_id in self._aliases and user_id not in seen:
+            seen.add(user_id)
+            user_id = self._aliases[user_id]
+        return user_id
@@ -0,0 +1,375 @@
+"""Inverted index of stored charts by placement.
+
+Every indexed user gets a small integer document ID. Each placement key
+(body in sign, body in house, aspect between a pair, retrograde body) has a
+posting bitmap of the documents holding it. Like roaring bitmaps, a bitmap is
+split into chunks of 65,536 documents, each chunk a Python ``int`` used as a
+bitset. Queries combine whole chunks with ``&``, ``|`` and ``& ~`` in C, so an
+intersection over millions of charts takes a few milliseconds. Updates touch
+only one chunk per key, so saving a chart never rebuilds anything.
+
+Queries are written in a small language::
+
+    Venus in Libra AND Venus in 7th house
+    Venus in Libra in house 7          (chained placements of one body)
+    Moon square Saturn within 3°
+    (Mars in Aries OR Mars in Scorpio) AND NOT Mercury retrograde
+
+``AND`` binds tighter than ``OR``; keywords are case-insensitive. Aspect orbs
+are indexed in half-degree steps, so ``within`` rounds down to a multiple
+of 0.5°; orbs wider than the engine's widest aspect orb match every aspect
+of the pair.
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from src.core.domain.exceptions import InvalidQueryError
+from src.core.domain.models import NatalChart
+
+CHUNK_SHIFT = 16  # documents per chunk: 65,536
+CHUNK_MASK = (1 << CHUNK_SHIFT) - 1
+
+ORB_STEP = 0.5  # degrees per orb bucket
+MAX_ORB = 10.0  # widest orb the engine reports (SwissEphemerisEngine.MAX_ORB)
+
+SIGNS = ("aries", "taurus", "gemini", "cancer", "leo", "virgo",
+         "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces")
+
+ASPECTS = {
+    "conjunction": "conjunction", "conjunct": "conjunction",
+    "sextile": "sextile",
+    "square": "square",
+    "trine": "trine",
+    "quincunx": "quincunx", "inconjunct": "quincunx",
+    "opposition": "opposition", "opposite": "opposition",
+}
+
+KEYWORDS = {"and", "or", "not", "in", "within", "retrograde", "rx", "(", ")"} | set(ASPECTS)
+
+Key = Tuple[Hashable, ...]
+Bitmap = Dict[int, int]  # chunk number -> bitset of the chunk's documents
+
+
+def _and(a: Bitmap, b: Bitmap) -> Bitmap:
+    if len(b) < len(a):
+        a, b = b, a
+    return {chunk: bits for chunk, mask in a.items() if (bits := mask & b.get(chunk, 0))}
+
+
+def _or(a: Bitmap, b: Bitmap) -> Bitmap:
+    result = dict(a)
+    for chunk, mask in b.items():
+        result[chunk] = result.get(chunk, 0) | mask
+    return result
+
+
+def _and_not(a: Bitmap, b: Bitmap) -> Bitmap:
+    return {chunk: bits for chunk, mask in a.items() if (bits := mask & ~b.get(chunk, 0))}
+
+
+def _documents(bitmap: Bitmap) -> Iterator[int]:
+    """Document IDs of a bitmap, ascending."""
+    for chunk in sorted(bitmap):
+        mask, base = bitmap[chunk], chunk << CHUNK_SHIFT
+        while mask:
+            low = mask & -mask
+            yield base + low.bit_length() - 1
+            mask ^= low
+
+
+def _orb_bucket(orb: float) -> int:
+    return math.ceil(round(orb / ORB_STEP, 9))
+
+
+def chart_keys(chart: NatalChart) -> List[Key]:
+    """Placement keys of a chart.
+
+    Args:
+        chart: The chart to index.
+
+    Returns:
+        List of keys: body/sign, body/house, retrograde body, aspect pair and
+        aspect pair with orb bucket.
+    """
+    keys: List[Key] = []
+    for planet in chart.planets:
+        body = planet.name.lower()
+        keys.append(("sign", body, planet.sign.lower()))
+        keys.append(("house", body, planet.house))
+        if planet.is_retrograde:
+            keys.append(("retrograde", body))
+    for aspect in chart.aspects:
+        kind = ASPECTS.get(aspect.type.lower(), aspect.type.lower())
+        first, second = sorted((aspect.planet1.lower(), aspect.planet2.lower()))
+        keys.append(("aspect", kind, first, second))
+        keys.append(("orb", kind, first, second, _orb_bucket(aspect.orb)))
+    return keys
+
+
+@dataclass
+class PlacementMatches:
+    """Result of a placement query."""
+
+    total: int = 0
+    user_ids: List[str] = field(default_factory=list)  # up to the requested limit, in index order
+
+
+class PlacementIndex:
+    """Incrementally maintained inverted index from placements to users.
+
+    Thread-safe; a user has at most one indexed chart, and indexing a user
+    again replaces their previous postings.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[Key, Bitmap] = {}
+        self._live: Bitmap = {}  # every indexed document, for NOT
+        self._doc_ids: Dict[str, int] = {}  # user_id -> document ID
+        self._users: Dict[int, str] = {}
+        self._doc_keys: Dict[int, List[Key]] = {}
+        self._free: List[int] = []  # IDs of removed documents, reused to keep bitmaps dense
+        self._next_doc = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._doc_ids
+
+    def add(self, user_id: str, chart: NatalChart) -> None:
+        """Index (or re-index) a user's chart.
+
+        Args:
+            user_id: The user ID.
+            chart: The user's natal chart.
+        """
+        keys = list(dict.fromkeys(chart_keys(chart)))
+        with self._lock:
+            self.remove(user_id)
+            doc = self._free.pop() if self._free else self._next_doc
+            if doc == self._next_doc:
+                self._next_doc += 1
+            chunk, bit = doc >> CHUNK_SHIFT, 1 << (doc & CHUNK_MASK)
+            for key in keys + [None]:
+                bitmap = self._live if key is None else self._postings.setdefault(key, {})
+                bitmap[chunk] = bitmap.get(chunk, 0) | bit
+            self._doc_ids[user_id] = doc
+            self._users[doc] = user_id
+            self._doc_keys[doc] = keys
+
+    def remove(self, user_id: str) -> bool:
+        """Drop a user from the index.
+
+        Args:
+            user_id: The user ID.
+
+        Returns:
+            bool: True if the user was indexed.
+        """
+        with self._lock:
+            doc = self._doc_ids.pop(user_id, None)
+            if doc is None:
+                return False
+            chunk, bit = doc >> CHUNK_SHIFT, 1 << (doc & CHUNK_MASK)
+            for key in self._doc_keys.pop(doc) + [None]:
+                bitmap = self._live if key is None else self._postings[key]
+                remaining = bitmap[chunk] & ~bit
+                if remaining:
+                    bitmap[chunk] = remaining
+                else:
+                    del bitmap[chunk]
+                    if key is not None and not bitmap:
+                        del self._postings[key]
+            del self._users[doc]
+            self._free.append(doc)
+            return True
+
+    def query(self, query: str, limit: Optional[int] = 100) -> PlacementMatches:
+        """Find the users whose charts match a query.
+
+        Args:
+            query: Expression in the placement query language.
+            limit: Maximum user IDs returned; None for all. ``total`` always
+                counts every match.
+
+        Returns:
+            PlacementMatches: Match count and user IDs.
+
+        Raises:
+            InvalidQueryError: If the query cannot be parsed.
+        """
+        tree = _Parser(query).parse()
+        with self._lock:
+            bitmap = self._evaluate(tree)
+            total = sum(mask.bit_count() for mask in bitmap.values())
+            user_ids = []
+            for doc in _documents(bitmap):
+                if limit is not None and len(user_ids) >= limit:
+                    break
+                user_ids.append(self._users[doc])
+        return PlacementMatches(total=total, user_ids=user_ids)
+
+    def stats(self) -> Dict[str, int]:
+        """Index size metrics."""
+        with self._lock:
+            return {
+                "documents": len(self._doc_ids),
+                "keys": len(self._postings),
+                "chunks": sum(len(bitmap) for bitmap in self._postings.values()),
+            }
+
+    def _evaluate(self, node: tuple) -> Bitmap:
+        op = node[0]
+        if op == "key":
+            return self._postings.get(node[1], {})
+        if op == "orb":
+            _, kind, first, second, max_bucket = node
+            result: Bitmap = {}
+            for bucket in range(max_bucket + 1):
+                result = _or(result, self._postings.get(("orb", kind, first, second, bucket), {}))
+            return result
+        if op == "not":
+            return _and_not(self._live, self._evaluate(node[1]))
+        if op == "and":
+            left, right = node[1], node[2]
+            # Intersect with the complement directly instead of materialising it
+            if right[0] == "not":
+                return _and_not(self._evaluate(left), self._evaluate(right[1]))
+            if left[0] == "not":
+                return _and_not(self._evaluate(right), self._evaluate(left[1]))
+            return _and(self._evaluate(left), self._evaluate(right))
+        return _or(self._evaluate(node[1]), self._evaluate(node[2]))
+
+
+class _Parser:
+    """Recursive-descent parser producing a tuple tree.
+
+    Grammar::
+
+        expr  := and ("OR" and)*
+        and   := unary ("AND" unary)*
+        unary := "NOT" unary | "(" expr ")" | term
+        term  := BODY ("in" place)+ | BODY ("retrograde" | "rx")
+               | BODY ASPECT BODY ["within" NUMBER]
+        place := SIGN | "house" N | N ["house"]
+    """
+
+    TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()]+')
+    FILLERS = {"the", "house", "degrees", "degree", "deg", "°"}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = [t.strip('"') if t.startswith('"') else t for t in self.TOKEN.findall(text)]
+        self.pos = 0
+
+    def parse(self) -> tuple:
+        if not self.tokens:
+            self._fail("empty query")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            self._fail(f"unexpected {self.tokens[self.pos]!r}")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos].lower() if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        if self.pos >= len(self.tokens):
+            self._fail("unexpected end of query")
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+
+    def _fail(self, reason: str):
+        raise InvalidQueryError(details=f"{reason} in {self.text!r}")
+
+    def _or(self) -> tuple:
+        node = self._and()
+        while self._peek() == "or":
+            self.pos += 1
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> tuple:
+        node = self._unary()
+        while self._peek() == "and":
+            self.pos += 1
+            node = ("and", node, self._unary())
+        return node
+
+    def _unary(self) -> tuple:
+        token = self._peek()
+        if token == "not":
+            self.pos += 1
+            return ("not", self._unary())
+        if token == "(":
+            self.pos += 1
+            node = self._or()
+            if self._next() != ")":
+                self._fail("missing ')'")
+            return node
+        return self._term()
+
+    def _body(self) -> str:
+        words = []
+        while self._peek() is not None and self._peek() not in KEYWORDS:
+            words.append(self._next())
+        if not words:
+            self._fail(f"expected a body name before {self._peek() or 'end of query'!r}")
+        return " ".join(words).lower()
+
+    def _term(self) -> tuple:
+        body = self._body()
+        token = self._peek()
+        if token in ("retrograde", "rx"):
+            self.pos += 1
+            return ("key", ("retrograde", body))
+        if token in ASPECTS:
+            self.pos += 1
+            kind = ASPECTS[token]
+            first, second = sorted((body, self._body()))
+            if self._peek() != "within":
+                return ("key", ("aspect", kind, first, second))
+            self.pos += 1
+            orb = self._number(self._next())
+            if orb < 0:
+                self._fail(f"negative orb {orb:g}")
+            while self._peek() in self.FILLERS:
+                self.pos += 1
+            return ("orb", kind, first, second, int(min(orb, MAX_ORB) / ORB_STEP + 1e-9))
+        if token != "in":
+            self._fail(f"expected 'in', an aspect or 'retrograde' after {body!r}")
+        node = None
+        while self._peek() == "in":
+            self.pos += 1
+            placement = ("key", self._place(body))
+            node = placement if node is None else ("and", node, placement)
+        return node
+
+    def _place(self, body: str) -> Key:
+        while self._peek() in ("the", "house"):
+            self.pos += 1
+        token = self._next()
+        if token.lower() in SIGNS:
+            return ("sign", body, token.lower())
+        house = int(self._number(token))
+        if not 1 <= house <= 12 or house != self._number(token):
+            self._fail(f"no house {token!r}")
+        if self._peek() == "house":
+            self.pos += 1
+        return ("house", body, house)
+
+    def _number(self, token: str) -> float:
+        value = re.sub(r"(°|st|nd|rd|th)$", "", token.lower())
+        try:
+            number = float(value)
+        except ValueError:
+            number = math.nan
+        if not math.isfinite(number):
+            self._fail(f"expected a sign or number, got {token!r}")
+        return number
@@ -0,0 +1,294 @@
+"""Chart cache in shared memory, one per host for every worker process.
+
+Several uvicorn workers each holding their own chart cache keep the same
+chart N times, and each worker sees only its share of the repeat requests.
+This cache is a memory-mapped file (under ``/dev/shm`` when available) that
+every worker maps, so a chart computed by one worker is a hit in all of them.
+
+The file holds a header, an index of fixed-size entries and a data area of
+fixed-size slots, entry i owning slot i. Charts are stored as compact binary
+records (``encode_chart``) under the first 16 bytes of their birth data
+hash. A key lives in one of ``PROBE_WINDOW`` consecutive entries starting at
+its hash position (open addressing); storing into a full window replaces
+its least recently used entry, so entries are never deleted and no
+tombstones are needed.
+
+Reads take no lock. Each entry has a sequence number that a writer makes odd
+while it rewrites the entry and even again when done (a seqlock); a reader
+copies the record and keeps it only if the number was even and unchanged.
+Writers are serialized per stripe of entries, by a thread lock inside the
+process and an ``fcntl`` byte-range lock across processes. A writer that
+dies mid-write leaves its entry odd; since the lock is released with the
+process, the next writer finds the odd number under the lock and rewrites
+the entry, keeping the number odd until it is done.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.domain.models import NatalChart
+from src.infrastructure.astro_engine.bodies import BODY_CATALOG
+from src.infrastructure.astro_engine.chart_arrays import SIGNS
+from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+MAGIC = b"LSC1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIIIII")  # magic, version, schema, entries, slot size, probe window, stripes
+HEADER_SIZE = 64
+ENTRY = struct.Struct("<II16sd")  # sequence, record length, key, last use (Unix time)
+ENTRY_DTYPE = np.dtype([("seq", "<u4"), ("length", "<u4"), ("key", "S16"), ("used", "<f8")])
+SEQ = struct.Struct("<I")
+ENTRY_BODY = struct.Struct("<I16sd")  # the entry after its sequence number
+USED = struct.Struct("<d")
+KEY_BYTES = 16
+PROBE_WINDOW = 8  # entries a key may occupy, starting at its hash position
+READ_RETRIES = 3  # reads racing a writer are retried, then counted as misses
+
+RECORD = struct.Struct("<dBBH")  # julian day (NaN when unknown), planets, houses, aspects
+PLANET = struct.Struct("<BBdBB")  # name, sign, longitude, house, retrograde
+HOUSE = struct.Struct("<BdB")  # number, degree, sign
+ASPECT = struct.Struct("<BBBd")  # planet1, planet2, type, orb
+
+NAMES = tuple(BODY_CATALOG)
+ASPECT_NAMES = tuple(SwissEphemerisEngine.ASPECT_TYPES.values())
+# Records store names as indices into these tuples, so files written with
+# other vocabularies are rebuilt instead of read
+SCHEMA = zlib.crc32("\n".join(NAMES + SIGNS + ASPECT_NAMES).encode("utf-8"))
+
+_NAME_CODES = {name: i for i, name in enumerate(NAMES)}
+_SIGN_CODES = {sign: i for i, sign in enumerate(SIGNS)}
+_ASPECT_CODES = {name: i for i, name in enumerate(ASPECT_NAMES)}
+
+
+def encode_chart(chart: NatalChart) -> Optional[bytes]:
+    """Pack a chart into a binary record.
+
+    Args:
+        chart: The chart.
+
+    Returns:
+        Optional[bytes]: The record, or None if the chart names a body, sign
+        or aspect outside the record vocabulary.
+    """
+    julian_day = float("nan") if chart.julian_day is None else chart.julian_day
+    try:
+        parts = [RECORD.pack(julian_day, len(chart.planets), len(chart.houses), len(chart.aspects))]
+        parts.extend(
+            PLANET.pack(_NAME_CODES[p.name], _SIGN_CODES[p.sign], p.longitude, p.house, p.is_retrograde)
+            for p in chart.planets
+        )
+        parts.extend(HOUSE.pack(h.number, h.degree, _SIGN_CODES[h.sign]) for h in chart.houses)
+        parts.extend(
+            ASPECT.pack(_NAME_CODES[a.planet1], _NAME_CODES[a.planet2], _ASPECT_CODES[a.type], a.orb)
+            for a in chart.aspects
+        )
+    except (KeyError, struct.error):
+        return None
+    return b"".join(parts)
+
+
+def decode_chart(record: bytes) -> NatalChart:
+    """Rebuild a chart from an ``encode_chart`` record."""
+    julian_day, n_planets, n_houses, n_aspects = RECORD.unpack_from(record, 0)
+    offset = RECORD.size
+    end = offset + n_planets * PLANET.size
+    planets = [
+        {"name": NAMES[name], "sign": SIGNS[sign], "longitude": longitude, "house": house,
+         "is_retrograde": bool(retrograde)}
+        for name, sign, longitude, house, retrograde in PLANET.iter_unpack(record[offset:end])
+    ]
+    offset, end = end, end + n_houses * HOUSE.size
+    houses = [
+        {"number": number, "degree": degree, "sign": SIGNS[sign]}
+        for number, degree, sign in HOUSE.iter_unpack(record[offset:end])
+    ]
+    offset, end = end, end + n_aspects * ASPECT.size
+    aspects = [
+        {"planet1": NAMES[first], "planet2": NAMES[second], "type": ASPECT_NAMES[kind], "orb": orb}
+        for first, second, kind, orb in ASPECT.iter_unpack(record[offset:end])
+    ]
+    # One validation of plain dicts is several times faster than model_construct per object
+    return NatalChart.model_validate({
+        "julian_day": None if julian_day != julian_day else julian_day,  # NaN marks an unknown day
+        "planets": planets, "houses": houses, "aspects": aspects,
+    })
+
+
+def default_cache_path() -> str:
+    """Cache file in shared memory (``/dev/shm``) when the host has it, else the temp dir."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"lilith-charts-v{FORMAT_VERSION}.cache")
+
+
+class SharedChartCache:
+    """Fixed-size chart cache in a memory-mapped file shared by all workers."""
+
+    def __init__(self, path: Optional[str] = None, entries: int = 32_768, slot_size: int = 1024,
+                 stripes: int = 64):
+        """Map the cache file, creating it if it is missing or has another layout.
+
+        Args:
+            path: Cache file; defaults to ``default_cache_path``.
+            entries: Number of charts held, rounded up to a power of two.
+            slot_size: Bytes per record; larger charts are not cached.
+            stripes: Number of write locks the entries are spread over.
+        """
+        self.path = path or default_cache_path()
+        self.entries = 1 << max(entries - 1, 1).bit_length()
+        self.slot_size = slot_size
+        self.stripes = stripes
+        self._mask = self.entries - 1
+        self._data_offset = HEADER_SIZE + self.entries * ENTRY.size
+        self._header = HEADER.pack(MAGIC, FORMAT_VERSION, SCHEMA, self.entries, slot_size, PROBE_WINDOW, stripes)
+        self._fd = self._open()
+        self._mm = mmap.mmap(self._fd, self._data_offset + self.entries * slot_size)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Counters of this process; workers report their own
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0  # charts too large for a slot or outside the record vocabulary
+
+    def _open(self) -> int:
+        """Open the cache file, replacing it when its header does not match."""
+        size = self._data_offset + self.entries * self.slot_size
+        with open(self.path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # one process creates the file, the others wait and map it
+            try:
+                with open(self.path, "rb") as existing:
+                    header = existing.read(HEADER.size)
+                    current = header == self._header and os.fstat(existing.fileno()).st_size == size
+            except FileNotFoundError:
+                current = False
+            if not current:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+                with os.fdopen(fd, "wb") as out:
+                    out.write(self._header)
+                    out.truncate(size)  # sparse: every entry starts empty
+                os.replace(tmp_path, self.path)
+            return os.open(self.path, os.O_RDWR)
+
+    def get(self, key: str) -> Optional[NatalChart]:
+        """Return the cached chart of a birth data hash, or None.
+
+        Args:
+            key: Hex birth data hash, e.g. from ``birth_data_hash``.
+
+        Returns:
+            Optional[NatalChart]: The chart, or None on a miss.
+        """
+        record = self._read(bytes.fromhex(key[:2 * KEY_BYTES]))
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_chart(record)
+
+    def put(self, key: str, chart: NatalChart) -> bool:
+        """Store a chart under a birth data hash.
+
+        Args:
+            key: Hex birth data hash.
+            chart: The chart.
+
+        Returns:
+            bool: False if the chart cannot be cached.
+        """
+        record = encode_chart(chart)
+        if record is None or len(record) > self.slot_size:
+            self.skipped += 1
+            return False
+        if self._write(bytes.fromhex(key[:2 * KEY_BYTES]), record):
+            self.stores += 1
+        return True
+
+    def _window(self, key: bytes) -> List[int]:
+        start = int.from_bytes(key[:8], "little") & self._mask
+        return [(start + i) & self._mask for i in range(min(PROBE_WINDOW, self.entries))]
+
+    def _read(self, key: bytes) -> Optional[bytes]:
+        mm = self._mm
+        for index in self._window(key):
+            position = HEADER_SIZE + index * ENTRY.size
+            for _ in range(READ_RETRIES):
+                seq, length, stored, _ = ENTRY.unpack_from(mm, position)
+                if stored != key:
+                    break
+                if seq & 1:
+                    continue  # being written
+                slot = self._data_offset + index * self.slot_size
+                record = mm[slot:slot + length]
+                if SEQ.unpack_from(mm, position)[0] == seq:
+                    USED.pack_into(mm, position + 24, time.time())  # racy by design: only guides eviction
+                    return record
+            else:
+                return None  # kept losing to writers
+        return None
+
+    def _write(self, key: bytes, record: bytes) -> bool:
+        """Store a record, replacing the least recently used entry of the key's window.
+
+        Returns:
+            bool: False if another worker stored the key first.
+        """
+        mm = self._mm
+        victim, oldest = None, float("inf")
+        for index in self._window(key):
+            seq, length, stored, used = ENTRY.unpack_from(mm, HEADER_SIZE + index * ENTRY.size)
+            if stored == key:
+                if not seq & 1:
+                    return False
+                victim = index  # being written, or left half-written by a dead writer
+                break
+            if length == 0:
+                victim = index
+                break
+            if used < oldest:
+                victim, oldest = index, used
+        position = HEADER_SIZE + victim * ENTRY.size
+        slot = self._data_offset + victim * self.slot_size
+        stripe = victim % self.stripes
+        with self._locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                seq, _, stored, _ = ENTRY.unpack_from(mm, position)
+                if stored == key and not seq & 1:
+                    return False  # another worker finished storing it while this one waited
+                # Odd under the lock means a writer died mid-write: keep it odd while rewriting
+                writing = (seq | 1) & 0xFFFFFFFF
+                SEQ.pack_into(mm, position, writing)
+                mm[slot:slot + len(record)] = record
+                ENTRY_BODY.pack_into(mm, position + SEQ.size, len(record), key, time.time())
+                SEQ.pack_into(mm, position, (writing + 1) & 0xFFFFFFFF)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Entries in use across all workers, and this process's hit counters."""
+        index = np.frombuffer(self._mm, dtype=ENTRY_DTYPE, count=self.entries, offset=HEADER_SIZE)
+        used = int(np.count_nonzero(index["length"]))
+        del index  # the mmap cannot close while a view is alive
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "used": used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
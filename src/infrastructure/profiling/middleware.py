@@ -0,0 +1,96 @@
+"""ASGI middleware recording profiles of sampled or slow requests.
+
+Modes:
+
+* ``sample``: a random ``sample_rate`` fraction of requests is profiled and
+  every one of them is recorded;
+* ``slow``: every request is profiled and recorded only if it took at least
+  ``slow_ms``.
+
+This is a plain ASGI middleware rather than ``BaseHTTPMiddleware``, so the
+route handlers run inside its ``__call__`` frame, which is how the sampler
+attributes stacks to requests. With profiling off it is not installed at all.
+"""
+
+import random
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict
+
+from src.infrastructure.profiling.recorder import ProfileCapture, ProfileRecorder, StackSampler
+from src.infrastructure.profiling.stages import current_trace, end_trace, start_trace
+
+MODES = ("off", "sample", "slow")
+
+
+class ProfilingMiddleware:
+    """Flight recorder for request profiles."""
+
+    def __init__(
+        self,
+        app: Callable,
+        recorder: ProfileRecorder,
+        mode: str = "slow",
+        sample_rate: float = 0.01,
+        slow_ms: float = 1000.0,
+        interval_ms: float = 5.0,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI app.
+            recorder: Destination of the captures.
+            mode: "sample" or "slow".
+            sample_rate: Fraction of requests profiled in sample mode.
+            slow_ms: Minimum duration recorded in slow mode.
+            interval_ms: Milliseconds between stack samples.
+        """
+        if mode not in MODES[1:]:
+            raise ValueError(f"Unknown profiling mode {mode!r}; expected one of {MODES}")
+        self.app = app
+        self.recorder = recorder
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.interval_ms = interval_ms
+        self.sampler = StackSampler(interval_ms / 1000.0)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or (self.mode == "sample" and random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        capture = ProfileCapture(f"{scope['method']} {scope['path']}")
+        status = {"code": 500}
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = start_trace()
+        trace = current_trace()
+        frame = sys._getframe()
+        self.sampler.track(frame, capture)
+        started = time.time()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.sampler.untrack(frame)
+            end_trace(token)
+            duration_ms = trace.elapsed_ms()
+            if self.mode == "sample" or duration_ms >= self.slow_ms:
+                self.recorder.write({
+                    "mode": self.mode,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "status": status["code"],
+                    "started_at": started,
+                    "duration_ms": duration_ms,
+                    "interval_ms": self.interval_ms,
+                    "sample_count": sum(capture.samples.values()),
+                    "stages": [asdict(timing) for timing in trace.stages],
+                    "samples": dict(capture.samples),
+                })
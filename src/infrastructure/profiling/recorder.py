@@ -0,0 +1,179 @@
+"""Statistical request profiler and its on-disk ring buffer.
+
+``StackSampler`` is a background thread that wakes every ``interval`` and,
+while any request is being profiled, snapshots the Python stacks of all
+threads with ``sys._current_frames()``. A sample is credited to a request
+when the request's middleware frame is on the sampled stack. That frame is
+where the request's handlers run, so requests interleaved on the event loop
+are told apart. Frames above it (server and event loop) are left out.
+
+``ProfileRecorder`` keeps the most recent captures as one JSON file each in
+a directory, pruning the oldest beyond ``capacity``. Several worker
+processes can share the directory. Captures export to the folded-stack
+format read by ``flamegraph.pl``, speedscope and most flamegraph viewers.
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional
+
+MAX_DEPTH = 128  # frames kept per sample
+MAX_STACKS = 5_000  # distinct stacks kept per capture; further ones are counted as "[truncated]"
+
+_CAPTURE_ID = re.compile(r"^\d+-\d+$")
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}.{code.co_qualname}"
+
+
+class ProfileCapture:
+    """Samples collected for one request."""
+
+    def __init__(self, root: str):
+        """Initialize the capture.
+
+        Args:
+            root: Name of the flamegraph root frame, e.g. ``"GET /api/v1/sky/now"``.
+        """
+        self.root = root
+        self.samples: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, stack: List[str]) -> None:
+        key = ";".join([self.root] + stack)
+        with self._lock:
+            if key not in self.samples and len(self.samples) >= MAX_STACKS:
+                key = f"{self.root};[truncated]"
+            self.samples[key] += 1
+
+
+class StackSampler:
+    """Background thread sampling the stacks of the requests being profiled."""
+
+    def __init__(self, interval: float = 0.005):
+        """Initialize the sampler; the thread starts with the first tracked request.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self._active: Dict[int, ProfileCapture] = {}  # id(middleware frame) -> capture
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, frame: FrameType, capture: ProfileCapture) -> None:
+        """Credit samples passing through ``frame`` to ``capture`` until ``untrack``."""
+        with self._lock:
+            self._active[id(frame)] = capture
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def untrack(self, frame: FrameType) -> None:
+        with self._lock:
+            self._active.pop(id(frame), None)
+
+    def sample(self) -> None:
+        """Take one sample of every thread."""
+        with self._lock:
+            active = dict(self._active)
+        if not active:
+            return
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack: List[str] = []
+            owner = None
+            while frame is not None:
+                owner = active.get(id(frame))
+                if owner is not None:
+                    break
+                stack.append(_label(frame))
+                frame = frame.f_back
+            if owner is not None:
+                owner.add(stack[:MAX_DEPTH][::-1])
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.sample()
+
+
+class ProfileRecorder:
+    """Bounded on-disk ring buffer of request captures."""
+
+    def __init__(self, directory: str, capacity: int = 200):
+        """Initialize the recorder.
+
+        Args:
+            directory: Where captures are stored; created if missing.
+            capacity: Captures kept; older ones are deleted.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: Dict) -> str:
+        """Store a capture and prune the oldest beyond capacity.
+
+        Args:
+            record: JSON-serialisable capture (see ``ProfilingMiddleware``).
+
+        Returns:
+            str: The capture ID.
+        """
+        capture_id = f"{time.time_ns()}-{os.getpid()}"
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"id": capture_id, **record}, f)
+        os.replace(tmp_path, self._path(capture_id))
+        for stale in self._ids()[self.capacity:]:
+            try:
+                os.remove(self._path(stale))
+            except FileNotFoundError:
+                pass  # pruned concurrently by another process
+        return capture_id
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        """Summaries of the most recent captures, newest first (without samples)."""
+        summaries = []
+        for capture_id in self._ids()[:limit]:
+            record = self.get(capture_id)
+            if record is not None:
+                record.pop("samples", None)
+                summaries.append(record)
+        return summaries
+
+    def get(self, capture_id: str) -> Optional[Dict]:
+        """A full capture, or None if unknown or already pruned."""
+        if not _CAPTURE_ID.match(capture_id):
+            return None
+        try:
+            with open(self._path(capture_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def folded(record: Dict) -> str:
+        """Folded stacks (``frame;frame;frame count`` lines) for flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(record.get("samples", {}).items()))
+
+    def _ids(self) -> List[str]:
+        """Capture IDs, newest first."""
+        ids = [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+        return sorted(ids, key=lambda i: tuple(int(part) for part in i.split("-")), reverse=True)
+
+    def _path(self, capture_id: str) -> str:
+        return os.path.join(self.directory, f"{capture_id}.json")
@@ -0,0 +1,109 @@
+"""Per-request stage timings.
+
+Code marks its expensive steps with ``with stage("chart"):``. When the
+current request is being traced, the step's start, duration and provenance
+(computed, served from cache, failed) are appended to its ``StageTrace``;
+otherwise ``stage`` costs one context-variable lookup. Code may also attach
+details of what it did, e.g. the time conversion applied, guarded by
+``current_trace()`` so nothing is built for untraced requests. The trace
+travels in a ``ContextVar``, so it follows the request across ``await`` and
+into threadpool calls.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageTiming:
+    """One timed step of a request."""
+
+    name: str
+    start_ms: float  # since the start of the trace
+    duration_ms: float = 0.0
+    source: str = "computed"  # "computed", "cache" or "error"
+
+
+@dataclass
+class StageTrace:
+    """Stage timings collected for one request."""
+
+    started: float = field(default_factory=time.perf_counter)
+    stages: List[StageTiming] = field(default_factory=list)
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+
+_current_trace: ContextVar[Optional[StageTrace]] = ContextVar("stage_trace", default=None)
+
+
+def start_trace() -> Token:
+    """Begin collecting stage timings for the current context.
+
+    Returns:
+        Token: Pass to ``end_trace`` to restore the previous context.
+    """
+    return _current_trace.set(StageTrace())
+
+
+def current_trace() -> Optional[StageTrace]:
+    """The trace of the current context, if one is being collected."""
+    return _current_trace.get()
+
+
+def end_trace(token: Token) -> None:
+    _current_trace.reset(token)
+
+
+@contextmanager
+def tracing() -> Iterator[StageTrace]:
+    """Trace the enclosed code, joining the trace already collected if any.
+
+    Joining keeps the stages visible to an outer collector, such as the
+    profiler, when a request is traced for a second reason.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        yield trace
+        return
+    token = start_trace()
+    try:
+        yield _current_trace.get()
+    finally:
+        end_trace(token)
+
+
+# Yielded by ``stage`` outside a trace; writes to it are discarded
+_UNTRACED = StageTiming(name="", start_ms=0.0)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTiming]:
+    """Time a step of the current request, if it is traced.
+
+    Args:
+        name: Step name, e.g. ``"chart"`` or ``"ai.analysis"``.
+
+    Yields:
+        StageTiming: The step's record; set its ``source`` to ``"cache"``
+        when the step was served from a cache.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _UNTRACED
+        return
+    start = time.perf_counter()
+    timing = StageTiming(name=name, start_ms=(start - trace.started) * 1000.0)
+    try:
+        yield timing
+    except BaseException:
+        timing.source = "error"
+        raise
+    finally:
+        timing.duration_ms = (time.perf_counter() - start) * 1000.0
+        trace.stages.append(timing)
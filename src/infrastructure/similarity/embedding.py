@@ -0,0 +1,134 @@
+"""Fixed-length vector embedding of natal charts.
+
+A chart becomes a float32 vector of three feature groups:
+
+* longitudes: sin and cos of each body's ecliptic longitude, so 359° and 1°
+  are neighbours;
+* houses: sin and cos of the middle of each body's house;
+* aspects: for each body and aspect type, the summed strength
+  ``1 - orb / ASPECT_ORB_LIMIT`` of its aspects of that type.
+
+Each group is scaled to unit length and weighted, and the whole vector is
+normalised, so the dot product of two embeddings is their cosine similarity.
+Bodies missing from a chart (e.g. a reduced body set) contribute zeros.
+
+``embed_batch`` computes the same vectors for a whole ``ChartBatch`` with
+array operations, without building pydantic charts.
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.core.domain.models import NatalChart
+from src.infrastructure.astro_engine.chart_arrays import NO_ASPECT, ChartBatch
+
+EMBEDDED_BODIES = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+ASPECT_TYPES = ("Conjunction", "Sextile", "Square", "Trine", "Quincunx", "Opposition")
+ASPECT_ORB_LIMIT = 10.0  # degrees; widest orb the engine reports
+
+GROUP_WEIGHTS = {"longitudes": 1.0, "houses": 0.6, "aspects": 0.5}
+
+_BODY_INDEX = {name: i for i, name in enumerate(EMBEDDED_BODIES)}
+_ASPECT_INDEX = {name: i for i, name in enumerate(ASPECT_TYPES)}
+_N = len(EMBEDDED_BODIES)
+
+EMBEDDING_DIM = 2 * _N + 2 * _N + _N * len(ASPECT_TYPES)
+
+
+def _unit(group: np.ndarray, weight: float) -> np.ndarray:
+    norm = float(np.linalg.norm(group))
+    return group * (weight / norm) if norm > 0 else group
+
+
+def embed_chart(chart: NatalChart) -> np.ndarray:
+    """Embed a chart.
+
+    Args:
+        chart: The natal chart.
+
+    Returns:
+        np.ndarray: Unit-length float32 vector of ``EMBEDDING_DIM`` values.
+    """
+    longitudes = np.zeros(2 * _N)
+    houses = np.zeros(2 * _N)
+    aspects = np.zeros((_N, len(ASPECT_TYPES)))
+    for planet in chart.planets:
+        i = _BODY_INDEX.get(planet.name)
+        if i is None:
+            continue
+        angle = np.radians(planet.longitude)
+        longitudes[2 * i:2 * i + 2] = np.sin(angle), np.cos(angle)
+        angle = np.radians((planet.house - 0.5) * 30.0)
+        houses[2 * i:2 * i + 2] = np.sin(angle), np.cos(angle)
+    for aspect in chart.aspects:
+        kind = _ASPECT_INDEX.get(aspect.type)
+        if kind is None:
+            continue
+        strength = max(0.0, 1.0 - aspect.orb / ASPECT_ORB_LIMIT)
+        for name in (aspect.planet1, aspect.planet2):
+            i = _BODY_INDEX.get(name)
+            if i is not None:
+                aspects[i, kind] += strength
+
+    vector = np.concatenate([
+        _unit(longitudes, GROUP_WEIGHTS["longitudes"]),
+        _unit(houses, GROUP_WEIGHTS["houses"]),
+        _unit(aspects.ravel(), GROUP_WEIGHTS["aspects"]),
+    ])
+    return _unit(vector, 1.0).astype(np.float32)
+
+
+def embed_charts(charts: Iterable[NatalChart]) -> np.ndarray:
+    """Embed many charts into an ``(n, EMBEDDING_DIM)`` float32 matrix."""
+    rows = [embed_chart(chart) for chart in charts]
+    return np.stack(rows) if rows else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+
+def _unit_rows(groups: np.ndarray, weight: float) -> np.ndarray:
+    norms = np.linalg.norm(groups, axis=1, keepdims=True)
+    return np.divide(groups * weight, norms, out=np.zeros_like(groups), where=norms > 0)
+
+
+def embed_batch(batch: ChartBatch) -> np.ndarray:
+    """Embed every chart of a batch; row ``i`` equals ``embed_chart`` of chart ``i``.
+
+    Args:
+        batch: Charts calculated with ``SwissEphemerisEngine.calculate_batch``.
+
+    Returns:
+        np.ndarray: ``(len(batch), EMBEDDING_DIM)`` float32 matrix.
+    """
+    n = len(batch)
+    body_map = np.array([_BODY_INDEX.get(name, -1) for name in batch.names], dtype=np.int64)
+    columns = np.flatnonzero(body_map >= 0)
+    slots = body_map[columns]
+
+    longitudes = np.zeros((n, _N, 2))
+    angle = np.radians(batch.longitudes[:, columns])
+    longitudes[:, slots, 0], longitudes[:, slots, 1] = np.sin(angle), np.cos(angle)
+    houses = np.zeros((n, _N, 2))
+    angle = np.radians((batch.houses[:, columns] - 0.5) * 30.0)
+    houses[:, slots, 0], houses[:, slots, 1] = np.sin(angle), np.cos(angle)
+
+    aspects = np.zeros((n, _N, len(ASPECT_TYPES)))
+    kind_map = np.array([_ASPECT_INDEX.get(name, -1) for name in batch.aspect_names] + [-1], dtype=np.int64)
+    kinds = kind_map[batch.aspect_types]  # NO_ASPECT (-1) maps to the trailing -1
+    strengths = np.maximum(0.0, 1.0 - np.nan_to_num(batch.aspect_orbs) / ASPECT_ORB_LIMIT)
+    found = (batch.aspect_types != NO_ASPECT) & (kinds >= 0)
+    rows, pair_index = np.nonzero(found)
+    for end in (0, 1):
+        bodies = body_map[batch.pairs[pair_index, end]]
+        keep = bodies >= 0
+        np.add.at(
+            aspects,
+            (rows[keep], bodies[keep], kinds[rows[keep], pair_index[keep]]),
+            strengths[rows[keep], pair_index[keep]],
+        )
+
+    vectors = np.concatenate([
+        _unit_rows(longitudes.reshape(n, -1), GROUP_WEIGHTS["longitudes"]),
+        _unit_rows(houses.reshape(n, -1), GROUP_WEIGHTS["houses"]),
+        _unit_rows(aspects.reshape(n, -1), GROUP_WEIGHTS["aspects"]),
+    ], axis=1)
+    return _unit_rows(vectors, 1.0).astype(np.float32)
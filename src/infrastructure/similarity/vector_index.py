@@ -0,0 +1,441 @@
+"""Nearest-neighbour indexes over chart embeddings.
+
+``FlatIndex`` scores every stored vector with one matrix-vector product:
+exact, and fastest below some tens of thousands of charts. ``IVFIndex``
+partitions vectors into ``nlist`` clusters with spherical k-means and scans
+only the ``nprobe`` clusters closest to the query. Each cluster is a
+``FlatIndex``. ``ChartSimilarityIndex`` embeds charts, starts flat and
+switches to IVF once it holds ``ivf_threshold`` vectors.
+
+Snapshots are written as ``.npy`` files plus a JSON manifest. Loading maps the
+vectors read-only (``mmap_mode="r"``), so every worker process shares one
+copy through the OS page cache. A cluster is copied into private memory only
+when that process first modifies it.
+
+Every process of a deployment holds its own index, so only one of them, the
+holder of ``writer.lock`` (see ``claim_snapshot_writer``), should save.
+Saves and loads also serialize on ``index.lock`` with ``fcntl``: a load never
+opens a manifest whose files a concurrent save is deleting.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import IO, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.domain.models import NatalChart
+from src.infrastructure.similarity.embedding import EMBEDDING_DIM, embed_chart
+
+MANIFEST = "index.json"
+LOCK_FILE = "index.lock"
+WRITER_LOCK_FILE = "writer.lock"
+FORMAT_VERSION = 1
+
+Matches = List[Tuple[Hashable, float]]  # (key, cosine similarity), best first
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class FlatIndex:
+    """Exact index: a dense float32 matrix scanned with one product per query."""
+
+    def __init__(self, dim: int, vectors: Optional[np.ndarray] = None, keys: Sequence[Hashable] = ()):
+        """Initialize the index.
+
+        Args:
+            dim: Vector dimension.
+            vectors: Initial ``(len(keys), dim)`` matrix; may be a read-only
+                memory map, which is copied on the first write.
+            keys: Keys of the initial rows.
+        """
+        self.dim = dim
+        self._keys: List[Hashable] = list(keys)
+        self._rows: Dict[Hashable, int] = {key: row for row, key in enumerate(self._keys)}
+        self._vectors = vectors if vectors is not None else np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    @property
+    def keys(self) -> List[Hashable]:
+        return self._keys
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The stored vectors, one row per key (a view, not a copy)."""
+        return self._vectors[:len(self._keys)]
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        return None if row is None else self._vectors[row]
+
+    def add(self, key: Hashable, vector: np.ndarray) -> None:
+        """Insert or replace the vector of a key."""
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._reserve(row + 1)
+            self._keys.append(key)
+            self._rows[key] = row
+        else:
+            self._reserve(len(self._keys))
+        self._vectors[row] = vector
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a key, moving the last row into its place."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self._reserve(len(self._keys))
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+        return True
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, List[Hashable]]:
+        """Exact top-k by dot product.
+
+        Returns:
+            Tuple of (scores, keys), best first.
+        """
+        scores = self.matrix @ query
+        best = _top_k(scores, k)
+        return scores[best], [self._keys[i] for i in best]
+
+    def _reserve(self, size: int) -> None:
+        """Make the matrix writable with room for ``size`` rows, doubling as needed."""
+        capacity = self._vectors.shape[0]
+        if size <= capacity and self._vectors.flags.writeable:
+            return
+        grown = np.zeros((max(size, 2 * capacity, 16), self.dim), dtype=np.float32)
+        grown[:len(self._keys)] = self.matrix
+        self._vectors = grown
+
+
+class IVFIndex:
+    """Inverted-file index: k-means clusters, each a ``FlatIndex``, probed nearest first."""
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 8, lists: Optional[List[FlatIndex]] = None):
+        """Initialize the index.
+
+        Args:
+            centroids: ``(nlist, dim)`` unit-length cluster centres.
+            nprobe: Clusters scanned per query; higher is slower and more exact.
+            lists: Existing clusters, in centroid order.
+        """
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.dim = self.centroids.shape[1]
+        self.nprobe = nprobe
+        self.lists = lists if lists is not None else [FlatIndex(self.dim) for _ in range(len(self.centroids))]
+        self._where: Dict[Hashable, int] = {key: i for i, flat in enumerate(self.lists) for key in flat.keys}
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        keys: Sequence[Hashable],
+        nlist: int,
+        nprobe: int = 8,
+        iterations: int = 10,
+        sample_size: int = 100_000,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Cluster vectors with spherical k-means and index them.
+
+        Args:
+            vectors: ``(n, dim)`` unit-length vectors.
+            keys: Key of each row.
+            nlist: Number of clusters.
+            nprobe: Clusters scanned per query.
+            iterations: k-means iterations.
+            sample_size: Rows used to fit the centroids.
+            seed: Random seed, for reproducible clusters.
+
+        Returns:
+            IVFIndex: The trained and filled index.
+        """
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = max(1, min(nlist, n))
+        sample = vectors[rng.choice(n, min(n, sample_size), replace=False)] if n > sample_size else vectors
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].astype(np.float32)
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            centroids = np.where(empty[:, None], centroids, sums / np.where(norms == 0, 1, norms))
+
+        assign = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65_536):  # bound the (rows, nlist) score matrix
+            assign[start:start + 65_536] = np.argmax(vectors[start:start + 65_536] @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        keys = list(keys)
+        lists = []
+        for i in range(nlist):
+            rows = order[bounds[i]:bounds[i + 1]]
+            lists.append(FlatIndex(vectors.shape[1], np.array(vectors[rows], dtype=np.float32), [keys[r] for r in rows]))
+        return cls(centroids, nprobe=nprobe, lists=lists)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._where
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        i = self._where.get(key)
+        return None if i is None else self.lists[i].get(key)
+
+    def add(self, key: Hashable, vector: np.ndarray) -> None:
+        """Insert or replace a vector in its nearest cluster."""
+        i = int(np.argmax(self.centroids @ vector))
+        previous = self._where.get(key)
+        if previous is not None and previous != i:
+            self.lists[previous].remove(key)
+        self.lists[i].add(key, vector)
+        self._where[key] = i
+
+    def remove(self, key: Hashable) -> bool:
+        i = self._where.pop(key, None)
+        return i is not None and self.lists[i].remove(key)
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, List[Hashable]]:
+        """Approximate top-k over the ``nprobe`` nearest clusters.
+
+        Returns:
+            Tuple of (scores, keys), best first.
+        """
+        probes = _top_k(self.centroids @ query, nprobe or self.nprobe)
+        scores, keys = [], []
+        for i in probes:
+            list_scores, list_keys = self.lists[i].search(query, k)
+            scores.append(list_scores)
+            keys.extend(list_keys)
+        if not keys:
+            return np.zeros(0, dtype=np.float32), []
+        merged = np.concatenate(scores)
+        best = _top_k(merged, k)
+        return merged[best], [keys[i] for i in best]
+
+    def matrix(self) -> Tuple[np.ndarray, List[Hashable], List[int]]:
+        """All vectors grouped by cluster, their keys and the cluster offsets."""
+        offsets = np.cumsum([0] + [len(flat) for flat in self.lists]).tolist()
+        vectors = np.concatenate([flat.matrix for flat in self.lists]) if self.lists else np.zeros((0, self.dim))
+        return vectors.astype(np.float32, copy=False), [key for flat in self.lists for key in flat.keys], offsets
+
+
+class ChartSimilarityIndex:
+    """Thread-safe "charts like this one" index keyed by user ID."""
+
+    def __init__(self, ivf_threshold: int = 50_000, nprobe: int = 8, retrain_factor: float = 4.0):
+        """Initialize an empty index.
+
+        Args:
+            ivf_threshold: Size at which the exact index is replaced by IVF.
+            nprobe: Clusters scanned per IVF query.
+            retrain_factor: IVF clusters are re-fitted once the index grows by
+                this factor since the last fit, so clusters stay balanced.
+        """
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.retrain_factor = retrain_factor
+        self._index = FlatIndex(EMBEDDING_DIM)
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    @property
+    def kind(self) -> str:
+        return "ivf" if isinstance(self._index, IVFIndex) else "flat"
+
+    def add(self, key: Hashable, chart: NatalChart) -> None:
+        """Insert or replace a user's chart."""
+        vector = embed_chart(chart)
+        with self._lock:
+            self._index.add(key, vector)
+            size = len(self._index)
+            if size >= self.ivf_threshold and (
+                self.kind == "flat" or size >= self._trained_size * self.retrain_factor
+            ):
+                self._retrain()
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._index.remove(key)
+
+    def similar(
+        self, key: Optional[Hashable] = None, chart: Optional[NatalChart] = None, k: int = 10
+    ) -> Optional[Matches]:
+        """Most similar stored charts to a user's chart or to a given chart.
+
+        Args:
+            key: Stored user to compare against; excluded from the results.
+            chart: Chart to compare against when no key is given.
+            k: Number of matches.
+
+        Returns:
+            Matches best first, or None if ``key`` is not indexed.
+        """
+        with self._lock:
+            if key is not None:
+                query = self._index.get(key)
+                if query is None:
+                    return None
+                query = np.array(query)
+            else:
+                query = embed_chart(chart)
+            scores, keys = self._index.search(query, k + (key is not None))
+        return [(match, float(score)) for match, score in zip(keys, scores) if match != key][:k]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {"vectors": len(self._index), "dim": EMBEDDING_DIM, "lists": 0, "nprobe": 0}
+            if isinstance(self._index, IVFIndex):
+                stats.update(lists=len(self._index.lists), nprobe=self._index.nprobe)
+            return stats
+
+    def save(self, directory: str) -> None:
+        """Write a snapshot that ``load`` can memory-map.
+
+        The ``.npy`` files are written under a fresh token first and the
+        manifest is swapped in last, so readers never see a half-written
+        snapshot. The whole save holds ``index.lock`` exclusively, so the
+        manifest it leaves is current when the files it does not reference
+        are deleted.
+        """
+        with self._lock:
+            if isinstance(self._index, IVFIndex):
+                vectors, keys, offsets = self._index.matrix()
+                centroids = self._index.centroids
+            else:
+                vectors, keys, offsets = self._index.matrix, list(self._index.keys), [0, len(self._index)]
+                centroids = None
+            os.makedirs(directory, exist_ok=True)
+            with _snapshot_lock(directory, fcntl.LOCK_EX):
+                token = uuid.uuid4().hex[:12]
+                referenced = {f"vectors.{token}.npy"}
+                _atomic_save(os.path.join(directory, f"vectors.{token}.npy"), vectors)
+                if centroids is not None:
+                    referenced.add(f"centroids.{token}.npy")
+                    _atomic_save(os.path.join(directory, f"centroids.{token}.npy"), centroids)
+                manifest = {
+                    "format": FORMAT_VERSION, "token": token, "kind": self.kind, "dim": EMBEDDING_DIM,
+                    "nprobe": self.nprobe, "trained_size": self._trained_size, "offsets": offsets, "keys": keys,
+                }
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(manifest, f)
+                os.replace(tmp_path, os.path.join(directory, MANIFEST))
+                for name in os.listdir(directory):
+                    # Processes that mapped an older snapshot keep their pages after unlink
+                    if name.endswith(".npy") and name not in referenced:
+                        os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def load(cls, directory: str, ivf_threshold: int = 50_000, nprobe: Optional[int] = None) -> "ChartSimilarityIndex":
+        """Open a snapshot with its vectors memory-mapped read-only.
+
+        Args:
+            directory: Directory passed to ``save``.
+            ivf_threshold: Size at which an exact index switches to IVF.
+            nprobe: Overrides the saved number of probed clusters.
+
+        Returns:
+            ChartSimilarityIndex: The index; empty if no snapshot exists.
+        """
+        path = os.path.join(directory, MANIFEST)
+        if not os.path.exists(path):
+            return cls(ivf_threshold=ivf_threshold, nprobe=nprobe or 8)
+        # Unlinking a mapped file is harmless, so the lock is only needed while opening
+        with _snapshot_lock(directory, fcntl.LOCK_SH):
+            with open(path) as f:
+                manifest = json.load(f)
+            vectors = np.load(os.path.join(directory, f"vectors.{manifest['token']}.npy"), mmap_mode="r")
+            centroids = None
+            if manifest["kind"] == "ivf":
+                centroids = np.load(os.path.join(directory, f"centroids.{manifest['token']}.npy"))
+        index = cls(ivf_threshold=ivf_threshold, nprobe=nprobe or manifest["nprobe"])
+        keys, offsets = manifest["keys"], manifest["offsets"]
+        if centroids is not None:
+            lists = [
+                FlatIndex(manifest["dim"], vectors[offsets[i]:offsets[i + 1]], keys[offsets[i]:offsets[i + 1]])
+                for i in range(len(offsets) - 1)
+            ]
+            index._index = IVFIndex(centroids, nprobe=index.nprobe, lists=lists)
+            index._trained_size = manifest["trained_size"]
+        else:
+            index._index = FlatIndex(manifest["dim"], vectors, keys)
+        return index
+
+    def _retrain(self) -> None:
+        if isinstance(self._index, IVFIndex):
+            vectors, keys, _ = self._index.matrix()
+        else:
+            vectors, keys = self._index.matrix, list(self._index.keys)
+        nlist = int(min(4096, max(16, 4 * np.sqrt(len(keys)))))
+        self._index = IVFIndex.train(vectors, keys, nlist=nlist, nprobe=self.nprobe)
+        self._trained_size = len(keys)
+
+
+def claim_snapshot_writer(directory: str) -> Optional[IO]:
+    """Try to become the one process that saves snapshots to ``directory``.
+
+    Args:
+        directory: Snapshot directory.
+
+    Returns:
+        The open lock file, to keep open until the final save and close
+        after it; None if another process already holds it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    lock = open(os.path.join(directory, WRITER_LOCK_FILE), "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+
+@contextmanager
+def _snapshot_lock(directory: str, operation: int) -> Iterator[None]:
+    with open(os.path.join(directory, LOCK_FILE), "a") as lock:
+        fcntl.flock(lock, operation)
+        yield
+
+
+def _atomic_save(path: str, array: np.ndarray) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+    os.replace(tmp_path, path)
@@ -1,14 +1,19 @@
 """FastAPI application entry point."""
 
+import asyncio
 import os
+import threading
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 
 from src.config.settings import Settings
 from src.core.domain.exceptions import DomainException
+from src.infrastructure.profiling.middleware import ProfilingMiddleware
+from src.infrastructure.similarity.vector_index import claim_snapshot_writer
+from src.interfaces.api.static_assets import StaticAssetCache
 
 
 def create_app(settings: Settings) -> FastAPI:
@@ -20,7 +25,56 @@ def create_app(settings: Settings) -> FastAPI:
     Returns:
         The configured FastAPI app.
     """
+    from .v1 import (
+        build_job_worker_pool, get_event_calendar, get_profile_recorder, get_repository, get_rise_set_service,
+        get_sky_feed, get_sky_snapshot_service, run_repository_compaction
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Horoscope jobs are drained by in-process workers backed by the
+        # SQLite queue; any number of processes may share the same queue.
+        pool = build_job_worker_pool(settings) if settings.job_workers > 0 else None
+        if pool is not None:
+            pool.start()
+        app.state.job_pool = pool
+        # Keep the shared ring of current-sky buckets warm
+        sky = get_sky_snapshot_service(settings)
+        sky.start()
+        # Build or extend the event calendar in the background; queries wait for it
+        threading.Thread(target=get_event_calendar, args=(settings,), name="event-calendar", daemon=True).start()
+        # Precompute rise and set times of the most common profile locations, now and nightly
+        rise_set = get_rise_set_service(settings)
+        if settings.rise_set_precompute_locations > 0:
+            rise_set.start()
+        # Each worker holds its own similarity index; one of them writes the shared snapshot
+        snapshot_writer = None
+        if settings.similarity_index_dir:
+            snapshot_writer = claim_snapshot_writer(settings.similarity_index_dir)
+        # Collapse duplicate profiles and charts left by older, non-content-addressed writes
+        compaction = None
+        if settings.repository_compaction_seconds > 0:
+            compaction = asyncio.create_task(
+                run_repository_compaction(get_repository(settings), settings.repository_compaction_seconds)
+            )
+        yield
+        if compaction is not None:
+            compaction.cancel()
+            with suppress(asyncio.CancelledError):
+                await compaction
+        # The live sky feed starts with its first subscriber; end it and its open streams
+        await get_sky_feed(settings).stop()
+        rise_set.stop()
+        sky.stop()
+        if pool is not None:
+            pool.stop()
+        if snapshot_writer is not None:
+            # Snapshot the similarity index for the next start; workers map it read-only
+            get_repository(settings).save_similarity_index(settings.similarity_index_dir)
+            snapshot_writer.close()
+
     app = FastAPI(
+        lifespan=lifespan,
         title="AstroPersona API",
         version="1.0.0",
         description="Personalized horoscope generation API"
@@ -35,6 +89,17 @@ def create_app(settings: Settings) -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Flight recorder for sampled or slow requests; not installed at all when off
+    if settings.profiling_mode != "off":
+        app.add_middleware(
+            ProfilingMiddleware,
+            recorder=get_profile_recorder(settings),
+            mode=settings.profiling_mode,
+            sample_rate=settings.profiling_sample_rate,
+            slow_ms=settings.profiling_slow_ms,
+            interval_ms=settings.profiling_interval_ms
+        )
+
     # Exception handlers
     @app.exception_handler(DomainException)
     async def domain_exception_handler(request: Request, exc: DomainException):
@@ -73,25 +138,37 @@ def create_app(settings: Settings) -> FastAPI:
 
     # --- Web App Serving Configuration ---
     # The application expects a static directory at the project root: ./static
-    STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'static')
-    
-    # 1. Mount StaticFiles for assets (e.g., /static/app.js)
-    app.mount(
-        "/static", StaticFiles(directory=STATIC_DIR), name="static"
+    STATIC_DIR = settings.static_dir or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'static'
     )
-    
+
+    # The SPA shell and built bundle are loaded into memory once, with
+    # precompressed variants and strong ETags. In development the cache reloads
+    # itself whenever the build output changes.
+    static_cache = StaticAssetCache(STATIC_DIR, auto_reload=settings.app_env == "development")
+    app.state.static_cache = static_cache
+
+    # 1. Serve assets under /static (e.g., /static/app.js)
+    @app.get("/static/{asset_path:path}", include_in_schema=False)
+    async def serve_static_asset(request: Request, asset_path: str):
+        asset = static_cache.get(asset_path)
+        if asset is None:
+            return JSONResponse(status_code=404, content={"detail": f"Static asset /static/{asset_path} not found."})
+        return static_cache.respond(request, asset)
+
     # 2. SPA fallback: serve index.html for any unmatched route (including /)
     # This ensures that any route not matching /health, /api, or /static returns index.html for client-side routing.
+    # Files emitted at the bundle root (webpack publicPath "/") are served as-is.
     @app.get("/{full_path:path}", include_in_schema=False)
     async def serve_spa_index(request: Request, full_path: str):
-        index_path = os.path.join(STATIC_DIR, "index.html")
-        
+        asset = static_cache.get(full_path) if full_path else None
+        if asset is None:
+            asset = static_cache.get("index.html")
+
         # If the index.html exists, serve it for all unmatched routes (SPA client-side routing)
-        if os.path.exists(index_path):
-            with open(index_path, 'r') as f:
-                html_content = f.read()
-            return HTMLResponse(content=html_content, status_code=200)
-        
+        if asset is not None:
+            return static_cache.respond(request, asset)
+
         # If index.html is missing, return a 404 JSON response.
         return JSONResponse(status_code=404, content={"detail": f"Path /{full_path} not found and frontend index.html is unavailable."})
 
@@ -0,0 +1,252 @@
+"""In-memory static asset cache for the SPA shell and the built bundle."""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:  # Brotli is optional; without it only gzip variants are precomputed.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+# Files whose name carries a content hash (e.g. bundle.3f2a9c1e.js) never change
+# under the same URL, so they may be cached by browsers and CDNs indefinitely.
+HASHED_NAME_PATTERN = re.compile(r"[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "application/wasm",
+)
+
+MIN_COMPRESS_SIZE = 256  # bytes; smaller payloads are not worth compressing
+
+
+@dataclass
+class StaticAsset:
+    """A static file held in memory with its precomputed variants."""
+
+    path: str
+    content_type: str
+    cache_control: str
+    # encoding ("identity", "gzip", "br") -> (body, strong etag)
+    variants: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)
+
+    def select(self, accept_encoding: str) -> Tuple[str, bytes, str]:
+        """Pick the best variant for an Accept-Encoding header.
+
+        Args:
+            accept_encoding: The raw Accept-Encoding request header.
+
+        Returns:
+            Tuple of (encoding, body, etag).
+        """
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                body, etag = self.variants[encoding]
+                return encoding, body, etag
+        body, etag = self.variants["identity"]
+        return "identity", body, etag
+
+
+def _parse_accept_encoding(header: str) -> List[str]:
+    """Return the encodings a client accepts (q=0 entries excluded).
+
+    Args:
+        header: The raw Accept-Encoding header.
+
+    Returns:
+        List of accepted encoding tokens, lower-cased.
+    """
+    accepted = []
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.append(token)
+    if "*" in accepted:
+        accepted.extend(["br", "gzip"])
+    return accepted
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: The raw If-None-Match header.
+        etag: The ETag of the representation being served.
+
+    Returns:
+        True if the client already holds this representation.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class StaticAssetCache:
+    """Loads a static directory into memory and serves it with HTTP caching.
+
+    Every file is read once, hashed for a strong ETag and, when compressible,
+    precompressed with gzip (and brotli if available). In auto-reload mode the
+    directory is re-scanned at most once per ``reload_interval`` seconds and
+    reloaded when any file's size or mtime changed.
+    """
+
+    def __init__(self, directory: str, auto_reload: bool = False, reload_interval: float = 1.0):
+        """Initialize and load the cache.
+
+        Args:
+            directory: Directory containing the built frontend.
+            auto_reload: Reload when the build output changes (dev mode).
+            reload_interval: Minimum seconds between change checks.
+        """
+        self.directory = os.path.abspath(directory)
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self._assets: Dict[str, StaticAsset] = {}
+        self._signature: Tuple = ()
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load every file under the directory into memory."""
+        assets: Dict[str, StaticAsset] = {}
+        for rel_path in self._walk():
+            full_path = os.path.join(self.directory, rel_path)
+            with open(full_path, "rb") as f:
+                content = f.read()
+            assets[rel_path] = self._build_asset(rel_path, content)
+        with self._lock:
+            self._assets = assets
+            self._signature = self._scan_signature()
+            self._last_check = time.monotonic()
+
+    def get(self, rel_path: str) -> Optional[StaticAsset]:
+        """Look up an asset by its path relative to the directory.
+
+        Args:
+            rel_path: Relative URL path, e.g. "index.html" or "js/app.js".
+
+        Returns:
+            The cached asset, or None if it does not exist.
+        """
+        self._maybe_reload()
+        return self._assets.get(rel_path.strip("/"))
+
+    def respond(self, request: Request, asset: StaticAsset) -> Response:
+        """Build the HTTP response for an asset, honouring conditional requests.
+
+        Args:
+            request: The incoming request.
+            asset: The asset to serve.
+
+        Returns:
+            A 200 response with the negotiated variant, or a bodiless 304.
+        """
+        encoding, body, etag = asset.select(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": etag,
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type=asset.content_type, headers=headers)
+
+    def _walk(self) -> List[str]:
+        """List files under the directory as relative POSIX paths."""
+        if not os.path.isdir(self.directory):
+            return []
+        paths = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                paths.append(os.path.relpath(full_path, self.directory).replace(os.sep, "/"))
+        return sorted(paths)
+
+    def _scan_signature(self) -> Tuple:
+        """Snapshot (path, size, mtime) of every file to detect rebuilds."""
+        signature = []
+        for rel_path in self._walk():
+            try:
+                stat = os.stat(os.path.join(self.directory, rel_path))
+            except FileNotFoundError:
+                continue
+            signature.append((rel_path, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def _maybe_reload(self) -> None:
+        """Reload the cache if auto-reload is on and the directory changed."""
+        if not self.auto_reload:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        if self._scan_signature() != self._signature:
+            self.load()
+
+    @staticmethod
+    def _build_asset(rel_path: str, content: bytes) -> StaticAsset:
+        """Create an asset with its ETags and compressed variants.
+
+        Args:
+            rel_path: Relative path of the file.
+            content: Raw file bytes.
+
+        Returns:
+            StaticAsset: The prepared asset.
+        """
+        content_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type = f"{content_type}; charset=utf-8"
+        digest = hashlib.sha256(content).hexdigest()[:32]
+
+        if HASHED_NAME_PATTERN.search(os.path.basename(rel_path)):
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+
+        asset = StaticAsset(path=rel_path, content_type=content_type, cache_control=cache_control)
+        asset.variants["identity"] = (content, f'"{digest}"')
+
+        if len(content) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(gzipped) < len(content):
+                asset.variants["gzip"] = (gzipped, f'"{digest}-gzip"')
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    asset.variants["br"] = (compressed, f'"{digest}-br"')
+        return asset
@@ -1,15 +1,60 @@
 """API v1 router."""
 
-from fastapi import APIRouter, Depends
+import asyncio
+import hmac
+import logging
+import os
+import tempfile
+from contextlib import nullcontext, suppress
+from dataclasses import asdict
+from datetime import date as LocalDate, datetime, timezone
+from functools import lru_cache
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from src.config.settings import Settings
-from src.core.domain.models import BirthData, HoroscopeOutput, NatalChart, UserProfile
+from src.core.domain.canonical import birth_data_hash, canonicalize_birth_data, chart_id_for, profile_id_for
+from src.core.domain.exceptions import (
+    ChartNotFoundError, EventRangeError, InvalidCoordinatesError, InvalidDateError, InvalidTimezoneError,
+    JobNotFoundError, PlaceNotFoundError, ProfileNotFoundError, SkyFeedFullError
+)
+from src.core.domain.models import (
+    BirthData, HoroscopeOutput, HoroscopePreferences, LocationDay, NatalChart, Place, ProgressedChart,
+    RectificationScan, ReturnChart, SkyEvent, SkySnapshot, UserProfile
+)
+from src.core.use_cases.astrocartography import AstrocartographyUseCase
 from src.core.use_cases.calculate_chart import CalculateChartUseCase
+from src.core.use_cases.chart_analysis import ANALYSIS_VERSION, GenerationCache
+from src.core.use_cases.chart_returns import ChartReturnsUseCase
 from src.core.use_cases.generate_horoscope import GenerateHoroscopeUseCase
+from src.core.use_cases.horoscope_jobs import HoroscopeJobHandler
+from src.core.use_cases.rectify_birth_time import RectifyBirthTimeUseCase
+from src.core.use_cases.template_text import TemplateTextGenerator
 from src.infrastructure.ai.gemini_adapter import GeminiAdapter
+from src.infrastructure.ai.resilience import CircuitBreaker, ResilientTextGenerator
+from src.infrastructure.astro_engine import event_calendar
+from src.infrastructure.astro_engine.astrocartography import MAX_STEP, MIN_STEP, AstrocartographyCalculator, MapGrid
+from src.infrastructure.astro_engine.event_calendar import EventCalendar
+from src.infrastructure.astro_engine.rectification import RectificationScanner
+from src.infrastructure.astro_engine.returns import ReturnsCalculator
+from src.infrastructure.astro_engine.rise_set import RiseSetService
+from src.infrastructure.astro_engine.sky_feed import SkyFeed
+from src.infrastructure.astro_engine.sky_snapshot import SkySnapshotService
 from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
-from src.infrastructure.persistence.in_memory_repo import InMemoryRepository
+from src.infrastructure.geo.gazetteer import BUNDLED_CITIES_PATH, Gazetteer
+from src.infrastructure.jobs.sqlite_queue import SqliteJobQueue
+from src.infrastructure.jobs.webhooks import check_webhook_url
+from src.infrastructure.jobs.worker_pool import JobWorkerPool, job_payload
+from src.infrastructure.persistence.bounded_repo import BoundedInMemoryRepository
+from src.infrastructure.persistence.shared_chart_cache import SharedChartCache
+from src.infrastructure.profiling.recorder import ProfileRecorder
+from src.infrastructure.profiling.stages import StageTrace, stage, tracing
+from src.infrastructure.similarity.vector_index import ChartSimilarityIndex
+from src.interfaces.api.static_assets import etag_matches
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1")
 
@@ -20,38 +65,336 @@ def get_settings():
 def get_astro_engine(settings: Settings = Depends(get_settings)):
     return SwissEphemerisEngine(eph_path=settings.swiss_eph_path)
 
-def get_calculate_use_case(astro_engine: SwissEphemerisEngine = Depends(get_astro_engine)):
-    return CalculateChartUseCase(astro_engine)
+@lru_cache(maxsize=None)
+def _shared_chart_cache(path: str, entries: int, slot_size: int) -> SharedChartCache:
+    # One mapping per process of the file all workers on the host share
+    return SharedChartCache(path or None, entries=entries, slot_size=slot_size)
+
+def get_chart_cache(settings: Settings = Depends(get_settings)):
+    if settings.chart_cache_entries <= 0:
+        return None
+    return _shared_chart_cache(settings.chart_cache_path, settings.chart_cache_entries, settings.chart_cache_slot_bytes)
+
+def get_calculate_use_case(
+    astro_engine: SwissEphemerisEngine = Depends(get_astro_engine),
+    cache: SharedChartCache | None = Depends(get_chart_cache),
+    settings: Settings = Depends(get_settings)
+):
+    return CalculateChartUseCase(astro_engine, default_bodies=settings.default_body_set, cache=cache)
+
+@lru_cache(maxsize=None)
+def _astrocartography_use_case(eph_path: str, default_bodies: str, max_bytes: int) -> AstrocartographyUseCase:
+    # One per process: maps are cached per chart and grid
+    calculator = AstrocartographyCalculator(SwissEphemerisEngine(eph_path=eph_path))
+    return AstrocartographyUseCase(calculator, default_bodies=default_bodies, max_bytes=max_bytes)
+
+def get_astrocartography_use_case(settings: Settings = Depends(get_settings)):
+    return _astrocartography_use_case(
+        settings.swiss_eph_path, settings.default_body_set, settings.astrocartography_cache_bytes
+    )
+
+def get_rectify_use_case(astro_engine: SwissEphemerisEngine = Depends(get_astro_engine)):
+    return RectifyBirthTimeUseCase(RectificationScanner(astro_engine))
+
+def get_chart_returns_use_case(
+    astro_engine: SwissEphemerisEngine = Depends(get_astro_engine),
+    settings: Settings = Depends(get_settings)
+):
+    return ChartReturnsUseCase(ReturnsCalculator(astro_engine), default_bodies=settings.default_body_set)
+
+@lru_cache(maxsize=None)
+def _resilient_ai_adapter(
+    api_key: str, base_url: str, model_name: str, deadline: float, hedge_percentile: float,
+    breaker_failures: int, breaker_reset: float
+) -> ResilientTextGenerator:
+    # One per process: latency history and breaker state must outlive requests
+    adapter = GeminiAdapter(api_key=api_key, base_url=base_url, model_name=model_name, timeout=deadline)
+    return ResilientTextGenerator(
+        adapter,
+        deadline=deadline,
+        hedge_percentile=hedge_percentile,
+        breaker=CircuitBreaker(failure_threshold=breaker_failures, reset_timeout=breaker_reset)
+    )
 
 def get_ai_adapter(settings: Settings = Depends(get_settings)):
-    return GeminiAdapter(api_key=settings.google_api_key)
+    return _resilient_ai_adapter(
+        settings.google_api_key,
+        settings.gemini_base_url,
+        settings.gemini_model,
+        settings.ai_deadline_seconds,
+        settings.ai_hedge_percentile,
+        settings.ai_breaker_failures,
+        settings.ai_breaker_reset_seconds
+    )
+
+@lru_cache(maxsize=None)
+def _generation_cache(max_entries: int) -> GenerationCache:
+    # One per process: analyses are reused across requests and preference changes
+    return GenerationCache(max_entries=max_entries)
+
+def get_generation_cache(settings: Settings = Depends(get_settings)):
+    return _generation_cache(settings.generation_cache_entries)
+
+@lru_cache(maxsize=None)
+def get_template_generator() -> TemplateTextGenerator:
+    # Language packs are compiled once per process
+    return TemplateTextGenerator()
 
 def get_generate_horoscope_use_case(
     calculate_use_case: CalculateChartUseCase = Depends(get_calculate_use_case),
-    ai_adapter: GeminiAdapter = Depends(get_ai_adapter)
+    ai_adapter: ResilientTextGenerator = Depends(get_ai_adapter),
+    cache: GenerationCache = Depends(get_generation_cache),
+    templates: TemplateTextGenerator = Depends(get_template_generator),
+    settings: Settings = Depends(get_settings)
+):
+    return GenerateHoroscopeUseCase(
+        calculate_use_case, ai_adapter, cache=cache, templates=templates, text_engine=settings.text_engine,
+        deadline=settings.ai_deadline_seconds
+    )
+
+@lru_cache(maxsize=None)
+def _bounded_repository(
+    max_entries: int, max_bytes: int, ttl_seconds: float, spill_dir: str,
+    similarity_dir: str, ivf_threshold: int, nprobe: int
+):
+    # Shared by all requests so saved profiles survive; bounded so it cannot grow without limit
+    if similarity_dir:
+        similarity = ChartSimilarityIndex.load(similarity_dir, ivf_threshold=ivf_threshold, nprobe=nprobe)
+    else:
+        similarity = ChartSimilarityIndex(ivf_threshold=ivf_threshold, nprobe=nprobe)
+    return BoundedInMemoryRepository(
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+        ttl_seconds=ttl_seconds or None,
+        spill_dir=spill_dir or None,
+        similarity=similarity
+    )
+
+def get_repository(settings: Settings = Depends(get_settings)):
+    return _bounded_repository(
+        settings.repository_max_entries,
+        settings.repository_max_bytes,
+        settings.repository_ttl_seconds,
+        settings.repository_spill_dir,
+        settings.similarity_index_dir,
+        settings.similarity_ivf_threshold,
+        settings.similarity_nprobe
+    )
+
+@lru_cache(maxsize=None)
+def _open_gazetteer(source_path: str) -> Gazetteer:
+    # One memory-mapped index per process, shared by all requests
+    return Gazetteer.open(source_path)
+
+def get_gazetteer(settings: Settings = Depends(get_settings)):
+    return _open_gazetteer(settings.gazetteer_path or BUNDLED_CITIES_PATH)
+
+@lru_cache(maxsize=None)
+def _sky_snapshot_service(eph_path: str) -> SkySnapshotService:
+    # Shared by all requests: the sky is the same for every user
+    return SkySnapshotService(SwissEphemerisEngine(eph_path=eph_path))
+
+def get_sky_snapshot_service(settings: Settings = Depends(get_settings)):
+    return _sky_snapshot_service(settings.swiss_eph_path)
+
+@lru_cache(maxsize=None)
+def _sky_feed(eph_path: str, interval: float, max_subscribers: int) -> SkyFeed:
+    # One per process: every live subscriber shares each tick's computation and encoding
+    return SkyFeed(SwissEphemerisEngine(eph_path=eph_path), interval=interval, max_subscribers=max_subscribers)
+
+def get_sky_feed(settings: Settings = Depends(get_settings)):
+    return _sky_feed(settings.swiss_eph_path, settings.sky_feed_interval_seconds, settings.sky_feed_max_subscribers)
+
+@lru_cache(maxsize=None)
+def _rise_set_service(max_entries: int, cell_degrees: float, top_n: int, precompute_hour: int,
+                      repository: BoundedInMemoryRepository) -> RiseSetService:
+    # Shared by all requests: users in one city share each day's times
+    return RiseSetService(
+        max_entries=max_entries,
+        cell_degrees=cell_degrees,
+        locations=repository.profile_locations,
+        top_n=top_n,
+        precompute_hour=precompute_hour
+    )
+
+def get_rise_set_service(settings: Settings = Depends(get_settings)):
+    return _rise_set_service(
+        settings.rise_set_cache_entries,
+        settings.rise_set_cell_degrees,
+        settings.rise_set_precompute_locations,
+        settings.rise_set_precompute_hour,
+        get_repository(settings)
+    )
+
+@lru_cache(maxsize=None)
+def _event_calendar(path: str, start_year: int, end_year: int, eph_path: str) -> EventCalendar:
+    # Built or extended once on disk, then memory-mapped by every worker
+    return EventCalendar.open(start_year, end_year, path or None, eph_path)
+
+def get_event_calendar(settings: Settings = Depends(get_settings)):
+    return _event_calendar(
+        settings.event_calendar_path,
+        settings.event_calendar_start_year,
+        settings.event_calendar_end_year,
+        settings.swiss_eph_path
+    )
+
+@lru_cache(maxsize=None)
+def _open_job_queue(path: str, max_attempts: int) -> SqliteJobQueue:
+    return SqliteJobQueue(path, max_attempts=max_attempts)
+
+def get_job_queue(settings: Settings = Depends(get_settings)):
+    return _open_job_queue(settings.job_queue_path, settings.job_max_attempts)
+
+@lru_cache(maxsize=None)
+def _profile_recorder(directory: str, capacity: int) -> ProfileRecorder:
+    return ProfileRecorder(directory, capacity=capacity)
+
+def get_profile_recorder(settings: Settings = Depends(get_settings)):
+    directory = settings.profiling_dir or os.path.join(tempfile.gettempdir(), "lilith-profiles")
+    return _profile_recorder(directory, settings.profiling_capacity)
+
+def require_admin(
+    settings: Settings = Depends(get_settings),
+    x_admin_token: str | None = Header(None)
 ):
-    return GenerateHoroscopeUseCase(calculate_use_case, ai_adapter)
+    # Fail closed: without a configured token no request is an admin request
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them.")
+    if not hmac.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token header is required.")
+
+
+async def run_repository_compaction(repository: BoundedInMemoryRepository, interval: float) -> None:
+    """Compact the repository every ``interval`` seconds until cancelled.
+
+    Runs on the event loop, so it never interleaves with a request handler
+    using the repository.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report = repository.compact()
+        except Exception:
+            logger.exception("Repository compaction failed")
+            continue
+        logger.info("Compacted repository: %s", asdict(report))
+
+
+def build_job_worker_pool(settings: Settings) -> JobWorkerPool:
+    """Wire the horoscope job workers outside of a request scope."""
+    # Jobs have no latency budget: retry with backoff rather than settle for fallback text
+    generate_use_case = GenerateHoroscopeUseCase(
+        get_calculate_use_case(get_astro_engine(settings), get_chart_cache(settings), settings),
+        get_ai_adapter(settings),
+        allow_fallback=False,
+        cache=get_generation_cache(settings),
+        templates=get_template_generator(),
+        text_engine=settings.text_engine
+    )
+    return JobWorkerPool(
+        get_job_queue(settings),
+        HoroscopeJobHandler(generate_use_case),
+        workers=settings.job_workers,
+        webhook_hosts=_webhook_hosts(settings),
+        max_run_seconds=settings.job_max_run_seconds
+    )
+
+def _webhook_hosts(settings: Settings) -> frozenset[str]:
+    """Hosts job webhooks may target; empty allows any public host."""
+    return frozenset(host.strip().lower().rstrip(".") for host in settings.job_webhook_hosts.split(",") if host.strip())
+
+def _profile_birth_data(profile: "HoroscopePersonalRequest.Profile", gazetteer: Gazetteer) -> BirthData:
+    """Build birth data from a horoscope request profile."""
+    # Horoscope profiles carry no timezone; raw coordinates are read as UTC
+    lat, lon, timezone = _resolve_location(gazetteer, profile.place_id, profile.latitude, profile.longitude, "UTC")
+    return BirthData(
+        date=profile.birth_date,
+        time=profile.birth_time,
+        lat=lat,
+        lon=lon,
+        timezone=timezone
+    )
+
+def _resolve_location(
+    gazetteer: Gazetteer,
+    place_id: int | None,
+    latitude: float | None,
+    longitude: float | None,
+    timezone: str | None
+) -> tuple[float, float, str]:
+    """Resolve a place ID or raw coordinates to (lat, lon, timezone).
 
-def get_repository():
-    return InMemoryRepository()
+    Raw coordinates need an explicit timezone: guessing one would silently
+    shift the chart.
+    """
+    if place_id is not None:
+        place = gazetteer.get(place_id)
+        if place is None:
+            raise PlaceNotFoundError(details=f"place_id={place_id}")
+        return place.latitude, place.longitude, place.timezone
+    if latitude is None or longitude is None:
+        raise InvalidCoordinatesError(details="Provide either place_id or latitude and longitude.")
+    if not timezone:
+        raise InvalidTimezoneError(details="timezone is required with latitude and longitude.")
+    return latitude, longitude, timezone
 
 # Request models
-from pydantic import BaseModel
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
 
 class CalculateChartRequest(BaseModel):
     date: str
     time: str | None = None
-    latitude: float
-    longitude: float
-    timezone: str
+    place_id: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    timezone: str | None = None
+    bodies: str | list[str] | None = None  # body set name or body names; defaults to the configured set
+
+class RectificationRequest(BaseModel):
+    date: str
+    place_id: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    timezone: str | None = None
+    start_time: str = "00:00"
+    end_time: str = "23:59"
+    step_minutes: int = 1
+
+class ChartReturnsRequest(CalculateChartRequest):
+    kind: Literal["solar", "lunar"] = "solar"
+    start_date: str | None = None  # first return after this date; defaults to now
+    count: int = Field(1, ge=1, le=1300)  # 100 years of lunar returns
+    return_latitude: float | None = Field(None, ge=-90.0, le=90.0)  # relocated return; defaults to the birthplace
+    return_longitude: float | None = Field(None, ge=-180.0, le=180.0)
+
+class ChartReturnsResponse(BaseModel):
+    returns: list[ReturnChart]
+
+class AstrocartographyRequest(CalculateChartRequest):
+    south: float = Field(-75.0, gt=-90.0, lt=90.0)
+    north: float = Field(75.0, gt=-90.0, lt=90.0)
+    west: float = Field(-180.0, ge=-180.0, le=180.0)
+    east: float = Field(180.0, ge=-180.0, le=180.0)
+    step: float = Field(1.0, ge=MIN_STEP, le=MAX_STEP)  # latitude spacing of the ASC/DSC curve points
+    precision: int = Field(2, ge=0, le=6)  # decimals of the coordinates
+
+class ProgressionsRequest(CalculateChartRequest):
+    ages: list[Annotated[float, Field(ge=0.0, le=150.0)]] = Field(..., min_length=1, max_length=1200)
+
+class ProgressionsResponse(BaseModel):
+    progressions: list[ProgressedChart]
 
 class HoroscopePersonalRequest(BaseModel):
     class Profile(BaseModel):
         name: str
         birth_date: str
         birth_time: str | None = None
-        latitude: float
-        longitude: float
+        place_id: int | None = None
+        latitude: float | None = None
+        longitude: float | None = None
 
     class Preferences(BaseModel):
         tone: str = "spiritual"
@@ -60,8 +403,12 @@ class HoroscopePersonalRequest(BaseModel):
 
     profile: Profile
     preferences: Preferences
+    text_engine: Literal["ai", "template"] | None = None  # None: the deployment's default
     admin: bool = False
 
+class HoroscopeJobRequest(HoroscopePersonalRequest):
+    webhook_url: str | None = None
+
 # Response models
 class PlanetResponse(BaseModel):
     name: str
@@ -81,6 +428,12 @@ class AspectResponse(BaseModel):
     type: str
     orb: float
 
+class PlaceSearchResponse(BaseModel):
+    results: list[Place]
+
+class SkyEventsResponse(BaseModel):
+    events: list[SkyEvent]
+
 class CalculateChartResponse(BaseModel):
     meta: dict
     planets: list[PlanetResponse]
@@ -93,108 +446,558 @@ class ProcessingStepsResponse(BaseModel):
     chart_generation: dict
     relationship_mapping: dict
     pm_config: dict
+    stages: list[dict] = []
+
+class HoroscopeJobResponse(BaseModel):
+    job_id: str
+    status: str
+    attempts: int
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict | None = None
+    error: str | None = None
+
+class JobQueueStatsResponse(BaseModel):
+    counts: dict[str, int]
+    lag_seconds: float
+
+class RepositoryStatsResponse(BaseModel):
+    profiles: dict
+    charts: dict
+    chart_refs: dict
+    placements: dict
+    similarity: dict
+
+class ChartSearchResponse(BaseModel):
+    total: int
+    user_ids: list[str]
+
+class SimilarChart(BaseModel):
+    user_id: str
+    similarity: float
+
+class SimilarChartsResponse(BaseModel):
+    user_id: str
+    matches: list[SimilarChart]
 
 class HoroscopePersonalResponse(BaseModel):
+    profile_id: str | None = None
     chart: dict
     interpretation: dict
     ai_text: str
+    text_source: str = "ai"
+    analysis_cached: bool = False
+    text_cached: bool = False
     processing_steps: ProcessingStepsResponse | None = None
 
+# Charts are deterministic for a given input and engine version, so shared
+# caches may keep them; validators are revisited daily.
+CHART_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+
+def _build_chart_response(chart: NatalChart) -> CalculateChartResponse:
+    """Map a natal chart to the chart calculation response."""
+    return CalculateChartResponse(
+        meta={"julian_day": chart.julian_day},
+        planets=[PlanetResponse(**p.model_dump()) for p in chart.planets],
+        houses=[HouseResponse(**h.model_dump()) for h in chart.houses],
+        aspects=[AspectResponse(**a.model_dump()) for a in chart.aspects]
+    )
+
+
 @router.post("/chart/calculate", response_model=CalculateChartResponse)
 async def calculate_chart(
     request: CalculateChartRequest,
-    use_case: CalculateChartUseCase = Depends(get_calculate_use_case)
+    use_case: CalculateChartUseCase = Depends(get_calculate_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
 ):
     """Calculate natal chart."""
+    lat, lon, timezone = _resolve_location(
+        gazetteer, request.place_id, request.latitude, request.longitude, request.timezone
+    )
     birth_data = BirthData(
         date=request.date,
         time=request.time,
-        lat=request.latitude,
-        lon=request.longitude,
-        timezone=request.timezone
+        lat=lat,
+        lon=lon,
+        timezone=timezone
     )
-    chart = use_case.execute(birth_data)
+    chart = use_case.execute(birth_data, request.bodies)
+    return _build_chart_response(chart)
 
-    # For now, meta is empty, as julian_day is not in NatalChart
-    return CalculateChartResponse(
-        meta={"julian_day": chart.julian_day},
-        planets=[PlanetResponse(**p.model_dump()) for p in chart.planets],
-        houses=[HouseResponse(**h.model_dump()) for h in chart.houses],
-        aspects=[AspectResponse(**a.model_dump()) for a in chart.aspects]
+
+@router.get("/chart/calculate", response_model=CalculateChartResponse)
+async def calculate_chart_cacheable(
+    request: Request,
+    response: Response,
+    date: str,
+    time: str | None = None,
+    place_id: int | None = None,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    timezone: str | None = None,
+    bodies: str | None = None,
+    use_case: CalculateChartUseCase = Depends(get_calculate_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """Calculate natal chart as a cacheable GET representation.
+
+    The strong ETag is derived from the canonical input and the engine version,
+    so a matching If-None-Match is answered with 304 before any ephemeris work.
+    """
+    lat, lon, timezone = _resolve_location(gazetteer, place_id, latitude, longitude, timezone)
+    birth_data = canonicalize_birth_data(BirthData(
+        date=date,
+        time=time,
+        lat=lat,
+        lon=lon,
+        timezone=timezone
+    ))
+    # The version tag includes the body set's plan signature, so each set gets its own ETag
+    etag = f'"{birth_data_hash(birth_data, use_case.version_for(bodies))}"'
+    location = {
+        "date": birth_data.date,
+        "time": birth_data.time,
+        "latitude": birth_data.lat,
+        "longitude": birth_data.lon,
+        "timezone": birth_data.timezone,
+    }
+    if bodies:
+        location["bodies"] = bodies
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CHART_CACHE_CONTROL,
+        "Content-Location": f"{request.url.path}?" + urlencode(location),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    chart = use_case.execute(birth_data, bodies)
+    response.headers.update(headers)
+    return _build_chart_response(chart)
+
+
+@router.post("/chart/rectification", response_model=RectificationScan)
+async def scan_birth_times(
+    request: RectificationRequest,
+    use_case: RectifyBirthTimeUseCase = Depends(get_rectify_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """Scan a window of candidate birth times for rising-sign and house changes."""
+    lat, lon, timezone = _resolve_location(
+        gazetteer, request.place_id, request.latitude, request.longitude, request.timezone
+    )
+    birth_data = BirthData(
+        date=request.date,
+        lat=lat,
+        lon=lon,
+        timezone=timezone
+    )
+    return use_case.execute(birth_data, request.start_time, request.end_time, request.step_minutes)
+
+
+def _request_birth_data(request: CalculateChartRequest, gazetteer: Gazetteer) -> BirthData:
+    """Build birth data from a chart request body."""
+    lat, lon, timezone = _resolve_location(
+        gazetteer, request.place_id, request.latitude, request.longitude, request.timezone
+    )
+    return BirthData(date=request.date, time=request.time, lat=lat, lon=lon, timezone=timezone)
+
+
+@router.post("/chart/returns", response_model=ChartReturnsResponse)
+async def calculate_returns(
+    request: ChartReturnsRequest,
+    use_case: ChartReturnsUseCase = Depends(get_chart_returns_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """Cast solar or lunar return charts, optionally relocated."""
+    birth_data = _request_birth_data(request, gazetteer)
+    location = None
+    if (request.return_latitude is None) != (request.return_longitude is None):
+        raise InvalidCoordinatesError(details="Provide both return_latitude and return_longitude, or neither.")
+    if request.return_latitude is not None:
+        location = (request.return_latitude, request.return_longitude)
+    return ChartReturnsResponse(returns=use_case.returns(
+        birth_data, request.kind, request.start_date, request.count, location, request.bodies
+    ))
+
+
+@router.post("/chart/progressions", response_model=ProgressionsResponse)
+async def calculate_progressions(
+    request: ProgressionsRequest,
+    use_case: ChartReturnsUseCase = Depends(get_chart_returns_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """Secondary progressed positions for one or more ages."""
+    birth_data = _request_birth_data(request, gazetteer)
+    return ProgressionsResponse(progressions=use_case.progressions(birth_data, request.ages, request.bodies))
+
+
+@router.post("/chart/astrocartography")
+async def calculate_astrocartography(
+    request: AstrocartographyRequest,
+    use_case: AstrocartographyUseCase = Depends(get_astrocartography_use_case),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """MC, IC, ASC and DSC lines of each natal body, as GeoJSON."""
+    birth_data = _request_birth_data(request, gazetteer)
+    grid = MapGrid(request.south, request.north, request.west, request.east, request.step, request.precision)
+    return Response(use_case.execute(birth_data, request.bodies, grid), media_type="application/geo+json")
+
+
+@router.get("/sky/current", response_model=SkySnapshot)
+async def get_current_sky(
+    resolution: str = Query("hour", pattern="^(hour|day)$"),
+    sky: SkySnapshotService = Depends(get_sky_snapshot_service)
+):
+    """Planet positions for the current UTC hour or day, shared by all users."""
+    return sky.get(resolution)
+
+
+async def _send_live_sky(websocket: WebSocket, feed: SkyFeed) -> None:
+    frames = feed.frames()
+    try:
+        async for frame in frames:
+            await websocket.send_text(frame.text)
+            feed.delivered(frame)
+    except SkyFeedFullError:
+        await websocket.close(code=1013)  # try again later
+    finally:
+        await frames.aclose()
+
+
+@router.websocket("/sky/live")
+async def live_sky_socket(websocket: WebSocket, feed: SkyFeed = Depends(get_sky_feed)):
+    """Positions of all bodies, pushed every tick; slow clients skip to the newest frame."""
+    await websocket.accept()
+    sender = asyncio.create_task(_send_live_sky(websocket, feed))
+    try:
+        # The feed is one-way; reading only notices the client leaving, at once rather than on the next send
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        with suppress(asyncio.CancelledError, WebSocketDisconnect):
+            await sender
+
+
+@router.get("/sky/live/events")
+async def live_sky_events(feed: SkyFeed = Depends(get_sky_feed)):
+    """The live sky feed as server-sent events, for clients without WebSockets."""
+    frames = feed.frames()
+    first = await frames.__anext__()  # refused subscriptions fail here, before the stream starts
+
+    async def stream():
+        try:
+            yield first.event
+            feed.delivered(first)
+            async for frame in frames:
+                yield frame.event
+                feed.delivered(frame)
+        finally:
+            await frames.aclose()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/sky/live/stats")
+async def get_live_sky_stats(feed: SkyFeed = Depends(get_sky_feed)) -> dict:
+    """Live sky subscribers, frames published, delivered and dropped, and broadcast latency."""
+    return feed.stats()
+
+
+@router.get("/sky/day", response_model=LocationDay)
+async def get_location_day(
+    place_id: int | None = None,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    timezone: str | None = None,
+    date: str | None = None,
+    gazetteer: Gazetteer = Depends(get_gazetteer),
+    rise_set: RiseSetService = Depends(get_rise_set_service)
+):
+    """Sunrise, sunset, moonrise, moonset and planetary hours of a local day (default: today)."""
+    lat, lon, tz = _resolve_location(gazetteer, place_id, latitude, longitude, timezone)
+    try:
+        local_date = LocalDate.fromisoformat(date) if date else None
+    except ValueError:
+        raise InvalidDateError(details=f"date={date!r}")
+    return rise_set.day(lat, lon, tz, local_date)
+
+
+EventKind = Literal[event_calendar.KINDS]
+EventBody = Literal[event_calendar.BODIES]
+
+
+@router.get("/events", response_model=SkyEventsResponse)
+async def list_sky_events(
+    start: datetime,
+    end: datetime,
+    kind: list[EventKind] | None = Query(None),
+    body: list[EventBody] | None = Query(None),
+    limit: int = Query(1000, ge=1, le=10_000),
+    calendar: EventCalendar = Depends(get_event_calendar)
+):
+    """Precomputed sky events starting between two moments, in time order."""
+    return SkyEventsResponse(events=calendar.between(
+        event_calendar.julian_day(start), event_calendar.julian_day(end), kind, body, limit
+    ))
+
+
+@router.get("/events/next", response_model=SkyEvent)
+async def next_sky_event(
+    kind: EventKind,
+    body: EventBody,
+    after: datetime | None = None,
+    calendar: EventCalendar = Depends(get_event_calendar)
+):
+    """The first event of a kind and body after a moment (default: now)."""
+    event = calendar.next(kind, body, event_calendar.julian_day(after or datetime.now(timezone.utc)))
+    if event is None:
+        raise EventRangeError(details=f"No {kind} of {body} before {calendar.end_year}-01-01.")
+    return event
+
+
+@router.get("/places/search", response_model=PlaceSearchResponse)
+async def search_places(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    gazetteer: Gazetteer = Depends(get_gazetteer)
+):
+    """Autocomplete birthplaces from the offline gazetteer."""
+    return PlaceSearchResponse(results=list(gazetteer.search(q, limit)))
+
+
+@router.get("/places/{place_id}", response_model=Place)
+async def get_place(place_id: int, gazetteer: Gazetteer = Depends(get_gazetteer)):
+    """Look up a gazetteer place by ID."""
+    place = gazetteer.get(place_id)
+    if place is None:
+        raise PlaceNotFoundError(details=f"place_id={place_id}")
+    return place
+
+
+def _processing_steps(birth_data: BirthData, output: HoroscopeOutput,
+                      use_case: GenerateHoroscopeUseCase, trace: StageTrace) -> ProcessingStepsResponse:
+    """Admin view of one pipeline run, built from its output and trace."""
+    chart = output.chart
+    calculate_use_case = use_case.calculate_use_case
+    return ProcessingStepsResponse(
+        coordinates={
+            "latitude": birth_data.lat,
+            "longitude": birth_data.lon,
+            "timezone": birth_data.timezone
+        },
+        time_correction=trace.details.get("time_correction", {}),
+        chart_generation={
+            "julian_day": chart.julian_day,
+            "planets": [
+                {"name": p.name, "degree": p.longitude, "sign": p.sign, "house": p.house,
+                 "retrograde": p.is_retrograde}
+                for p in chart.planets
+            ],
+            "houses": [{"number": h.number, "degree": h.degree, "sign": h.sign} for h in chart.houses]
+        },
+        relationship_mapping={
+            "aspects": [a.model_dump() for a in chart.aspects],
+            "patterns": [p.model_dump(exclude_none=True) for p in output.interpretation.patterns]
+        },
+        pm_config={
+            "house_system": calculate_use_case.astro_engine.HOUSE_SYSTEM.decode(),
+            "ephemeris_source": "SwissEphemeris",
+            "engine_version": calculate_use_case.version_for(),
+            "body_set": calculate_use_case.default_bodies,
+            "interpretation_engine": "Hybrid",
+            "ai_model": getattr(use_case.ai_adapter, "model_name", ""),
+            "temperature": None,  # the model's default; the adapter does not set one
+            "analysis_version": ANALYSIS_VERSION,
+            "preferences": output.preferences.model_dump(),
+            "text_source": output.text_source
+        },
+        stages=[asdict(timing) for timing in trace.stages]
     )
 
+
 @router.post("/horoscope/personal", response_model=HoroscopePersonalResponse)
 async def generate_personal_horoscope(
     request: HoroscopePersonalRequest,
     use_case: GenerateHoroscopeUseCase = Depends(get_generate_horoscope_use_case),
-    repo: InMemoryRepository = Depends(get_repository)
+    repo: BoundedInMemoryRepository = Depends(get_repository),
+    gazetteer: Gazetteer = Depends(get_gazetteer),
+    settings: Settings = Depends(get_settings),
+    x_admin_token: str | None = Header(None)
 ):
     """Generate personalized horoscope."""
-    import uuid
-
-    req_id = str(uuid.uuid4())
-
-    birth_data = BirthData(
-        date=request.profile.birth_date,
-        time=request.profile.birth_time,
-        lat=request.profile.latitude,
-        lon=request.profile.longitude,
-        timezone="UTC"  # Assume UTC for now
-    )
+    if request.admin:
+        # The trace exposes the engine configuration and model; same gate as /admin
+        require_admin(settings, x_admin_token)
+    birth_data = _profile_birth_data(request.profile, gazetteer)
 
-    horoscope_output = use_case.execute(birth_data)
+    # Admin requests record what the pipeline actually did; others skip tracing entirely
+    with tracing() if request.admin else nullcontext() as trace:
+        horoscope_output = use_case.execute(
+            birth_data, HoroscopePreferences(**request.preferences.model_dump()), request.text_engine
+        )
 
-    # Save profile and chart
-    user_id = req_id  # Use req_id as user_id for now
-    profile = UserProfile(
-        user_id=user_id,
-        birth=birth_data
-    )
-    repo.save_profile(profile)
-    repo.save_chart(user_id, horoscope_output.chart)
+        # Save profile and chart under content-addressed IDs, so repeated
+        # submissions of the same birth data upsert instead of duplicating
+        user_id = profile_id_for(birth_data)
+        profile = UserProfile(
+            user_id=user_id,
+            birth=birth_data
+        )
+        with stage("store"):
+            repo.save_profile(profile)
+            repo.save_chart(
+                user_id,
+                horoscope_output.chart,
+                chart_id=chart_id_for(birth_data, use_case.calculate_use_case.version_for())
+            )
 
-    # Build processing steps for admin mode
     processing_steps = None
     if request.admin:
-        processing_steps = ProcessingStepsResponse(
-            coordinates={
-                "latitude": request.profile.latitude,
-                "longitude": request.profile.longitude,
-                "timezone": "UTC"
-            },
-            time_correction={
-                "local_time": request.profile.birth_time,
-                "universal_time": "12:00:00",  # Mock conversion
-                "offset": "0:00"
-            },
-            chart_generation={
-                "planets": [
-                    {"name": "Sun", "degree": 15.5, "sign": "Aries"},
-                    {"name": "Moon", "degree": 22.1, "sign": "Libra"},
-                    {"name": "Ascendant", "degree": 5.0, "sign": "Cancer"}
-                ],
-                "houses": [
-                    {"number": 1, "degree": 5.0, "sign": "Cancer"},
-                    {"number": 2, "degree": 35.0, "sign": "Leo"}
-                ]
-            },
-            relationship_mapping={
-                "aspects": [
-                    {"planet1": "Sun", "planet2": "Moon", "type": "Opposition", "orb": 1.6}
-                ]
-            },
-            pm_config={
-                "house_system": "Placidus",
-                "ephemeris_source": "SwissEphemeris",
-                "interpretation_engine": "Hybrid",
-                "ai_model": "Gemini",
-                "temperature": 0.7
-            }
-        )
+        processing_steps = _processing_steps(birth_data, horoscope_output, use_case, trace)
 
     return HoroscopePersonalResponse(
+        profile_id=user_id,
         chart=horoscope_output.chart.model_dump(),
         interpretation=horoscope_output.interpretation.model_dump(),
         ai_text=horoscope_output.ai_text,
+        text_source=horoscope_output.text_source,
+        analysis_cached=horoscope_output.analysis_cached,
+        text_cached=horoscope_output.text_cached,
         processing_steps=processing_steps
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/horoscope/jobs", response_model=HoroscopeJobResponse, status_code=202)
+async def submit_horoscope_job(
+    request: HoroscopeJobRequest,
+    http_request: Request,
+    response: Response,
+    queue: SqliteJobQueue = Depends(get_job_queue),
+    gazetteer: Gazetteer = Depends(get_gazetteer),
+    settings: Settings = Depends(get_settings)
+):
+    """Queue a personalized horoscope and return immediately.
+
+    Poll ``GET /horoscope/jobs/{job_id}`` or pass ``webhook_url`` to be
+    notified when the job succeeds or is dead-lettered. Webhooks must be
+    https URLs of public hosts.
+    """
+    birth_data = _profile_birth_data(request.profile, gazetteer)
+    if request.webhook_url is not None:
+        # Resolving the host blocks; keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, check_webhook_url, request.webhook_url, _webhook_hosts(settings)
+        )
+    job_id = queue.enqueue(
+        {
+            "birth": birth_data.model_dump(),
+            "profile_id": profile_id_for(birth_data),
+            "preferences": request.preferences.model_dump(),
+            "text_engine": request.text_engine
+        },
+        webhook_url=request.webhook_url
+    )
+    response.headers["Location"] = http_request.url_for("get_horoscope_job", job_id=job_id).path
+    return HoroscopeJobResponse(**job_payload(queue.get(job_id)))
+
+
+@router.get("/horoscope/jobs/stats", response_model=JobQueueStatsResponse)
+async def get_job_queue_stats(queue: SqliteJobQueue = Depends(get_job_queue)):
+    """Queue depth per status and lag of the oldest due job."""
+    return JobQueueStatsResponse(**queue.stats())
+
+
+@router.get("/horoscope/generation/stats")
+async def get_generation_stats(
+    cache: GenerationCache = Depends(get_generation_cache),
+    ai_adapter: ResilientTextGenerator = Depends(get_ai_adapter)
+) -> dict:
+    """Reuse of cached chart analyses and rendered texts, and model prompt volume and latency per stage."""
+    return {**cache.stats(), "latency": {stage: ai_adapter.stage_stats(stage) for stage in ("analysis", "rewrite")}}
+
+
+@router.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=1000),
+    recorder: ProfileRecorder = Depends(get_profile_recorder),
+    settings: Settings = Depends(get_settings)
+) -> dict:
+    """Most recent profiling captures, newest first, without their samples."""
+    return {"mode": settings.profiling_mode, "captures": recorder.list(limit)}
+
+
+@router.get("/admin/profiles/{capture_id}", dependencies=[Depends(require_admin)])
+async def get_profile(capture_id: str, recorder: ProfileRecorder = Depends(get_profile_recorder)) -> dict:
+    """A full capture: request, stage timings and sampled stacks."""
+    record = recorder.get(capture_id)
+    if record is None:
+        raise ProfileNotFoundError(details=f"capture_id={capture_id}")
+    return record
+
+
+@router.get("/admin/profiles/{capture_id}/flamegraph", dependencies=[Depends(require_admin)],
+            response_class=PlainTextResponse)
+async def get_profile_flamegraph(capture_id: str, recorder: ProfileRecorder = Depends(get_profile_recorder)):
+    """The capture's samples as folded stacks, for flamegraph.pl or speedscope."""
+    record = recorder.get(capture_id)
+    if record is None:
+        raise ProfileNotFoundError(details=f"capture_id={capture_id}")
+    return PlainTextResponse(
+        recorder.folded(record),
+        headers={"Content-Disposition": f'attachment; filename="{capture_id}.folded"'}
+    )
+
+
+@router.post("/admin/repository/compact", dependencies=[Depends(require_admin)])
+async def compact_repository(repo: BoundedInMemoryRepository = Depends(get_repository)) -> dict:
+    """Merge duplicate profiles and charts and drop unreferenced charts now."""
+    return asdict(repo.compact())
+
+
+@router.get("/repository/stats", response_model=RepositoryStatsResponse)
+async def get_repository_stats(repo: BoundedInMemoryRepository = Depends(get_repository)):
+    """Occupancy, eviction and estimated-bytes metrics of the profile and chart store."""
+    return RepositoryStatsResponse(**repo.stats())
+
+
+@router.get("/charts/search", response_model=ChartSearchResponse, dependencies=[Depends(require_admin)])
+async def search_charts(
+    q: str = Query(..., min_length=1, max_length=1000),
+    limit: int = Query(100, ge=0, le=10000),
+    repo: BoundedInMemoryRepository = Depends(get_repository)
+):
+    """Find users by chart placements, e.g. ``Venus in Libra in house 7``."""
+    matches = repo.find_users(q, limit)
+    return ChartSearchResponse(total=matches.total, user_ids=matches.user_ids)
+
+
+@router.get("/charts/{user_id}/similar", response_model=SimilarChartsResponse,
+            dependencies=[Depends(require_admin)])
+async def get_similar_charts(
+    user_id: str,
+    k: int = Query(10, ge=1, le=100),
+    repo: BoundedInMemoryRepository = Depends(get_repository)
+):
+    """Users whose charts are most similar to this user's chart."""
+    matches = repo.find_similar(user_id, k)
+    if matches is None:
+        raise ChartNotFoundError(details=f"user_id={user_id}")
+    return SimilarChartsResponse(
+        user_id=user_id,
+        matches=[SimilarChart(user_id=match, similarity=score) for match, score in matches]
+    )
+
+
+@router.get("/horoscope/jobs/{job_id}", response_model=HoroscopeJobResponse)
+async def get_horoscope_job(job_id: str, queue: SqliteJobQueue = Depends(get_job_queue)):
+    """Poll a queued horoscope job."""
+    job = queue.get(job_id)
+    if job is None:
+        raise JobNotFoundError(details=f"job_id={job_id}")
+    return HoroscopeJobResponse(**job_payload(job))
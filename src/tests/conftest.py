@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+# Several test modules import the app inside ``patch.dict('sys.modules', ...)``
+# to stub swisseph, which drops every module first imported in that block when
+# it exits. NumPy refuses to be imported twice per process, so load it up front.
+import numpy  # noqa: F401
@@ -0,0 +1,196 @@
+"""Local stand-in for the Gemini API, for load tests that must not burn quota.
+
+Implements ``models/{model}:generateContent`` and ``:streamGenerateContent``
+(server-sent events) with configurable latency distribution, error rate and
+streaming behaviour. Point ``GeminiAdapter`` at it via ``GEMINI_BASE_URL``.
+
+Run standalone::
+
+    python -m src.tests.fake_llm_server --port 8090 --median-ms 800 --p99-ms 6000 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ROUTE = re.compile(r"^/(?P<version>[^/]+)/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)")
+
+FAKE_TEXT = (
+    "Your chart shows a grounded Taurus Sun balanced by an inventive Aquarius Moon. "
+    "This is a period to build patiently on ideas that once felt too unconventional. "
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour of the fake model server."""
+
+    median_ms: float = 800.0  # median latency of a full response
+    p99_ms: float = 6000.0  # 99th percentile; together with the median defines a log-normal
+    error_rate: float = 0.0  # fraction of requests answered with an error
+    error_status: int = 503
+    hang_rate: float = 0.0  # fraction of requests that never answer within hang_ms
+    hang_ms: float = 60000.0
+    stream_chunks: int = 8  # chunks per streamed response
+    response_chars: int = 1200
+    seed: Optional[int] = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw a response latency in seconds from the log-normal distribution."""
+        mu = math.log(max(self.median_ms, 1e-3))
+        # z(0.99) = 2.326: sigma such that exp(mu + 2.326 sigma) == p99
+        sigma = max(math.log(max(self.p99_ms, self.median_ms) / max(self.median_ms, 1e-3)) / 2.326, 0.0)
+        return rng.lognormvariate(mu, sigma) / 1000.0
+
+
+class FakeLLMServer:
+    """Threaded HTTP server emulating the Gemini generateContent endpoints."""
+
+    def __init__(self, config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the server (not yet serving).
+
+        Args:
+            config: Latency, error and streaming behaviour.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+        """
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _draw(self):
+        with self._rng_lock:
+            self.requests += 1
+            latency = self.config.sample_latency(self._rng)
+            fail = self._rng.random() < self.config.error_rate
+            hang = self._rng.random() < self.config.hang_rate
+        return latency, fail, hang
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        handler.rfile.read(length)
+        match = ROUTE.match(handler.path)
+        if match is None:
+            self._send_json(handler, 404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        latency, fail, hang = self._draw()
+        if hang:
+            time.sleep(self.config.hang_ms / 1000.0)
+        if fail:
+            time.sleep(latency * 0.1)
+            self._send_json(handler, self.config.error_status, {
+                "error": {"code": self.config.error_status, "message": "Injected failure", "status": "UNAVAILABLE"}
+            })
+            return
+
+        text = (FAKE_TEXT * (self.config.response_chars // len(FAKE_TEXT) + 1))[:self.config.response_chars]
+        if match.group("method") == "generateContent":
+            time.sleep(latency)
+            self._send_json(handler, 200, self._response(text, match.group("model")))
+            return
+
+        # Streaming: first chunk after a share of the latency, the rest spread evenly
+        chunks = max(self.config.stream_chunks, 1)
+        size = math.ceil(len(text) / chunks)
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        for i in range(chunks):
+            time.sleep(latency / chunks)
+            event = f"data: {json.dumps(self._response(text[i * size:(i + 1) * size], match.group('model')))}\r\n\r\n"
+            data = event.encode("utf-8")
+            handler.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _response(text: str, model: str) -> dict:
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": 350,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": 350 + len(text) // 4,
+            },
+            "modelVersion": model,
+        }
+
+    @staticmethod
+    def _send_json(handler: BaseHTTPRequestHandler, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--median-ms", type=float, default=800.0)
+    parser.add_argument("--p99-ms", type=float, default=6000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--stream-chunks", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    config = FakeLLMConfig(
+        median_ms=args.median_ms, p99_ms=args.p99_ms, error_rate=args.error_rate,
+        hang_rate=args.hang_rate, stream_chunks=args.stream_chunks, seed=args.seed,
+    )
+    server = FakeLLMServer(config, args.host, args.port)
+    print(f"Fake LLM server listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
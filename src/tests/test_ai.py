@@ -1,19 +1,28 @@
 """Tests for AI components."""
 
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
 
 # Mock swisseph to avoid import error
 mock_swe = MagicMock()
 mock_swe.julday.return_value = 2448029.020833
-mock_swe.houses.return_value = ([0]*13, 0, 0, 0, 0)  # cusps, asc, mc, armc, vertex
+mock_swe.houses.return_value = ((0.0,) * 12, (0.0,) * 8)  # cusps, (asc, mc, armc, vertex, ...)
 mock_swe.calc_ut.return_value = ((56.45, 0, 0, 1.0, 0), 0)  # pos, flag
 mock_swe.house_pos.return_value = 9
 with patch.dict('sys.modules', {'swisseph': mock_swe}):
-    from src.core.domain.models import BirthData, HoroscopeOutput, Interpretation, NatalChart, Planet
+    from src.core.domain.models import (
+        BirthData, HoroscopeOutput, HoroscopePreferences, Interpretation, NatalChart, Planet
+    )
     from src.core.use_cases import generate_horoscope
+    from src.core.use_cases.chart_analysis import GenerationCache, parse_analysis
     from src.core.use_cases.generate_horoscope import GenerateHoroscopeUseCase
     from src.infrastructure.ai.gemini_adapter import GeminiAdapter
+    from src.infrastructure.ai.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ResilientTextGenerator
+    from src.core.domain.exceptions import AIServiceUnavailableError
+
+from src.tests.fake_llm_server import FakeLLMConfig, FakeLLMServer
 
 
 class TestGeminiAdapter:
@@ -32,6 +41,116 @@ class TestGeminiAdapter:
             assert result == "Generated horoscope text"
             mock_generate.assert_called_once_with(model=adapter.model_name, contents="Test prompt")
 
+    def test_against_fake_llm_server(self):
+        """The adapter talks to the load-test fake server through base_url."""
+        server = FakeLLMServer(FakeLLMConfig(median_ms=1, p99_ms=2, response_chars=200)).start()
+        try:
+            adapter = GeminiAdapter(api_key="fake_key", base_url=server.base_url)
+            assert len(adapter.generate_text("Test prompt")) == 200
+            assert server.requests == 1
+        finally:
+            server.stop()
+
+    def test_fake_llm_server_injects_errors(self):
+        """Injected failures surface as API errors."""
+        server = FakeLLMServer(FakeLLMConfig(median_ms=1, p99_ms=2, error_rate=1.0)).start()
+        try:
+            adapter = GeminiAdapter(api_key="fake_key", base_url=server.base_url)
+            with pytest.raises(Exception):
+                adapter.generate_text("Test prompt")
+        finally:
+            server.stop()
+
+
+class SlowAdapter:
+    """Adapter whose calls take the next delay from a list, or raise."""
+
+    def __init__(self, delays, error=None):
+        self.delays = list(delays)
+        self.error = error
+        self.calls = 0
+
+    def generate_text(self, prompt):
+        self.calls += 1
+        delay = self.delays.pop(0) if self.delays else 0.0
+        time.sleep(delay)
+        if self.error:
+            raise self.error
+        return f"text after {delay}"
+
+
+class TestResilientTextGenerator:
+    """Unit tests for deadlines, hedging and circuit breaking."""
+
+    def test_hedge_wins_over_slow_primary(self):
+        """A hedged duplicate answers when the primary is stuck."""
+        generator = ResilientTextGenerator(SlowAdapter([2.0, 0.0]), deadline=1.0, initial_hedge_delay=0.05)
+        assert generator.generate_text("p") == "text after 0.0"
+        assert generator.counters["hedge_wins"] == 1
+
+    def test_deadline_raises_unavailable(self):
+        """Calls past the deadline are abandoned."""
+        generator = ResilientTextGenerator(SlowAdapter([1.0, 1.0]), deadline=0.1, hedge_percentile=0)
+        started = time.monotonic()
+        with pytest.raises(AIServiceUnavailableError):
+            generator.generate_text("p")
+        assert time.monotonic() - started < 0.5
+        assert generator.counters["timeouts"] == 1
+
+    def test_fast_failure_is_retried_once(self):
+        """An immediate upstream error triggers the hedge as a retry."""
+        adapter = SlowAdapter([], error=RuntimeError("503"))
+        generator = ResilientTextGenerator(adapter, deadline=1.0)
+        with pytest.raises(AIServiceUnavailableError, match="AI text service"):
+            generator.generate_text("p")
+        assert adapter.calls == 2
+
+    def test_breaker_opens_and_probes(self):
+        """The breaker short-circuits after repeated failures and probes once after the cool-down."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+        adapter = SlowAdapter([], error=RuntimeError("503"))
+        generator = ResilientTextGenerator(adapter, deadline=1.0, hedge_percentile=0, breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(AIServiceUnavailableError):
+                generator.generate_text("p")
+        assert breaker.state == OPEN
+        with pytest.raises(AIServiceUnavailableError):
+            generator.generate_text("p")
+        assert adapter.calls == 2
+        assert generator.counters["short_circuited"] == 1
+
+        time.sleep(0.15)
+        assert breaker.state == HALF_OPEN
+        adapter.error = None
+        assert generator.generate_text("p") == "text after 0.0"
+        assert breaker.state == CLOSED
+
+    def test_timeout_shortens_the_deadline(self):
+        """A call gets at most the remaining budget, and none once it is spent."""
+        adapter = SlowAdapter([0.5])
+        generator = ResilientTextGenerator(adapter, deadline=5.0, hedge_percentile=0)
+        started = time.monotonic()
+        with pytest.raises(AIServiceUnavailableError, match="AI text service"):
+            generator.generate_text("p", timeout=0.1)
+        assert time.monotonic() - started < 0.4
+
+        with pytest.raises(AIServiceUnavailableError):
+            generator.generate_text("p", timeout=0.0)
+        assert adapter.calls == 1
+        assert generator.counters["timeouts"] == 2
+
+    def test_latency_is_tracked_per_stage(self):
+        """Each stage has its own latency window and hedge delay."""
+        generator = ResilientTextGenerator(SlowAdapter([0.05, 0.0, 0.0]), deadline=1.0, min_samples=1)
+        generator.generate_text("p", stage="analysis")
+        generator.generate_text("p", stage="rewrite")
+        generator.generate_text("p", stage="rewrite")
+        analysis, rewrite = generator.stage_stats("analysis"), generator.stage_stats("rewrite")
+        assert analysis["samples"] == 1 and rewrite["samples"] == 2
+        assert analysis["p50_ms"] >= 50 > rewrite["max_ms"]
+        assert generator.hedge_delay("rewrite") < generator.hedge_delay("analysis")
+        assert set(generator.stats()["stages"]) == {"analysis", "rewrite"}
+
 
 class TestGenerateHoroscopeUseCase:
     """Integration tests for GenerateHoroscopeUseCase."""
@@ -66,4 +185,123 @@ class TestGenerateHoroscopeUseCase:
             assert result.interpretation == mock_interpretation
             assert result.ai_text == "AI generated horoscope"
 
-            mock_calculate_uc.execute.assert_called_once_with(birth_data)
\ No newline at end of file
+            mock_calculate_uc.execute.assert_called_once_with(birth_data)
+    def test_execute_falls_back_to_template_text(self):
+        """Unavailable AI yields template text flagged as fallback."""
+        mock_calculate_uc = MagicMock()
+        mock_calculate_uc.execute.return_value = NatalChart(
+            planets=[Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False)],
+            houses=[],
+            aspects=[]
+        )
+        ai_adapter = MagicMock()
+        ai_adapter.generate_text.side_effect = AIServiceUnavailableError(details="circuit open")
+        birth_data = BirthData(date="1990-05-17", time="12:00", lat=44.4, lon=26.1, timezone="UTC")
+
+        result = GenerateHoroscopeUseCase(mock_calculate_uc, ai_adapter).execute(birth_data)
+        assert result.text_source == "fallback"
+        assert "Sun in Leo" in result.ai_text
+
+        with pytest.raises(AIServiceUnavailableError):
+            GenerateHoroscopeUseCase(mock_calculate_uc, ai_adapter, allow_fallback=False).execute(birth_data)
+
+    def test_execute_shares_one_deadline_across_stages(self):
+        """The rewrite only gets the time the analysis left of the deadline."""
+        mock_calculate_uc = MagicMock()
+        mock_calculate_uc.execute.return_value = NatalChart(
+            planets=[Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False)],
+            houses=[],
+            aspects=[]
+        )
+        adapter = SlowAdapter([0.3, 0.4])
+        generator = ResilientTextGenerator(adapter, deadline=1.0, hedge_percentile=0)
+        birth_data = BirthData(date="1990-05-17", time="12:00", lat=44.4, lon=26.1, timezone="UTC")
+
+        started = time.monotonic()
+        result = GenerateHoroscopeUseCase(mock_calculate_uc, generator, deadline=0.5).execute(birth_data)
+        assert time.monotonic() - started < 0.65
+        assert result.text_source == "fallback" and adapter.calls == 2
+        assert generator.stage_stats("analysis")["samples"] == 1
+        assert generator.stage_stats("rewrite")["samples"] == 0
+
+    def test_execute_with_template_engine(self):
+        """The template engine never calls the model, per request or as the default."""
+        mock_calculate_uc = MagicMock()
+        mock_calculate_uc.execute.return_value = NatalChart(
+            planets=[Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False)],
+            houses=[],
+            aspects=[]
+        )
+        ai_adapter = MagicMock()
+        birth_data = BirthData(date="1990-05-17", time="12:00", lat=44.4, lon=26.1, timezone="UTC")
+
+        result = GenerateHoroscopeUseCase(mock_calculate_uc, ai_adapter).execute(
+            birth_data, HoroscopePreferences(language="es"), text_engine="template")
+        assert result.text_source == "template"
+        assert "el Sol en Leo" in result.ai_text
+
+        default = GenerateHoroscopeUseCase(mock_calculate_uc, ai_adapter, text_engine="template")
+        assert default.execute(birth_data).text_source == "template"
+        ai_adapter.generate_text.assert_not_called()
+
+        with pytest.raises(ValueError):
+            default.execute(birth_data, text_engine="markov")
+
+
+class RecordingAdapter:
+    """Answers stage one with JSON and stage two with a marker of the prompt."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_text(self, prompt, timeout=None, stage="default"):
+        self.prompts.append(prompt)
+        if "Answer with JSON only" in prompt:
+            return '```json\n{"overview": "Leo heart.", "sections": {"love": "Warm lover.", "career": "Born leader."}}\n```'
+        return f"rendered #{len(self.prompts)}"
+
+
+class TestTwoStageGeneration:
+    """Cached chart analysis reused across tone, focus and language."""
+
+    @pytest.fixture
+    def use_case(self):
+        calculate = MagicMock()
+        calculate.execute.return_value = NatalChart(
+            planets=[Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False)],
+            houses=[],
+            aspects=[]
+        )
+        return GenerateHoroscopeUseCase(calculate, RecordingAdapter(), cache=GenerationCache())
+
+    def test_preference_switch_costs_one_small_call(self, use_case):
+        """The analysis runs once; each new preference set costs one rewrite; repeats are free."""
+        birth_data = BirthData(date="1990-05-17", time="12:00", lat=44.4, lon=26.1, timezone="UTC")
+        adapter = use_case.ai_adapter
+
+        first = use_case.execute(birth_data, HoroscopePreferences(focus="love"))
+        assert not first.analysis_cached and not first.text_cached
+        assert len(adapter.prompts) == 2
+        assert "Warm lover." in adapter.prompts[1] and "Born leader." not in adapter.prompts[1]
+
+        second = use_case.execute(birth_data, HoroscopePreferences(focus="career", tone="direct", language="ro"))
+        assert second.analysis_cached and not second.text_cached
+        assert len(adapter.prompts) == 3
+        rewrite = adapter.prompts[2]
+        assert '"longitude"' not in rewrite and "Born leader." in rewrite and '"ro"' in rewrite
+        assert len(rewrite) < len(adapter.prompts[0])
+
+        again = use_case.execute(birth_data, HoroscopePreferences(focus="Love "))
+        assert again.text_cached and again.ai_text == first.ai_text
+        assert len(adapter.prompts) == 3
+
+        stats = use_case.cache.stats()
+        assert stats["analysis_calls"] == 1 and stats["rewrite_calls"] == 2
+        assert stats["analysis_hits"] == 2 and stats["text_hits"] == 1
+        assert stats["analysis_hit_ratio"] == pytest.approx(2 / 3)
+
+    def test_parse_analysis_tolerates_prose(self):
+        """Answers that are not JSON are kept whole as the overview."""
+        assert parse_analysis("Just prose.").overview == "Just prose."
+        parsed = parse_analysis('{"overview": "O", "sections": {"Love": "L", "career": ""}}')
+        assert parsed.sections == {"love": "L"}
@@ -1,5 +1,7 @@
 """Integration tests for the API."""
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
@@ -9,13 +11,15 @@ import sys
 mock_swe = MagicMock()
 sys.modules['swisseph'] = mock_swe
 
-from src.core.domain.models import NatalChart, Planet, House, Aspect
-from src.interfaces.api.main import app
+from src.config.settings import Settings
+from src.core.domain.models import BirthData, NatalChart, Planet, House, Aspect, UserProfile
+from src.infrastructure.persistence.bounded_repo import BoundedInMemoryRepository
+from src.interfaces.api.main import app, create_app
 import src.interfaces.api.v1 as v1_module
 
 # Set return values for mocked functions
 mock_swe.julday.return_value = 2448029.020833
-mock_swe.houses.return_value = ([0]*13, 0, 0, 0, 0)
+mock_swe.houses.return_value = ((0.0,) * 12, (0.0,) * 8)
 mock_swe.calc_ut.return_value = ((56.45, 0, 0, 1.0, 0), 0)
 mock_swe.house_pos.return_value = 9
 
@@ -26,6 +30,15 @@ def client():
     yield TestClient(app)
 
 
+@pytest.fixture
+def admin_client():
+    """Client of an app with an admin token, sending it on every request."""
+    settings = Settings(google_api_key="x", admin_token="secret")
+    admin_app = create_app(settings)
+    admin_app.dependency_overrides[v1_module.get_settings] = lambda: settings
+    yield TestClient(admin_app, headers={"X-Admin-Token": "secret"})
+
+
 def test_calculate_chart(client):
     """Test the /api/v1/chart/calculate endpoint."""
     request_data = {
@@ -47,6 +60,171 @@ def test_calculate_chart(client):
     assert "aspects" in data
 
 
+def test_calculate_chart_get_is_cacheable(client):
+    """The GET variant carries a strong ETag and Cache-Control."""
+    params = {
+        "date": "1990-05-17",
+        "time": "12:30",
+        "latitude": 44.4268,
+        "longitude": 26.1025,
+        "timezone": "Europe/Bucharest"
+    }
+    response = client.get("/api/v1/chart/calculate", params=params)
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "max-age" in response.headers["cache-control"]
+    assert len(response.json()["houses"]) == 12
+
+    # Equivalent, non-canonical input maps to the same representation
+    equivalent = dict(params, date="1990-5-17", latitude="44.42680000")
+    assert client.get("/api/v1/chart/calculate", params=equivalent).headers["etag"] == response.headers["etag"]
+
+
+def test_calculate_chart_get_not_modified_skips_engine(client):
+    """A matching If-None-Match returns 304 without touching the engine."""
+    params = {"date": "1990-05-17", "latitude": 44.4268, "longitude": 26.1025, "timezone": "UTC"}
+    etag = client.get("/api/v1/chart/calculate", params=params).headers["etag"]
+
+    with patch.object(v1_module.SwissEphemerisEngine, "calculate_chart") as mock_calculate:
+        response = client.get("/api/v1/chart/calculate", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        mock_calculate.assert_not_called()
+
+
+def test_calculate_chart_get_rejects_invalid_date(client):
+    """Unparseable dates surface as a domain error."""
+    params = {"date": "1990-13-40", "latitude": 0, "longitude": 0, "timezone": "UTC"}
+    response = client.get("/api/v1/chart/calculate", params=params)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_DATE"
+
+
+def test_calculate_chart_body_set(client):
+    """The body set is chosen per request and keyed into the ETag."""
+    params = {"date": "1990-05-17", "latitude": 44.4268, "longitude": 26.1025, "timezone": "UTC"}
+    classic = client.get("/api/v1/chart/calculate", params=params)
+    standard = client.get("/api/v1/chart/calculate", params=dict(params, bodies="standard"))
+    assert standard.status_code == 200
+    assert standard.headers["etag"] != classic.headers["etag"]
+    assert "bodies=standard" in standard.headers["content-location"]
+
+    response = client.post("/api/v1/chart/calculate", json=dict(params, bodies=["Sun", "Nibiru"]))
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_BODY_SET"
+
+
+def test_current_sky(client):
+    """The current sky snapshot lists every body for the bucket."""
+    response = client.get("/api/v1/sky/current", params={"resolution": "day"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resolution"] == "day"
+    assert len(data["positions"]) == 10
+
+    assert client.get("/api/v1/sky/current", params={"resolution": "week"}).status_code == 422
+
+
+def test_search_places(client):
+    """The gazetteer search returns coordinates and IANA zone."""
+    response = client.get("/api/v1/places/search", params={"q": "bucha", "limit": 3})
+    assert response.status_code == 200
+    place = response.json()["results"][0]
+    assert place["place_id"] == 683506
+    assert place["timezone"] == "Europe/Bucharest"
+
+
+def test_calculate_chart_with_place_id(client):
+    """A place ID can stand in for coordinates and timezone."""
+    response = client.post("/api/v1/chart/calculate", json={"date": "1990-05-17", "place_id": 683506})
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/chart/calculate", json={"date": "1990-05-17", "place_id": 1})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "PLACE_NOT_FOUND"
+
+
+def test_calculate_chart_coordinates_require_timezone(client):
+    """Raw coordinates without a timezone are rejected rather than read as UTC."""
+    request_data = {"date": "1990-05-17", "time": "12:30", "latitude": 44.4268, "longitude": 26.1025}
+    response = client.post("/api/v1/chart/calculate", json=request_data)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_TIMEZONE"
+
+    response = client.get("/api/v1/chart/calculate", params=request_data)
+    assert response.status_code == 400
+
+
+def test_chart_returns_bodies_and_relocation(client):
+    """Returns are cast for the requested body set; a half-specified relocation is rejected."""
+    use_case = MagicMock()
+    use_case.returns.return_value = []
+    app.dependency_overrides[v1_module.get_chart_returns_use_case] = lambda: use_case
+    try:
+        request_data = {"date": "1990-05-17", "latitude": 44.4268, "longitude": 26.1025, "timezone": "UTC",
+                        "bodies": "standard", "return_latitude": 51.5, "return_longitude": -0.12}
+        assert client.post("/api/v1/chart/returns", json=request_data).status_code == 200
+        args = use_case.returns.call_args.args
+        assert args[4] == (51.5, -0.12) and args[5] == "standard"
+
+        del request_data["return_longitude"]
+        response = client.post("/api/v1/chart/returns", json=request_data)
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_COORDINATES"
+        assert use_case.returns.call_count == 1
+
+        out_of_range = dict(request_data, return_latitude=500, return_longitude=0)
+        assert client.post("/api/v1/chart/returns", json=out_of_range).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_chart_progressions_bodies_and_ages(client):
+    """Progressions use the requested body set; ages outside 0-150 are rejected."""
+    use_case = MagicMock()
+    use_case.progressions.return_value = []
+    app.dependency_overrides[v1_module.get_chart_returns_use_case] = lambda: use_case
+    try:
+        request_data = {"date": "1990-05-17", "latitude": 44.4268, "longitude": 26.1025, "timezone": "UTC",
+                        "bodies": "standard", "ages": [30.0]}
+        assert client.post("/api/v1/chart/progressions", json=request_data).status_code == 200
+        assert use_case.progressions.call_args.args[1:] == ([30.0], "standard")
+
+        assert client.post("/api/v1/chart/progressions", json=dict(request_data, ages=[1e9])).status_code == 422
+        assert client.post("/api/v1/chart/progressions", json=dict(request_data, ages=[-1])).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_astrocartography_rejects_too_fine_grids(client):
+    """The curve step has a floor, since map size and cost grow as 1/step."""
+    request_data = {"date": "1990-05-17", "latitude": 44.4268, "longitude": 26.1025, "timezone": "UTC",
+                    "step": 0.001}
+    assert client.post("/api/v1/chart/astrocartography", json=request_data).status_code == 422
+
+
+def test_search_charts(admin_client):
+    """Placement queries return matching users; malformed queries are rejected."""
+    response = admin_client.get("/api/v1/charts/search", params={"q": "Sun in Leo OR NOT Sun in Leo", "limit": 5})
+    assert response.status_code == 200
+    assert response.json()["total"] >= len(response.json()["user_ids"])
+
+    response = admin_client.get("/api/v1/charts/search", params={"q": "Sun in Nowhere"})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_QUERY"
+
+    params = {"q": "Sun in Leo"}
+    assert admin_client.get("/api/v1/charts/search", params=params, headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_similar_charts_unknown_user(admin_client):
+    """Users without a stored chart have no neighbours; only admins may ask."""
+    response = admin_client.get("/api/v1/charts/nobody/similar")
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "CHART_NOT_FOUND"
+
+    assert admin_client.get("/api/v1/charts/nobody/similar", headers={"X-Admin-Token": ""}).status_code == 403
+
+
 def test_generate_personal_horoscope(client):
     """Test the /api/v1/horoscope/personal endpoint."""
     from src.core.domain.models import HoroscopeOutput, NatalChart, Interpretation, Planet
@@ -99,6 +277,140 @@ def test_generate_personal_horoscope(client):
         assert "challenges" in data["interpretation"]
         assert "ai_text" in data
         assert data["ai_text"] == "Mocked AI text"
+        assert data["text_source"] == "ai"
+
+
+def test_generate_personal_horoscope_admin_trace(admin_client):
+    """Admin mode reports the real pipeline run, including cache provenance."""
+    client = admin_client
+    request_data = {
+        "profile": {
+            "name": "Alex",
+            "birth_date": "1990-05-17",
+            "birth_time": "12:30",
+            "place_id": 683506
+        },
+        "preferences": {"tone": "practical", "focus": "finances", "language": "de"},
+        "admin": True
+    }
+    with patch('src.infrastructure.ai.gemini_adapter.GeminiAdapter.generate_text', return_value="Mocked AI text"):
+        first = client.post("/api/v1/horoscope/personal", json=request_data).json()["processing_steps"]
+        second = client.post("/api/v1/horoscope/personal", json=request_data).json()["processing_steps"]
+
+    assert first["time_correction"] == {
+        "local_time": "1990-05-17 12:30",
+        "time_assumed": False,
+        "timezone": "Europe/Bucharest",
+        "universal_time": "1990-05-17 09:30:00",
+        "offset": "+03:00",
+        "zone_offset": "+03:00",
+        "julian_day": 2448029.020833
+    }
+    assert first["chart_generation"]["planets"][0] == {
+        "name": "Sun", "degree": 56.45, "sign": "Taurus", "house": 9, "retrograde": False
+    }
+    assert first["pm_config"]["house_system"] == "P"
+    assert first["pm_config"]["preferences"]["language"] == "de"
+
+    stages = {s["name"]: s for s in first["stages"]}
+    assert list(stages) == ["chart", "interpretation", "ai.analysis", "ai.rewrite", "store"]
+    assert stages["chart"]["source"] == "computed"
+    assert stages["ai.rewrite"]["source"] == "computed"
+    assert all(s["duration_ms"] >= 0 for s in first["stages"])
+    assert {s["name"]: s["source"] for s in second["stages"]}["ai.analysis"] == "cache"
+    assert {s["name"]: s["source"] for s in second["stages"]}["ai.rewrite"] == "cache"
+
+
+def test_generate_personal_horoscope_admin_trace_requires_token(client, admin_client):
+    """The trace is only returned to callers holding the admin token."""
+    request_data = {
+        "profile": {"name": "Alex", "birth_date": "1990-05-17", "birth_time": "12:30", "place_id": 683506},
+        "preferences": {"tone": "practical", "focus": "career", "language": "en"},
+        "text_engine": "template",
+        "admin": True
+    }
+    assert client.post("/api/v1/horoscope/personal", json=request_data).status_code == 403
+    wrong_token = {"X-Admin-Token": "guess"}
+    assert admin_client.post("/api/v1/horoscope/personal", json=request_data, headers=wrong_token).status_code == 403
+
+    request_data["admin"] = False
+    response = client.post("/api/v1/horoscope/personal", json=request_data)
+    assert response.status_code == 200
+    assert response.json()["processing_steps"] is None
+
+
+def test_generate_personal_horoscope_template_text(admin_client):
+    """The template text engine answers without calling the model."""
+    client = admin_client
+    request_data = {
+        "profile": {"name": "Alex", "birth_date": "1990-05-17", "birth_time": "12:30", "place_id": 683506},
+        "preferences": {"tone": "practical", "focus": "career", "language": "ro"},
+        "text_engine": "template",
+        "admin": True
+    }
+    with patch('src.infrastructure.ai.gemini_adapter.GeminiAdapter.generate_text') as generate_text:
+        response = client.post("/api/v1/horoscope/personal", json=request_data)
+    generate_text.assert_not_called()
+    assert response.status_code == 200
+    body = response.json()
+    assert body["text_source"] == "template"
+    assert "Soarele în Taur" in body["ai_text"]
+    assert [s["name"] for s in body["processing_steps"]["stages"]] == ["chart", "interpretation", "template_text", "store"]
+
+    request_data["text_engine"] = "markov"
+    assert client.post("/api/v1/horoscope/personal", json=request_data).status_code == 422
+
+
+def legacy_repository() -> BoundedInMemoryRepository:
+    """A repository holding two uuid-keyed copies of one profile and chart."""
+    repo = BoundedInMemoryRepository()
+    birth = BirthData(date="1990-05-17", time="12:30", lat=44.4268, lon=26.1025, timezone="UTC")
+    chart = NatalChart(planets=[Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False)],
+                       houses=[], aspects=[])
+    for legacy_id in ("uuid-1", "uuid-2"):
+        repo.save_profile(UserProfile(user_id=legacy_id, birth=birth))
+        repo.save_chart(legacy_id, chart, chart_id=f"legacy-{legacy_id}")
+    return repo
+
+
+def test_repository_is_compacted_periodically():
+    """The lifespan task compacts the shared repository on its interval."""
+    repo = legacy_repository()
+
+    async def scenario():
+        task = asyncio.create_task(v1_module.run_repository_compaction(repo, 0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert len(repo._profiles) == 1 and len(repo._charts) == 1
+    assert repo.get_chart("uuid-2") is not None
+
+
+def test_admin_repository_compaction():
+    """Admins can compact the repository on demand."""
+    settings = Settings(google_api_key="x", admin_token="secret")
+    admin_app = create_app(settings)
+    repo = legacy_repository()
+    admin_app.dependency_overrides[v1_module.get_settings] = lambda: settings
+    admin_app.dependency_overrides[v1_module.get_repository] = lambda: repo
+    admin_client = TestClient(admin_app)
+
+    assert admin_client.post("/api/v1/admin/repository/compact").status_code == 403
+    response = admin_client.post("/api/v1/admin/repository/compact", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json() == {"profiles_merged": 2, "charts_merged": 1, "orphan_charts_removed": 0}
+
+
+def test_admin_endpoints_fail_closed_without_token():
+    """With no ADMIN_TOKEN configured, admin endpoints reject every request."""
+    settings = Settings(google_api_key="x", admin_token="")
+    admin_app = create_app(settings)
+    admin_app.dependency_overrides[v1_module.get_settings] = lambda: settings
+    admin_client = TestClient(admin_app)
+
+    assert admin_client.post("/api/v1/admin/repository/compact").status_code == 403
+    assert admin_client.post("/api/v1/admin/repository/compact", headers={"X-Admin-Token": ""}).status_code == 403
 
 
 def test_health_check(client):
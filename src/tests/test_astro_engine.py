@@ -1,15 +1,23 @@
 """Unit tests for the astro engine."""
 
+import importlib.machinery
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
 import pytest
 from unittest.mock import MagicMock, patch
 
 # Mock swisseph to avoid import error
 mock_swe = MagicMock()
 mock_swe.julday.return_value = 2448029.020833
-mock_swe.houses.return_value = ([0]*13, 0, 0, 0, 0)  # cusps, asc, mc, armc, vertex
+mock_swe.houses.return_value = ((0.0,) * 12, (0.0,) * 8)  # cusps, (asc, mc, armc, vertex, ...)
 mock_swe.calc_ut.return_value = ((280.46, 0, 0, 1.0, 0), 0)  # pos, flag for Sun in Capricorn
 mock_swe.house_pos.return_value = 9
 with patch.dict('sys.modules', {'swisseph': mock_swe}):
+    from src.core.domain.exceptions import InvalidTimezoneError
     from src.core.domain.models import BirthData
     from src.core.use_cases.calculate_chart import CalculateChartUseCase
     from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
@@ -107,6 +115,21 @@ class TestSwissEphemerisEngine:
             assert aspect.type in ["Conjunction", "Sextile", "Square", "Trine", "Opposition"]
             assert 0 <= aspect.orb <= 10.0
 
+    @pytest.mark.parametrize("date, ut_hour", [("1990-07-04", 12.5), ("1990-01-04", 13.5)])
+    def test_birth_time_is_converted_to_ut(self, engine, date, ut_hour):
+        """Local birth times are shifted by the zone's offset, daylight saving included."""
+        birth_data = BirthData(date=date, time="08:30", lat=40.7128, lon=-74.006, timezone="America/New_York")
+        with patch("src.infrastructure.astro_engine.swiss_ephemeris.swe") as swe:
+            engine._calculate_julian_day(birth_data)
+        year, month, day = map(int, date.split("-"))
+        swe.julday.assert_called_once_with(year, month, day, ut_hour)
+
+    def test_unknown_timezone_is_rejected(self, engine):
+        """A timezone that is not an IANA zone cannot be converted."""
+        birth_data = BirthData(date="1990-05-17", time="12:30", lat=0.0, lon=0.0, timezone="Mars/Olympus")
+        with pytest.raises(InvalidTimezoneError):
+            engine.calculate_chart(birth_data)
+
     def test_use_case_execute(self, use_case):
         """Test the use case execution."""
         birth_data = BirthData(
@@ -118,4 +141,50 @@ class TestSwissEphemerisEngine:
         )
         chart = use_case.execute(birth_data)
         assert isinstance(chart, type(chart))  # NatalChart
-        assert len(chart.planets) == 10
\ No newline at end of file
+        assert len(chart.planets) == 10
+
+
+# Run against the real pyswisseph in a fresh interpreter: the mocks above are
+# shared through sys.modules and would answer any call shape.
+SWISSEPH_API_SCRIPT = textwrap.dedent("""
+    import json
+    import swisseph as swe
+    from src.core.domain.models import BirthData
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+    engine = SwissEphemerisEngine()
+    report = []
+    for lat, lon in ((44.4268, 26.1025), (-33.87, 151.21), (64.13, -21.9)):
+        birth = BirthData(date="1990-05-17", time="12:30", lat=lat, lon=lon, timezone="UTC")
+        chart = engine.calculate_chart(birth)
+        jd = swe.julday(1990, 5, 17, 12.5)
+        cusps, ascmc = swe.houses(jd, lat, lon, b"P")
+        eps = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+        expected_houses = {}
+        for name, body in engine.PLANETS:
+            pos = swe.calc_ut(jd, body, engine.CALC_FLAGS)[0]
+            expected_houses[name] = int(swe.house_pos(ascmc[2], lat, eps, (pos[0], pos[1]), b"P"))
+        report.append({
+            "cusps": [house.degree for house in chart.houses],
+            "expected_cusps": list(cusps),
+            "ascendant": ascmc[0],
+            "houses": {planet.name: planet.house for planet in chart.planets},
+            "expected_houses": expected_houses,
+        })
+    print(json.dumps(report))
+""")
+
+
+@pytest.mark.skipif(importlib.machinery.PathFinder.find_spec("swisseph") is None,
+                    reason="pyswisseph is not installed")
+def test_engine_uses_the_swisseph_api():
+    """Cusps come from houses()[0] in order and planet houses from house_pos((lon, lat), hsys)."""
+    completed = subprocess.run(
+        [sys.executable, "-c", SWISSEPH_API_SCRIPT], cwd=Path(__file__).resolve().parents[2],
+        capture_output=True, text=True, timeout=120, check=True,
+    )
+    for location in json.loads(completed.stdout):
+        assert len(location["cusps"]) == 12
+        assert location["cusps"] == pytest.approx(location["expected_cusps"])
+        assert location["cusps"][0] == pytest.approx(location["ascendant"])
+        assert location["houses"] == location["expected_houses"]
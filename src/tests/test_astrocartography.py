@@ -0,0 +1,137 @@
+"""Unit tests for astrocartography angle lines."""
+
+import gc
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.exceptions import InvalidMapGridError
+    from src.core.domain.models import BirthData
+    from src.core.use_cases.astrocartography import AstrocartographyUseCase
+    from src.infrastructure.astro_engine import astrocartography
+    from src.infrastructure.astro_engine.astrocartography import (
+        AstrocartographyCalculator, MapGrid, angle_lines, wrap_longitude
+    )
+    from src.infrastructure.astro_engine.bodies import BODY_CATALOG
+
+SIDEREAL_DEGREES = 100.0
+EQUATORIAL = {  # body: (right ascension, declination)
+    "Sun": (54.0, 19.3), "Moon": (324.7, -17.0), "Mercury": (36.5, 13.1), "Venus": (5.0, 1.2),
+    "Mars": (350.0, -4.4), "Jupiter": (100.0, 23.2), "Saturn": (290.0, -21.6), "Uranus": (278.0, -23.4),
+    "Neptune": (284.0, -21.3), "Pluto": (226.0, -0.8),
+}
+
+
+class FakeSwe:
+    """Fixed equatorial positions and sidereal time."""
+
+    FLG_SWIEPH = 2
+    FLG_EQUATORIAL = 2048
+
+    def __init__(self):
+        self.names = {spec.swe_id: name for name, spec in BODY_CATALOG.items() if spec.swe_id is not None}
+        self.calls = 0
+
+    def calc_ut(self, jd, body, flags=0):
+        self.calls += 1
+        ra, dec = EQUATORIAL[self.names[body]]
+        return (ra, dec, 1.0, 0.0, 0.0, 0.0), flags
+
+    def sidtime(self, jd):
+        return SIDEREAL_DEGREES / 15.0
+
+
+class FakeEngine:
+    def version_for(self, bodies=None):
+        return f"1/{bodies}"
+
+    def _calculate_julian_day(self, birth_data):
+        return 2448029.0
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSwe()
+    with patch.object(astrocartography, "swe", fake):
+        yield fake
+
+
+def altitude(lat, lon, ra, dec):
+    """Sine of a body's altitude at a place, and its hour angle."""
+    hour_angle = wrap_longitude(lon + SIDEREAL_DEGREES - ra)
+    lat, dec, h = np.radians(lat), np.radians(dec), np.radians(hour_angle)
+    return np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(h), hour_angle
+
+
+def test_lines_satisfy_the_angle_definitions():
+    ra, dec = np.array(list(EQUATORIAL.values())).T
+    lines = angle_lines(ra, dec, SIDEREAL_DEGREES, MapGrid().latitudes())
+
+    np.testing.assert_allclose(wrap_longitude(lines["MC"][1][:, 0] + SIDEREAL_DEGREES - ra), 0.0, atol=1e-9)
+    np.testing.assert_allclose(np.abs(wrap_longitude(lines["IC"][1][:, 0] + SIDEREAL_DEGREES - ra)), 180.0)
+    for angle, sign in (("ASC", -1), ("DSC", 1)):
+        lats, lons = lines[angle]
+        valid = ~np.isnan(lons)
+        assert valid.sum() > 0.9 * lons.size - 2 * len(ra)  # only the padding and polar points are missing
+        sin_altitude, hour_angle = altitude(lats, lons, ra[:, None], dec[:, None])
+        np.testing.assert_allclose(sin_altitude[valid], 0.0, atol=1e-9)  # on the horizon
+        # Rising in the east, setting in the west; the turning points are on the meridian
+        turning = np.isclose(np.abs(hour_angle[valid]), 180.0) | np.isclose(hour_angle[valid], 0.0)
+        assert np.all((hour_angle[valid] * sign > 0) | turning)
+
+
+def test_curves_reach_the_turning_latitude():
+    lats, lons = angle_lines(np.array([0.0]), np.array([60.0]), 0.0, MapGrid().latitudes())["ASC"]
+    valid = ~np.isnan(lons[0])
+    assert lats[0][valid].min() == pytest.approx(-30.0) and lats[0][valid].max() == pytest.approx(30.0)
+    dsc = angle_lines(np.array([0.0]), np.array([60.0]), 0.0, MapGrid().latitudes())["DSC"][1]
+    assert wrap_longitude(lons[0][valid][-1] - dsc[0][valid][-1]) == pytest.approx(0.0, abs=1e-4)  # they meet
+
+
+def test_geojson_lines(fake):
+    collection = AstrocartographyCalculator(FakeEngine()).lines(2448029.0, "classic", MapGrid(step=0.5))
+    assert collection["type"] == "FeatureCollection" and len(collection["features"]) == 40
+    assert fake.calls == 10  # one equatorial position per body
+
+    for feature in collection["features"]:
+        for line in feature["geometry"]["coordinates"]:
+            points = np.array(line)
+            assert len(points) >= 2
+            assert np.all(np.abs(np.diff(points[:, 0])) < 180.0)  # split at the antimeridian
+            assert np.all(np.abs(points[:, 1]) <= 75.0)
+
+    regional = AstrocartographyCalculator(FakeEngine()).lines(2448029.0, "classic", MapGrid(30, 60, -15, 40))
+    points = np.array([p for f in regional["features"] for line in f["geometry"]["coordinates"] for p in line])
+    assert np.all((points[:, 0] >= -15) & (points[:, 0] <= 40) & (points[:, 1] >= 30) & (points[:, 1] <= 60))
+    assert len(regional["features"]) < 40
+
+    with pytest.raises(InvalidMapGridError):
+        MapGrid(south=10, north=0)
+    with pytest.raises(InvalidMapGridError):
+        MapGrid(step=0.001)
+
+
+def test_maps_are_cached_per_chart_and_grid(fake):
+    use_case = AstrocartographyUseCase(AstrocartographyCalculator(FakeEngine()), default_bodies="classic")
+    birth = BirthData(date="1990-05-17", time="12:30", lat=44.4268, lon=26.1025, timezone="UTC")
+
+    coarse = use_case.execute(birth, grid=MapGrid(step=0.2))  # also pays one-time lazy imports
+    gc.freeze()  # keep collections of the rest of the session's heap out of the timing
+    try:
+        started = time.perf_counter()
+        first = use_case.execute(birth, grid=MapGrid(step=0.1))
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.unfreeze()
+    assert elapsed < 0.1  # a fine map in well under 100 ms
+    assert use_case.execute(birth, grid=MapGrid(step=0.1)) is first
+    assert fake.calls == 20
+    assert len(json.loads(first)["features"]) == 40
+
+    assert use_case.execute(birth, grid=MapGrid(step=0.2)) is coarse
+    use_case.execute(birth, bodies=["Sun", "Moon"], grid=MapGrid(step=0.1))
+    assert fake.calls == 22
@@ -0,0 +1,127 @@
+"""Unit tests for configurable body sets and calculation plans."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.exceptions import InvalidBodySetError
+    from src.core.domain.models import BirthData
+    from src.core.use_cases.calculate_chart import CalculateChartUseCase
+    from src.infrastructure.astro_engine import swiss_ephemeris
+    from src.infrastructure.astro_engine.bodies import BODY_SETS, resolve_plan
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+
+class FakeSwe:
+    """Fixed positions per body; the Sun is above the horizon (house 10)."""
+
+    ECL_NUT = -1
+    Error = RuntimeError
+    LONGITUDES = {"Sun": 100.0, "Moon": 40.0, "True Node": 350.0, "Mars": 280.0}
+
+    def __init__(self, catalog):
+        self.by_id = {spec.swe_id: name for name, spec in catalog.items() if spec.swe_id is not None}
+        self.calls = []
+
+    def julday(self, year, month, day, hour):
+        return 2451545.0
+
+    def houses(self, jd, lat, lon, hsys):
+        return tuple(float(i * 30) for i in range(12)), (10.0, 280.0, 0.0, 190.0, 0.0, 0.0, 0.0, 0.0)
+
+    def calc_ut(self, jd, body, flags=0):
+        if body == self.ECL_NUT:
+            return (23.44, 23.44, 0.0, 0.0, 0.0, 0.0), 0
+        name = self.by_id[body]
+        self.calls.append(name)
+        if name == "Chiron":
+            raise self.Error("SwissEph file 'seas_18.se1' not found")
+        return (self.LONGITUDES.get(name, 200.0), 0.0, 1.0, -0.05 if name == "True Node" else 1.0, 0.0, 0.0), flags
+
+    def house_pos(self, armc, lat, eps, lon_lat, hsys):
+        return 10.0 if lon_lat[0] == 100.0 else 1.0
+
+
+@pytest.fixture
+def fake_swe():
+    fake = FakeSwe(swiss_ephemeris.BODY_CATALOG)
+    with patch.object(swiss_ephemeris, "swe", fake):
+        yield fake
+
+
+@pytest.fixture
+def birth_data():
+    return BirthData(date="2000-01-01", time="12:00", lat=0.0, lon=0.0, timezone="UTC")
+
+
+def test_plans_are_cached_per_body_set():
+    """Equivalent spellings of a body set resolve to the same plan object."""
+    plan = resolve_plan(["Sun", "Moon", "True Node"])
+    assert resolve_plan("Sun, Moon, True Node") is plan
+    assert resolve_plan(("Sun", "Moon", "Sun", "True Node")) is plan
+    assert resolve_plan(None) is resolve_plan("classic")
+    assert resolve_plan("standard").layout == BODY_SETS["standard"]
+    assert plan.signature != resolve_plan("classic").signature
+
+
+def test_unknown_or_empty_body_set_is_rejected():
+    """Unknown body names and empty sets raise a domain error."""
+    with pytest.raises(InvalidBodySetError) as exc:
+        resolve_plan(["Sun", "Nibiru"])
+    assert "Nibiru" in exc.value.details
+    with pytest.raises(InvalidBodySetError):
+        resolve_plan(" , ")
+
+
+def test_plan_adds_hidden_dependencies():
+    """Derived points pull in their inputs without adding them to the output."""
+    plan = resolve_plan(["Part of Fortune"])
+    assert plan.layout == ("Part of Fortune",)
+    assert [name for name, _ in plan.ephemeris] == ["Sun", "Moon"]
+    assert [name for name, _ in plan.angles] == ["Ascendant"]
+    assert plan.derived == ("Part of Fortune",)
+    assert resolve_plan("extended").needs_asteroid_files
+    assert not resolve_plan("standard").needs_asteroid_files
+
+
+def test_chart_follows_body_set(fake_swe, birth_data):
+    """Only the chosen bodies are returned and aspected; derived points are computed."""
+    chart = SwissEphemerisEngine().calculate_chart(
+        birth_data, ["Sun", "Moon", "True Node", "South Node", "Ascendant", "MC", "Part of Fortune"]
+    )
+    by_name = {p.name: p for p in chart.planets}
+    assert list(by_name) == ["Sun", "Moon", "True Node", "South Node", "Ascendant", "MC", "Part of Fortune"]
+    assert by_name["South Node"].longitude == pytest.approx(170.0)
+    assert by_name["South Node"].is_retrograde
+    assert by_name["Ascendant"].longitude == pytest.approx(10.0)
+    assert by_name["MC"].sign == "Capricorn"
+    # Day chart: Asc + Moon - Sun
+    assert by_name["Part of Fortune"].longitude == pytest.approx((10.0 + 40.0 - 100.0) % 360.0)
+    assert sorted(fake_swe.calls) == ["Moon", "Sun", "True Node"]
+    pairs = {frozenset((a.planet1, a.planet2)) for a in chart.aspects}
+    assert frozenset(("True Node", "South Node")) not in pairs
+    assert frozenset(("Sun", "Ascendant")) in pairs  # 90 degrees apart
+
+
+def test_part_of_fortune_hidden_inputs(fake_swe, birth_data):
+    """Part of Fortune alone is computed from the Sun, Moon and Ascendant."""
+    chart = SwissEphemerisEngine().calculate_chart(birth_data, "Part of Fortune")
+    assert [p.name for p in chart.planets] == ["Part of Fortune"]
+    assert chart.aspects == []
+
+
+def test_missing_asteroid_files_raise_calculation_error(fake_swe, birth_data):
+    """A missing asteroid ephemeris surfaces as a calculation error with a hint."""
+    with pytest.raises(Exception) as exc:
+        SwissEphemerisEngine().calculate_chart(birth_data, ["Sun", "Chiron"])
+    assert exc.value.code == "CALCULATION_ERROR"
+    assert "seas_18.se1" in exc.value.details
+
+
+def test_version_tags_distinguish_body_sets():
+    """The default set keeps the engine version; other sets get their own tag."""
+    engine = SwissEphemerisEngine()
+    assert engine.version_for() == engine.version
+    assert engine.version_for("standard") == f"{engine.version}/{resolve_plan('standard').signature}"
+    use_case = CalculateChartUseCase(engine, default_bodies="standard")
+    assert use_case.version_for() == engine.version_for("standard")
@@ -0,0 +1,137 @@
+"""Unit tests for the columnar chart results and batched calculation."""
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.infrastructure.astro_engine import swiss_ephemeris
+    from src.infrastructure.astro_engine.bodies import BODY_CATALOG
+    from src.infrastructure.astro_engine.chart_arrays import NO_ASPECT, SIGNS
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+    from src.infrastructure.similarity.embedding import embed_batch, embed_chart
+
+
+class FakeSwe:
+    """Positions that vary with the moment and the body; every third catalog body is retrograde."""
+
+    ECL_NUT = -1
+    Error = RuntimeError
+
+    def __init__(self):
+        self.number = {spec.swe_id: n for n, spec in enumerate(BODY_CATALOG.values()) if spec.swe_id is not None}
+
+    def houses(self, jd, lat, lon, hsys):
+        first = (jd * 7.0 + lon) % 360.0
+        cusps = tuple((first + i * 30.0) % 360.0 for i in range(12))
+        return cusps, (first, (first + 270.0) % 360.0, (jd * 3.0) % 360.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def calc_ut(self, jd, body, flags=0):
+        if body == self.ECL_NUT:
+            return (23.44, 23.44, 0.0, 0.0, 0.0, 0.0), 0
+        body = self.number[body]
+        longitude = (jd * (body + 1) * 11.0 + body * 37.0) % 360.0
+        return (longitude, 0.0, 1.0, -0.1 if body % 3 == 0 else 0.5, 0.0, 0.0), flags
+
+    def house_pos(self, armc, lat, eps, lon_lat, hsys):
+        return 1.0 + ((lon_lat[0] - armc) % 360.0) / 30.0
+
+
+@pytest.fixture
+def engine():
+    with patch.object(swiss_ephemeris, "swe", FakeSwe()):
+        yield SwissEphemerisEngine()
+
+
+@pytest.fixture
+def moments():
+    rng = np.random.default_rng(0)
+    return rng.uniform(2420000.0, 2460000.0, 50), rng.uniform(-60.0, 65.0, 50), rng.uniform(-180.0, 180.0, 50)
+
+
+def reference_aspects(engine, chart):
+    """Aspects as the per-object engine found them: first matching angle per pair."""
+    found = []
+    for i, p1 in enumerate(chart.planets):
+        for p2 in chart.planets[i + 1:]:
+            if {p1.name, p2.name} == {"True Node", "South Node"}:
+                continue
+            diff = abs(p1.longitude - p2.longitude)
+            diff = min(diff, 360 - diff)
+            for angle, kind in engine.ASPECT_TYPES.items():
+                if abs(diff - angle) <= engine.ASPECT_ORBS.get(angle, engine.MAX_ORB):
+                    found.append((p1.name, p2.name, kind, abs(diff - angle)))
+                    break
+    return found
+
+
+@pytest.mark.parametrize("bodies", ["classic", "standard"])
+def test_batch_rows_match_single_charts(engine, moments, bodies):
+    """Every row of a batch is the chart calculate_chart_at returns for that moment."""
+    jds, lats, lons = moments
+    batch = engine.calculate_batch(jds, lats, lons, bodies)
+    assert len(batch) == 50
+    assert np.count_nonzero(batch.aspect_types != NO_ASPECT) > 50
+    for row, chart in enumerate(batch.to_charts()):
+        assert chart == engine.calculate_chart_at(jds[row], lats[row], lons[row], bodies)
+        assert [(a.planet1, a.planet2, a.type, a.orb) for a in chart.aspects] == reference_aspects(engine, chart)
+        assert [h.sign for h in chart.houses] == [SIGNS[int(c // 30) % 12] for c in batch.cusps[row]]
+
+
+def test_columns_and_packed_retrograde_flags(engine, moments):
+    """Sixteen bodies pack their retrograde flags into two bytes per chart."""
+    jds, lats, lons = moments
+    batch = engine.calculate_batch(jds, lats, lons, "standard")
+    assert batch.longitudes.shape == (50, 16)
+    assert batch.signs.dtype == np.int8 and batch.houses.dtype == np.int8
+    assert batch.retrograde.shape == (50, 2)
+
+    chart = batch.chart(7)
+    assert chart.names == batch.names
+    np.testing.assert_array_equal(chart.is_retrograde, batch.speeds[7] < 0)
+    assert chart.is_retrograde[batch.names.index("Sun")]  # first catalog body
+    assert not chart.is_retrograde[batch.names.index("Ascendant")]
+    assert np.all((chart.houses >= 1) & (chart.houses <= 12))
+    assert len(chart.aspect_types) == np.count_nonzero(batch.aspect_types[7] != NO_ASPECT)
+
+
+def test_batch_fills_a_preallocated_batch(engine, moments):
+    """Passing ``out`` fills it in place; a batch of another shape is rejected."""
+    jds, lats, lons = moments
+    out = engine.calculate_batch(jds, lats, lons)
+    first = out.longitudes.copy()
+    shifted = engine.calculate_batch(jds + 0.5, lats, lons, out=out)
+    assert shifted is out
+    assert not np.array_equal(first, out.longitudes)
+    with pytest.raises(ValueError):
+        engine.calculate_batch(jds[:10], lats[:10], lons[:10], out=out)
+    with pytest.raises(ValueError):
+        engine.calculate_batch(jds, lats, lons, "standard", out=out)
+    with pytest.raises(ValueError):
+        engine.calculate_batch(jds, lats[:10], lons)
+
+
+def test_calculation_errors_are_domain_errors(engine):
+    """An ephemeris failure for one body names the body, as in single charts."""
+    chiron = BODY_CATALOG["Chiron"].swe_id
+    fake = swiss_ephemeris.swe
+    original = fake.calc_ut
+
+    def calc_ut(jd, body, flags=0):
+        if body is chiron:
+            raise fake.Error("SwissEph file 'seas_18.se1' not found")
+        return original(jd, body, flags)
+
+    with patch.object(fake, "calc_ut", calc_ut):
+        with pytest.raises(swiss_ephemeris.CalculationError) as exc:
+            engine.calculate_batch([2451545.0], [0.0], [0.0], ["Sun", "Chiron"])
+    assert "Chiron" in exc.value.details
+
+
+def test_embed_batch_matches_embed_chart(engine, moments):
+    """Batched embeddings equal the per-chart embeddings, also for reduced body sets."""
+    jds, lats, lons = moments
+    for bodies in ("standard", ["Sun", "Moon", "Mars", "True Node"]):
+        batch = engine.calculate_batch(jds, lats, lons, bodies)
+        expected = np.stack([embed_chart(chart) for chart in batch.to_charts()])
+        np.testing.assert_allclose(embed_batch(batch), expected, atol=1e-6)
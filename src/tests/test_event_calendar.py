@@ -0,0 +1,217 @@
+"""Unit tests for the precomputed sky event calendar."""
+
+import fcntl
+import math
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.config.settings import Settings
+    from src.core.domain.exceptions import EventRangeError
+    from src.infrastructure.astro_engine import event_calendar
+    from src.infrastructure.astro_engine.bodies import BODY_CATALOG
+    from src.infrastructure.astro_engine.event_calendar import EventCalendar, compute_events, year_start
+
+T0 = year_start(2000)
+MOTION = {  # body: (longitude at T0, degrees per day)
+    "Sun": (280.0, 1.0), "Moon": (5.0, 13.0), "Venus": (300.0, 1.2), "Mars": (10.0, 0.5),
+    "Jupiter": (25.0, 0.08), "Saturn": (40.0, 0.03), "Uranus": (314.0, 0.01), "Neptune": (303.0, 0.006),
+    "Pluto": (251.0, 0.004),
+}
+MERCURY_SWING = 40.0  # degrees of the Mercury epicycle, period 100 days: retrograde part of each cycle
+
+
+class FakeSwe:
+    """Bodies moving uniformly, Mercury with a retrograde loop; eclipses every 100 days."""
+
+    FLG_SPEED = 256
+    FLG_SWIEPH = 2
+    ECL_TOTAL, ECL_ANNULAR, ECL_PARTIAL, ECL_ANNULAR_TOTAL, ECL_PENUMBRAL = 4, 8, 16, 32, 64
+
+    def __init__(self):
+        self.names = {spec.swe_id: name for name, spec in BODY_CATALOG.items() if spec.swe_id is not None}
+        self.calls = 0
+
+    def calc_ut(self, jd, body, flags=0):
+        self.calls += 1
+        name, t = self.names[body], jd - T0
+        if name == "Mercury":
+            phase = 2 * math.pi * t / 100.0
+            longitude = 270.0 + t + MERCURY_SWING * math.sin(phase)
+            speed = 1.0 + MERCURY_SWING * 2 * math.pi / 100.0 * math.cos(phase)
+        else:
+            start, speed = MOTION[name]
+            longitude = start + speed * t
+        return (longitude % 360.0, 0.0, 1.0, speed, 0.0, 0.0), flags
+
+    def sol_eclipse_when_glob(self, jd, flags=0, kind=0):
+        return self.ECL_TOTAL, (T0 + 37.0 + 100.0 * math.floor((jd - T0 - 37.0) / 100.0 + 1.0), 0.0)
+
+    def lun_eclipse_when(self, jd, flags=0, kind=0):
+        return self.ECL_PENUMBRAL, (T0 + 50.0 + 100.0 * math.floor((jd - T0 - 50.0) / 100.0 + 1.0), 0.0)
+
+    def set_ephe_path(self, path):
+        pass
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSwe()
+    with patch.object(event_calendar, "swe", fake):
+        yield fake
+
+
+def longitude(fake, jd, body):
+    return fake.calc_ut(jd, BODY_CATALOG[body].swe_id)[0][0]
+
+
+def kind_of(events, kind, body=None):
+    mask = events["kind"] == event_calendar.KINDS.index(kind)
+    if body is not None:
+        mask &= events["body"] == event_calendar.BODIES.index(body)
+    return events[mask]
+
+
+def test_events_match_the_analytic_sky(fake):
+    events = compute_events(T0, T0 + 365.0)
+    assert np.all(np.diff(events["jd"]) >= 0)
+
+    ingresses = kind_of(events, "ingress", "Sun")
+    expected = [T0 + 20.0 + 30.0 * k for k in range(12)]  # 280 + t crosses 300, 330, ...
+    np.testing.assert_allclose(ingresses["jd"], expected, atol=1e-5)
+    assert [event_calendar.SIGNS[s] for s in ingresses["sign"][:2]] == ["Aquarius", "Pisces"]
+
+    new_moons = kind_of(events, "new_moon")["jd"]
+    full_moons = kind_of(events, "full_moon")["jd"]
+    np.testing.assert_allclose(new_moons, [T0 + (360.0 * k + 275.0) / 12.0 for k in range(len(new_moons))], atol=1e-5)
+    np.testing.assert_allclose(full_moons, [T0 + (360.0 * k + 95.0) / 12.0 for k in range(len(full_moons))], atol=1e-5)
+
+    retrograde = kind_of(events, "station_retrograde", "Mercury")
+    direct = kind_of(events, "station_direct", "Mercury")
+    assert (len(retrograde), len(direct)) == (4, 3)  # days 31.5 and 68.5 of each 100-day cycle
+    for jd in np.concatenate((retrograde["jd"], direct["jd"])):
+        assert abs(fake.calc_ut(jd, BODY_CATALOG["Mercury"].swe_id)[0][3]) < 1e-6
+    assert np.all(direct["jd"] > retrograde["jd"][:3])
+    assert np.any(kind_of(events, "ingress", "Mercury")["detail"] == event_calendar.DETAILS.index("retrograde"))
+
+    np.testing.assert_array_equal(kind_of(events, "solar_eclipse")["jd"], [T0 + 37.0, T0 + 137.0, T0 + 237.0, T0 + 337.0])
+    assert event_calendar.DETAILS[kind_of(events, "lunar_eclipse")["detail"][0]] == "penumbral"
+
+
+def test_void_of_course_periods(fake):
+    events = compute_events(T0, T0 + 60.0)
+    moon_ingresses = kind_of(events, "ingress", "Moon")["jd"]
+    periods = kind_of(events, "void_of_course")
+    assert len(periods) >= 18
+
+    others = [body for body in event_calendar.BODIES if body != "Moon"]
+    for start, end, other in periods[["jd", "end_jd", "other"]].tolist():
+        assert np.min(np.abs(moon_ingresses - end)) < 1e-5  # ends when the Moon changes sign
+        body = event_calendar.BODIES[other]
+        separation = (longitude(fake, start, "Moon") - longitude(fake, start, body)) % 360.0
+        assert min(abs((separation - angle + 180.0) % 360.0 - 180.0) for angle in range(0, 360, 30)) < 1e-4
+        assert round(separation / 30.0) % 12 not in (1, 5, 7, 11)  # a major aspect
+        # No major aspect is exact during the period itself: the separation
+        # only crosses multiples of 30 degrees that are minor aspects
+        for body in others:
+            buckets = [
+                (longitude(fake, t, "Moon") - longitude(fake, t, body)) % 360.0 // 30.0
+                for t in np.linspace(start + 1e-4, end - 1e-4, 200)
+            ]
+            for before, after in zip(buckets, buckets[1:]):
+                assert after == before or after in (1, 5, 7, 11)
+
+
+@pytest.fixture
+def calendar(fake, tmp_path):
+    return EventCalendar.open(2000, 2002, str(tmp_path / "events.idx"))
+
+
+def test_range_and_next_queries(calendar):
+    start = year_start(2001) + 0.5
+    found = calendar.between(start, start + 30.0)
+    assert found and all(start <= e.julian_day < start + 30.0 for e in found)
+    assert [e.julian_day for e in found] == sorted(e.julian_day for e in found)
+    assert found[0].time == event_calendar.from_julian_day(found[0].julian_day).isoformat()
+
+    moons = calendar.between(start, start + 30.0, kinds=["new_moon", "full_moon"], limit=1)
+    assert len(moons) == 1 and moons[0].kind in ("new_moon", "full_moon") and moons[0].body == "Moon"
+
+    station = calendar.next("station_retrograde", "Mercury", start)
+    assert station.kind == "station_retrograde" and station.body == "Mercury"
+    later = calendar.between(start, station.julian_day, kinds=["station_retrograde"], bodies=["Mercury"])
+    assert later == []
+    assert calendar.next("station_retrograde", "Mercury", station.julian_day).julian_day > station.julian_day
+
+    void = calendar.next("void_of_course", "Moon", start)
+    assert void.end_julian_day > void.julian_day and void.other_body is not None
+
+    with pytest.raises(EventRangeError):
+        calendar.between(year_start(1999), start)
+    with pytest.raises(EventRangeError):
+        calendar.next("new_moon", "Moon", year_start(2003) + 1.0)
+    assert calendar.next("station_retrograde", "Sun", start) is None
+
+
+def test_extending_computes_only_the_missing_years(fake, tmp_path):
+    path = str(tmp_path / "events.idx")
+    EventCalendar.open(2001, 2002, path)
+    calls = fake.calls
+    assert EventCalendar.open(2001, 2002, path).start_year == 2001
+    assert fake.calls == calls  # covered: nothing computed
+
+    extended = EventCalendar.open(2000, 2003, path)
+    assert (extended.start_year, extended.end_year) == (2000, 2003)
+    full = EventCalendar.open(2000, 2003, str(tmp_path / "full.idx"))
+    assert len(extended) == len(full)
+    start, end = year_start(2000), year_start(2003)
+    assert extended.between(start, end) == full.between(start, end)
+
+
+def test_concurrent_open_waits_for_the_builder(fake, tmp_path):
+    """While another process holds the build lock, open waits and maps what it built."""
+    path = str(tmp_path / "events.idx")
+    opened = []
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # a separate open file description, as in another process
+        opener = threading.Thread(target=lambda: opened.append(EventCalendar.open(2000, 2001, path)))
+        opener.start()
+        time.sleep(0.2)
+        assert opener.is_alive() and fake.calls == 0
+        event_calendar.write_index(event_calendar.build_events(2000, 2001), 2000, 2001, path)
+        calls = fake.calls
+    opener.join(timeout=5)
+    assert opened[0].start_year == 2000 and len(opened[0]) > 0
+    assert fake.calls == calls  # mapped, not rebuilt
+
+
+def test_events_endpoints(calendar):
+    from src.interfaces.api.main import create_app
+    import src.interfaces.api.v1 as v1_module
+
+    app = create_app(Settings(google_api_key="x"))
+    reopened = v1_module.EventCalendar(calendar.path)  # SkyEvent and errors of the modules the app uses
+    app.dependency_overrides[v1_module.get_event_calendar] = lambda: reopened
+    client = TestClient(app)
+
+    response = client.get("/api/v1/events", params={
+        "start": "2001-03-01T00:00:00Z", "end": "2001-04-01T00:00:00Z", "kind": ["ingress"], "body": ["Sun"],
+    })
+    assert response.status_code == 200
+    (ingress,) = response.json()["events"]
+    assert ingress["kind"] == "ingress" and ingress["body"] == "Sun"
+
+    response = client.get("/api/v1/events/next", params={
+        "kind": "station_direct", "body": "Mercury", "after": "2001-06-01T00:00:00Z",
+    })
+    assert response.status_code == 200
+    assert response.json()["time"] > "2001-06-01"
+
+    response = client.get("/api/v1/events", params={"start": "1990-01-01", "end": "1990-02-01"})
+    assert response.status_code == 400 and response.json()["error"]["code"] == "EVENT_RANGE_NOT_INDEXED"
+    assert client.get("/api/v1/events/next", params={"kind": "eclipse", "body": "Sun"}).status_code == 422
@@ -0,0 +1,51 @@
+"""Unit tests for the offline gazetteer."""
+
+import pytest
+
+from src.infrastructure.geo.gazetteer import BUNDLED_CITIES_PATH, Gazetteer, normalize
+
+
+@pytest.fixture(scope="module")
+def gazetteer(tmp_path_factory):
+    """Gazetteer built from the bundled sample into a fresh index."""
+    index_path = tmp_path_factory.mktemp("gazetteer") / "cities.idx"
+    return Gazetteer.open(BUNDLED_CITIES_PATH, str(index_path))
+
+
+def test_normalize_folds_case_and_diacritics():
+    """Keys are lower-case ASCII with punctuation collapsed."""
+    assert normalize("  Timişoara ") == "timisoara"
+    assert normalize("Cluj-Napoca") == "cluj napoca"
+
+
+def test_prefix_search_ranks_by_population(gazetteer):
+    """Prefix matches are returned most populous first."""
+    names = [p.name for p in gazetteer.search("bu", 10)]
+    assert names[0] == "Buenos Aires"
+    assert "Bucharest" in names and "Budapest" in names
+
+
+def test_search_matches_alternate_names(gazetteer):
+    """Alternate and accented spellings resolve to the same place."""
+    assert gazetteer.search("București", 1)[0].place_id == 683506
+    assert gazetteer.search("Bucuresti", 1)[0].timezone == "Europe/Bucharest"
+
+
+def test_search_tolerates_single_typo(gazetteer):
+    """Transpositions and substitutions still find the place."""
+    assert gazetteer.search("lodnon", 1)[0].name == "London"
+    assert gazetteer.search("timsoara", 1)[0].name == "Timişoara"
+
+
+def test_get_by_place_id(gazetteer):
+    """Places are retrievable by ID with coordinates and IANA zone."""
+    place = gazetteer.get(2643743)
+    assert place.name == "London"
+    assert place.country_code == "GB"
+    assert place.timezone == "Europe/London"
+    assert gazetteer.get(1) is None
+
+
+def test_empty_query_returns_nothing(gazetteer):
+    """Queries without searchable characters return no results."""
+    assert gazetteer.search("  -- ", 5) == ()
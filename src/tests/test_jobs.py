@@ -0,0 +1,239 @@
+"""Tests for the SQLite job queue, worker pool and job endpoints."""
+
+import socket
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from src.core.domain.exceptions import InvalidWebhookError
+from src.infrastructure.jobs import webhooks, worker_pool
+from src.infrastructure.jobs.sqlite_queue import DEAD, QUEUED, RUNNING, SUCCEEDED, SqliteJobQueue
+from src.infrastructure.jobs.webhooks import check_webhook_url
+from src.infrastructure.jobs.worker_pool import JobWorkerPool
+
+
+def resolving_to(*addresses):
+    """Patch DNS so every host resolves to ``addresses``."""
+    infos = [(socket.AF_INET6 if ":" in a else socket.AF_INET, socket.SOCK_STREAM, 6, "", (a, 443))
+             for a in addresses]
+    return patch.object(webhooks.socket, "getaddrinfo", return_value=infos)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """A queue with instant retries."""
+    return SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=3, backoff_base=0.0)
+
+
+def test_claim_is_exclusive(queue):
+    """A claimed job is not handed out twice."""
+    job_id = queue.enqueue({"n": 1})
+    job = queue.claim()
+    assert job.id == job_id
+    assert job.status == RUNNING
+    assert queue.claim() is None
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """Jobs of crashed workers become claimable once the lease expires."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.0)
+    job_id = queue.enqueue({"n": 1})
+    queue.claim()
+    time.sleep(0.01)
+    assert queue.claim().id == job_id
+
+
+def test_lost_workers_use_up_attempts(tmp_path):
+    """Each claim counts; a job whose worker keeps dying ends up dead-lettered."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2, lease_seconds=0.0)
+    job_id = queue.enqueue({"n": 1})
+    assert queue.claim().attempts == 1
+    time.sleep(0.01)
+    assert queue.claim().attempts == 2
+    time.sleep(0.01)
+    assert queue.claim() is None
+    assert queue.reap() == [job_id]
+    assert queue.get(job_id).status == DEAD
+    assert queue.reap() == []
+
+
+def test_stale_claims_are_fenced(tmp_path):
+    """A worker whose lease was taken over can no longer settle the job."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.0)
+    job_id = queue.enqueue({"n": 1})
+    first = queue.claim()
+    time.sleep(0.01)
+    second = queue.claim()
+    assert not queue.extend_lease(job_id, first.attempts)
+    assert not queue.complete(job_id, {"n": 1}, attempt=first.attempts)
+    assert queue.fail(job_id, "late", attempt=first.attempts) is None
+    assert queue.complete(job_id, {"n": 2}, attempt=second.attempts)
+    assert queue.get(job_id).result == {"n": 2}
+
+
+def test_retries_then_dead_letters(queue):
+    """Failures are retried until the attempt budget is spent."""
+    job_id = queue.enqueue({"n": 1})
+    for expected in (QUEUED, QUEUED, DEAD):
+        queue.claim()
+        assert queue.fail(job_id, "boom") == expected
+    job = queue.get(job_id)
+    assert job.attempts == 3
+    assert job.error == "boom"
+    assert queue.stats()["counts"][DEAD] == 1
+
+
+def test_backoff_delays_retry(tmp_path):
+    """A failed job is not due again until its backoff elapsed."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), backoff_base=60.0)
+    job_id = queue.enqueue({"n": 1})
+    queue.claim()
+    queue.fail(job_id, "boom")
+    assert queue.claim() is None
+    assert queue.get(job_id).available_at > time.time() + 30
+
+
+def test_stats_reports_lag(queue):
+    """Lag is the wait time of the oldest due job."""
+    assert queue.stats()["lag_seconds"] == 0.0
+    queue.enqueue({"n": 1})
+    time.sleep(0.02)
+    stats = queue.stats()
+    assert stats["counts"][QUEUED] == 1
+    assert stats["lag_seconds"] > 0.0
+
+
+def test_worker_completes_job_and_calls_webhook(queue):
+    """Successful jobs store their result and notify the webhook."""
+    pool = JobWorkerPool(queue, handler=lambda payload: {"double": payload["n"] * 2})
+    job_id = queue.enqueue({"n": 21}, webhook_url="https://client.test/hook")
+
+    with patch.object(worker_pool.httpx, "post") as mock_post, resolving_to("93.184.216.34"):
+        assert pool.run_once()
+
+    job = queue.get(job_id)
+    assert job.status == SUCCEEDED
+    assert job.result == {"double": 42}
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs["json"]["status"] == SUCCEEDED
+
+
+@pytest.mark.parametrize("url, addresses", [
+    ("http://client.test/hook", ["93.184.216.34"]),  # not https
+    ("https://localhost/hook", ["127.0.0.1"]),
+    ("https://metadata.test/latest", ["169.254.169.254"]),
+    ("https://intranet.test/hook", ["10.0.0.7"]),
+    ("https://mixed.test/hook", ["93.184.216.34", "192.168.1.2"]),
+    ("https://v6.test/hook", ["::ffff:127.0.0.1"]),
+    ("https://[::1]/hook", ["::1"]),
+])
+def test_webhooks_must_target_public_https_hosts(url, addresses):
+    """Webhook URLs that could reach internal addresses are rejected."""
+    with resolving_to(*addresses), pytest.raises(InvalidWebhookError):
+        check_webhook_url(url)
+
+
+def test_webhook_allowlist():
+    """With an allowlist, only its hosts are accepted."""
+    with resolving_to("93.184.216.34"):
+        check_webhook_url("https://client.test/hook")
+        check_webhook_url("https://client.test./hook", allowed_hosts={"client.test"})
+        with pytest.raises(InvalidWebhookError):
+            check_webhook_url("https://other.test/hook", allowed_hosts={"client.test"})
+
+
+def test_webhook_is_rechecked_before_delivery(queue):
+    """A host that now resolves to an internal address is not called."""
+    pool = JobWorkerPool(queue, handler=lambda payload: {})
+    queue.enqueue({"n": 1}, webhook_url="https://client.test/hook")
+
+    with patch.object(worker_pool.httpx, "post") as mock_post, resolving_to("127.0.0.1"):
+        assert pool.run_once()
+    mock_post.assert_not_called()
+
+
+def test_lease_is_kept_while_the_handler_runs(tmp_path):
+    """A job slower than the lease is not claimed a second time."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.1)
+    claimed_twice = []
+
+    def slow(payload):
+        for _ in range(5):
+            time.sleep(0.06)
+            claimed_twice.append(queue.claim())
+        return {"ok": True}
+
+    job_id = queue.enqueue({"n": 1})
+    assert JobWorkerPool(queue, handler=slow).run_once()
+    assert claimed_twice == [None] * 5
+    job = queue.get(job_id)
+    assert job.status == SUCCEEDED and job.attempts == 1
+
+
+def test_hung_jobs_are_dead_lettered_and_notified(tmp_path):
+    """A job whose last attempt hung is dead-lettered by the next worker iteration."""
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=1, lease_seconds=0.0)
+    job_id = queue.enqueue({"n": 1}, webhook_url="https://client.test/hook")
+    queue.claim()  # its worker never comes back
+    time.sleep(0.01)
+
+    pool = JobWorkerPool(queue, handler=MagicMock())
+    with patch.object(worker_pool.httpx, "post") as mock_post, resolving_to("93.184.216.34"):
+        assert not pool.run_once()
+    pool.handler.assert_not_called()
+    assert queue.get(job_id).status == DEAD
+    assert mock_post.call_args.kwargs["json"]["status"] == DEAD
+
+
+def test_worker_pool_threads_drain_queue(queue):
+    """Started workers process queued jobs in the background."""
+    handler = MagicMock(return_value={"ok": True})
+    pool = JobWorkerPool(queue, handler=handler, workers=2, poll_interval=0.01)
+    job_ids = [queue.enqueue({"n": i}) for i in range(5)]
+    pool.start()
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and queue.stats()["counts"][SUCCEEDED] < 5:
+            time.sleep(0.01)
+    finally:
+        pool.stop()
+    assert all(queue.get(job_id).status == SUCCEEDED for job_id in job_ids)
+    assert handler.call_count == 5
+
+
+def test_job_endpoints(queue):
+    """Submitting returns 202 with a job ID that can be polled."""
+    from src.interfaces.api.main import app
+    import src.interfaces.api.v1 as v1_module
+
+    app.dependency_overrides[v1_module.get_job_queue] = lambda: queue
+    try:
+        client = TestClient(app)
+        response = client.post("/api/v1/horoscope/jobs", json={
+            "profile": {"name": "Alex", "birth_date": "1990-05-17", "place_id": 683506},
+            "preferences": {}
+        })
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["location"] == f"/api/v1/horoscope/jobs/{job_id}"
+
+        polled = client.get(f"/api/v1/horoscope/jobs/{job_id}").json()
+        assert polled["status"] == QUEUED
+        assert queue.get(job_id).payload["birth"]["timezone"] == "Europe/Bucharest"
+
+        assert client.get("/api/v1/horoscope/jobs/stats").json()["counts"][QUEUED] == 1
+        assert client.get("/api/v1/horoscope/jobs/unknown").status_code == 400
+
+        with resolving_to("169.254.169.254"):
+            response = client.post("/api/v1/horoscope/jobs", json={
+                "profile": {"name": "Alex", "birth_date": "1990-05-17", "place_id": 683506},
+                "preferences": {},
+                "webhook_url": "https://metadata.test/latest/meta-data"
+            })
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_WEBHOOK_URL"
+        assert client.get("/api/v1/horoscope/jobs/stats").json()["counts"][QUEUED] == 1
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,85 @@
+"""Unit tests for aspect pattern detection."""
+
+import time
+
+from src.core.domain.models import Aspect, NatalChart, Planet
+from src.core.use_cases.detect_patterns import describe_patterns, detect_patterns, detect_patterns_batch
+from src.core.use_cases.interpret_chart import interpret_chart
+
+ANGLES = {0: "Conjunction", 60: "Sextile", 90: "Square", 120: "Trine", 150: "Quincunx", 180: "Opposition"}
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+
+def make_chart(longitudes, orb=2.0):
+    """Chart with bodies B0..Bn at the given longitudes and their exact-ish aspects."""
+    planets = [
+        Planet(name=f"B{i}", sign=SIGNS[int(lon // 30) % 12], longitude=lon, house=int(lon // 30) % 12 + 1,
+               is_retrograde=False)
+        for i, lon in enumerate(longitudes)
+    ]
+    aspects = []
+    for i, p1 in enumerate(planets):
+        for p2 in planets[i + 1:]:
+            diff = abs(p1.longitude - p2.longitude)
+            diff = min(diff, 360 - diff)
+            for angle, kind in ANGLES.items():
+                if abs(diff - angle) <= orb:
+                    aspects.append(Aspect(planet1=p1.name, planet2=p2.name, type=kind, orb=abs(diff - angle)))
+    return NatalChart(planets=planets, houses=[], aspects=aspects)
+
+
+def types(patterns):
+    return sorted(p.type for p in patterns)
+
+
+def test_grand_trine_and_kite():
+    """A grand trine with a body opposite one corner forms a kite."""
+    patterns = detect_patterns(make_chart([10.0, 130.0, 250.0, 190.0]))
+    assert types(patterns) == ["Grand Trine", "Kite"]
+    kite = next(p for p in patterns if p.type == "Kite")
+    assert kite.apex == "B3"
+    assert kite.bodies == ["B0", "B1", "B2", "B3"]
+
+
+def test_t_square_and_grand_cross():
+    """T-squares inside a grand cross are not reported separately."""
+    t_square = detect_patterns(make_chart([5.0, 185.0, 95.0]))
+    assert types(t_square) == ["T-Square"]
+    assert t_square[0].apex == "B2"
+
+    cross = detect_patterns(make_chart([5.0, 95.0, 185.0, 275.0]))
+    assert types(cross) == ["Grand Cross"]
+
+
+def test_yod_and_mystic_rectangle():
+    """Yods need a sextile base and a quincunx apex; rectangles alternate sextiles and trines."""
+    yod = detect_patterns(make_chart([0.0, 60.0, 210.0]))
+    assert types(yod) == ["Yod"]
+    assert yod[0].apex == "B2"
+
+    rectangle = detect_patterns(make_chart([0.0, 60.0, 180.0, 240.0]))
+    assert types(rectangle) == ["Mystic Rectangle"]
+
+
+def test_stellium_by_sign_and_house():
+    """Three bodies in one sign (and house) form a stellium."""
+    patterns = detect_patterns(make_chart([121.0, 125.0, 139.0], orb=0.0))
+    assert [(p.type, p.sign, p.house) for p in patterns] == [("Stellium", "Leo", None), ("Stellium", None, 5)]
+
+
+def test_patterns_feed_interpretation_and_prompts():
+    """Interpretation carries the patterns and their traits."""
+    interpretation = interpret_chart(make_chart([10.0, 130.0, 250.0]))
+    assert [p.type for p in interpretation.patterns] == ["Grand Trine"]
+    assert "naturally gifted" in interpretation.traits
+    assert describe_patterns(interpretation.patterns) == "- Grand Trine: B0, B1, B2"
+
+
+def test_many_bodies_in_batch_is_fast():
+    """Thirty bodies with dense aspects over many charts stay well within budget."""
+    charts = [make_chart([(i * 37.0 + shift) % 360.0 for i in range(30)], orb=6.0) for shift in range(50)]
+    started = time.perf_counter()
+    results = detect_patterns_batch(charts)
+    assert len(results) == 50
+    assert time.perf_counter() - started < 2.0
@@ -0,0 +1,129 @@
+"""Unit tests for the in-memory repository."""
+
+from src.core.domain.canonical import chart_id_for, profile_id_for
+from src.core.domain.models import BirthData, NatalChart, Planet, UserProfile
+from src.infrastructure.persistence import bounded_repo
+from src.infrastructure.persistence.bounded_repo import BoundedInMemoryRepository, estimate_size
+from src.infrastructure.persistence.in_memory_repo import InMemoryRepository
+
+
+BIRTH = BirthData(date="1990-05-17", time="12:30", lat=44.4268, lon=26.1025, timezone="UTC")
+
+
+def make_chart(longitude: float = 135.0) -> NatalChart:
+    """A minimal chart."""
+    return NatalChart(
+        julian_day=2448029.020833,
+        planets=[Planet(name="Sun", sign="Leo", longitude=longitude, house=5, is_retrograde=False)],
+        houses=[],
+        aspects=[]
+    )
+
+
+def test_profile_ids_are_content_addressed():
+    """Equivalent birth data yields the same profile and chart IDs."""
+    equivalent = BirthData(date="1990-5-17", time="12:30", lat=44.42680000001, lon=26.1025, timezone=" UTC ")
+    assert profile_id_for(BIRTH) == profile_id_for(equivalent)
+    assert chart_id_for(BIRTH, "1/P") == chart_id_for(equivalent, "1/P")
+    assert chart_id_for(BIRTH, "1/P") != chart_id_for(BIRTH, "2/P")
+
+
+def test_repeated_saves_upsert():
+    """Saving the same profile and chart repeatedly keeps one copy."""
+    repo = InMemoryRepository()
+    user_id = profile_id_for(BIRTH)
+    chart_id = chart_id_for(BIRTH, "1/P")
+    for _ in range(5):
+        repo.save_profile(UserProfile(user_id=user_id, birth=BIRTH))
+        repo.save_chart(user_id, make_chart(), chart_id=chart_id)
+
+    assert len(repo._profiles) == 1
+    assert len(repo._charts) == 1
+    assert repo.get_chart(user_id) is repo.get_chart_by_id(chart_id)
+
+
+def test_charts_are_shared_by_reference():
+    """Two users with the same chart reference a single stored object."""
+    repo = InMemoryRepository()
+    repo.save_chart("alice", make_chart())
+    repo.save_chart("bob", make_chart())
+    assert repo.get_chart("alice") is repo.get_chart("bob")
+
+
+def test_compact_collapses_legacy_duplicates():
+    """Compaction merges uuid-keyed duplicates and drops orphan charts."""
+    repo = InMemoryRepository()
+    for legacy_id in ("uuid-1", "uuid-2", "uuid-3"):
+        repo.save_profile(UserProfile(user_id=legacy_id, birth=BIRTH))
+        repo._chart_refs[legacy_id] = f"legacy-{legacy_id}"
+        repo._charts[f"legacy-{legacy_id}"] = make_chart()
+    repo._charts["orphan"] = make_chart(longitude=10.0)
+
+    report = repo.compact()
+
+    assert report.profiles_merged == 3
+    assert report.charts_merged == 2
+    assert report.orphan_charts_removed == 1
+    assert list(repo._profiles) == [profile_id_for(BIRTH)]
+    assert len(repo._charts) == 1
+    # Old IDs keep resolving to the surviving profile and chart
+    assert repo.get_profile("uuid-2").user_id == profile_id_for(BIRTH)
+    assert repo.get_chart("uuid-3") is not None
+
+
+def test_bounded_repository_evicts_least_recently_used():
+    """Past max_entries, the least recently read chart is evicted."""
+    repo = BoundedInMemoryRepository(max_entries=2, max_bytes=None)
+    repo.save_chart("a", make_chart(1.0), chart_id="c1")
+    repo.save_chart("b", make_chart(2.0), chart_id="c2")
+    repo.get_chart_by_id("c1")
+    repo.save_chart("c", make_chart(3.0), chart_id="c3")
+
+    assert repo.get_chart_by_id("c2") is None
+    assert repo.get_chart_by_id("c1") is not None
+    stats = repo.stats()["charts"]
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["occupancy"] == 1.0
+
+
+def test_bounded_repository_respects_byte_budget():
+    """The estimated size of cached charts stays within max_bytes."""
+    chart_size = estimate_size("c0") + estimate_size(make_chart())
+    repo = BoundedInMemoryRepository(max_bytes=int(chart_size * 3.5))
+    for i in range(10):
+        repo.save_chart(f"user-{i}", make_chart(float(i)), chart_id=f"c{i}")
+
+    stats = repo.stats()["charts"]
+    assert stats["entries"] == 3
+    assert stats["estimated_bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] == 7
+
+
+def test_bounded_repository_ttl(monkeypatch):
+    """Entries past their TTL are no longer returned."""
+    now = [1000.0]
+    monkeypatch.setattr(bounded_repo.time, "monotonic", lambda: now[0])
+    repo = BoundedInMemoryRepository(ttl_seconds=60)
+    repo.save_profile(UserProfile(user_id="u", birth=BIRTH))
+    repo.save_chart("u", make_chart(), chart_id="c1")
+
+    now[0] += 30
+    assert repo.get_profile("u") is not None
+    now[0] += 31
+    assert repo.get_profile("u") is None
+    assert repo.expire() == 2  # chart and chart reference
+    assert repo.stats()["charts"]["entries"] == 0
+
+
+def test_bounded_repository_spills_evicted_charts(tmp_path):
+    """Charts evicted for capacity are read back from the spill directory."""
+    repo = BoundedInMemoryRepository(max_entries=1, spill_dir=str(tmp_path))
+    repo.save_chart("a", make_chart(1.0), chart_id="c1")
+    repo.save_chart("b", make_chart(2.0), chart_id="c2")
+    assert (tmp_path / "c1.json").exists()
+
+    assert repo.get_chart_by_id("c1").planets[0].longitude == 1.0
+    assert not (tmp_path / "c1.json").exists()
+    assert (tmp_path / "c2.json").exists()  # displaced by the re-admitted chart
+    assert repo.stats()["charts"]["spill_hits"] == 1
@@ -0,0 +1,145 @@
+"""Unit tests for the placement index and its query language."""
+
+import random
+import time
+
+import pytest
+
+from src.core.domain.exceptions import InvalidQueryError
+from src.core.domain.models import Aspect, NatalChart, Planet
+from src.infrastructure.persistence.bounded_repo import BoundedInMemoryRepository
+from src.infrastructure.persistence.in_memory_repo import InMemoryRepository
+from src.infrastructure.persistence.placement_index import PlacementIndex
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+
+def make_chart(placements, aspects=()):
+    """Chart from {body: (sign, house, retrograde)} and (body, type, body, orb) aspects."""
+    return NatalChart(
+        planets=[
+            Planet(name=name, sign=sign, longitude=SIGNS.index(sign) * 30.0 + 15.0, house=house, is_retrograde=rx)
+            for name, (sign, house, rx) in placements.items()
+        ],
+        houses=[],
+        aspects=[Aspect(planet1=a, type=kind, planet2=b, orb=orb) for a, kind, b, orb in aspects],
+    )
+
+
+@pytest.fixture
+def index():
+    index = PlacementIndex()
+    index.add("ana", make_chart(
+        {"Venus": ("Libra", 7, False), "Moon": ("Cancer", 4, False), "Saturn": ("Aries", 1, True)},
+        [("Moon", "Square", "Saturn", 2.5)],
+    ))
+    index.add("ben", make_chart(
+        {"Venus": ("Libra", 6, False), "Moon": ("Leo", 5, False), "Saturn": ("Aries", 1, False)},
+        [("Saturn", "Square", "Moon", 3.4)],
+    ))
+    index.add("cleo", make_chart(
+        {"Venus": ("Scorpio", 7, True), "Moon": ("Cancer", 4, False), "True Node": ("Leo", 2, False)},
+    ))
+    return index
+
+
+def users(index, query):
+    return sorted(index.query(query, limit=None).user_ids)
+
+
+def test_placement_terms(index):
+    """Sign, house, chained placements, aspects and retrograde terms."""
+    assert users(index, "Venus in Libra") == ["ana", "ben"]
+    assert users(index, "venus in the 7th house") == ["ana", "cleo"]
+    assert users(index, "Venus in Libra in house 7") == ["ana"]
+    assert users(index, "Moon square Saturn") == ["ana", "ben"]
+    assert users(index, "Saturn square Moon within 3°") == ["ana"]
+    assert users(index, "Moon square Saturn within 3.5") == ["ana", "ben"]
+    assert users(index, "Saturn retrograde OR Venus rx") == ["ana", "cleo"]
+    assert users(index, "True Node in Leo") == ["cleo"]
+    assert users(index, '"True Node" in 2') == ["cleo"]
+    assert users(index, "Chiron in Aries") == []
+
+
+def test_boolean_operators(index):
+    """AND binds tighter than OR; NOT complements against all indexed charts."""
+    assert users(index, "NOT Venus in Libra") == ["cleo"]
+    assert users(index, "Moon in Cancer AND NOT Saturn retrograde") == ["cleo"]
+    assert users(index, "Venus in Scorpio OR Moon in Leo AND Venus in Libra") == ["ben", "cleo"]
+    assert users(index, "(Venus in Scorpio OR Moon in Leo) AND Venus in Libra") == ["ben"]
+    matches = index.query("Venus in Libra OR Venus in Scorpio", limit=1)
+    assert matches.total == 3 and len(matches.user_ids) == 1
+
+
+def test_wide_orbs_are_clamped(index):
+    """An orb past the engine's widest scans only the buckets that can exist."""
+    started = time.perf_counter()
+    assert users(index, "Moon square Saturn within 1e8") == ["ana", "ben"]
+    assert time.perf_counter() - started < 0.1
+
+
+def test_updates_are_incremental(index):
+    """Re-indexing replaces a user's postings and removal frees the document."""
+    index.add("ana", make_chart({"Venus": ("Taurus", 2, False)}))
+    assert users(index, "Venus in Libra") == ["ben"]
+    assert users(index, "Venus in Taurus") == ["ana"]
+    assert index.remove("ben")
+    assert not index.remove("ben")
+    assert users(index, "NOT Venus in Taurus") == ["cleo"]
+    index.add("dan", make_chart({"Venus": ("Libra", 7, False)}))
+    assert users(index, "Venus in Libra") == ["dan"]
+    assert index.stats()["documents"] == 3
+
+
+@pytest.mark.parametrize("query", [
+    "", "Venus", "Venus in", "Venus in Nowhere", "Venus in house 13", "Venus in Libra AND",
+    "(Venus in Libra", "Venus in Libra)", "Moon square", "Moon square Saturn within lots",
+    "Moon square Saturn within inf", "Moon square Saturn within nan", "Moon square Saturn within -1",
+    "Venus in nan", "Venus in inf", "Venus in 1e400",
+])
+def test_invalid_queries(index, query):
+    """Malformed queries raise a domain error."""
+    with pytest.raises(InvalidQueryError):
+        index.query(query)
+
+
+def test_repository_indexes_saved_charts():
+    """Saving a chart indexes it; evicted users leave the index."""
+    repo = InMemoryRepository()
+    repo.save_chart("u1", make_chart({"Venus": ("Libra", 7, False)}))
+    repo.save_chart("u1", make_chart({"Venus": ("Aries", 1, False)}))
+    assert repo.find_users("Venus in Libra").total == 0
+    assert repo.find_users("Venus in Aries").user_ids == ["u1"]
+
+    bounded = BoundedInMemoryRepository(max_entries=2)
+    for user_id in ("a", "b", "c"):
+        bounded.save_chart(user_id, make_chart({"Venus": ("Libra", 7, False)}))
+    assert sorted(bounded.find_users("Venus in Libra", limit=None).user_ids) == ["b", "c"]
+    assert bounded.stats()["placements"]["documents"] == 2
+
+
+def test_intersections_are_fast_at_scale():
+    """Boolean queries over 100k indexed charts stay within milliseconds."""
+    index = PlacementIndex()
+    rng = random.Random(7)
+    charts = [
+        make_chart(
+            {body: (rng.choice(SIGNS), rng.randint(1, 12), rng.random() < 0.2) for body in ("Sun", "Moon", "Venus")},
+            [("Moon", "Square", "Venus", rng.uniform(0, 8))] if rng.random() < 0.3 else (),
+        )
+        for _ in range(500)
+    ]
+    for i in range(100_000):
+        index.add(f"u{i}", charts[i % len(charts)])
+
+    start = time.perf_counter()
+    matches = index.query("(Venus in Libra OR Venus in house 7) AND NOT Moon square Venus within 3", limit=50)
+    elapsed = time.perf_counter() - start
+    expected = sum(
+        1 for i in range(100_000)
+        if (lambda c: (c.planets[2].sign == "Libra" or c.planets[2].house == 7)
+            and not any(a.orb <= 3 for a in c.aspects))(charts[i % len(charts)])
+    )
+    assert matches.total == expected
+    assert elapsed < 0.05
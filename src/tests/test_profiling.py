@@ -0,0 +1,174 @@
+"""Unit tests for stage timings, the stack sampler and the profile recorder."""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.modules.setdefault('swisseph', MagicMock())
+
+from src.config.settings import Settings
+from src.infrastructure.profiling.recorder import ProfileCapture, ProfileRecorder, StackSampler
+from src.infrastructure.profiling.stages import current_trace, end_trace, stage, start_trace, tracing
+from src.interfaces.api import v1
+from src.interfaces.api.main import create_app
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestStages:
+    def test_stage_without_trace_is_a_no_op(self):
+        assert current_trace() is None
+        with stage("chart"):
+            pass
+        assert current_trace() is None
+
+    def test_stage_records_timings(self):
+        token = start_trace()
+        trace = current_trace()
+        try:
+            with stage("chart"):
+                time.sleep(0.01)
+            with stage("ai.analysis"):
+                pass
+        finally:
+            end_trace(token)
+        assert current_trace() is None
+        assert [timing.name for timing in trace.stages] == ["chart", "ai.analysis"]
+        chart, analysis = trace.stages
+        assert chart.duration_ms >= 9
+        assert analysis.start_ms >= chart.start_ms + chart.duration_ms
+
+    def test_stage_provenance(self):
+        with tracing() as trace:
+            with stage("ai.analysis") as step:
+                step.source = "cache"
+            with pytest.raises(ValueError):
+                with stage("ai.rewrite"):
+                    raise ValueError
+        assert [(t.name, t.source) for t in trace.stages] == [("ai.analysis", "cache"), ("ai.rewrite", "error")]
+
+    def test_tracing_joins_the_current_trace(self):
+        with tracing() as outer:
+            with tracing() as inner:
+                with stage("chart"):
+                    pass
+            assert inner is outer
+            assert current_trace() is outer
+        assert current_trace() is None
+        assert [t.name for t in outer.stages] == ["chart"]
+
+
+class TestStackSampler:
+    def test_samples_are_attributed_below_the_tracked_frame(self):
+        sampler = StackSampler(interval=3600)  # sampled by hand below
+        capture = ProfileCapture("GET /busy")
+        tracked = threading.Event()
+        done = threading.Event()
+
+        def busy_leaf():
+            while not done.is_set():
+                pass
+
+        def request():
+            sampler.track(sys._getframe(), capture)
+            tracked.set()
+            busy_leaf()
+            sampler.untrack(sys._getframe())
+
+        worker = threading.Thread(target=request)
+        worker.start()
+        tracked.wait()
+        for _ in range(5):
+            sampler.sample()
+        done.set()
+        worker.join()
+
+        assert sum(capture.samples.values()) == 5
+        for stack in capture.samples:
+            assert stack.startswith("GET /busy;")
+            assert "busy_leaf" in stack
+            assert "Thread.run" not in stack  # frames above the tracked one are left out
+
+        sampler.sample()
+        assert sum(capture.samples.values()) == 5  # untracked
+
+
+class TestProfileRecorder:
+    def test_write_list_get_and_prune(self, tmp_path):
+        recorder = ProfileRecorder(str(tmp_path), capacity=2)
+        ids = [recorder.write({"path": f"/{i}", "samples": {"GET /;a;b": 2}}) for i in range(3)]
+
+        summaries = recorder.list()
+        assert [s["path"] for s in summaries] == ["/2", "/1"]
+        assert "samples" not in summaries[0]
+        assert recorder.get(ids[0]) is None  # pruned
+        assert recorder.get(ids[2])["samples"] == {"GET /;a;b": 2}
+
+    def test_get_rejects_ids_outside_the_directory(self, tmp_path):
+        recorder = ProfileRecorder(str(tmp_path))
+        assert recorder.get("../../etc/passwd") is None
+        assert recorder.get("123-456") is None
+
+    def test_folded_format(self):
+        folded = ProfileRecorder.folded({"samples": {"GET /;b": 1, "GET /;a;c": 3}})
+        assert folded == "GET /;a;c 3\nGET /;b 1\n"
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    settings = Settings(
+        google_api_key="x", profiling_mode="slow", profiling_slow_ms=100,
+        profiling_interval_ms=1, profiling_dir=str(tmp_path), admin_token="secret",
+    )
+    app = create_app(settings)
+
+    @app.get("/busy")
+    async def busy(ms: float = 50):
+        with stage("chart"):
+            spin(ms / 1000.0)
+        return {"ok": True}
+
+    app.router.routes.insert(0, app.router.routes.pop())  # ahead of the SPA fallback
+    app.dependency_overrides[v1.get_settings] = lambda: settings
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+    def test_slow_requests_are_recorded(self, profiled):
+        assert profiled.get("/busy", params={"ms": 0}).status_code == 200
+        assert profiled.get("/busy", params={"ms": 150}).status_code == 200
+
+        response = profiled.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["mode"] == "slow"
+        (capture,) = body["captures"]  # the fast request was not kept
+        assert capture["path"] == "/busy"
+        assert capture["query"] == "ms=150"
+        assert capture["status"] == 200
+        assert capture["duration_ms"] >= 150
+        assert [s["name"] for s in capture["stages"]] == ["chart"]
+        assert capture["sample_count"] > 0
+
+        flamegraph = profiled.get(f"/api/v1/admin/profiles/{capture['id']}/flamegraph",
+                                  headers={"X-Admin-Token": "secret"})
+        assert flamegraph.status_code == 200
+        assert "spin" in flamegraph.text
+        assert all(line.startswith("GET /busy;") for line in flamegraph.text.splitlines())
+
+    def test_admin_endpoints_require_the_token(self, profiled):
+        assert profiled.get("/api/v1/admin/profiles").status_code == 403
+        assert profiled.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    def test_unknown_capture(self, profiled):
+        response = profiled.get("/api/v1/admin/profiles/1-1", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "PROFILE_NOT_FOUND"
@@ -0,0 +1,149 @@
+"""Unit tests for the birth-time rectification scan."""
+
+import importlib.machinery
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.exceptions import InvalidDateError
+    from src.core.domain.models import BirthData
+    from src.infrastructure.astro_engine import rectification
+    from src.infrastructure.astro_engine.rectification import RectificationScanner
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+
+class FakeSwe:
+    """Deterministic stand-in for swisseph: static planets, equal houses from the ARMC."""
+
+    ECL_NUT = -1
+    FLG_SWIEPH = 2
+    FLG_SPEED = 256
+    JD0 = 2448028.5
+
+    def __init__(self):
+        self.calc_calls = 0
+        self.house_calls = 0
+
+    def julday(self, year, month, day, hour):
+        return self.JD0 + hour / 24.0
+
+    def calc_ut(self, jd, body, flags=0):
+        if body == self.ECL_NUT:
+            return (23.44, 23.44, 0.0, 0.0, 0.0, 0.0), 0
+        self.calc_calls += 1
+        return (float(body) * 33.0 + 5.0, 0.0, 1.0, 0.5, 0.0, 0.0), flags
+
+    def houses(self, jd, lat, lon, hsys):
+        return self.houses_armc(0.0, lat, 23.44, hsys)
+
+    def houses_armc(self, armc, lat, eps, hsys):
+        self.house_calls += 1
+        cusps = tuple((armc + 30.0 * i) % 360.0 for i in range(12))
+        return cusps, (armc, (armc + 270.0) % 360.0, armc, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def house_pos(self, armc, lat, eps, position, hsys):
+        return 1.0 + ((position[0] - armc) % 360.0) / 30.0
+
+
+@pytest.fixture
+def fake_swe():
+    """Patch the rectification module's ephemeris."""
+    fake = FakeSwe()
+    with patch.object(rectification, "swe", fake):
+        yield fake
+
+
+@pytest.fixture
+def scanner():
+    """Scanner over the default engine body set."""
+    return RectificationScanner(SwissEphemerisEngine())
+
+
+BIRTH = BirthData(date="1990-05-17", lat=44.4268, lon=0.0, timezone="UTC")
+
+
+def test_scan_covers_window_with_contiguous_intervals(fake_swe, scanner):
+    """Intervals tile the window and each one differs from its predecessor."""
+    result = scanner.scan(BIRTH)
+
+    assert result.intervals[0].start_time == "00:00"
+    assert result.intervals[-1].end_time == "23:59"
+    assert len(result.intervals) >= 12  # the ascendant passes through every sign
+    for previous, current in zip(result.intervals, result.intervals[1:]):
+        assert (previous.ascendant_sign, previous.placements) != (current.ascendant_sign, current.placements)
+
+
+def test_scan_computes_bodies_once_and_sweeps_houses(fake_swe, scanner):
+    """Bodies are evaluated at the window ends only; houses once per step."""
+    scanner.scan(BIRTH, start_time="06:00", end_time="07:59", step_minutes=1)
+
+    assert fake_swe.calc_calls == 2 * len(SwissEphemerisEngine.PLANETS)
+    assert fake_swe.house_calls == 1 + 120
+
+
+def test_scan_respects_step(fake_swe, scanner):
+    """Coarser steps sample fewer times."""
+    scanner.scan(BIRTH, step_minutes=15)
+    assert fake_swe.house_calls == 1 + 96
+
+
+def test_scan_window_is_local_time_in_the_birth_zone(fake_swe, scanner):
+    """The window is converted with the birth zone, across a daylight saving change too."""
+    birth = BirthData(date="2021-03-28", lat=44.4268, lon=0.0, timezone="Europe/Bucharest")
+    result = scanner.scan(birth, start_time="02:00", end_time="05:00")
+
+    assert fake_swe.house_calls == 1 + 121  # 02:00 EET to 05:00 EEST is two hours
+    assert result.intervals[0].start_time == "02:00"
+    assert result.intervals[-1].end_time == "05:00"
+
+
+def test_scan_rejects_inverted_window(fake_swe, scanner):
+    """The window end must not precede its start."""
+    with pytest.raises(InvalidDateError):
+        scanner.scan(BIRTH, start_time="12:00", end_time="11:00")
+
+
+# Runs in a fresh interpreter: the stubbed swisseph of this process leaks
+# into constants (body IDs, flags) captured at import time.
+AGREEMENT_SCRIPT = textwrap.dedent("""
+    import json
+    from src.core.domain.models import BirthData
+    from src.infrastructure.astro_engine.rectification import RectificationScanner
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+    engine = SwissEphemerisEngine()
+    birth = BirthData(date="1990-05-17", lat=44.4, lon=26.1, timezone="UTC")
+    result = RectificationScanner(engine).scan(birth)
+    mismatches, covered = [], []
+    for interval in result.intervals:
+        for label in (interval.start_time, interval.end_time):
+            chart = engine.calculate_chart(birth.model_copy(update={"time": label}))
+            placements = {planet.name: planet.house for planet in chart.planets}
+            if placements != interval.placements or chart.houses[0].sign != interval.ascendant_sign:
+                mismatches.append(label)
+        start_h, start_m = map(int, interval.start_time.split(":"))
+        end_h, end_m = map(int, interval.end_time.split(":"))
+        covered.extend(range(start_h * 60 + start_m, end_h * 60 + end_m + 1))
+    print(json.dumps({"intervals": len(result.intervals), "covered": covered, "mismatches": mismatches}))
+""")
+
+
+@pytest.mark.skipif(importlib.machinery.PathFinder.find_spec("swisseph") is None,
+                    reason="pyswisseph is not installed")
+def test_scan_agrees_with_calculate_chart():
+    """On the real ephemeris, both edges of every interval match the engine's chart."""
+    completed = subprocess.run(
+        [sys.executable, "-c", AGREEMENT_SCRIPT], cwd=Path(__file__).resolve().parents[2],
+        capture_output=True, text=True, timeout=120, check=True,
+    )
+    report = json.loads(completed.stdout)
+
+    assert report["covered"] == list(range(1440))
+    assert report["intervals"] > 100
+    assert report["mismatches"] == []
@@ -0,0 +1,115 @@
+"""Unit tests for return and progression root-finding."""
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.exceptions import CalculationError
+    from src.infrastructure.astro_engine import returns
+    from src.infrastructure.astro_engine.chart_arrays import ChartBatch
+    from src.infrastructure.astro_engine.returns import ReturnsCalculator
+    from src.infrastructure.astro_engine.swiss_ephemeris import SwissEphemerisEngine
+
+
+class FakeSwe:
+    """Sun and Moon with a wobbling (non-uniform) motion, for testing convergence."""
+
+    SUN = 0
+    MOON = 1
+    JD0 = 2451545.0
+    MOTION = {SUN: (280.0, 0.9856), MOON: (218.0, 13.1764)}  # (longitude at JD0, mean speed)
+    LAST_JD = JD0 + 100 * 365.0  # end of the (fake) ephemeris files
+
+    class Error(Exception):
+        pass
+
+    def julday(self, year, month, day, hour):
+        # 365-day years starting at JD0, good enough for the year table
+        return self.JD0 + (year - 2000) * 365.0 + hour / 24.0 + (month - 1) * 30.0 + (day - 1)
+
+    def calc_ut(self, jd, body, flags=0):
+        import math
+        if jd > self.LAST_JD:
+            raise self.Error("jd beyond ephemeris range")
+        lon0, speed = self.MOTION[body]
+        t = jd - self.JD0
+        lon = lon0 + speed * t + 2.0 * math.sin(t / 20.0)
+        return (lon % 360.0, 0.0, 1.0, speed + 0.1 * math.cos(t / 20.0), 0.0, 0.0), flags
+
+
+@pytest.fixture
+def calculator():
+    """Calculator over the fake ephemeris."""
+    fake = FakeSwe()
+    with patch.object(returns, "swe", fake):
+        calc = ReturnsCalculator(SwissEphemerisEngine())
+        calc.BODIES = {"solar": fake.SUN, "lunar": fake.MOON}
+        yield calc
+
+
+def angle(calc, body, jd):
+    return calc.longitude(body, jd)[0]
+
+
+def test_find_return_converges_from_mean_motion(calculator):
+    """Newton iteration lands on the target longitude within a few calls."""
+    jd = calculator.find_return(FakeSwe.SUN, 100.0, FakeSwe.JD0 + 180.0)
+    assert abs((angle(calculator, FakeSwe.SUN, jd) - 100.0 + 180.0) % 360.0 - 180.0) < 1e-6
+    assert calculator.ephemeris_calls <= 6
+
+
+def test_returns_are_consecutive_and_after_start(calculator):
+    """A series of returns has one return per cycle, all after the start."""
+    natal_jd = FakeSwe.JD0
+    start = FakeSwe.JD0 + 1000.0
+    moments = calculator.returns("lunar", natal_jd, start, 24)
+    target = angle(calculator, FakeSwe.MOON, natal_jd)
+
+    assert moments[0] > start
+    assert moments[0] - start < 28.0
+    for jd in moments:
+        assert abs((angle(calculator, FakeSwe.MOON, jd) - target + 180.0) % 360.0 - 180.0) < 1e-6
+    gaps = [b - a for a, b in zip(moments, moments[1:])]
+    assert all(25.0 < gap < 30.0 for gap in gaps)
+
+
+def test_solar_returns_for_year_matches_individual_search(calculator):
+    """The shared year table gives the same moments as per-person searches."""
+    longitudes = [0.0, 45.5, 123.4, 280.0, 359.9]
+    batch = calculator.solar_returns_for_year(longitudes, 2001)
+    calls_before = calculator.ephemeris_calls
+    for lon, jd in zip(longitudes, batch):
+        single = calculator.find_return(FakeSwe.SUN, lon, jd + 3.0)
+        assert single == pytest.approx(jd, abs=1e-5)
+    assert calls_before < 366 + 4 * len(longitudes)
+
+
+def test_progressions_use_one_day_per_year(calculator):
+    """The progressed ephemeris day is birth plus the age in days, for the requested bodies."""
+    batch = ChartBatch(2, ("Sun", "Ascendant"), np.zeros((0, 2), dtype=np.int64), ())
+    batch.longitudes[:] = [[83.27, 200.0], [113.0, 10.0]]
+    batch.speeds[:] = [[0.96, 0.0], [-0.5, 0.0]]
+    batch.signs[:] = [[2, 6], [3, 0]]
+    calculator.engine.calculate_batch = MagicMock(return_value=batch)
+    progressed = calculator.progressions(FakeSwe.JD0, [0.0, 30.5], 44.4, 26.1, ["Sun", "Ascendant"])
+    assert [p.julian_day for p in progressed] == [FakeSwe.JD0, FakeSwe.JD0 + 30.5]
+    assert [p.age_years for p in progressed] == [0.0, 30.5]
+    calculator.engine.calculate_batch.assert_called_once_with(
+        [FakeSwe.JD0, FakeSwe.JD0 + 30.5], [44.4, 44.4], [26.1, 26.1], ["Sun", "Ascendant"]
+    )
+    assert [(p.name, p.sign) for p in progressed[0].positions] == [("Sun", "Gemini"), ("Ascendant", "Libra")]
+    assert progressed[1].positions[0].is_retrograde and not progressed[1].positions[1].is_retrograde
+
+
+def test_non_convergence_raises(calculator):
+    """A body that never reaches the target raises a calculation error."""
+    calculator.longitude = lambda body, jd: (10.0, 1.0)
+    with pytest.raises(CalculationError):
+        calculator.find_return(FakeSwe.SUN, 100.0, FakeSwe.JD0)
+
+
+def test_ephemeris_errors_become_calculation_errors(calculator):
+    """A moment outside the ephemeris files is a domain error, not a crash."""
+    with pytest.raises(CalculationError):
+        calculator.longitude(FakeSwe.SUN, FakeSwe.LAST_JD + 1.0)
@@ -0,0 +1,158 @@
+"""Unit tests for the location-day rise/set cache and planetary hours."""
+
+import math
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.config.settings import Settings
+    from src.core.domain.exceptions import InvalidCoordinatesError, InvalidTimezoneError
+    from src.core.domain.models import BirthData, UserProfile
+    from src.infrastructure.astro_engine import rise_set
+    from src.infrastructure.astro_engine.rise_set import CHALDEAN_ORDER, RiseSetService, planetary_hours
+    from src.infrastructure.persistence.in_memory_repo import InMemoryRepository
+
+MOON_DAY = 1.035  # days between moonrises, so some days have none
+
+
+class FakeSwe:
+    """Sun up from 06:00 to 18:00 UT, a Moon rising 50 minutes later each day; polar above 70 degrees."""
+
+    SUN, MOON = 0, 1
+    CALC_RISE, CALC_SET = 1, 2
+
+    def __init__(self):
+        self.calls = 0
+
+    def rise_trans(self, jd, body, rsmi, geopos, atpress=0.0, attemp=0.0, flags=0):
+        self.calls += 1
+        if abs(geopos[1]) > 70.0:
+            return -2, (0.0,) * 10
+        if body == self.SUN:
+            offset = 0.25 if rsmi == self.CALC_RISE else 0.75  # after midnight UT (jd - 0.5)
+            event = math.floor(jd - 0.5 - offset) + 1 + offset + 0.5
+        else:
+            offset = 0.1 if rsmi == self.CALC_RISE else 0.6
+            event = offset + MOON_DAY * (math.floor((jd - offset) / MOON_DAY) + 1)
+        return 0, (event,) + (0.0,) * 9
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSwe()
+    with patch.object(rise_set, "swe", fake):
+        yield fake
+
+
+def test_planetary_hours_follow_the_chaldean_order():
+    sunrise = np.array([0.25, 1.2])
+    bounds, rulers = planetary_hours(sunrise, sunrise + 0.6, sunrise + 1.0, np.array([5, 6]))
+
+    assert bounds.shape == (2, 25) and rulers.shape == (2, 24)
+    assert CHALDEAN_ORDER[rulers[0, 0]] == "Saturn" and CHALDEAN_ORDER[rulers[1, 0]] == "Sun"
+    np.testing.assert_allclose(np.diff(bounds[:, :13]), 0.05)  # twelve equal day hours
+    np.testing.assert_allclose(np.diff(bounds[:, 12:]), 0.4 / 12)  # and night hours
+    # Counting on past the night reaches the next weekday's ruler
+    all_days = np.arange(7)
+    _, week = planetary_hours(np.zeros(7), np.full(7, 0.5), np.ones(7), all_days)
+    assert np.array_equal((week[:, -1] + 1) % 7, week[(all_days + 1) % 7, 0])
+
+
+def test_days_are_cached_per_cell_and_utc_day(fake):
+    service = RiseSetService(cell_degrees=0.05)
+    day = service.day(44.4268, 26.1025, "Europe/Bucharest", date(2024, 6, 21))
+    assert service.computed == 3  # June 20 21:00 to June 21 21:00 UT, and the next sunrise on June 22
+
+    # UTC 06:00 and 18:00 are 09:00 and 21:00 in Bucharest (UTC+3 in June)
+    assert day.sunrise == "2024-06-21T06:00:00+00:00" and day.sunset == "2024-06-21T18:00:00+00:00"
+    assert (day.latitude, day.longitude) == (44.45, 26.1) and day.day_ruler == "Venus"
+    assert [hour.ruler for hour in day.planetary_hours[:3]] == ["Venus", "Mercury", "Moon"]
+    assert day.planetary_hours[0].start == day.sunrise and day.planetary_hours[12].start == day.sunset
+    assert day.planetary_hours[-1].end == "2024-06-22T06:00:00+00:00"
+    assert sum(hour.daytime for hour in day.planetary_hours) == 12
+
+    calls = fake.calls
+    assert service.day(44.43, 26.11, "Europe/Bucharest", date(2024, 6, 21)) == day  # same cell
+    # Other zones share the cell's UTC days, e.g. profiles stored without a real zone
+    utc_day = service.day(44.43, 26.11, "UTC", date(2024, 6, 21))
+    assert (utc_day.sunrise, utc_day.sunset) == (day.sunrise, day.sunset)
+    assert fake.calls == calls
+    service.day(44.43, 26.11, "Europe/Bucharest", date(2024, 6, 22))
+    service.day(44.53, 26.11, "Europe/Bucharest", date(2024, 6, 21))
+    assert service.computed == 7 and service.stats()["entries"] == 7
+
+    # The local day decides which events belong to it
+    tokyo = service.day(35.68, 139.69, "Asia/Tokyo", date(2024, 6, 21))  # 2024-06-20 15:00 to 06-21 15:00 UT
+    assert tokyo.sunrise == "2024-06-21T06:00:00+00:00"
+    assert tokyo.sunset is None and tokyo.planetary_hours == []  # 18:00 UT is already June 22 in Tokyo
+
+
+def test_days_without_events(fake):
+    service = RiseSetService()
+    polar = service.day(78.2, 15.6, "Arctic/Longyearbyen", date(2024, 6, 21))
+    assert polar.sunrise is None and polar.sunset is None and polar.planetary_hours == []
+    assert polar.day_ruler == "Venus"
+
+    moonrises = [service.day(0.0, 0.0, "UTC", date(2024, 1, d)).moonrise for d in range(1, 31)]
+    assert 0 < moonrises.count(None) < 3  # the Moon skips a rise about once a month
+
+    with pytest.raises(InvalidTimezoneError):
+        service.day(0.0, 0.0, "Mars/Olympus_Mons")
+    with pytest.raises(InvalidCoordinatesError):
+        service.day(91.0, 0.0)
+
+
+def test_nightly_batch_precomputes_the_most_common_cells(fake):
+    repository = InMemoryRepository()
+    # Profiles with raw coordinates are stored as UTC, while callers ask in their real zone
+    places = [(44.4268, 26.1025, "UTC")] * 5 + [(48.8566, 2.3522, "Europe/Paris")] * 3 + [
+        (40.7128, -74.006, "America/New_York"), (1.0, 1.0, "Nowhere/Else"),
+    ]
+    for i, (lat, lon, tz) in enumerate(places):
+        birth = BirthData(date="1990-05-17", time="12:30", lat=lat, lon=lon + i * 1e-4, timezone=tz)
+        repository.save_profile(UserProfile(user_id=f"u{i}", birth=birth))
+
+    service = RiseSetService(locations=repository.profile_locations, top_n=2)
+    top = service.top_locations(repository.profile_locations(), 3)
+    assert [tz for _, _, tz in top] == ["UTC", "Europe/Paris", "America/New_York"]
+
+    now = datetime(2024, 6, 21, 2, tzinfo=timezone.utc)
+    assert service.run_batch(now) == 10  # UTC June 20-24 of the two largest cells
+    assert service.run_batch(now) == 0
+    calls, computed = fake.calls, service.computed
+    service.day(44.4268, 26.1025, "Europe/Bucharest", date(2024, 6, 22))
+    service.day(44.4268, 26.1025, "Pacific/Kiritimati", date(2024, 6, 22))
+    service.day(48.8566, 2.3522, "Europe/Paris", date(2024, 6, 21))
+    assert fake.calls == calls and service.computed == computed
+
+    assert service.precompute(places, days=1, now=now) == 8  # New York and Nowhere, UTC June 20-23
+    assert service.seconds_until_batch(datetime(2024, 6, 21, 1, 30, tzinfo=timezone.utc)) == 1800.0
+    assert service.seconds_until_batch(now) == 86400.0
+
+
+def test_location_day_endpoint(fake):
+    from src.interfaces.api.main import create_app
+    import src.interfaces.api.v1 as v1_module
+    from src.infrastructure.astro_engine import rise_set as app_rise_set
+
+    app = create_app(Settings(google_api_key="x"))
+    service = v1_module.RiseSetService()
+    app.dependency_overrides[v1_module.get_rise_set_service] = lambda: service
+    client = TestClient(app)
+
+    with patch.object(app_rise_set, "swe", fake):
+        response = client.get("/api/v1/sky/day", params={
+            "latitude": 44.4268, "longitude": 26.1025, "timezone": "Europe/Bucharest", "date": "2024-06-21",
+        })
+        assert response.status_code == 200
+        body = response.json()
+        assert body["day_ruler"] == "Venus" and len(body["planetary_hours"]) == 24
+
+        response = client.get("/api/v1/sky/day", params={"latitude": 0, "longitude": 0, "timezone": "UTC", "date": "21/06/2024"})
+        assert response.status_code == 400 and response.json()["error"]["code"] == "INVALID_DATE"
+        response = client.get("/api/v1/sky/day", params={"latitude": 0, "longitude": 0, "timezone": "Nope"})
+        assert response.status_code == 400 and response.json()["error"]["code"] == "INVALID_TIMEZONE"
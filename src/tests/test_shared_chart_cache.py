@@ -0,0 +1,161 @@
+"""Unit tests for the cross-worker shared-memory chart cache."""
+
+import hashlib
+import itertools
+import multiprocessing
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.models import Aspect, BirthData, House, NatalChart, Planet
+    from src.core.use_cases.calculate_chart import CalculateChartUseCase
+    from src.infrastructure.persistence import shared_chart_cache
+    from src.infrastructure.persistence.shared_chart_cache import SharedChartCache, decode_chart, encode_chart
+    from src.infrastructure.profiling.stages import tracing
+
+BODIES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+def make_chart(longitude: float = 135.0, julian_day=2448029.020833) -> NatalChart:
+    """A chart whose bodies all sit at one longitude."""
+    return NatalChart(
+        julian_day=julian_day,
+        planets=[Planet(name=name, sign="Leo", longitude=longitude, house=5, is_retrograde=name == "Mercury")
+                 for name in BODIES],
+        houses=[House(number=i + 1, degree=(longitude + 30 * i) % 360, sign="Aries") for i in range(12)],
+        aspects=[Aspect(planet1="Sun", planet2="Moon", type="Conjunction", orb=longitude / 1000.0)],
+    )
+
+
+def key_for(n: int) -> str:
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+def test_records_round_trip():
+    chart = make_chart(123.456789012345)
+    assert decode_chart(encode_chart(chart)) == chart
+    assert decode_chart(encode_chart(make_chart(julian_day=None))).julian_day is None
+    unknown = make_chart()
+    unknown.planets[0].name = "Planet X"
+    assert encode_chart(unknown) is None
+
+
+def test_workers_share_one_file(tmp_path):
+    path = str(tmp_path / "charts.cache")
+    first, second = SharedChartCache(path, entries=64), SharedChartCache(path, entries=64)
+    assert first.entries == 64 and first.get(key_for(1)) is None
+
+    assert second.put(key_for(1), make_chart(10.0))
+    assert first.get(key_for(1)) == make_chart(10.0)  # stored by the other "worker"
+    assert first.stats()["used"] == 1 and first.stats()["hit_rate"] == 0.5
+
+    # Another layout replaces the file instead of misreading it
+    assert SharedChartCache(path, entries=128).get(key_for(1)) is None
+
+
+def test_full_window_replaces_the_least_recently_used_entry(tmp_path, monkeypatch):
+    clock = itertools.count(1.0)
+    monkeypatch.setattr(shared_chart_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache = SharedChartCache(str(tmp_path / "charts.cache"), entries=8)  # one probe window: the whole table
+    for n in range(8):
+        cache.put(key_for(n), make_chart(float(n)))
+    assert cache.get(key_for(0)) is not None  # now the most recently used
+
+    cache.put(key_for(8), make_chart(8.0))
+    assert cache.get(key_for(1)) is None
+    assert [cache.get(key_for(n)) is not None for n in (0, 2, 8)] == [True, True, True]
+    assert cache.stats()["used"] == 8
+
+
+def test_charts_that_do_not_fit_are_skipped(tmp_path):
+    cache = SharedChartCache(str(tmp_path / "charts.cache"), entries=8, slot_size=64)
+    assert not cache.put(key_for(1), make_chart())
+    assert cache.get(key_for(1)) is None and cache.stats()["skipped"] == 1
+
+
+def test_entry_of_a_dead_writer_is_rewritten(tmp_path):
+    """A writer that died mid-write leaves the entry odd; the next writer rewrites it."""
+    cache = SharedChartCache(str(tmp_path / "charts.cache"), entries=64)
+    key = key_for(1)
+    cache.put(key, make_chart(10.0))
+    index = cache._window(bytes.fromhex(key[:2 * shared_chart_cache.KEY_BYTES]))[0]
+    position = shared_chart_cache.HEADER_SIZE + index * shared_chart_cache.ENTRY.size
+    slot = cache._data_offset + index * cache.slot_size
+    seq = shared_chart_cache.SEQ.unpack_from(cache._mm, position)[0]
+    shared_chart_cache.SEQ.pack_into(cache._mm, position, seq + 1)  # died after marking the entry...
+    cache._mm[slot:slot + 16] = b"\xff" * 16  # ...and while copying the record
+    assert cache.get(key) is None
+
+    assert cache.put(key, make_chart(10.0)) and cache.stores == 2
+    assert shared_chart_cache.SEQ.unpack_from(cache._mm, position)[0] == seq + 2
+    assert cache.get(key) == make_chart(10.0)
+    assert cache.put(key, make_chart(10.0)) and cache.stores == 2  # complete again: not rewritten
+
+
+def _write_randomly(path: str, seconds: float, seed: int) -> None:
+    cache = SharedChartCache(path, entries=8)
+    rng = random.Random(seed)
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        n = rng.randrange(32)
+        cache.put(key_for(n), make_chart(float(n)))
+
+
+def test_reads_never_see_a_half_written_chart(tmp_path):
+    """Two writer processes churn an 8-entry cache while this process reads."""
+    path = str(tmp_path / "charts.cache")
+    cache = SharedChartCache(path, entries=8)
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_write_randomly, args=(path, 1.0, seed)) for seed in range(2)]
+    for writer in writers:
+        writer.start()
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline:
+        for n in range(32):
+            chart = cache.get(key_for(n))
+            if chart is not None:
+                assert {planet.longitude for planet in chart.planets} == {float(n)}
+                assert chart.aspects[0].orb == n / 1000.0
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    assert cache.hits > 0
+
+
+class FakeEngine:
+    """Counts calculations; every chart is the same."""
+
+    HOUSE_SYSTEM = b"P"
+
+    def __init__(self):
+        self.calls = 0
+        self.corrections = []
+
+    def version_for(self, bodies=None):
+        return f"1/{bodies}"
+
+    def calculate_chart(self, birth_data, bodies=None):
+        self.calls += 1
+        return make_chart()
+
+    def trace_time_correction(self, birth_data, jd):
+        self.corrections.append(jd)
+
+
+def test_use_case_serves_repeats_from_the_cache(tmp_path):
+    engine = FakeEngine()
+    cache = SharedChartCache(str(tmp_path / "charts.cache"), entries=64)
+    use_case = CalculateChartUseCase(engine, default_bodies="classic", cache=cache)
+    birth = BirthData(date="1990-05-17", time="12:30", lat=44.4268, lon=26.1025, timezone="UTC")
+
+    assert use_case.execute(birth) == make_chart()
+    with tracing() as trace:
+        assert use_case.execute(birth.model_copy(update={"time": "12:30 "})) == make_chart()
+    assert engine.calls == 1
+    assert [(s.name, s.source) for s in trace.stages] == [("chart", "cache")]
+    assert engine.corrections == [make_chart().julian_day]  # hits still report the time correction
+
+    use_case.execute(birth, bodies="standard")  # another body set, another engine version
+    assert engine.calls == 2
@@ -0,0 +1,182 @@
+"""Unit tests for chart embeddings and nearest-neighbour indexes."""
+
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from src.core.domain.models import Aspect, NatalChart, Planet
+from src.infrastructure.persistence.bounded_repo import BoundedInMemoryRepository
+from src.infrastructure.similarity.embedding import EMBEDDED_BODIES, EMBEDDING_DIM, embed_chart
+from src.infrastructure.similarity.vector_index import (
+    ChartSimilarityIndex, FlatIndex, IVFIndex, claim_snapshot_writer
+)
+
+
+def make_chart(longitudes, houses=None, aspects=()):
+    houses = houses or [1] * len(longitudes)
+    return NatalChart(
+        planets=[
+            Planet(name=name, sign="Aries", longitude=lon % 360.0, house=house, is_retrograde=False)
+            for name, lon, house in zip(EMBEDDED_BODIES, longitudes, houses)
+        ],
+        houses=[],
+        aspects=[Aspect(planet1=a, planet2=b, type=kind, orb=orb) for a, kind, b, orb in aspects],
+    )
+
+
+def random_chart(rng):
+    return make_chart([rng.uniform(0, 360) for _ in EMBEDDED_BODIES], [rng.randint(1, 12) for _ in EMBEDDED_BODIES])
+
+
+def clustered_vectors(n, dim=EMBEDDING_DIM, clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_embedding_is_unit_length_and_wraps_longitude():
+    """Embeddings are normalised; 359° and 1° are neighbours."""
+    base = [10.0, 100.0, 200.0, 250.0, 300.0, 30.0, 60.0, 90.0, 120.0, 150.0]
+    chart = make_chart(base, aspects=[("Sun", "Square", "Moon", 1.0)])
+    vector = embed_chart(chart)
+    assert vector.dtype == np.float32 and vector.shape == (EMBEDDING_DIM,)
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+
+    near = embed_chart(make_chart([359.0] + base[1:]))
+    also_near = embed_chart(make_chart([1.0] + base[1:]))
+    far = embed_chart(make_chart([180.0] + base[1:]))
+    assert near @ also_near > near @ far
+    assert embed_chart(make_chart(base[:3])).shape == (EMBEDDING_DIM,)  # missing bodies are zeros
+
+
+def test_flat_index_is_exact_and_updates_in_place():
+    """Flat search matches a full sort; removal keeps the matrix dense."""
+    vectors = clustered_vectors(500)
+    flat = FlatIndex(EMBEDDING_DIM)
+    for i, vector in enumerate(vectors):
+        flat.add(i, vector)
+    scores, keys = flat.search(vectors[7], 5)
+    assert keys == list(np.argsort(-(vectors @ vectors[7]), kind="stable")[:5])
+    assert keys[0] == 7 and scores[0] == pytest.approx(1.0, abs=1e-5)
+
+    assert flat.remove(7) and not flat.remove(7)
+    assert len(flat) == 499 and 7 not in flat
+    assert flat.search(vectors[7], 1)[1] != [7]
+    np.testing.assert_array_equal(flat.get(499), vectors[499])  # moved into the freed row
+
+
+def test_ivf_recall():
+    """IVF recovers most exact neighbours while scanning a fraction of the vectors."""
+    vectors = clustered_vectors(5000)
+    flat = FlatIndex(EMBEDDING_DIM, vectors.copy(), range(5000))
+    ivf = IVFIndex.train(vectors, range(5000), nlist=64, nprobe=8)
+    assert len(ivf) == 5000
+    queries = clustered_vectors(50, seed=1)
+    recall = np.mean([
+        len(set(ivf.search(q, 10)[1]) & set(flat.search(q, 10)[1])) / 10 for q in queries
+    ])
+    assert recall >= 0.9
+
+    ivf.add("new", queries[0])
+    assert ivf.search(queries[0], 1)[1] == ["new"]
+    assert ivf.remove("new") and "new" not in ivf
+
+
+def test_similarity_index_switches_to_ivf_and_excludes_self():
+    """The chart index goes approximate past its threshold; queries skip the user."""
+    rng = random.Random(3)
+    index = ChartSimilarityIndex(ivf_threshold=300)
+    charts = [random_chart(rng) for _ in range(400)]
+    for i, chart in enumerate(charts):
+        index.add(f"u{i}", chart)
+    assert index.kind == "ivf" and len(index) == 400
+
+    twin = make_chart([p.longitude + 0.5 for p in charts[5].planets], [p.house for p in charts[5].planets])
+    index.add("twin", twin)
+    matches = index.similar("u5", k=3)
+    assert matches[0][0] == "twin" and all(user != "u5" for user, _ in matches)
+    assert index.similar("missing") is None
+    assert index.similar(chart=charts[9], k=1)[0][0] == "u9"
+
+
+def test_snapshot_is_memory_mapped_and_copy_on_write(tmp_path):
+    """A loaded snapshot maps vectors read-only and copies a cluster only when modified."""
+    rng = random.Random(4)
+    index = ChartSimilarityIndex(ivf_threshold=200)
+    for i in range(250):
+        index.add(f"u{i}", random_chart(rng))
+    index.save(str(tmp_path))
+    index.save(str(tmp_path))  # a second snapshot replaces the first's files
+    assert len(list(tmp_path.glob("vectors.*.npy"))) == 1
+
+    loaded = ChartSimilarityIndex.load(str(tmp_path))
+    assert loaded.kind == "ivf" and len(loaded) == 250
+    assert loaded.similar("u1", k=5) == index.similar("u1", k=5)
+    lists = loaded._index.lists
+    assert all(isinstance(flat._vectors.base, np.memmap) or not len(flat) for flat in lists)
+
+    loaded.add("u1", random_chart(rng))
+    loaded.remove("u2")
+    assert len(loaded) == 249
+    # at most the old and new cluster of u1 and the cluster of u2
+    assert sum(flat._vectors.flags.writeable for flat in lists if len(flat)) <= 3
+
+    assert len(ChartSimilarityIndex.load(str(tmp_path / "empty"))) == 0
+
+
+def test_concurrent_saves_never_break_loads(tmp_path):
+    """Loads racing saves of other writers always find the files their manifest names."""
+    rng = random.Random(6)
+    writers = []
+    for w in range(2):
+        index = ChartSimilarityIndex(ivf_threshold=50)
+        for i in range(60):
+            index.add(f"w{w}-u{i}", random_chart(rng))
+        writers.append(index)
+    stop, errors = threading.Event(), []
+
+    def keep_saving(index):
+        try:
+            while not stop.is_set():
+                index.save(str(tmp_path))
+        except OSError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=keep_saving, args=(index,)) for index in writers]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(50):
+            assert len(ChartSimilarityIndex.load(str(tmp_path))) in (0, 60)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert errors == []
+    token = (tmp_path / "index.json").read_text().split('"token": "')[1][:12]
+    assert sorted(path.name for path in tmp_path.glob("*.npy")) == [f"centroids.{token}.npy", f"vectors.{token}.npy"]
+
+
+def test_one_process_claims_the_snapshot_writer(tmp_path):
+    """The writer lock is exclusive until its holder closes it."""
+    writer = claim_snapshot_writer(str(tmp_path))
+    assert writer is not None
+    assert claim_snapshot_writer(str(tmp_path)) is None
+    writer.close()
+    second = claim_snapshot_writer(str(tmp_path))
+    assert second is not None
+    second.close()
+
+
+def test_repository_maintains_similarity_index():
+    """Saved charts are searchable at once and leave the index when evicted."""
+    rng = random.Random(5)
+    repo = BoundedInMemoryRepository(max_entries=3)
+    for user_id in ("a", "b", "c", "d"):
+        repo.save_chart(user_id, random_chart(rng))
+    assert repo.find_similar("a") is None
+    assert {user for user, _ in repo.find_similar("d")} == {"b", "c"}
+    assert repo.stats()["similarity"]["vectors"] == 3
@@ -0,0 +1,118 @@
+"""Unit tests for the live sky feed."""
+
+import asyncio
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.modules.setdefault('swisseph', MagicMock())
+
+from src.config.settings import Settings
+from src.core.domain.exceptions import SkyFeedFullError
+from src.core.domain.models import SkyPosition
+from src.infrastructure.astro_engine.sky_feed import SkyFeed
+from src.interfaces.api import v1
+from src.interfaces.api.main import create_app
+
+
+class FakeEngine:
+    """Counts position calculations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def calculate_positions(self, jd):
+        self.calls += 1
+        return [SkyPosition(name="Sun", sign="Libra", longitude=205.9, speed=0.99, is_retrograde=False)]
+
+
+async def take(feed, count, received, pause=None):
+    """Subscribe and collect ``count`` frames, optionally waiting on ``pause`` after the first."""
+    async for frame in feed.frames():
+        feed.delivered(frame)
+        received.append(frame)
+        if len(received) == count:
+            return
+        if pause is not None and len(received) == 1:
+            await pause.wait()
+
+
+def test_each_tick_is_computed_and_encoded_once():
+    engine = FakeEngine()
+    feed = SkyFeed(engine, interval=0.05)
+
+    async def scenario():
+        assert engine.calls == 0  # nothing runs without subscribers
+        inboxes = [[] for _ in range(500)]
+        await asyncio.wait_for(asyncio.gather(*(take(feed, 3, inbox) for inbox in inboxes)), timeout=5.0)
+        await feed.stop()
+        return inboxes
+
+    inboxes = asyncio.run(scenario())
+    assert engine.calls == feed.counters["published"] <= 4
+    # Every subscriber got the very same encoded frames
+    first = inboxes[0]
+    assert all(a is b for inbox in inboxes for a, b in zip(inbox, first))
+    assert [json.loads(frame.text)["seq"] for frame in first] == [1, 2, 3]
+    assert first[0].event.startswith(b"id: 1\ndata: {")
+    stats = feed.stats()
+    assert stats["peak_subscribers"] == 500 and stats["subscribers"] == 0 and stats["delivered"] == 1500
+    assert stats["broadcast_max_ms"] > 0.0
+
+
+def test_slow_subscribers_skip_stale_frames():
+    feed = SkyFeed(FakeEngine(), interval=3600.0)  # frames after the first are published by hand
+
+    async def scenario():
+        fast, slow, pause = [], [], asyncio.Event()
+        tasks = [asyncio.create_task(take(feed, 4, fast)), asyncio.create_task(take(feed, 2, slow, pause))]
+        while len(fast) < 1 or len(slow) < 1:
+            await asyncio.sleep(0.01)
+        for seq in (2, 3, 4):
+            feed.publish(feed.compute(seq))
+            await asyncio.sleep(0.01)  # the fast subscriber takes each frame as it comes
+        pause.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=5.0)
+        await feed.stop()
+        return fast, slow
+
+    fast, slow = asyncio.run(scenario())
+    assert [frame.seq for frame in fast] == [1, 2, 3, 4]
+    assert [frame.seq for frame in slow] == [1, 4]  # 2 and 3 were never queued for it
+    assert feed.counters["dropped"] == 2
+
+
+def test_subscriber_limit_and_shutdown():
+    feed = SkyFeed(FakeEngine(), interval=3600.0, max_subscribers=2)
+
+    async def scenario():
+        received = [[], []]
+        tasks = [asyncio.create_task(take(feed, 10, inbox)) for inbox in received]
+        while not all(received):
+            await asyncio.sleep(0.01)
+        with pytest.raises(SkyFeedFullError):
+            await feed.frames().__anext__()
+        await feed.stop()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=5.0)  # subscriptions end with the feed
+
+    asyncio.run(scenario())
+    assert feed.counters["rejected"] == 1 and feed.subscribers == 0
+
+
+def test_live_sky_endpoints():
+    app = create_app(Settings(google_api_key="x"))
+    feed = SkyFeed(FakeEngine(), interval=0.05)
+    app.dependency_overrides[v1.get_sky_feed] = lambda: feed
+    client = TestClient(app)
+
+    with client.websocket_connect("/api/v1/sky/live") as websocket:
+        frames = [websocket.receive_json() for _ in range(3)]
+    assert [frame["seq"] for frame in frames] == [1, 2, 3]
+    assert frames[0]["positions"][0]["name"] == "Sun" and frames[0]["time"].endswith("+00:00")
+
+    stats = client.get("/api/v1/sky/live/stats").json()
+    assert stats["published"] >= 3 and stats["delivered"] >= 3
+    assert stats["peak_subscribers"] == 1 and stats["subscribers"] == 0  # the closed socket left at once
@@ -0,0 +1,60 @@
+"""Unit tests for the shared sky snapshot cache."""
+
+from datetime import datetime, timezone
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+with patch.dict('sys.modules', {'swisseph': MagicMock()}):
+    from src.core.domain.models import SkyPosition
+    from src.infrastructure.astro_engine import sky_snapshot
+    from src.infrastructure.astro_engine.sky_snapshot import SkySnapshotService, bucket_start
+
+
+NOW = datetime(2026, 10, 19, 14, 37, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    """Engine double counting position computations."""
+    engine = MagicMock()
+    engine.calculate_positions.return_value = [
+        SkyPosition(name="Sun", sign="Libra", longitude=206.0, speed=0.99, is_retrograde=False)
+    ]
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def fake_julday():
+    """Deterministic Julian Day conversion."""
+    with patch.object(sky_snapshot.swe, "julday", side_effect=lambda y, m, d, h: 2461000.0 + d + h / 24.0):
+        yield
+
+
+def test_bucket_start_floors_to_utc():
+    """Buckets start on the UTC hour or day."""
+    assert bucket_start(NOW, "hour") == datetime(2026, 10, 19, 14, tzinfo=timezone.utc)
+    assert bucket_start(NOW, "day") == datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def test_same_bucket_is_computed_once(engine):
+    """Every lookup inside a bucket reuses the first computation."""
+    service = SkySnapshotService(engine)
+    first = service.get("hour", NOW)
+    second = service.get("hour", NOW.replace(minute=59))
+    assert first is second
+    assert engine.calculate_positions.call_count == 1
+    assert first.bucket_start == "2026-10-19T14:00:00+00:00"
+
+
+def test_refresh_precomputes_ring_and_evicts(engine):
+    """The ring around now is warm, older buckets are dropped."""
+    service = SkySnapshotService(engine, past=1, ahead=2)
+    service.get("hour", datetime(2026, 10, 18, 3, tzinfo=timezone.utc))
+    service.refresh(NOW)
+
+    assert len(service._snapshots) == 2 * (1 + 1 + 2)
+    calls = engine.calculate_positions.call_count
+    service.get("hour", NOW.replace(hour=16))
+    service.get("day", NOW)
+    assert engine.calculate_positions.call_count == calls
@@ -0,0 +1,84 @@
+"""Tests for the in-memory static asset cache."""
+
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config.settings import Settings
+from src.interfaces.api.main import create_app
+from src.interfaces.api.static_assets import IMMUTABLE_CACHE_CONTROL, StaticAssetCache
+
+
+INDEX_HTML = "<!DOCTYPE html><html><body>" + "<p>AstroPersona</p>" * 50 + "</body></html>"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """A small built frontend: the SPA shell plus a hashed bundle."""
+    (tmp_path / "index.html").write_text(INDEX_HTML)
+    (tmp_path / "bundle.3f2a9c1e.js").write_text("console.log('lilith');" * 40)
+    return tmp_path
+
+
+@pytest.fixture
+def client(static_dir):
+    """Test client for an app serving the temporary static directory."""
+    settings = Settings(google_api_key="fake_key", static_dir=str(static_dir), app_env="production")
+    yield TestClient(create_app(settings))
+
+
+def test_spa_fallback_serves_index_with_etag(client):
+    """Unmatched routes return the SPA shell with a strong ETag."""
+    response = client.get("/some/client/route", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.text == INDEX_HTML
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_conditional_request_returns_304(client):
+    """A matching If-None-Match short-circuits with 304 and no body."""
+    first = client.get("/", headers={"Accept-Encoding": "identity"})
+    second = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_gzip_variant_is_negotiated(static_dir):
+    """Clients accepting gzip receive the precompressed variant."""
+    cache = StaticAssetCache(str(static_dir))
+    asset = cache.get("index.html")
+    encoding, body, etag = asset.select("gzip, deflate")
+    assert encoding == "gzip"
+    assert gzip.decompress(body).decode() == INDEX_HTML
+    assert etag != asset.variants["identity"][1]
+
+
+def test_hashed_assets_are_immutable(client):
+    """Content-hashed bundles get long-lived cache headers."""
+    response = client.get("/static/bundle.3f2a9c1e.js")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_missing_static_asset_returns_404(client):
+    """Unknown files under /static are not answered with the SPA shell."""
+    response = client.get("/static/missing.js")
+    assert response.status_code == 404
+
+
+def test_auto_reload_picks_up_rebuilds(static_dir):
+    """In dev mode a changed build output is reloaded."""
+    cache = StaticAssetCache(str(static_dir), auto_reload=True, reload_interval=0.0)
+    old_etag = cache.get("index.html").variants["identity"][1]
+
+    index_path = static_dir / "index.html"
+    index_path.write_text("<html>rebuilt</html>")
+    stat = os.stat(index_path)
+    os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    asset = cache.get("index.html")
+    assert asset.variants["identity"][0] == b"<html>rebuilt</html>"
+    assert asset.variants["identity"][1] != old_etag
@@ -0,0 +1,93 @@
+"""Unit tests for the template text generator."""
+
+import random
+import time
+
+import pytest
+
+from src.core.domain.models import HoroscopePreferences, House, NatalChart, Planet
+from src.core.domain.rules import ASPECT_RULES, HOUSE_RULES, PATTERN_RULES, SIGN_RULES
+from src.core.domain.text_templates import LANGUAGE_PACKS
+from src.core.use_cases.interpret_chart import interpret_chart
+from src.core.use_cases.template_text import TemplateTextGenerator
+
+SIGNS = list(SIGN_RULES)
+BODIES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+def make_chart(seed):
+    """A chart with random placements and no aspects."""
+    rng = random.Random(seed)
+    planets = []
+    for name in BODIES:
+        longitude = rng.uniform(0.0, 360.0)
+        planets.append(Planet(name=name, sign=SIGNS[int(longitude // 30)], longitude=longitude,
+                              house=rng.randint(1, 12), is_retrograde=rng.random() < 0.2))
+    first = rng.uniform(0.0, 360.0)
+    houses = [House(number=i + 1, degree=(first + 30 * i) % 360, sign=SIGNS[int((first + 30 * i) % 360 // 30)])
+              for i in range(12)]
+    return NatalChart(planets=planets, houses=houses, aspects=[])
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return TemplateTextGenerator()
+
+
+@pytest.fixture
+def leo_chart():
+    return NatalChart(
+        planets=[
+            Planet(name="Sun", sign="Leo", longitude=135.0, house=5, is_retrograde=False),
+            Planet(name="Venus", sign="Cancer", longitude=100.0, house=7, is_retrograde=True),
+        ],
+        houses=[House(number=1, degree=250.0, sign="Sagittarius")],
+        aspects=[],
+    )
+
+
+def test_text_is_deterministic_per_chart(generator, leo_chart):
+    interpretation = interpret_chart(leo_chart)
+    text = generator.generate(leo_chart, interpretation)
+    assert text == generator.generate(leo_chart, interpretation)
+    assert "Sun in Leo" in text and "Sagittarius" in text
+
+    variants = {generator.generate(leo_chart, interpretation, chart_id=f"c_{i}") for i in range(20)}
+    assert len(variants) > 1  # wording varies with the chart ID
+
+
+def test_languages_and_preferences(generator, leo_chart):
+    interpretation = interpret_chart(leo_chart)
+    romanian = generator.generate(leo_chart, interpretation, HoroscopePreferences(language="ro", focus="love"))
+    assert "Soarele în Leu" in romanian
+    assert "Casa a VII-a" in romanian and "Venus" in romanian
+    spanish = generator.generate(leo_chart, interpretation, HoroscopePreferences(language="ES "))
+    assert "el Sol en Leo" in spanish
+
+    english = generator.generate(leo_chart, interpretation)
+    assert generator.generate(leo_chart, interpretation, HoroscopePreferences(language="xx")) == english
+    assert generator.generate(leo_chart, interpretation, HoroscopePreferences(tone="unknown")) == english
+
+
+def test_every_rule_keyword_is_translated():
+    keywords = {
+        keyword
+        for rules in (SIGN_RULES, HOUSE_RULES, ASPECT_RULES, PATTERN_RULES)
+        for entry in rules.values()
+        for values in entry.values()
+        for keyword in values
+    }
+    for code, pack in LANGUAGE_PACKS.items():
+        if code != "en":
+            assert keywords <= set(pack["words"]), code
+        assert set(pack["templates"]) == set(LANGUAGE_PACKS["en"]["templates"]), code
+        assert set(pack["templates"]["closing"]) == set(LANGUAGE_PACKS["en"]["templates"]["closing"]), code
+
+
+def test_throughput(generator):
+    charts = [make_chart(seed) for seed in range(50)]
+    interpretations = [interpret_chart(chart) for chart in charts]
+    started = time.perf_counter()
+    for i in range(1000):
+        generator.generate(charts[i % 50], interpretations[i % 50], chart_id=str(i))
+    assert time.perf_counter() - started < 1.0  # thousands of texts per second